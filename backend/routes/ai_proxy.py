@@ -20,7 +20,7 @@ All endpoints require appropriate content.* permissions
 
 from fastapi import APIRouter, HTTPException, Header, Depends, Request
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
 import os
@@ -31,6 +31,11 @@ from emergentintegrations.llm.chat import LlmChat, UserMessage
 from services.database import get_db
 # RBAC decorator
 from services.authorization_decorator import require_permission
+# SSE streaming helpers
+from services.llm_streaming_service import stream_llm_completion, sse_response
+# Provider concurrency limiter and latency-aware routing
+from services.circuit_breaker_service import llm_concurrency_slot
+from services.latency_router_service import Route, get_latency_router
 
 logger = logging.getLogger(__name__)
 
@@ -108,7 +113,12 @@ class AISummarizeRequest(BaseModel):
 # HELPER FUNCTIONS
 # =============================================================================
 
-async def get_ai_client(session_id: str = "default", system_message: str = "You are a helpful AI assistant."):
+async def get_ai_client(
+    session_id: str = "default",
+    system_message: str = "You are a helpful AI assistant.",
+    provider: str = "openai",
+    model: str = "gpt-4o-mini"
+):
     """Get the AI client with proper API key from environment"""
     api_key = os.environ.get('EMERGENT_LLM_KEY') or os.environ.get('OPENAI_API_KEY')
     if not api_key:
@@ -117,7 +127,47 @@ async def get_ai_client(session_id: str = "default", system_message: str = "You
         api_key=api_key,
         session_id=session_id,
         system_message=system_message
-    ).with_model("openai", "gpt-4o-mini")
+    ).with_model(provider, model)
+
+
+# Equivalent (provider, model) pairs for proxy calls, in preference order
+PROXY_ROUTES = [
+    ("openai", "gpt-4o-mini"),
+    ("gemini", "gemini-2.5-flash"),
+]
+
+
+async def send_with_limit(chat: LlmChat, text: str, provider: str = "openai", model: str = "gpt-4o-mini"):
+    """Send a message while holding a provider concurrency slot (AIMD limiter)"""
+    async with llm_concurrency_slot(provider, model):
+        return await chat.send_message(UserMessage(text=text))
+
+
+async def routed_ai_call(session_id: str, system_message: str, text: str, hedge: bool = True) -> Tuple[str, str]:
+    """
+    Send a message via the fastest healthy provider in PROXY_ROUTES.
+    
+    Proxy calls are interactive, so by default a hedged request is fired on
+    the next provider once the first one runs past its p95 latency.
+    
+    Returns:
+        (content, model) - model is the one that answered, which differs
+        from the primary route after a fallback or a winning hedge
+    """
+    def make_route(provider: str, model: str) -> Route:
+        async def call():
+            chat = await get_ai_client(session_id, system_message, provider=provider, model=model)
+            return await send_with_limit(chat, text, provider, model)
+        return Route(provider, f"{provider}:{model}", call)
+    
+    result = await get_latency_router().execute(
+        [make_route(provider, model) for provider, model in PROXY_ROUTES],
+        hedge=hedge
+    )
+    if result.route != PROXY_ROUTES[0][0]:
+        logger.info(f"AI proxy call served by {result.route} (attempts: {result.attempts})")
+    content = result.value if isinstance(result.value, str) else str(result.value)
+    return content, dict(PROXY_ROUTES)[result.route]
 
 
 async def log_ai_operation(
@@ -160,6 +210,104 @@ async def deduct_credits(db: AsyncIOMotorDatabase, user_id: str, credits: int =
     )
 
 
+def _extract_chat_messages(request: AIChatRequest) -> Tuple[str, str]:
+    """Extract the system prompt and latest user message from a chat request"""
+    system_content = "You are a helpful AI assistant."
+    user_content = ""
+    
+    for msg in request.messages:
+        if msg.role == "system":
+            system_content = msg.content
+        elif msg.role == "user":
+            user_content = msg.content
+    
+    if not user_content:
+        raise HTTPException(400, "No user message provided")
+    
+    return system_content, user_content
+
+
+REWRITE_SYSTEM_MESSAGE = "You are a professional content writer specializing in rewriting and improving text."
+
+
+def _build_rewrite_prompt(request: AIRewriteRequest) -> str:
+    """Build the rewrite prompt for a style"""
+    style_instructions = {
+        "professional": "Use a professional, business-appropriate tone.",
+        "casual": "Use a friendly, conversational tone.",
+        "academic": "Use formal academic language with proper citations style.",
+        "creative": "Use creative, engaging language with vivid descriptions.",
+        "simple": "Use simple, easy-to-understand language."
+    }
+    
+    style_prompt = style_instructions.get(request.style, style_instructions["professional"])
+    
+    return f"""Rewrite the following content in a {request.style} style.
+{style_prompt}
+{f'Additional instructions: {request.instructions}' if request.instructions else ''}
+
+Content to rewrite:
+{request.content}"""
+
+
+def _generate_system_message(request: AIGenerateRequest) -> str:
+    """System prompt for content generation"""
+    return f"You are a professional content creator specializing in {request.content_type} writing."
+
+
+def _build_generate_prompt(request: AIGenerateRequest) -> str:
+    """Build the generation prompt for a content type and length"""
+    length_instructions = {
+        "short": "Keep it brief, around 100-200 words.",
+        "medium": "Write a moderate length piece, around 300-500 words.",
+        "long": "Write a comprehensive piece, around 800-1200 words."
+    }
+    
+    content_type_instructions = {
+        "article": "Write a well-structured article with an introduction, body paragraphs, and conclusion.",
+        "blog_post": "Write an engaging blog post with a catchy introduction and helpful content.",
+        "product_description": "Write a compelling product description highlighting key features and benefits.",
+        "essay": "Write a formal essay with a thesis statement and supporting arguments.",
+        "social_post": "Write engaging social media content that drives engagement.",
+        "email": "Write a professional email with clear subject and call-to-action.",
+        "caption": "Write an engaging caption suitable for social media."
+    }
+    
+    return f"""Generate {request.content_type} content about: {request.topic}
+
+Tone: {request.tone}
+{length_instructions.get(request.length, length_instructions['medium'])}
+{content_type_instructions.get(request.content_type, '')}
+{f'Additional context: {request.additional_context}' if request.additional_context else ''}
+
+Generate the content:"""
+
+
+def _streaming_callbacks(
+    db: AsyncIOMotorDatabase,
+    user_id: str,
+    operation_type: str,
+    model: str,
+    credits: int = 1
+):
+    """
+    Build the completion/cancel callbacks for a streamed AI operation.
+    
+    Credits are only deducted once the stream completes; a disconnect or
+    upstream failure is logged as an unsuccessful operation.
+    """
+    async def on_complete(content: str) -> Dict[str, Any]:
+        tokens_used = len(content) // 4
+        await log_ai_operation(db, user_id, operation_type, model, tokens_used=tokens_used, success=True)
+        await deduct_credits(db, user_id, credits)
+        return {"model_used": model, "tokens_used": tokens_used, "operation_type": operation_type}
+    
+    async def on_cancel(partial_content: str):
+        await log_ai_operation(db, user_id, operation_type, model, tokens_used=len(partial_content) // 4, success=False)
+    
+    return on_complete, on_cancel
+
+
 # =============================================================================
 # AI PROXY ENDPOINTS
 # =============================================================================
@@ -188,20 +336,17 @@ async def ai_complete(
         if not await check_user_credits(db, user_id):
             raise HTTPException(403, "Insufficient credits")
         
-        # Get AI client with system prompt
         system_msg = request.system_prompt or "You are a helpful AI assistant."
-        chat = await get_ai_client(
+        
+        # Make AI call on the fastest healthy provider
+        content, model_used = await routed_ai_call(
             session_id=f"{user_id}_{request.operation_type}",
-            system_message=system_msg
+            system_message=system_msg,
+            text=request.prompt
         )
         
-        # Make AI call using UserMessage object
-        response = await chat.send_message(UserMessage(text=request.prompt))
-        
-        content = response if isinstance(response, str) else str(response)
-        
         # Log operation
-        await log_ai_operation(db, user_id, request.operation_type, request.model, success=True)
+        await log_ai_operation(db, user_id, request.operation_type, model_used, success=True)
         
         # Deduct credits
         await deduct_credits(db, user_id, 1)
@@ -209,7 +354,7 @@ async def ai_complete(
         return AICompletionResponse(
             success=True,
             content=content,
-            model_used=request.model,
+            model_used=model_used,
             operation_type=request.operation_type
         )
         
@@ -217,7 +362,7 @@ async def ai_complete(
         raise
     except Exception as e:
         logger.error(f"AI completion error: {str(e)}")
-        await log_ai_operation(db, user_id, request.operation_type, request.model, success=False)
+        await log_ai_operation(db, user_id, request.operation_type, PROXY_ROUTES[0][1], success=False)
         raise HTTPException(500, f"AI service error: {str(e)}")
 
 
@@ -238,29 +383,15 @@ async def ai_chat(
         if not await check_user_credits(db, user_id):
             raise HTTPException(403, "Insufficient credits")
         
-        # Extract system message from messages
-        system_content = "You are a helpful AI assistant."
-        user_content = ""
-        
-        for msg in request.messages:
-            if msg.role == "system":
-                system_content = msg.content
-            elif msg.role == "user":
-                user_content = msg.content
-        
-        if not user_content:
-            raise HTTPException(400, "No user message provided")
+        system_content, user_content = _extract_chat_messages(request)
         
-        chat = await get_ai_client(
+        content, model_used = await routed_ai_call(
             session_id=f"{user_id}_chat",
-            system_message=system_content
+            system_message=system_content,
+            text=user_content
         )
         
-        response = await chat.send_message(UserMessage(text=user_content))
-        
-        content = response if isinstance(response, str) else str(response)
-        
-        await log_ai_operation(db, user_id, request.operation_type, request.model, success=True)
+        await log_ai_operation(db, user_id, request.operation_type, model_used, success=True)
         await deduct_credits(db, user_id, 1)
         
         return {
@@ -269,7 +400,7 @@ async def ai_chat(
                 "role": "assistant",
                 "content": content
             },
-            "model_used": request.model
+            "model_used": model_used
         }
         
     except HTTPException:
@@ -300,16 +431,13 @@ Only return the translation, no explanations.
 Text to translate:
 {request.text}"""
         
-        chat = await get_ai_client(
+        content, model_used = await routed_ai_call(
             session_id=f"{user_id}_translate",
-            system_message="You are a professional translator. Provide accurate translations."
+            system_message="You are a professional translator. Provide accurate translations.",
+            text=prompt
         )
         
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        content = response if isinstance(response, str) else str(response)
-        
-        await log_ai_operation(db, user_id, "translate", "gpt-4o-mini", success=True)
+        await log_ai_operation(db, user_id, "translate", model_used, success=True)
         await deduct_credits(db, user_id, 1)
         
         return {
@@ -341,33 +469,15 @@ async def ai_rewrite(
         if not await check_user_credits(db, user_id):
             raise HTTPException(403, "Insufficient credits")
         
-        style_instructions = {
-            "professional": "Use a professional, business-appropriate tone.",
-            "casual": "Use a friendly, conversational tone.",
-            "academic": "Use formal academic language with proper citations style.",
-            "creative": "Use creative, engaging language with vivid descriptions.",
-            "simple": "Use simple, easy-to-understand language."
-        }
-        
-        style_prompt = style_instructions.get(request.style, style_instructions["professional"])
+        prompt = _build_rewrite_prompt(request)
         
-        prompt = f"""Rewrite the following content in a {request.style} style.
-{style_prompt}
-{f'Additional instructions: {request.instructions}' if request.instructions else ''}
-
-Content to rewrite:
-{request.content}"""
-        
-        chat = await get_ai_client(
+        content, model_used = await routed_ai_call(
             session_id=f"{user_id}_rewrite",
-            system_message="You are a professional content writer specializing in rewriting and improving text."
+            system_message=REWRITE_SYSTEM_MESSAGE,
+            text=prompt
         )
         
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        content = response if isinstance(response, str) else str(response)
-        
-        await log_ai_operation(db, user_id, "rewrite", "gpt-4o-mini", success=True)
+        await log_ai_operation(db, user_id, "rewrite", model_used, success=True)
         await deduct_credits(db, user_id, 1)
         
         return {
@@ -399,41 +509,15 @@ async def ai_generate(
         if not await check_user_credits(db, user_id):
             raise HTTPException(403, "Insufficient credits")
         
-        length_instructions = {
-            "short": "Keep it brief, around 100-200 words.",
-            "medium": "Write a moderate length piece, around 300-500 words.",
-            "long": "Write a comprehensive piece, around 800-1200 words."
-        }
-        
-        content_type_instructions = {
-            "article": "Write a well-structured article with an introduction, body paragraphs, and conclusion.",
-            "blog_post": "Write an engaging blog post with a catchy introduction and helpful content.",
-            "product_description": "Write a compelling product description highlighting key features and benefits.",
-            "essay": "Write a formal essay with a thesis statement and supporting arguments.",
-            "social_post": "Write engaging social media content that drives engagement.",
-            "email": "Write a professional email with clear subject and call-to-action.",
-            "caption": "Write an engaging caption suitable for social media."
-        }
+        prompt = _build_generate_prompt(request)
         
-        prompt = f"""Generate {request.content_type} content about: {request.topic}
-
-Tone: {request.tone}
-{length_instructions.get(request.length, length_instructions['medium'])}
-{content_type_instructions.get(request.content_type, '')}
-{f'Additional context: {request.additional_context}' if request.additional_context else ''}
-
-Generate the content:"""
-        
-        chat = await get_ai_client(
+        content, model_used = await routed_ai_call(
             session_id=f"{user_id}_generate_{request.content_type}",
-            system_message=f"You are a professional content creator specializing in {request.content_type} writing."
+            system_message=_generate_system_message(request),
+            text=prompt
         )
         
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        content = response if isinstance(response, str) else str(response)
-        
-        await log_ai_operation(db, user_id, f"generate_{request.content_type}", "gpt-4o-mini", success=True)
+        await log_ai_operation(db, user_id, f"generate_{request.content_type}", model_used, success=True)
         await deduct_credits(db, user_id, 2)  # Generation costs more credits
         
         return {
@@ -477,16 +561,13 @@ async def ai_summarize(
 Text to summarize:
 {request.text}"""
         
-        chat = await get_ai_client(
+        content, model_used = await routed_ai_call(
             session_id=f"{user_id}_summarize",
-            system_message="You are an expert at creating clear and accurate summaries."
+            system_message="You are an expert at creating clear and accurate summaries.",
+            text=prompt
         )
         
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        content = response if isinstance(response, str) else str(response)
-        
-        await log_ai_operation(db, user_id, "summarize", "gpt-4o-mini", success=True)
+        await log_ai_operation(db, user_id, "summarize", model_used, success=True)
         await deduct_credits(db, user_id, 1)
         
         return {
@@ -522,19 +603,16 @@ async def ai_generate_hashtags(
 
 Return only the hashtags, one per line, with the # symbol. Do not include any explanations."""
         
-        chat = await get_ai_client(
+        content, model_used = await routed_ai_call(
             session_id=f"{user_id}_hashtags",
-            system_message="You are a social media expert specializing in hashtag strategy."
+            system_message="You are a social media expert specializing in hashtag strategy.",
+            text=prompt
         )
         
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        content = response if isinstance(response, str) else str(response)
-        
         # Parse hashtags
         hashtags = [tag.strip() for tag in content.split('\n') if tag.strip().startswith('#')]
         
-        await log_ai_operation(db, user_id, "hashtags", "gpt-4o-mini", success=True)
+        await log_ai_operation(db, user_id, "hashtags", model_used, success=True)
         await deduct_credits(db, user_id, 1)
         
         return {
@@ -575,19 +653,16 @@ Include a mix of:
 
 Return only the keywords, one per line. Do not include explanations or numbering."""
         
-        chat = await get_ai_client(
+        content, model_used = await routed_ai_call(
             session_id=f"{user_id}_seo",
-            system_message="You are an SEO expert specializing in keyword research and optimization."
+            system_message="You are an SEO expert specializing in keyword research and optimization.",
+            text=prompt
         )
         
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        content = response if isinstance(response, str) else str(response)
-        
         # Parse keywords
         keywords = [kw.strip() for kw in content.split('\n') if kw.strip()]
         
-        await log_ai_operation(db, user_id, "seo_keywords", "gpt-4o-mini", success=True)
+        await log_ai_operation(db, user_id, "seo_keywords", model_used, success=True)
         await deduct_credits(db, user_id, 1)
         
         return {
@@ -603,6 +678,123 @@ Return only the keywords, one per line. Do not include explanations or numbering
         raise HTTPException(500, f"SEO keyword generation error: {str(e)}")
 
 
+# =============================================================================
+# STREAMING (SSE) ENDPOINTS
+# =============================================================================
+# Token-by-token variants of the endpoints above. Responses are
+# text/event-stream with "token", "done" and "error" events; credits are
+# deducted and the operation is logged when the "done" event is sent.
+
+@router.post("/complete/stream")
+@require_permission("content.create")
+async def ai_complete_stream(
+    http_request: Request,
+    request: AICompletionRequest,
+    user_id: str = Header(..., alias="X-User-ID"),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Streaming variant of /ai/complete - emits tokens as Server-Sent Events.
+    """
+    if not await check_user_credits(db, user_id):
+        raise HTTPException(403, "Insufficient credits")
+    
+    tokens = stream_llm_completion(
+        system_message=request.system_prompt or "You are a helpful AI assistant.",
+        prompt=request.prompt,
+        model="gpt-4o-mini",
+        temperature=request.temperature,
+        max_tokens=request.max_tokens
+    )
+    on_complete, on_cancel = _streaming_callbacks(db, user_id, request.operation_type, "gpt-4o-mini")
+    return sse_response(http_request, tokens, on_complete=on_complete, on_cancel=on_cancel)
+
+
+@router.post("/chat/stream")
+@require_permission("content.create")
+async def ai_chat_stream(
+    http_request: Request,
+    request: AIChatRequest,
+    user_id: str = Header(..., alias="X-User-ID"),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Streaming variant of /ai/chat - emits tokens as Server-Sent Events.
+    """
+    if not await check_user_credits(db, user_id):
+        raise HTTPException(403, "Insufficient credits")
+    
+    system_content, user_content = _extract_chat_messages(request)
+    
+    tokens = stream_llm_completion(
+        system_message=system_content,
+        prompt=user_content,
+        model="gpt-4o-mini",
+        temperature=request.temperature,
+        max_tokens=request.max_tokens
+    )
+    on_complete, on_cancel = _streaming_callbacks(db, user_id, request.operation_type, "gpt-4o-mini")
+    return sse_response(http_request, tokens, on_complete=on_complete, on_cancel=on_cancel)
+
+
+@router.post("/rewrite/stream")
+@require_permission("content.create")
+async def ai_rewrite_stream(
+    http_request: Request,
+    request: AIRewriteRequest,
+    user_id: str = Header(..., alias="X-User-ID"),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Streaming variant of /ai/rewrite - emits tokens as Server-Sent Events.
+    """
+    if not await check_user_credits(db, user_id):
+        raise HTTPException(403, "Insufficient credits")
+    
+    tokens = stream_llm_completion(
+        system_message=REWRITE_SYSTEM_MESSAGE,
+        prompt=_build_rewrite_prompt(request),
+        model="gpt-4o-mini"
+    )
+    on_complete, on_cancel = _streaming_callbacks(db, user_id, "rewrite", "gpt-4o-mini")
+    return sse_response(
+        http_request, tokens,
+        on_complete=on_complete,
+        on_cancel=on_cancel,
+        metadata={"style": request.style}
+    )
+
+
+@router.post("/generate/stream")
+@require_permission("content.create")
+async def ai_generate_stream(
+    http_request: Request,
+    request: AIGenerateRequest,
+    user_id: str = Header(..., alias="X-User-ID"),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Streaming variant of /ai/generate - emits tokens as Server-Sent Events.
+    """
+    if not await check_user_credits(db, user_id):
+        raise HTTPException(403, "Insufficient credits")
+    
+    tokens = stream_llm_completion(
+        system_message=_generate_system_message(request),
+        prompt=_build_generate_prompt(request),
+        model="gpt-4o-mini"
+    )
+    on_complete, on_cancel = _streaming_callbacks(
+        db, user_id, f"generate_{request.content_type}", "gpt-4o-mini", credits=2  # Generation costs more credits
+    )
+    return sse_response(
+        http_request, tokens,
+        on_complete=on_complete,
+        on_cancel=on_cancel,
+        metadata={"content_type": request.content_type, "topic": request.topic}
+    )
+
+
 # =============================================================================
 # LEGACY COMPATIBILITY - SET_DB (DEPRECATED)
 # =============================================================================
@@ -924,6 +924,119 @@ async def delete_professional_brand_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _replace_company_document(
+    db_conn: AsyncIOMotorDatabase,
+    user_id: str,
+    document_id: str,
+    file: UploadFile,
+    tier: str,
+    subdir: str
+) -> Dict[str, Any]:
+    """Save a new version of a company KB document and re-index the changed chunks."""
+    user = await db_conn.users.find_one({"id": user_id}, {"_id": 0})
+    if not user or user.get("company_role") != "admin":
+        raise HTTPException(status_code=403, detail="Only Company Admins can replace documents")
+    
+    company_id = user["company_id"]
+    doc = await db_conn.knowledge_documents.find_one(
+        {"id": document_id, "tier": tier, "tier_id": company_id}, {"_id": 0, "id": 1}
+    )
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    # Validate file
+    filename = file.filename or "unknown"
+    file_ext = Path(filename).suffix.lower()
+    
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+    
+    content = await file.read()
+    
+    if len(content) > MAX_FILE_SIZE:
+        raise HTTPException(status_code=400, detail="File too large. Max: 50MB")
+    
+    if len(content) == 0:
+        raise HTTPException(status_code=400, detail="File is empty")
+    
+    file_path = UPLOADS_DIR / subdir / f"{uuid4()}{file_ext}"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(content)
+    
+    from services.knowledge_base_service import get_knowledge_service
+    
+    kb_service = get_knowledge_service()
+    try:
+        result = await kb_service.update_document_tiered(
+            document_id=document_id,
+            file_path=str(file_path),
+            tier=tier,
+            tier_id=company_id,
+            filename=filename,
+            user_id=user_id
+        )
+    except Exception:
+        file_path.unlink(missing_ok=True)
+        raise
+    
+    if not result.get("success"):
+        # The previous version stays in place - the new upload is unused
+        file_path.unlink(missing_ok=True)
+    return result
+
+
+@router.put("/knowledge/universal/documents/{document_id}")
+@require_permission("knowledge.upload")
+async def replace_universal_company_document(
+    request: Request,
+    document_id: str,
+    file: UploadFile = File(...),
+    user_id: str = Header(..., alias="X-User-ID"),
+    db_conn: AsyncIOMotorDatabase = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Upload a new version of a Universal Company Policy document.
+    Only the chunks that changed are re-indexed. Only Company Admins can do this.
+    """
+    try:
+        return await _replace_company_document(
+            db_conn, user_id, document_id, file, "company_universal", "universal"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error replacing universal company document: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put("/knowledge/professional/documents/{document_id}")
+@require_permission("knowledge.upload")
+async def replace_professional_brand_document(
+    request: Request,
+    document_id: str,
+    file: UploadFile = File(...),
+    user_id: str = Header(..., alias="X-User-ID"),
+    db_conn: AsyncIOMotorDatabase = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Upload a new version of a Professional Brand & Compliance document.
+    Only the chunks that changed are re-indexed. Only Company Admins can do this.
+    """
+    try:
+        return await _replace_company_document(
+            db_conn, user_id, document_id, file, "company_professional", "professional"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error replacing professional brand document: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/knowledge/stats")
 @require_permission("knowledge.view")
 async def get_company_knowledge_stats_detailed(
@@ -24,6 +24,7 @@ Rate Limiting (ARCH-013):
 from fastapi import APIRouter, HTTPException, UploadFile, File, Header, Depends, Request
 from typing import Optional, List
 import os
+import asyncio
 import logging
 import uuid
 import shutil
@@ -53,9 +54,12 @@ from services.authorization_decorator import require_permission
 # Credit consumption service (Pricing v3.0)
 from services.credit_service import (
     consume_credits_util,
+    check_credits_for,
     CreditAction,
     CreditService,
 )
+# SSE streaming for /content/generate/stream
+from services.llm_streaming_service import sse_response
 import json
 import re
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -71,6 +75,9 @@ ROOT_DIR = Path(__file__).parent.parent
 UPLOADS_DIR = ROOT_DIR / "uploads"
 UPLOADS_DIR.mkdir(exist_ok=True)
 
+# Model that reads /content/analyze prompts (sizes the knowledge base context)
+CONTENT_ANALYSIS_MODEL = "gpt-4.1-mini"
+
 # Language mapping
 LANGUAGE_NAMES = {
     'en': 'English',
@@ -227,6 +234,175 @@ IMPORTANT: Your analysis MUST factor in the platform context above. Score conten
 """
     return context
 
+# ============================================================
+# AGENTIC STAGES - run concurrently with the main analysis
+# Both are non-blocking: a failed agent call yields None, and a
+# malformed result is dropped by the caller's merge try/except.
+# ============================================================
+async def _run_employment_law_stage(content: str, policy_context: str):
+    """Employment law agent call, or None if it fails"""
+    try:
+        from services.employment_law_agent import analyze_employment_compliance
+
+        logging.info(f"Running employment law analysis on content: {content[:100]}...")
+        return await analyze_employment_compliance(
+            content=content,
+            company_policies=policy_context if policy_context != "No custom policies uploaded" else None
+        )
+    except Exception as hr_error:
+        logging.warning(f"Employment law analysis failed (non-blocking): {str(hr_error)}")
+        return None
+
+
+async def _run_cultural_stage(content: str, target_region: Optional[str], target_audience: Optional[str]):
+    """Agentic cultural analysis call, or None if it fails"""
+    try:
+        from services.cultural_analysis_agent import analyze_cultural_sensitivity
+
+        logging.info("Running agentic cultural analysis...")
+        return await analyze_cultural_sensitivity(
+            content=content,
+            target_region=target_region,
+            target_audience=target_audience,
+            content_type="hiring" if "hiring" in content.lower() or "job" in content.lower() else None
+        )
+    except Exception as cultural_error:
+        logging.warning(f"Agentic cultural analysis failed (non-blocking): {str(cultural_error)}")
+        return None
+
+
+def _merge_employment_law_analysis(result: dict, hr_analysis: dict, compliance_score, overall_score):
+    """
+    Merge the employment law agent result into the analysis.
+
+    Everything is built before result is touched, so a malformed agent
+    payload raises without leaving a half-merged analysis behind.
+
+    Returns:
+        (compliance_score, overall_score) after the agent's overrides
+    """
+    logging.info(f"Employment law analysis: violations_detected={hr_analysis.get('violations_detected', False)}, score={hr_analysis.get('compliance_score', 100)}")
+
+    if not hr_analysis.get("violations_detected", False):
+        # No violations - add clean check
+        employment_law_check = {
+            "is_hr_content": hr_analysis.get("analysis_type") != "skipped",
+            "violations_found": False,
+            "models_used": hr_analysis.get("models_used", []),
+            "analysis_type": hr_analysis.get("analysis_type", "agentic_ensemble")
+        }
+        result.setdefault("compliance_analysis", {})["employment_law_check"] = employment_law_check
+        return compliance_score, overall_score
+
+    violations = hr_analysis.get("violations", [])
+    logging.info(f"Employment law violations detected: {len(violations)} violations")
+
+    # Override compliance score with agentic analysis
+    agent_compliance_score = hr_analysis.get("compliance_score", 100)
+    compliance_score = min(compliance_score, agent_compliance_score)
+
+    # Cap overall score based on violation severity
+    severity = hr_analysis.get("severity", "none")
+    severity_caps = {"critical": 35, "severe": 45, "high": 55, "moderate": 70}
+    overall_cap = severity_caps.get(severity, 100)
+    overall_score = min(overall_score, overall_cap)
+
+    detected = [{
+        "severity": violation.get("severity", "moderate"),
+        "type": violation.get("type", "employment_law_violation"),
+        "description": violation.get("explanation", violation.get("description", "")),
+        "law_reference": violation.get("law_reference", ""),
+        "problematic_text": violation.get("problematic_text", ""),
+        "recommendation": violation.get("recommendation", "")
+    } for violation in violations]
+
+    # Employment law check details
+    employment_law_check = {
+        "is_hr_content": True,
+        "violations_found": True,
+        "violation_count": len(violations),
+        "severity": severity,
+        "compliance_score": agent_compliance_score,
+        "violation_types": [v.get("type", "unknown") for v in violations],
+        "specific_issues": [v.get("explanation", v.get("description", "")) for v in violations],
+        "recommendations": hr_analysis.get("rewrite_suggestions", []),
+        "models_used": hr_analysis.get("models_used", ["gpt-4.1-mini", "gemini-2.5-flash"]),
+        "analysis_type": hr_analysis.get("analysis_type", "agentic_ensemble")
+    }
+
+    # Update the compliance analysis with detected violations
+    compliance_analysis = result.setdefault("compliance_analysis", {})
+    compliance_analysis["severity"] = severity
+    compliance_analysis.setdefault("violations", []).extend(detected)
+    compliance_analysis["explanation"] = hr_analysis.get("summary",
+        "Employment law violations detected. This content contains problematic language that could expose the company to legal liability.")
+    compliance_analysis["employment_law_check"] = employment_law_check
+
+    # Update overall rating based on severity
+    rating_map = {"critical": "Critical", "severe": "Poor", "high": "Needs Improvement", "moderate": "Fair"}
+    result["overall_rating"] = rating_map.get(severity, "Needs Improvement")
+
+    # Mark as flagged
+    result["flagged_status"] = "policy_violation"
+    return compliance_score, overall_score
+
+
+def _merge_cultural_analysis(result: dict, cultural_result: dict, cultural_score):
+    """
+    Replace the cultural analysis with the agentic multi-model result.
+
+    Returns:
+        cultural_score after the agent's override
+    """
+    if cultural_result.get("analysis_type") != "agentic_multi_model":
+        return cultural_score
+
+    logging.info(f"Agentic cultural analysis complete: score={cultural_result.get('overall_score')}")
+
+    # Override cultural analysis with agentic results
+    result["cultural_analysis"] = {
+        "overall_score": cultural_result.get("overall_score", 75),
+        "summary": cultural_result.get("summary", ""),
+        "dimensions": cultural_result.get("dimensions", []),
+        "appropriate_cultures": cultural_result.get("appropriate_cultures", []),
+        "risk_regions": cultural_result.get("risk_regions", []),
+        "general_recommendations": cultural_result.get("general_recommendations", []),
+        "target_match_status": cultural_result.get("target_match_status", "good"),
+        "target_match_explanation": cultural_result.get("target_match_explanation", ""),
+        "models_used": cultural_result.get("models_used", []),
+        "analysis_type": cultural_result.get("analysis_type", "agentic_multi_model")
+    }
+
+    return cultural_result.get("overall_score", 75)
+
+
+def _merge_agent_results(result: dict, hr_analysis, cultural_result, compliance_score, cultural_score, overall_score):
+    """
+    Merge both agent results into the analysis, each on its own.
+
+    A malformed agent payload is logged and skipped; the main analysis
+    and the other agent's merge still go through.
+
+    Returns:
+        (compliance_score, cultural_score, overall_score)
+    """
+    if hr_analysis is not None:
+        try:
+            compliance_score, overall_score = _merge_employment_law_analysis(
+                result, hr_analysis, compliance_score, overall_score
+            )
+        except Exception as hr_error:
+            logging.warning(f"Employment law analysis merge failed (non-blocking): {str(hr_error)}")
+
+    if cultural_result is not None:
+        try:
+            cultural_score = _merge_cultural_analysis(result, cultural_result, cultural_score)
+        except Exception as cultural_error:
+            logging.warning(f"Agentic cultural analysis merge failed (non-blocking): {str(cultural_error)}")
+
+    return compliance_score, cultural_score, overall_score
+
+
 # DEPRECATED: Use Depends(get_db) instead
 def set_db(database):
     """Set database instance"""
@@ -586,10 +762,28 @@ async def analyze_content(data: ContentAnalyze, request: Request = None, db_conn
             # Usage tracker not initialized - allow request but log warning
             logging.warning("Usage tracker not initialized - proceeding without limit check")
             usage_check = {"tier": "unknown", "allowed": True}
-        
-        # Get user's policy documents
-        policies = await db_conn.policies.find({"user_id": data.user_id}, {"_id": 0}).to_list(10)
-        
+
+        # === PARALLEL PREFETCH ===
+        # The analysis context reads are independent of each other, so fan
+        # them out at once instead of awaiting five round trips in sequence.
+        async def _fetch_profile():
+            if not data.profile_id:
+                return None
+            return await db_conn.strategic_profiles.find_one({"id": data.profile_id}, {"_id": 0})
+
+        policies, profile, user, conversation_history, user_feedback = await asyncio.gather(
+            db_conn.policies.find({"user_id": data.user_id}, {"_id": 0}).to_list(10),
+            _fetch_profile(),
+            db_conn.users.find_one({"id": data.user_id}, {"_id": 0}),
+            db_conn.conversation_memory.find(
+                {"user_id": data.user_id}
+            ).sort("created_at", -1).limit(10).to_list(10),
+            db_conn.analysis_feedback.find(
+                {"user_id": data.user_id}
+            ).sort("created_at", -1).limit(5).to_list(5),
+        )
+        company_id = user.get("company_id") if user else None
+
         # Extract text content from policy documents
         policy_texts = []
         for policy in policies:
@@ -634,7 +828,6 @@ async def analyze_content(data: ContentAnalyze, request: Request = None, db_conn
         cultural_target_context = ""
         
         if data.profile_id:
-            profile = await db_conn.strategic_profiles.find_one({"id": data.profile_id}, {"_id": 0})
             if profile:
                 # Get profile type first - determines which knowledge tiers to query
                 profile_type = profile.get("profile_type", "personal")
@@ -680,11 +873,7 @@ async def analyze_content(data: ContentAnalyze, request: Request = None, db_conn
                 try:
                     from services.knowledge_base_service import get_knowledge_service
                     kb_service = get_knowledge_service()
-                    
-                    # Get user info for company context
-                    user = await db_conn.users.find_one({"id": data.user_id}, {"_id": 0})
-                    company_id = user.get("company_id") if user else None
-                    
+
                     # Get combined context - profile_type determines which tiers are included
                     # profile_type="personal" will SKIP company tier
                     # profile_type="company" will INCLUDE all tiers
@@ -693,7 +882,8 @@ async def analyze_content(data: ContentAnalyze, request: Request = None, db_conn
                         user_id=data.user_id,
                         company_id=company_id,
                         profile_id=data.profile_id,
-                        profile_type=profile_type  # Pass profile_type for context-aware filtering
+                        profile_type=profile_type,  # Pass profile_type for context-aware filtering
+                        model=CONTENT_ANALYSIS_MODEL
                     )
                     
                     if knowledge_context:
@@ -710,11 +900,7 @@ async def analyze_content(data: ContentAnalyze, request: Request = None, db_conn
             try:
                 from services.knowledge_base_service import get_knowledge_service
                 kb_service = get_knowledge_service()
-                
-                # Get user info for company context
-                user = await db_conn.users.find_one({"id": data.user_id}, {"_id": 0})
-                company_id = user.get("company_id") if user else None
-                
+
                 if company_id:
                     # Get ONLY Universal Company Policies (Tier 1)
                     knowledge_context = await kb_service.get_tiered_context_for_ai(
@@ -722,7 +908,8 @@ async def analyze_content(data: ContentAnalyze, request: Request = None, db_conn
                         user_id=data.user_id,
                         company_id=company_id,
                         profile_id=None,
-                        profile_type="personal"  # This still includes universal tier
+                        profile_type="personal",  # This still includes universal tier
+                        model=CONTENT_ANALYSIS_MODEL
                     )
                     
                     if knowledge_context:
@@ -731,18 +918,9 @@ async def analyze_content(data: ContentAnalyze, request: Request = None, db_conn
                         
             except Exception as kb_error:
                 logging.warning(f"Universal policy query for analysis failed: {str(kb_error)}")
-        
-        # Get conversation history for context
-        conversation_history = await db_conn.conversation_memory.find(
-            {"user_id": data.user_id}
-        ).sort("created_at", -1).limit(10).to_list(10)
+
         conversation_history.reverse()  # oldest first
-        
-        # Get user feedback history to improve analysis
-        user_feedback = await db_conn.analysis_feedback.find(
-            {"user_id": data.user_id}
-        ).sort("created_at", -1).limit(5).to_list(5)
-        
+
         feedback_context = ""
         if user_feedback:
             feedback_context = "\n\nUser's past corrections/feedback:\n" + "\n".join([
@@ -778,7 +956,7 @@ Learn from user feedback to continuously improve accuracy.{feedback_context}"""
             api_key=api_key,
             session_id=f"user_{data.user_id}",
             system_message=hardened_system_message
-        ).with_model("openai", "gpt-4.1-mini")  # Upgraded for better compliance detection
+        ).with_model("openai", CONTENT_ANALYSIS_MODEL)  # Upgraded for better compliance detection
         
         # Language-specific instruction
         language_instruction = ""
@@ -1091,11 +1269,30 @@ CRITICAL REQUIREMENTS FOR CULTURAL ANALYSIS:
             role="user",
             message=f"Analyze: {data.content[:100]}"
         )
-        await db_conn.conversation_memory.insert_one(user_memory.model_dump())
-        
         user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
-        
+
+        # ============================================================
+        # AGENTIC STAGES - run concurrently with the main analysis
+        # Employment law and cultural agents only depend on the content
+        # and the prefetched context, so they do not wait on the main LLM.
+        # Both are non-blocking: a failure yields None and is skipped below.
+        # ============================================================
+        hr_task = asyncio.ensure_future(_run_employment_law_stage(data.content, policy_context))
+        cultural_task = asyncio.ensure_future(
+            _run_cultural_stage(data.content, profile_target_region, profile_target_audience)
+        )
+        try:
+            _, response = await asyncio.gather(
+                db_conn.conversation_memory.insert_one(user_memory.model_dump()),
+                chat.send_message(user_message),
+            )
+            hr_analysis, cultural_result = await asyncio.gather(hr_task, cultural_task)
+        except BaseException:
+            # Main analysis failed - don't leave the agent calls running
+            hr_task.cancel()
+            cultural_task.cancel()
+            raise
+
         # Parse response with robust JSON extraction
         try:
             # Clean the response - remove code block markers
@@ -1410,136 +1607,12 @@ CRITICAL REQUIREMENTS FOR CULTURAL ANALYSIS:
         overall_score = scoring_result["overall_score"]
         
         # ============================================================
-        # EMPLOYMENT LAW ANALYSIS - Agentic Multi-Model System
-        # Uses multiple LLMs to detect subtle employment law violations
-        # ============================================================
-        logging.info(f"Running employment law analysis on content: {data.content[:100]}...")
-        
-        try:
-            from services.employment_law_agent import analyze_employment_compliance
-            
-            # Run the agentic multi-model analysis
-            hr_analysis = await analyze_employment_compliance(
-                content=data.content,
-                company_policies=policy_context if policy_context != "No custom policies uploaded" else None
-            )
-            
-            logging.info(f"Employment law analysis: violations_detected={hr_analysis.get('violations_detected', False)}, score={hr_analysis.get('compliance_score', 100)}")
-            
-            if hr_analysis.get("violations_detected", False):
-                violations = hr_analysis.get("violations", [])
-                logging.info(f"Employment law violations detected: {len(violations)} violations")
-                
-                # Override compliance score with agentic analysis
-                agent_compliance_score = hr_analysis.get("compliance_score", 100)
-                compliance_score = min(compliance_score, agent_compliance_score)
-                
-                # Cap overall score based on violation severity
-                severity = hr_analysis.get("severity", "none")
-                severity_caps = {"critical": 35, "severe": 45, "high": 55, "moderate": 70}
-                overall_cap = severity_caps.get(severity, 100)
-                overall_score = min(overall_score, overall_cap)
-                
-                # Update the compliance analysis with detected violations
-                if "compliance_analysis" not in result:
-                    result["compliance_analysis"] = {}
-                
-                # Set severity
-                result["compliance_analysis"]["severity"] = severity
-                
-                # Add/update violations list
-                if "violations" not in result["compliance_analysis"]:
-                    result["compliance_analysis"]["violations"] = []
-                
-                for violation in violations:
-                    result["compliance_analysis"]["violations"].append({
-                        "severity": violation.get("severity", "moderate"),
-                        "type": violation.get("type", "employment_law_violation"),
-                        "description": violation.get("explanation", violation.get("description", "")),
-                        "law_reference": violation.get("law_reference", ""),
-                        "problematic_text": violation.get("problematic_text", ""),
-                        "recommendation": violation.get("recommendation", "")
-                    })
-                
-                # Update explanation
-                result["compliance_analysis"]["explanation"] = hr_analysis.get("summary", 
-                    "Employment law violations detected. This content contains problematic language that could expose the company to legal liability.")
-                
-                # Add employment law check details
-                result["compliance_analysis"]["employment_law_check"] = {
-                    "is_hr_content": True,
-                    "violations_found": True,
-                    "violation_count": len(violations),
-                    "severity": severity,
-                    "compliance_score": agent_compliance_score,
-                    "violation_types": [v.get("type", "unknown") for v in violations],
-                    "specific_issues": [v.get("explanation", v.get("description", "")) for v in violations],
-                    "recommendations": hr_analysis.get("rewrite_suggestions", []),
-                    "models_used": hr_analysis.get("models_used", ["gpt-4.1-mini", "gemini-2.5-flash"]),
-                    "analysis_type": hr_analysis.get("analysis_type", "agentic_ensemble")
-                }
-                
-                # Update overall rating based on severity
-                rating_map = {"critical": "Critical", "severe": "Poor", "high": "Needs Improvement", "moderate": "Fair"}
-                result["overall_rating"] = rating_map.get(severity, "Needs Improvement")
-                
-                # Mark as flagged
-                result["flagged_status"] = "policy_violation"
-            else:
-                # No violations - add clean check
-                if "compliance_analysis" not in result:
-                    result["compliance_analysis"] = {}
-                result["compliance_analysis"]["employment_law_check"] = {
-                    "is_hr_content": hr_analysis.get("analysis_type") != "skipped",
-                    "violations_found": False,
-                    "models_used": hr_analysis.get("models_used", []),
-                    "analysis_type": hr_analysis.get("analysis_type", "agentic_ensemble")
-                }
-                
-        except Exception as hr_error:
-            logging.warning(f"Employment law analysis failed (non-blocking): {str(hr_error)}")
-            # Non-blocking - if the agentic service fails, continue with standard analysis
-        
-        # ============================================================
-        # CULTURAL ANALYSIS - Agentic Multi-Model System
-        # Uses multiple LLMs to analyze cultural sensitivity
+        # AGENTIC RESULTS - employment law violations and multi-model
+        # cultural analysis override the main analysis (non-blocking)
         # ============================================================
-        try:
-            from services.cultural_analysis_agent import analyze_cultural_sensitivity
-            
-            logging.info("Running agentic cultural analysis...")
-            
-            # Run the agentic multi-model cultural analysis
-            cultural_result = await analyze_cultural_sensitivity(
-                content=data.content,
-                target_region=profile_target_region,
-                target_audience=profile_target_audience,
-                content_type="hiring" if "hiring" in data.content.lower() or "job" in data.content.lower() else None
-            )
-            
-            if cultural_result.get("analysis_type") == "agentic_multi_model":
-                logging.info(f"Agentic cultural analysis complete: score={cultural_result.get('overall_score')}")
-                
-                # Override cultural analysis with agentic results
-                result["cultural_analysis"] = {
-                    "overall_score": cultural_result.get("overall_score", 75),
-                    "summary": cultural_result.get("summary", ""),
-                    "dimensions": cultural_result.get("dimensions", []),
-                    "appropriate_cultures": cultural_result.get("appropriate_cultures", []),
-                    "risk_regions": cultural_result.get("risk_regions", []),
-                    "general_recommendations": cultural_result.get("general_recommendations", []),
-                    "target_match_status": cultural_result.get("target_match_status", "good"),
-                    "target_match_explanation": cultural_result.get("target_match_explanation", ""),
-                    "models_used": cultural_result.get("models_used", []),
-                    "analysis_type": cultural_result.get("analysis_type", "agentic_multi_model")
-                }
-                
-                # Update cultural score
-                cultural_score = cultural_result.get("overall_score", 75)
-                
-        except Exception as cultural_error:
-            logging.warning(f"Agentic cultural analysis failed (non-blocking): {str(cultural_error)}")
-            # Non-blocking - continue with standard analysis
+        compliance_score, cultural_score, overall_score = _merge_agent_results(
+            result, hr_analysis, cultural_result, compliance_score, cultural_score, overall_score
+        )
         
         # If content needs disclosure confirmation, keep compliance score higher
         # until user confirms (don't penalize prematurely)
@@ -1591,8 +1664,7 @@ CRITICAL REQUIREMENTS FOR CULTURAL ANALYSIS:
                 "language": data.language
             }
             
-            # Add enterprise_id if user belongs to enterprise
-            user = await db_conn.users.find_one({"id": data.user_id}, {"_id": 0, "enterprise_id": 1})
+            # Add enterprise_id if user belongs to enterprise (user was prefetched above)
             if user and user.get("enterprise_id"):
                 analysis_record["enterprise_id"] = user["enterprise_id"]
             
@@ -2051,8 +2123,11 @@ STRATEGIC PROFILE GUIDELINES:
                 
                 # Get knowledge base context
                 try:
+                    from services.ai_content_agent import MODEL_CONFIG, ModelTier
                     knowledge_service = get_knowledge_service()
-                    kb_context = await knowledge_service.get_context_for_generation(profile_id, limit=3)
+                    kb_context = await knowledge_service.get_context_for_generation(
+                        profile_id, limit=3, model=MODEL_CONFIG[ModelTier.TOP_TIER]["model"]  # The agent rewrites on TOP_TIER
+                    )
                     if kb_context:
                         profile_context = f"\n\nKNOWLEDGE BASE CONTEXT:\n{kb_context}"
                 except Exception as kb_error:
@@ -2382,8 +2457,30 @@ async def generate_content(data: dict, request: Request = None, db_conn: AsyncIO
     Security (ARCH-005): Requires content.create permission.
     Security (ARCH-028): Implements prompt injection protection
     """
+    return await _run_content_generation(data, request, db_conn)
+
+
+@router.post("/content/generate/stream")
+@require_permission("content.create")
+async def generate_content_stream(data: dict, request: Request = None, db_conn: AsyncIOMotorDatabase = Depends(get_db)):
+    """
+    Streaming variant of /content/generate using Server-Sent Events.
+    
+    Emits a "start" event with the resolved language/model, then "token"
+    events as the content is written, and a final "done" event with usage.
+    Credits are checked up front but only consumed once the stream completes;
+    a client disconnect cancels the upstream LLM call.
+    
+    Security (ARCH-005): Requires content.create permission.
+    Security (ARCH-028): Implements prompt injection protection
+    """
+    return await _run_content_generation(data, request, db_conn, stream=True)
+
+
+async def _run_content_generation(data: dict, request: Optional[Request], db_conn: AsyncIOMotorDatabase, stream: bool = False):
+    """Shared implementation of /content/generate and /content/generate/stream"""
     try:
-        from services.ai_content_agent import get_content_agent, TaskType, ModelTier
+        from services.ai_content_agent import get_content_agent, TaskType, ModelTier, MODEL_CONFIG
         from services.language_service import resolve_content_language, build_language_instruction
         
         prompt_text = data.get('prompt', '')
@@ -2454,16 +2551,34 @@ async def generate_content(data: dict, request: Request = None, db_conn: AsyncIO
                 logging.info(f"Rate limit warning for user {user_id}: {warning['message']}")
         
         # === CREDIT CONSUMPTION (Pricing v3.0) ===
-        # Consume credits for content generation before proceeding
-        credit_success, credit_result = await consume_credits_util(
-            action=CreditAction.CONTENT_GENERATION,
-            user_id=user_id,
-            db=db_conn,
-            quantity=1,
-            metadata={"platforms": platforms, "tone": tone},
-            raise_on_insufficient=True  # Will raise 402 if insufficient
-        )
-        logging.info(f"Credits consumed for user {user_id}: {credit_result.get('credits_consumed', 0)}")
+        if stream:
+            # Streaming: verify the balance now, consume once the stream completes
+            has_enough, credits_required, credits_available = await check_credits_for(
+                CreditAction.CONTENT_GENERATION, 1, user_id, db_conn
+            )
+            if not has_enough:
+                raise HTTPException(
+                    status_code=402,
+                    detail={
+                        "error": "insufficient_credits",
+                        "message": "Insufficient credits for this action",
+                        "credits_required": credits_required,
+                        "credits_available": credits_available,
+                        "action": CreditAction.CONTENT_GENERATION.value,
+                        "upgrade_url": "/pricing"
+                    }
+                )
+        else:
+            # Consume credits for content generation before proceeding
+            credit_success, credit_result = await consume_credits_util(
+                action=CreditAction.CONTENT_GENERATION,
+                user_id=user_id,
+                db=db_conn,
+                quantity=1,
+                metadata={"platforms": platforms, "tone": tone},
+                raise_on_insufficient=True  # Will raise 402 if insufficient
+            )
+            logging.info(f"Credits consumed for user {user_id}: {credit_result.get('credits_consumed', 0)}")
         
         # === RESOLVE CONTENT LANGUAGE ===
         # Priority: Profile Language → User Language → Default (English)
@@ -2517,6 +2632,17 @@ async def generate_content(data: dict, request: Request = None, db_conn: AsyncIO
         user = await db_conn.users.find_one({"id": user_id}, {"_id": 0})
         company_id = user.get("company_id") if user else None
         
+        # Allow forcing a specific tier via request (for testing/advanced users)
+        override_tier = None
+        if data.get("force_tier"):
+            tier_map = {
+                "top_tier": ModelTier.TOP_TIER,
+                "balanced": ModelTier.BALANCED,
+                "fast": ModelTier.FAST
+            }
+            override_tier = tier_map.get(data["force_tier"])
+        generation_model = MODEL_CONFIG[override_tier or ModelTier.TOP_TIER]["model"]
+        
         # Query tiered knowledge base with profile_type for context-aware filtering
         try:
             from services.knowledge_base_service import get_knowledge_service
@@ -2528,7 +2654,8 @@ async def generate_content(data: dict, request: Request = None, db_conn: AsyncIO
                 user_id=user_id,
                 company_id=company_id,
                 profile_id=profile_id,
-                profile_type=profile_type  # Pass profile_type for context-aware filtering
+                profile_type=profile_type,  # Pass profile_type for context-aware filtering
+                model=generation_model
             )
             
             if knowledge_context:
@@ -2804,15 +2931,72 @@ INSTRUCTIONS:
         try:
             agent = get_content_agent()
             
-            # Allow forcing a specific tier via request (for testing/advanced users)
-            override_tier = None
-            if data.get("force_tier"):
-                tier_map = {
-                    "top_tier": ModelTier.TOP_TIER,
-                    "balanced": ModelTier.BALANCED,
-                    "fast": ModelTier.FAST
-                }
-                override_tier = tier_map.get(data["force_tier"])
+            if stream:
+                stream_model = generation_model
+                tokens = agent.stream_generate_content(
+                    prompt=enhanced_prompt,
+                    user_id=user_id,
+                    tone=tone,
+                    platforms=platforms,
+                    language=language,
+                    hashtag_count=hashtag_count,
+                    job_title=job_title,
+                    override_tier=override_tier
+                )
+                
+                async def on_stream_complete(content: str):
+                    # Charge and record usage only for completed generations
+                    await consume_credits_util(
+                        action=CreditAction.CONTENT_GENERATION,
+                        user_id=user_id,
+                        db=db_conn,
+                        quantity=1,
+                        metadata={"platforms": platforms, "tone": tone, "streamed": True},
+                        raise_on_insufficient=False
+                    )
+                    tokens_used = (len(enhanced_prompt) + len(content)) // 4
+                    try:
+                        await usage_tracker.record_usage(
+                            user_id=user_id,
+                            operation="content_generation",
+                            tokens_used=tokens_used,
+                            model=stream_model,
+                            metadata={"platforms": platforms, "tone": tone, "streamed": True}
+                        )
+                    except Exception as usage_error:
+                        logging.warning(f"Failed to record generation usage: {str(usage_error)}")
+                    if knowledge_entries_used:
+                        try:
+                            await knowledge_service.increment_usage_count(knowledge_entries_used)
+                        except Exception as ke:
+                            logging.warning(f"Failed to track knowledge usage: {ke}")
+                    return {
+                        "generated_content": content,
+                        "usage": {"tokens_used": tokens_used, "tier": usage_check.get("tier", "unknown")}
+                    }
+                
+                return sse_response(
+                    request,
+                    tokens,
+                    on_complete=on_stream_complete,
+                    metadata={
+                        "prompt": prompt_text,
+                        "tone": tone,
+                        "job_title": job_title,
+                        "language": language,
+                        "language_source": language_info["source"],
+                        "language_name": language_info["name"],
+                        "model_used": stream_model,
+                        "news_context": {
+                            "used": news_context_added,
+                            "industry": detected_industry,
+                            "articles": [
+                                {"title": a["title"], "source": a["source"], "url": a["url"]}
+                                for a in news_articles_used
+                            ] if news_articles_used else []
+                        }
+                    }
+                )
             
             result = await agent.generate_content(
                 prompt=enhanced_prompt,
@@ -2887,6 +3071,34 @@ INSTRUCTIONS:
         except RuntimeError:
             # Fallback to legacy implementation if agent not initialized
             logging.warning("AI Content Agent not initialized - using legacy generation")
+            if stream:
+                # Legacy generation is not streamed - sent as one chunk, charged on completion
+                async def legacy_tokens():
+                    result = await _legacy_generate_content(
+                        prompt_text, tone, job_title, user_id, platforms, language, hashtag_count, usage_check
+                    )
+                    yield result["generated_content"]
+                
+                async def on_legacy_complete(content: str):
+                    await consume_credits_util(
+                        action=CreditAction.CONTENT_GENERATION,
+                        user_id=user_id,
+                        db=db_conn,
+                        quantity=1,
+                        metadata={"platforms": platforms, "tone": tone, "streamed": True},
+                        raise_on_insufficient=False
+                    )
+                    return {
+                        "generated_content": content,
+                        "usage": {"tokens_used": 0, "tier": usage_check.get("tier", "unknown")}
+                    }
+                
+                return sse_response(
+                    request,
+                    legacy_tokens(),
+                    on_complete=on_legacy_complete,
+                    metadata={"prompt": prompt_text, "tone": tone, "job_title": job_title, "model_used": "gpt-4.1-nano"}
+                )
             return await _legacy_generate_content(
                 prompt_text, tone, job_title, user_id, platforms, language, hashtag_count, usage_check
             )
@@ -3824,6 +4036,7 @@ class SEOBlogPostRequest(BaseModel):
     include_titles: bool = True
     include_meta: bool = True
     tone: str = "professional"
+    source_material: Optional[str] = None  # Long articles/notes are condensed with map-reduce
 
 
 @router.post("/content/generate-seo-blog")
@@ -3853,7 +4066,8 @@ async def generate_seo_blog_post(
             word_count=request.word_count,
             include_titles=request.include_titles,
             include_meta=request.include_meta,
-            tone=request.tone
+            tone=request.tone,
+            source_material=request.source_material
         )
         
         if not result.get("success"):
@@ -3872,8 +4086,10 @@ class SocialCampaignRequest(BaseModel):
     product_description: str
     num_posts: int = 5
     platform: str = "twitter"  # twitter, instagram, linkedin, facebook
+    platforms: Optional[List[str]] = None  # Several platforms are generated concurrently
     include_image: bool = True
     image_style: str = "simple"  # simple, creative, illustration
+    check_compliance: bool = False  # Extra FAST-tier check per platform variant
 
 
 @router.post("/content/generate-social-campaign")
@@ -3902,7 +4118,9 @@ async def generate_social_campaign(
             num_posts=request.num_posts,
             platform=request.platform,
             include_image=request.include_image,
-            image_style=request.image_style
+            image_style=request.image_style,
+            platforms=request.platforms,
+            check_compliance=request.check_compliance
         )
         
         if not result.get("success"):
@@ -3965,6 +4183,84 @@ async def repurpose_podcast(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _create_repurpose_job(request_obj: Request, db_conn: AsyncIOMotorDatabase, user_id: str,
+                                input_data: dict, endpoint: str) -> dict:
+    """Queue a CONTENT_REPURPOSE job and return the standard async response"""
+    from services.job_queue_service import get_job_queue_service, TaskType
+    
+    job_service = get_job_queue_service()
+    job_service.set_db(db_conn)
+    
+    job = await job_service.create_job(
+        task_type=TaskType.CONTENT_REPURPOSE,
+        user_id=user_id,
+        input_data=input_data,
+        metadata={
+            "client_ip": request_obj.client.host if request_obj and request_obj.client else None,
+            "endpoint": endpoint
+        }
+    )
+    
+    return {
+        "job_id": job.job_id,
+        "status": job.status.value,
+        "message": "Processing started. Use GET /api/jobs/{job_id} to check status.",
+        "websocket_url": f"/api/jobs/ws/{job.job_id}"
+    }
+
+
+@router.post("/content/repurpose-podcast/async")
+@require_permission("content.create")
+async def repurpose_podcast_async(
+    request_obj: Request,
+    request: PodcastRepurposeRequest,
+    user_id: str = Header(..., alias="X-User-ID"),
+    db_conn: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Submit a podcast repurpose request. Returns immediately with job_id.
+    
+    Recommended for long transcripts: segments are summarized in parallel
+    and per-segment progress is reported on the job.
+    
+    Security (ARCH-005): Requires content.create permission.
+    """
+    return await _create_repurpose_job(request_obj, db_conn, user_id, {
+        "operation": "podcast_repurpose",
+        "transcript_or_summary": request.transcript_or_summary,
+        "podcast_title": request.podcast_title,
+        "target_formats": request.target_formats
+    }, "/content/repurpose-podcast/async")
+
+
+@router.post("/content/generate-seo-blog/async")
+@require_permission("content.create")
+async def generate_seo_blog_post_async(
+    request_obj: Request,
+    request: SEOBlogPostRequest,
+    user_id: str = Header(..., alias="X-User-ID"),
+    db_conn: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Submit an SEO blog post request. Returns immediately with job_id.
+    
+    Recommended with long source_material, which is outlined in parallel
+    segments before writing.
+    
+    Security (ARCH-005): Requires content.create permission.
+    """
+    return await _create_repurpose_job(request_obj, db_conn, user_id, {
+        "operation": "seo_blog_post",
+        "topic": request.topic,
+        "target_keyword": request.target_keyword,
+        "word_count": request.word_count,
+        "include_titles": request.include_titles,
+        "include_meta": request.include_meta,
+        "tone": request.tone,
+        "source_material": request.source_material
+    }, "/content/generate-seo-blog/async")
+
+
 @router.get("/content/agent-capabilities")
 @require_permission("settings.view")
 async def get_agent_capabilities(request: Request):
@@ -7,7 +7,7 @@ Security Update (ARCH-005 Phase 5.1b):
 - Added @require_permission decorators for RBAC enforcement
 """
 from fastapi import APIRouter, HTTPException, Header, Query, Depends, Request
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
@@ -64,6 +64,59 @@ def parse_date_range(date_range: str, custom_start: Optional[str] = None, custom
     return start, end
 
 
+# Post statuses counted as approved / pending on the dashboard
+APPROVED_STATUSES = ["approved", "published"]
+PENDING_STATUSES = ["draft", "pending", "pending_approval"]
+
+
+def created_at_filter(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    """
+    Match documents created between start_date and end_date.
+    
+    created_at is stored as an ISO string (compared lexicographically, like
+    the admin stats) or as a BSON date on older documents. Stored strings are
+    UTC ("+00:00" or "Z"), so the bounds are converted to UTC first; naive
+    bounds are taken as UTC.
+    """
+    start_date, end_date = (
+        d.replace(tzinfo=timezone.utc) if d.tzinfo is None else d.astimezone(timezone.utc)
+        for d in (start_date, end_date)
+    )
+    return {"$or": [
+        {"created_at": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}},
+        {"created_at": {"$gte": start_date, "$lte": end_date}},
+    ]}
+
+
+def avg_score(field: str) -> Dict[str, Any]:
+    """$avg of an analysis score, skipping analyses where it is unset or zero"""
+    path = f"$analysis_result.{field}"
+    return {"$avg": {"$cond": [{"$gt": [path, 0]}, path, None]}}
+
+
+def round_score(value: Optional[float]) -> float:
+    return round(value, 1) if value else 0
+
+
+async def post_status_counts(
+    db_conn: AsyncIOMotorDatabase,
+    match: Dict[str, Any],
+    with_ids: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """Post count (and post ids) per status, computed in MongoDB"""
+    group = {"_id": "$status", "count": {"$sum": 1}}
+    if with_ids:
+        group["post_ids"] = {"$push": "$id"}
+    rows = await db_conn.posts.aggregate([{"$match": match}, {"$group": group}]).to_list(None)
+    return {row["_id"]: row for row in rows}
+
+
+def status_bucket(counts: Dict[str, Dict[str, Any]], statuses: List[str]) -> Tuple[int, List[str]]:
+    """Total count and post ids over a set of statuses"""
+    rows = [counts[status] for status in statuses if status in counts]
+    return sum(row["count"] for row in rows), [i for row in rows for i in row.get("post_ids", [])]
+
+
 @router.get("/stats")
 @require_permission("analytics.view_own")
 async def get_dashboard_stats(
@@ -85,37 +138,23 @@ async def get_dashboard_stats(
         if not user:
             raise HTTPException(404, "User not found")
         
-        # Get basic stats for the user
-        posts = await db_conn.posts.find({"user_id": x_user_id}, {"_id": 0}).to_list(10000)
-        
-        # Calculate basic statistics
-        total_posts = len(posts)
-        approved_posts = len([p for p in posts if p.get("status") in ["approved", "published"]])
-        pending_posts = len([p for p in posts if p.get("status") in ["draft", "pending", "pending_approval"]])
-        flagged_posts = len([p for p in posts if p.get("status") == "flagged"])
-        
-        # Get content analyses for score calculations
-        analyses = await db_conn.content_analyses.find(
-            {"user_id": x_user_id},
-            {"_id": 0}
-        ).to_list(10000)
-        
-        # Calculate average scores
-        overall_scores = []
-        for analysis in analyses:
-            result = analysis.get("analysis_result", {})
-            if result.get("overall_score"):
-                overall_scores.append(result["overall_score"])
+        # Count posts per status in MongoDB
+        counts = await post_status_counts(db_conn, {"user_id": x_user_id})
         
-        avg_overall_score = round(sum(overall_scores) / len(overall_scores), 1) if overall_scores else 0
+        # Average score over the user's content analyses
+        score_rows = await db_conn.content_analyses.aggregate([
+            {"$match": {"user_id": x_user_id}},
+            {"$group": {"_id": None, "overall": avg_score("overall_score")}}
+        ]).to_list(1)
+        scores = score_rows[0] if score_rows else {}
         
         return {
             "stats": {
-                "total_posts": total_posts,
-                "approved_posts": approved_posts,
-                "pending_posts": pending_posts,
-                "flagged_posts": flagged_posts,
-                "avg_overall_score": avg_overall_score
+                "total_posts": sum(row["count"] for row in counts.values()),
+                "approved_posts": status_bucket(counts, APPROVED_STATUSES)[0],
+                "pending_posts": status_bucket(counts, PENDING_STATUSES)[0],
+                "flagged_posts": status_bucket(counts, ["flagged"])[0],
+                "avg_overall_score": round_score(scores.get("overall"))
             },
             "generated_at": datetime.now(timezone.utc).isoformat()
         }
@@ -154,68 +193,31 @@ async def get_dashboard_overview(
         
         start_date, end_date = parse_date_range(date_range, custom_start, custom_end)
         
-        # Build date filter for MongoDB
-        date_filter = {
-            "$gte": start_date.isoformat(),
-            "$lte": end_date.isoformat()
-        }
-        
-        # Get posts with date filter
-        posts_query = {"user_id": x_user_id}
-        posts = await db_conn.posts.find(posts_query, {"_id": 0}).to_list(10000)
-        
-        # Filter by date in Python (more flexible with different date formats)
-        filtered_posts = []
-        for post in posts:
-            created_at = post.get("created_at")
-            if created_at:
-                if isinstance(created_at, str):
-                    try:
-                        post_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        if start_date <= post_date <= end_date:
-                            filtered_posts.append(post)
-                    except (ValueError, TypeError):
-                        filtered_posts.append(post)  # Include if date parse fails
-                elif isinstance(created_at, datetime):
-                    if start_date <= created_at <= end_date:
-                        filtered_posts.append(post)
-        
-        # Calculate stats with post IDs for drill-down
-        total_posts = len(filtered_posts)
-        
-        approved_posts = [p for p in filtered_posts if p.get("status") in ["approved", "published"]]
-        pending_posts = [p for p in filtered_posts if p.get("status") in ["draft", "pending", "pending_approval"]]
-        flagged_posts = [p for p in filtered_posts if p.get("status") == "flagged"]
-        revision_posts = [p for p in filtered_posts if p.get("status") == "revisions_requested"]
-        
-        # Get content analyses for score calculations
-        analyses = await db_conn.content_analyses.find(
-            {"user_id": x_user_id},
-            {"_id": 0}
-        ).to_list(10000)
-        
-        # Calculate average scores
-        compliance_scores = []
-        cultural_scores = []
-        accuracy_scores = []
-        overall_scores = []
-        
-        for analysis in analyses:
-            result = analysis.get("analysis_result", {})
-            
-            if result.get("compliance_score"):
-                compliance_scores.append(result["compliance_score"])
-            if result.get("cultural_score"):
-                cultural_scores.append(result["cultural_score"])
-            if result.get("accuracy_score"):
-                accuracy_scores.append(result["accuracy_score"])
-            if result.get("overall_score"):
-                overall_scores.append(result["overall_score"])
-        
-        avg_compliance = round(sum(compliance_scores) / len(compliance_scores), 1) if compliance_scores else 0
-        avg_cultural = round(sum(cultural_scores) / len(cultural_scores), 1) if cultural_scores else 0
-        avg_accuracy = round(sum(accuracy_scores) / len(accuracy_scores), 1) if accuracy_scores else 0
-        avg_overall = round(sum(overall_scores) / len(overall_scores), 1) if overall_scores else 0
+        # Post counts and ids (for drill-down) per status, in the date range
+        counts = await post_status_counts(
+            db_conn,
+            {"user_id": x_user_id, **created_at_filter(start_date, end_date)},
+            with_ids=True
+        )
+        total_posts, total_ids = status_bucket(counts, list(counts))
+        approved_count, approved_ids = status_bucket(counts, APPROVED_STATUSES)
+        pending_count, pending_ids = status_bucket(counts, PENDING_STATUSES)
+        flagged_count, flagged_ids = status_bucket(counts, ["flagged"])
+        revision_count, revision_ids = status_bucket(counts, ["revisions_requested"])
+        
+        # Average scores over the user's content analyses
+        score_rows = await db_conn.content_analyses.aggregate([
+            {"$match": {"user_id": x_user_id}},
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "overall": avg_score("overall_score"),
+                "compliance": avg_score("compliance_score"),
+                "cultural": avg_score("cultural_score"),
+                "accuracy": avg_score("accuracy_score")
+            }}
+        ]).to_list(1)
+        scores = score_rows[0] if score_rows else {}
         
         return {
             "date_range": {
@@ -226,49 +228,49 @@ async def get_dashboard_overview(
             "stats": {
                 "total_posts": {
                     "value": total_posts,
-                    "post_ids": [p.get("id") for p in filtered_posts],
+                    "post_ids": total_ids,
                     "drill_down_url": "/contentry/content-moderation?tab=posts"
                 },
                 "approved": {
-                    "value": len(approved_posts),
-                    "post_ids": [p.get("id") for p in approved_posts],
+                    "value": approved_count,
+                    "post_ids": approved_ids,
                     "drill_down_url": "/contentry/content-moderation?tab=posts&status=published"
                 },
                 "pending": {
-                    "value": len(pending_posts),
-                    "post_ids": [p.get("id") for p in pending_posts],
+                    "value": pending_count,
+                    "post_ids": pending_ids,
                     "drill_down_url": "/contentry/content-moderation?tab=posts&status=pending_approval"
                 },
                 "flagged": {
-                    "value": len(flagged_posts),
-                    "post_ids": [p.get("id") for p in flagged_posts],
+                    "value": flagged_count,
+                    "post_ids": flagged_ids,
                     "drill_down_url": "/contentry/content-moderation?tab=posts&status=flagged"
                 },
                 "revisions_requested": {
-                    "value": len(revision_posts),
-                    "post_ids": [p.get("id") for p in revision_posts],
+                    "value": revision_count,
+                    "post_ids": revision_ids,
                     "drill_down_url": "/contentry/content-moderation?tab=posts&status=revisions_requested"
                 }
             },
             "scores": {
                 "overall": {
-                    "value": avg_overall,
+                    "value": round_score(scores.get("overall")),
                     "drill_down_url": "/contentry/analytics?view=overall"
                 },
                 "compliance": {
-                    "value": avg_compliance,
+                    "value": round_score(scores.get("compliance")),
                     "drill_down_url": "/contentry/analytics?view=compliance"
                 },
                 "cultural": {
-                    "value": avg_cultural,
+                    "value": round_score(scores.get("cultural")),
                     "drill_down_url": "/contentry/analytics?view=cultural"
                 },
                 "accuracy": {
-                    "value": avg_accuracy,
+                    "value": round_score(scores.get("accuracy")),
                     "drill_down_url": "/contentry/analytics?view=accuracy"
                 }
             },
-            "total_analyses": len(analyses),
+            "total_analyses": scores.get("total", 0),
             "generated_at": datetime.now(timezone.utc).isoformat()
         }
         
@@ -287,11 +289,18 @@ async def get_team_performance(
     date_range: str = Query("last_30_days", description="Date range filter"),
     custom_start: Optional[str] = Query(None),
     custom_end: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000, description="Team members per page"),
+    skip: int = Query(0, ge=0, description="Team members to skip for pagination"),
     db_conn: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
     Get team performance analytics for managers/admins.
-    Returns content volume and compliance scores by team member.
+    Returns content volume and compliance scores by team member, ordered
+    by content volume and paginated with limit/skip. Charts cover the top
+    10 members of the whole team.
+    
+    Volumes and scores come from one aggregation each over the team's
+    posts and content analyses, grouped by user_id.
     
     Security (ARCH-005): Requires team.view_members permission.
     """
@@ -326,57 +335,48 @@ async def get_team_performance(
             # For non-enterprise, just show user's own data
             team_query = {"id": x_user_id}
         
-        team_members = await db_conn.users.find(team_query, {"_id": 0, "id": 1, "full_name": 1, "email": 1}).to_list(1000)
+        team_members = await db_conn.users.find(
+            team_query, {"_id": 0, "id": 1, "full_name": 1, "email": 1}
+        ).to_list(None)
+        member_ids = [m.get("id") for m in team_members]
+        
+        # Content volume per member in the date range
+        volume_rows = await db_conn.posts.aggregate([
+            {"$match": {"user_id": {"$in": member_ids}, **created_at_filter(start_date, end_date)}},
+            {"$group": {"_id": "$user_id", "content_volume": {"$sum": 1}}}
+        ]).to_list(None)
+        volumes = {row["_id"]: row["content_volume"] for row in volume_rows}
+        
+        # Average score per member (overall score, else compliance score)
+        score_rows = await db_conn.content_analyses.aggregate([
+            {"$match": {"user_id": {"$in": member_ids}}},
+            {"$group": {"_id": "$user_id", "avg_score": {"$avg": {"$cond": [
+                {"$gt": ["$analysis_result.overall_score", 0]},
+                "$analysis_result.overall_score",
+                {"$cond": [
+                    {"$gt": ["$analysis_result.compliance_score", 0]},
+                    "$analysis_result.compliance_score",
+                    None
+                ]}
+            ]}}}}
+        ]).to_list(None)
+        scores = {row["_id"]: row["avg_score"] for row in score_rows}
         
         team_performance = []
-        
         for member in team_members:
             member_id = member.get("id")
-            member_name = member.get("full_name") or member.get("email", "Unknown").split("@")[0]
-            
-            # Get posts for this member
-            posts = await db_conn.posts.find({"user_id": member_id}, {"_id": 0}).to_list(10000)
-            
-            # Filter by date
-            filtered_posts = []
-            for post in posts:
-                created_at = post.get("created_at")
-                if created_at:
-                    try:
-                        if isinstance(created_at, str):
-                            post_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        else:
-                            post_date = created_at
-                        if start_date <= post_date <= end_date:
-                            filtered_posts.append(post)
-                    except:
-                        filtered_posts.append(post)
-            
-            # Get analyses for compliance scores
-            analyses = await db_conn.content_analyses.find(
-                {"user_id": member_id},
-                {"_id": 0}
-            ).to_list(10000)
-            
-            compliance_scores = []
-            for analysis in analyses:
-                result = analysis.get("analysis_result", {})
-                score = result.get("overall_score") or result.get("compliance_score")
-                if score:
-                    compliance_scores.append(score)
-            
-            avg_score = round(sum(compliance_scores) / len(compliance_scores), 1) if compliance_scores else 0
-            
+            member_name = member.get("full_name") or (member.get("email") or "Unknown").split("@")[0]
             team_performance.append({
                 "user_id": member_id,
                 "name": member_name,
-                "content_volume": len(filtered_posts),
-                "avg_compliance_score": avg_score,
+                "content_volume": volumes.get(member_id, 0),
+                "avg_compliance_score": round_score(scores.get(member_id)),
                 "drill_down_url": f"/contentry/content-moderation?tab=posts&user_id={member_id}"
             })
         
         # Sort by content volume (descending)
         team_performance.sort(key=lambda x: x["content_volume"], reverse=True)
+        top_members = team_performance[:10]
         
         return {
             "date_range": {
@@ -384,15 +384,20 @@ async def get_team_performance(
                 "start": start_date.isoformat(),
                 "end": end_date.isoformat()
             },
-            "team_performance": team_performance,
+            "team_performance": team_performance[skip:skip + limit],
+            "pagination": {
+                "total_members": len(team_performance),
+                "limit": limit,
+                "skip": skip
+            },
             "charts": {
                 "content_volume": {
-                    "labels": [m["name"] for m in team_performance[:10]],
-                    "data": [m["content_volume"] for m in team_performance[:10]]
+                    "labels": [m["name"] for m in top_members],
+                    "data": [m["content_volume"] for m in top_members]
                 },
                 "compliance_scores": {
-                    "labels": [m["name"] for m in team_performance[:10]],
-                    "data": [m["avg_compliance_score"] for m in team_performance[:10]]
+                    "labels": [m["name"] for m in top_members],
+                    "data": [m["avg_compliance_score"] for m in top_members]
                 }
             },
             "generated_at": datetime.now(timezone.utc).isoformat()
@@ -439,62 +444,69 @@ async def get_content_strategy_insights(
                         for role in [user_role, enterprise_role])
         
         if is_manager and enterprise_id:
-            # Get all enterprise users
-            enterprise_users = await db_conn.users.find(
-                {"enterprise_id": enterprise_id},
-                {"_id": 0, "id": 1}
-            ).to_list(1000)
-            user_ids = [u["id"] for u in enterprise_users]
+            # All enterprise users
+            user_ids = await db_conn.users.distinct("id", {"enterprise_id": enterprise_id})
             posts_query = {"user_id": {"$in": user_ids}}
         else:
             posts_query = {"user_id": x_user_id}
         
-        # Get posts
-        posts = await db_conn.posts.find(posts_query, {"_id": 0}).to_list(10000)
+        # Count posts by platform and by strategic profile in one pass
+        facets = await db_conn.posts.aggregate([
+            {"$match": {**posts_query, **created_at_filter(start_date, end_date)}},
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "by_platform": [
+                    # platforms is a list, a single string, or unset
+                    {"$project": {"_id": 0, "platform": {"$switch": {
+                        "branches": [
+                            {"case": {"$isArray": "$platforms"}, "then": "$platforms"},
+                            {"case": {"$and": [
+                                {"$eq": [{"$type": "$platforms"}, "string"]},
+                                {"$ne": ["$platforms", ""]}
+                            ]}, "then": ["$platforms"]}
+                        ],
+                        "default": ["unspecified"]
+                    }}}},
+                    {"$unwind": "$platform"},
+                    {"$group": {
+                        "_id": {"$cond": [
+                            {"$in": ["$platform", [None, ""]]}, "unspecified", {"$toLower": "$platform"}
+                        ]},
+                        "count": {"$sum": 1}
+                    }},
+                    {"$sort": {"count": -1}}
+                ],
+                "by_profile": [
+                    {"$group": {
+                        "_id": {"$cond": [
+                            {"$in": [{"$ifNull": ["$profile_id", ""]}, [None, ""]]},
+                            {"$ifNull": ["$strategic_profile_id", None]},
+                            "$profile_id"
+                        ]},
+                        "count": {"$sum": 1}
+                    }}
+                ]
+            }}
+        ]).to_list(1)
+        facets = facets[0] if facets else {"total": [], "by_platform": [], "by_profile": []}
+        
+        platform_counts = {row["_id"]: row["count"] for row in facets["by_platform"]}
+        
+        # Resolve profile names in one query
+        profile_ids = [row["_id"] for row in facets["by_profile"] if row["_id"]]
+        profile_names = {}
+        if profile_ids:
+            profiles = await db_conn.strategic_profiles.find(
+                {"id": {"$in": profile_ids}},
+                {"_id": 0, "id": 1, "name": 1}
+            ).to_list(len(profile_ids))
+            profile_names = {p["id"]: p.get("name", "Unknown") for p in profiles}
         
-        # Filter by date
-        filtered_posts = []
-        for post in posts:
-            created_at = post.get("created_at")
-            if created_at:
-                try:
-                    if isinstance(created_at, str):
-                        post_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    else:
-                        post_date = created_at
-                    if start_date <= post_date <= end_date:
-                        filtered_posts.append(post)
-                except:
-                    filtered_posts.append(post)
-        
-        # Count posts by platform
-        platform_counts = {}
-        for post in filtered_posts:
-            platforms = post.get("platforms", [])
-            if isinstance(platforms, list):
-                for platform in platforms:
-                    platform_lower = platform.lower() if platform else "unspecified"
-                    platform_counts[platform_lower] = platform_counts.get(platform_lower, 0) + 1
-            elif platforms:
-                platform_lower = platforms.lower()
-                platform_counts[platform_lower] = platform_counts.get(platform_lower, 0) + 1
-            else:
-                platform_counts["unspecified"] = platform_counts.get("unspecified", 0) + 1
-        
-        # Count posts by strategic profile
         profile_counts = {}
-        for post in filtered_posts:
-            profile_id = post.get("profile_id") or post.get("strategic_profile_id")
-            if profile_id:
-                # Get profile name
-                profile = await db_conn.strategic_profiles.find_one(
-                    {"id": profile_id},
-                    {"_id": 0, "name": 1}
-                )
-                profile_name = profile.get("name", "Unknown") if profile else "Unknown"
-            else:
-                profile_name = "No Profile"
-            profile_counts[profile_name] = profile_counts.get(profile_name, 0) + 1
+        for row in facets["by_profile"]:
+            profile_name = profile_names.get(row["_id"], "Unknown") if row["_id"] else "No Profile"
+            profile_counts[profile_name] = profile_counts.get(profile_name, 0) + row["count"]
+        total_posts = facets["total"][0]["count"] if facets["total"] else 0
         
         return {
             "date_range": {
@@ -530,7 +542,7 @@ async def get_content_strategy_insights(
                     "data": list(profile_counts.values())
                 }
             },
-            "total_posts": len(filtered_posts),
+            "total_posts": total_posts,
             "generated_at": datetime.now(timezone.utc).isoformat()
         }
         
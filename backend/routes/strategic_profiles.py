@@ -1586,7 +1586,9 @@ async def generate_ai_description(
         # Document/Knowledge Base content
         try:
             kb_service = get_knowledge_service()
-            kb_context = await kb_service.get_context_for_generation(profile_id, limit=5)
+            kb_context = await kb_service.get_context_for_generation(
+                profile_id, limit=5, model="claude-4-sonnet-20250514"  # The description model below
+            )
             if kb_context:
                 context_parts.append(f"Knowledge Base Content:\n{kb_context[:3000]}")
         except Exception as kb_error:
@@ -24,6 +24,8 @@ from services.circuit_breaker_service import (
     CircuitOpenError,
     ServiceUnavailableError
 )
+from services.latency_router_service import get_latency_router
+from services.employment_law_agent import get_employment_law_agent
 from services.feature_flags_service import (
     get_feature_flags_service,
     is_feature_enabled,
@@ -53,6 +55,64 @@ async def get_circuits_status(request: Request):
     return get_all_circuits_status()
 
 
+@router.get("/routing")
+@require_permission("admin.view")
+async def get_routing_status(request: Request):
+    """
+    Get latency-aware routing statistics.
+    
+    Returns:
+        Hedge/fallback counters and rolling p50/p95 per route
+    """
+    return get_latency_router().get_status()
+
+
+@router.get("/employment-law/stats")
+@require_permission("admin.view")
+async def get_employment_law_stats(request: Request):
+    """
+    Get Employment Law Agent shortcut statistics.
+    
+    Returns:
+        Cache hits, pre-filter and validation skips, and their rates
+    """
+    return get_employment_law_agent().get_stats()
+
+
+@router.get("/chroma")
+@require_permission("admin.view")
+async def get_chroma_executor_status(request: Request):
+    """
+    Get ChromaDB executor statistics.
+    
+    Returns:
+        Thread pool utilisation, per-operation wait/run times, the
+        collection handle, embedding and RAG context caches
+    """
+    from services.knowledge_base_service import KnowledgeBaseService, get_chroma_executor
+    from services.embedding_cache_service import _embedding_caches
+    from services.rag_context_cache_service import get_rag_context_cache
+    return {
+        **get_chroma_executor().get_stats(),
+        "collection_cache": KnowledgeBaseService.get_collection_cache_stats(),
+        "embedding_cache": {model: store.get_stats() for model, store in _embedding_caches.items()},
+        "rag_context_cache": get_rag_context_cache().get_stats()
+    }
+
+
+@router.get("/ingestion")
+@require_permission("admin.view")
+async def get_ingestion_status(request: Request):
+    """
+    Get document ingestion pool statistics.
+    
+    Returns:
+        Worker processes, running/queued documents and per-operation times
+    """
+    from services.ingestion_pool_service import get_ingestion_pool
+    return get_ingestion_pool().get_stats()
+
+
 @router.get("/circuits/{service_name}")
 @require_permission("admin.view")
 async def get_service_circuit_status(request: Request, service_name: str):
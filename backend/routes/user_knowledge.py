@@ -165,6 +165,78 @@ async def delete_user_knowledge_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.put("/documents/{document_id}")
+@require_permission("knowledge.upload")
+async def replace_user_knowledge_document(
+    request: Request,
+    document_id: str,
+    file: UploadFile = File(...),
+    user_id: str = Header(..., alias="X-User-ID")
+) -> Dict[str, Any]:
+    """
+    Upload a new version of a document in the user's personal knowledge base.
+    Only the chunks that changed are re-indexed.
+    """
+    try:
+        doc = await db.knowledge_documents.find_one({
+            "id": document_id,
+            "user_id": user_id,
+            "tier": "user"
+        })
+        
+        if not doc:
+            raise HTTPException(status_code=404, detail="Document not found")
+        
+        # Validate file
+        filename = file.filename or "unknown"
+        file_ext = Path(filename).suffix.lower()
+        
+        if file_ext not in ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File type not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
+            )
+        
+        content = await file.read()
+        
+        if len(content) > MAX_FILE_SIZE:
+            raise HTTPException(status_code=400, detail="File too large. Max: 50MB")
+        
+        if len(content) == 0:
+            raise HTTPException(status_code=400, detail="File is empty")
+        
+        file_path = UPLOADS_DIR / f"{uuid4()}{file_ext}"
+        with open(file_path, "wb") as f:
+            f.write(content)
+        
+        from services.knowledge_base_service import get_knowledge_service
+        
+        kb_service = get_knowledge_service()
+        try:
+            result = await kb_service.update_document_tiered(
+                document_id=document_id,
+                file_path=str(file_path),
+                tier="user",
+                tier_id=user_id,
+                filename=filename,
+                user_id=user_id
+            )
+        except Exception:
+            file_path.unlink(missing_ok=True)
+            raise
+        
+        if not result.get("success"):
+            # The previous version stays in place - the new upload is unused
+            file_path.unlink(missing_ok=True)
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error replacing user knowledge document: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/stats")
 @require_permission("knowledge.view")
 async def get_user_knowledge_stats(
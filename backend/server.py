@@ -10,6 +10,7 @@ from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
 import os
 import json
 import logging
@@ -1506,6 +1507,21 @@ async def startup_scheduler():
         logging.info("Rate limit indexes created")
     except Exception as e:
         logging.warning(f"Failed to create rate limit indexes (non-critical): {e}")
+    
+    # Warn if /stream endpoints will fall back to buffered completions
+    try:
+        from services.llm_streaming_service import check_streaming_config
+        check_streaming_config()
+    except Exception as e:
+        logging.warning(f"LLM streaming config check failed (non-critical): {e}")
+    
+    # Preload ChromaDB collections for the most active knowledge bases
+    async def _warmup_knowledge_collections():
+        try:
+            await knowledge_service.warmup_collections()
+        except Exception as e:
+            logging.warning(f"Knowledge base collection warmup failed (non-critical): {e}")
+    asyncio.create_task(_warmup_knowledge_collections())
 
 @app.on_event("shutdown")
 async def shutdown_scheduler():
@@ -6,15 +6,17 @@ Plans analysis workflows, delegates to specialized agents, and synthesizes resul
 
 Workflow:
 1. Analyze content type → Plan approach
-2. Delegate to Visual Agent (if media present)
-3. Delegate to Text Agent (if text present)
-4. Delegate to Compliance Agent → Policy check
-5. Delegate to Risk Assessment Agent → Final assessment
-6. Synthesize and return results
+2. In parallel:
+   - Delegate to Visual Agent (if media present)
+   - Delegate to Text Agent (if text present)
+   - Delegate to Compliance Agent → Policy check
+3. Delegate to Risk Assessment Agent → Final assessment
+4. Synthesize and return results
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Awaitable, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 
@@ -26,6 +28,14 @@ from .risk_agent import RiskAssessmentAgent
 
 logger = logging.getLogger(__name__)
 
+# Per-agent timeouts for the concurrent analysis stage; a slow agent is
+# reported as partial instead of holding up the whole analysis
+AGENT_TIMEOUTS_SECONDS = {
+    "visual_analysis": 90.0,   # Multi-frame vision calls
+    "text_analysis": 45.0,
+    "compliance_check": 45.0,
+}
+
 
 @dataclass
 class AnalysisContext:
@@ -104,7 +114,7 @@ AS THE ANALYSIS ORCHESTRATOR, YOUR RESPONSIBILITIES ARE:
    - Produce unified analysis report
 
 ANALYSIS WORKFLOW:
-Content → [Visual + Text (parallel)] → Compliance → Risk Assessment → Final Report
+Content → [Visual + Text + Compliance (parallel)] → Risk Assessment → Final Report
 """
     
     async def _plan_analysis(self, context: AnalysisContext) -> Dict[str, Any]:
@@ -126,19 +136,55 @@ Content → [Visual + Text (parallel)] → Compliance → Risk Assessment → Fi
                 "compliance_check",
                 "risk_assessment"
             ],
-            "parallel_tasks": ["visual_analysis", "text_analysis"] if needs_visual and needs_text else []
+            "parallel_tasks": [
+                task for task, needed in (
+                    ("visual_analysis", needs_visual),
+                    ("text_analysis", needs_text),
+                    ("compliance_check", True)
+                ) if needed
+            ]
         }
     
+    async def _run_agent_stage(
+        self, step: str, agent_name: str, coro: Awaitable[Dict[str, Any]]
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Run one agent with its timeout and record its span.
+        
+        Never raises: failures and timeouts return (None, log_entry) so the
+        other agents' results are still used.
+        """
+        timeout = AGENT_TIMEOUTS_SECONDS.get(step)
+        started_at = datetime.now(timezone.utc)
+        log_entry = {"step": step, "agent": agent_name, "started_at": started_at.isoformat()}
+        result = None
+        
+        try:
+            result = await asyncio.wait_for(coro, timeout=timeout)
+            log_entry["status"] = "success"
+        except asyncio.TimeoutError:
+            logger.error(f"[AnalysisOrchestrator] {agent_name} timed out after {timeout}s")
+            log_entry.update({"status": "timeout", "error": f"{agent_name} timed out after {timeout}s"})
+        except Exception as e:
+            logger.error(f"[AnalysisOrchestrator] {agent_name} failed: {e}")
+            log_entry.update({"status": "error", "error": str(e)})
+        
+        finished_at = datetime.now(timezone.utc)
+        log_entry["finished_at"] = finished_at.isoformat()
+        log_entry["duration_ms"] = round((finished_at - started_at).total_seconds() * 1000, 2)
+        return result, log_entry
+    
     async def execute(self, context: AnalysisContext, task: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Execute the full multi-agent analysis workflow.
         
         Steps:
         1. Plan analysis based on content type
-        2. Visual Agent: Analyze media (if present)
-        3. Text Agent: Analyze text (if present)
-        4. Compliance Agent: Check policies
-        5. Risk Agent: Aggregate and assess
+        2-4. Concurrently, each with its own timeout:
+           - Visual Agent: Analyze media (if present)
+           - Text Agent: Analyze text (if present)
+           - Compliance Agent: Check policies
+        5. Risk Agent: Aggregate and assess (uses whatever partial results arrived)
         6. Return comprehensive report
         """
         start_time = datetime.now(timezone.utc)
@@ -152,11 +198,15 @@ Content → [Visual + Text (parallel)] → Compliance → Risk Assessment → Fi
         workflow_log.append({"step": "planning", "plan": plan})
         logger.info(f"[AnalysisOrchestrator] Plan: {plan['agents_required']}")
         
-        # === STEP 2: Visual Analysis (if needed) ===
+        # === STEPS 2-4: Visual, Text and Compliance Agents (concurrent) ===
+        # The three analyses only read the input content, so they run in
+        # parallel; the Risk Agent below waits for all of them.
+        stage_calls = {}
+        
         if plan["agents_required"]["visual"]:
-            logger.info("[AnalysisOrchestrator] Running Visual Agent")
-            try:
-                visual_result = await self.visual_agent.execute(
+            stage_calls["visual_analysis"] = (
+                "VisualAnalysisAgent",
+                self.visual_agent.execute(
                     context=context,
                     task={
                         "frames": context.media_frames,
@@ -164,59 +214,25 @@ Content → [Visual + Text (parallel)] → Compliance → Risk Assessment → Fi
                         "media_type": context.content_type
                     }
                 )
-                context.visual_results = visual_result
-                workflow_log.append({
-                    "step": "visual_analysis",
-                    "agent": "VisualAnalysisAgent",
-                    "status": "success",
-                    "risk_score": visual_result.get("aggregate", {}).get("average_risk_score", 0)
-                })
-            except Exception as e:
-                logger.error(f"[AnalysisOrchestrator] Visual analysis failed: {e}")
-                context.visual_results = {"status": "error", "error": str(e)}
-                workflow_log.append({
-                    "step": "visual_analysis",
-                    "status": "error",
-                    "error": str(e)
-                })
+            )
         
-        # === STEP 3: Text Analysis (if needed) ===
         if plan["agents_required"]["text"]:
-            logger.info("[AnalysisOrchestrator] Running Text Agent")
-            
             # Combine all text sources
             combined_text = " ".join(filter(None, [
                 context.text_content,
                 context.caption,
                 context.transcript
             ]))
-            
-            try:
-                text_result = await self.text_agent.execute(
+            stage_calls["text_analysis"] = (
+                "TextAnalysisAgent",
+                self.text_agent.execute(
                     context=context,
                     task={
                         "text": combined_text,
                         "text_type": "mixed" if context.transcript else "caption"
                     }
                 )
-                context.text_results = text_result
-                workflow_log.append({
-                    "step": "text_analysis",
-                    "agent": "TextAnalysisAgent",
-                    "status": "success",
-                    "risk_score": text_result.get("summary", {}).get("risk_score", 0)
-                })
-            except Exception as e:
-                logger.error(f"[AnalysisOrchestrator] Text analysis failed: {e}")
-                context.text_results = {"status": "error", "error": str(e)}
-                workflow_log.append({
-                    "step": "text_analysis",
-                    "status": "error",
-                    "error": str(e)
-                })
-        
-        # === STEP 4: Compliance Check ===
-        logger.info("[AnalysisOrchestrator] Running Compliance Agent")
+            )
         
         # Create a minimal context for compliance agent
         from .base_agent import AgentContext as BaseContext
@@ -228,28 +244,51 @@ Content → [Visual + Text (parallel)] → Compliance → Risk Assessment → Fi
         # Set draft content for compliance check
         compliance_context.draft_content = context.text_content or context.caption or ""
         compliance_context.research_data = {"industry": {"detected": "general"}}
-        
-        try:
-            compliance_result = await self.compliance_agent.execute(
+        stage_calls["compliance_check"] = (
+            "ComplianceAgent",
+            self.compliance_agent.execute(
                 context=compliance_context,
                 task={"content_type": context.content_type}
             )
-            context.compliance_results = compliance_result
-            workflow_log.append({
-                "step": "compliance_check",
-                "agent": "ComplianceAgent",
-                "status": "success",
-                "compliant": compliance_result.get("compliant", False),
-                "score": compliance_result.get("score", 0)
-            })
-        except Exception as e:
-            logger.error(f"[AnalysisOrchestrator] Compliance check failed: {e}")
-            context.compliance_results = {"status": "error", "error": str(e), "compliant": False, "score": 0}
-            workflow_log.append({
-                "step": "compliance_check",
-                "status": "error",
-                "error": str(e)
-            })
+        )
+        
+        logger.info(f"[AnalysisOrchestrator] Running {', '.join(name for name, _ in stage_calls.values())} concurrently")
+        stage_start = datetime.now(timezone.utc)
+        stage_results = await asyncio.gather(*[
+            self._run_agent_stage(step, agent_name, coro)
+            for step, (agent_name, coro) in stage_calls.items()
+        ])
+        stage_duration_ms = (datetime.now(timezone.utc) - stage_start).total_seconds() * 1000
+        
+        partial_results = False
+        for step, (agent_result, log_entry) in zip(stage_calls, stage_results):
+            if agent_result is None:
+                partial_results = True
+            
+            if step == "visual_analysis":
+                context.visual_results = agent_result or {"status": log_entry["status"], "error": log_entry["error"]}
+                if agent_result is not None:
+                    log_entry["risk_score"] = agent_result.get("aggregate", {}).get("average_risk_score", 0)
+            elif step == "text_analysis":
+                context.text_results = agent_result or {"status": log_entry["status"], "error": log_entry["error"]}
+                if agent_result is not None:
+                    log_entry["risk_score"] = agent_result.get("summary", {}).get("risk_score", 0)
+            else:
+                context.compliance_results = agent_result or {
+                    "status": log_entry["status"], "error": log_entry["error"], "compliant": False, "score": 0
+                }
+                if agent_result is not None:
+                    log_entry["compliant"] = agent_result.get("compliant", False)
+                    log_entry["score"] = agent_result.get("score", 0)
+            
+            workflow_log.append(log_entry)
+        
+        workflow_log.append({
+            "step": "parallel_analysis",
+            "agents": [agent_name for agent_name, _ in stage_calls.values()],
+            "duration_ms": round(stage_duration_ms, 2),
+            "sequential_duration_ms": round(sum(entry["duration_ms"] for _, entry in stage_results), 2)
+        })
         
         # === STEP 5: Risk Assessment ===
         logger.info("[AnalysisOrchestrator] Running Risk Assessment Agent")
@@ -346,6 +385,7 @@ Content → [Visual + Text (parallel)] → Compliance → Risk Assessment → Fi
                     "RiskAssessmentAgent"
                 ],
                 "duration_ms": round(duration_ms, 2),
+                "partial_results": partial_results,
                 "log": workflow_log
             },
             
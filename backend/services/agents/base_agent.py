@@ -19,6 +19,8 @@ from datetime import datetime, timezone
 from enum import Enum
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 
+from services.circuit_breaker_service import llm_concurrency_slot
+
 logger = logging.getLogger(__name__)
 
 
@@ -167,7 +169,8 @@ IMPORTANT GUIDELINES:
         ).with_model("openai", self.model)
         
         user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
+        async with llm_concurrency_slot("openai", self.model):
+            response = await chat.send_message(user_message)
         
         return response.strip()
     
@@ -13,11 +13,12 @@ Image Models:
 """
 
 import os
+import asyncio
 import logging
 import json
 import re
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator, Callable, Awaitable
 from uuid import uuid4
 from enum import Enum
 from emergentintegrations.llm.chat import LlmChat, UserMessage
@@ -26,9 +27,14 @@ from emergentintegrations.llm.chat import LlmChat, UserMessage
 from services.circuit_breaker_service import (
     circuit_breaker,
     get_circuit_status,
+    llm_concurrency_slot,
     ServiceUnavailableError,
     retry_openai
 )
+# Local fast-path for Step 1 domain classification
+from services.domain_classifier_service import get_domain_classifier
+# Step 2 compliance requirements cache
+from services.compliance_cache_service import get_compliance_cache
 # ARCH-018: Feature flags imports
 from services.feature_flags_service import (
     is_feature_enabled,
@@ -215,6 +221,112 @@ DOMAIN_CATEGORIES = {
     }
 }
 
+# Verified rewrite: candidates generated concurrently per iteration (more
+# than one multiplies rewrite cost), the share of sentences that may change
+# and the smallest changed excerpt that can be re-verified on its own -
+# outside those limits re-verification falls back to a full check
+REWRITE_CANDIDATES = 1
+INCREMENTAL_VERIFY_MAX_CHANGED_RATIO = 0.6
+INCREMENTAL_VERIFY_MIN_EXCERPT_CHARS = 200
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences (and standalone lines such as hashtags)"""
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text or "") if s.strip()]
+
+
+def changed_sentences(previous: str, current: str) -> List[str]:
+    """Sentences of current that do not appear verbatim in previous"""
+    previous_sentences = set(split_sentences(previous))
+    return [s for s in split_sentences(current) if s not in previous_sentences]
+
+
+def meets_rewrite_targets(
+    scores: Dict[str, Any],
+    min_compliance: int = 90,
+    min_cultural: int = 90,
+    min_accuracy: int = 100
+) -> bool:
+    """Whether verified rewrite scores pass every threshold"""
+    return (scores["compliance"] >= min_compliance and
+            scores["cultural"] >= min_cultural and
+            scores["accuracy"] >= min_accuracy)
+
+
+def merge_incremental_verification(
+    prev_result: Dict[str, Any],
+    carried: List[Dict[str, str]],
+    span_result: Dict[str, Any],
+    changed: int
+) -> Dict[str, Any]:
+    """
+    Combine the check of the changed sentences with the previous verification.
+    
+    Scores are capped by the previous ones while its issues are carried
+    over; issues are the carried spans plus the new check's issues.
+    """
+    merged = {"verification": "incremental", "changed_sentences": changed,
+              "tokens_used": span_result.get("tokens_used", 0)}
+    for key in ("compliance_score", "cultural_score", "accuracy_score"):
+        new_score = span_result.get(key, 0)
+        merged[key] = min(new_score, prev_result.get(key, 0)) if carried else new_score
+    new_spans = span_result.get("flagged_spans", [])
+    spans = carried + new_spans
+    merged["flagged_spans"] = spans
+    merged["issues"] = [span["issue"] for span in spans] + [
+        issue for issue in span_result.get("issues", [])
+        if issue not in {span["issue"] for span in new_spans}
+    ]
+    return merged
+
+
+# Map-reduce for long inputs (podcast transcripts, blog source material).
+# Token counts use the same ~4 characters per token estimate as the metrics.
+MAP_REDUCE_THRESHOLD_CHARS = 5000
+MAP_REDUCE_SEGMENT_TOKENS = 3000
+MAP_REDUCE_CONCURRENCY = 6
+MAP_REDUCE_MAX_ROUNDS = 4
+# Largest input of the final reduce call (two segments)
+MAP_REDUCE_FINAL_MAX_CHARS = MAP_REDUCE_SEGMENT_TOKENS * 4 * 2
+
+# Concurrent platform variants per social campaign
+SOCIAL_CAMPAIGN_FANOUT = 6
+
+
+def split_into_segments(text: str, max_tokens: int = MAP_REDUCE_SEGMENT_TOKENS) -> List[str]:
+    """
+    Split text into segments of at most ~max_tokens, breaking on paragraph
+    and then sentence boundaries (hard-splitting only oversized sentences).
+    """
+    max_chars = max_tokens * 4
+    pieces: List[str] = []
+    for paragraph in re.split(r'\n\s*\n', text or ""):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in split_sentences(paragraph):
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            pieces.append(sentence)
+
+    segments: List[str] = []
+    current = ""
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        if current and len(current) + len(piece) + 2 > max_chars:
+            segments.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        segments.append(current)
+    return segments
+
 
 class PromptAnalyzer:
     """Analyzes prompts to determine optimal model selection"""
@@ -597,7 +709,7 @@ class AIContentAgent:
             step1_duration = (datetime.now(timezone.utc) - step1_start).total_seconds() * 1000
             pipeline_metrics["steps"].append({
                 "step": "domain_classification",
-                "model": "gpt-4.1-nano",
+                "model": domain_classification.get("model", "gpt-4.1-nano"),
                 "duration_ms": round(step1_duration, 2),
                 "result": domain_classification
             })
@@ -614,13 +726,13 @@ class AIContentAgent:
             logger.info("[Pipeline Step 2] Compliance Requirements Check")
             
             compliance_requirements = await self._get_compliance_requirements(
-                prompt, detected_domain, user_id
+                prompt, detected_domain, user_id, language
             )
             
             step2_duration = (datetime.now(timezone.utc) - step2_start).total_seconds() * 1000
             pipeline_metrics["steps"].append({
                 "step": "compliance_check",
-                "model": "gpt-4.1-mini",
+                "model": "cache" if compliance_requirements.get("cached") else "gpt-4.1-mini",
                 "duration_ms": round(step2_duration, 2),
                 "result": compliance_requirements
             })
@@ -637,6 +749,8 @@ class AIContentAgent:
             quality_score = 0
             generation_attempt = 0
             refined_prompt = prompt
+            generation_tier = override_tier or ModelTier.TOP_TIER
+            generation_config = self._get_model_config(generation_tier)
             
             while generation_attempt <= max_regeneration_attempts:
                 generation_attempt += 1
@@ -659,13 +773,14 @@ class AIContentAgent:
                     refined_prompt if generation_attempt > 1 else prompt,
                     constraints,
                     user_id,
-                    context
+                    context,
+                    generation_tier
                 )
                 
                 step3_duration = (datetime.now(timezone.utc) - step3_start).total_seconds() * 1000
                 pipeline_metrics["steps"].append({
                     "step": f"content_generation_attempt_{generation_attempt}",
-                    "model": "gpt-4o-mini",
+                    "model": generation_config["model"],
                     "duration_ms": round(step3_duration, 2)
                 })
                 pipeline_metrics["total_tokens"] += generation_result.get("tokens", 0)
@@ -799,10 +914,10 @@ class AIContentAgent:
                 "success": True,
                 "content": content,
                 "model_selection": {
-                    "tier": ModelTier.TOP_TIER.value,
-                    "model": "gpt-4o-mini",
-                    "provider": "openai",
-                    "selection_method": "multi_step_pipeline",
+                    "tier": generation_tier.value,
+                    "model": generation_config["model"],
+                    "provider": generation_config["provider"],
+                    "selection_method": "manual_override" if override_tier else "multi_step_pipeline",
                     "reasoning": "Multi-step pipeline with domain-aware compliance"
                 },
                 "quality_metrics": {
@@ -840,11 +955,99 @@ class AIContentAgent:
             logger.error(f"Content generation pipeline error: {str(e)}")
             raise
     
+    async def stream_generate_content(
+        self,
+        prompt: str,
+        user_id: str,
+        tone: str = "professional",
+        platforms: Optional[List[str]] = None,
+        language: str = "en",
+        hashtag_count: int = 3,
+        job_title: Optional[str] = None,
+        override_tier: Optional[ModelTier] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of generate_content.
+        
+        Runs Steps 1-2 (domain classification, compliance requirements) as
+        usual, then streams Step 3 token by token. Steps 4-5 (cultural
+        analysis and regeneration) are skipped because the content has
+        already been delivered to the client while it was written.
+        
+        Raises:
+            ServiceUnavailableError: If the feature is disabled or the circuit is open
+        """
+        from services.llm_streaming_service import stream_llm_completion
+        
+        # ARCH-018: Check if AI content generation is enabled
+        if not await is_feature_enabled(FeatureFlag.AI_CONTENT_GENERATION, user_id, check_circuit=True):
+            raise ServiceUnavailableError("openai", {
+                "error": "AI content generation is temporarily unavailable",
+                "retry_after": 30
+            })
+        
+        domain_classification = await self._classify_domain(prompt, user_id)
+        detected_domain = domain_classification.get("domain", "general")
+        
+        compliance_requirements = await self._get_compliance_requirements(
+            prompt, detected_domain, user_id, language
+        )
+        
+        constraints = self._build_generation_constraints(
+            compliance_requirements,
+            detected_domain,
+            tone,
+            platforms,
+            language,
+            hashtag_count,
+            job_title
+        )
+        system_message, generation_prompt = self._build_generation_messages(prompt, constraints)
+        
+        config = self._get_model_config(override_tier or ModelTier.TOP_TIER)
+        logger.info(f"[Pipeline Step 3] Streaming content generation (domain: {detected_domain})")
+        
+        tokens = stream_llm_completion(
+            system_message=system_message,
+            prompt=generation_prompt,
+            provider=config["provider"],
+            model=config["model"],
+            api_key=self.api_key
+        )
+        try:
+            async for token in tokens:
+                yield token
+        finally:
+            await tokens.aclose()
+    
     async def _classify_domain(self, prompt: str, user_id: str) -> Dict[str, Any]:
         """
         Step 1: Domain Classification using gpt-4.1-nano
         Classifies the content domain to apply appropriate compliance rules.
+        
+        The local classifier answers first; the nano call is only made when
+        its answer is not confident (or the prompt is sampled for a label),
+        and the LLM's answer is logged back as training data for the local model.
         """
+        classifier = get_domain_classifier(DOMAIN_CATEGORIES)
+        await classifier.ensure_loaded(self.db)
+        
+        local = classifier.predict(prompt)
+        if local["confident"] and not classifier.sample_for_label():
+            classifier.stats["local_hits"] += 1
+            domain_info = DOMAIN_CATEGORIES.get(local["domain"], DOMAIN_CATEGORIES["general"])
+            return {
+                "domain": local["domain"],
+                "risk_level": domain_info.get("risk_level", "low"),
+                "compliance_requirements": domain_info.get("compliance_requirements", []),
+                "model": "local_classifier",
+                "confidence": local["confidence"],
+                "method": local["method"],
+                "tokens": 0,
+                "cost": 0
+            }
+        classifier.stats["llm_fallbacks"] += 1
+        
         config = self._get_model_config(ModelTier.FAST)
         session_id = f"domain_class_{user_id}_{uuid4()}"
         
@@ -868,7 +1071,8 @@ Content to classify:
             response = await self._call_llm_with_circuit_breaker(
                 chat=chat,
                 message=classification_prompt,
-                provider=config["provider"]
+                provider=config["provider"],
+                model=config["model"]
             )
             
             # Parse response
@@ -879,10 +1083,13 @@ Content to classify:
             # Get domain info
             domain_info = DOMAIN_CATEGORIES.get(domain, DOMAIN_CATEGORIES["general"])
             
+            await classifier.record_llm_classification(self.db, prompt, domain)
+            
             return {
                 "domain": domain,
                 "risk_level": domain_info.get("risk_level", "low"),
                 "compliance_requirements": domain_info.get("compliance_requirements", []),
+                "model": config["model"],
                 "tokens": len(classification_prompt) // 4 + len(response) // 4,
                 "cost": 0.0001  # Estimate for nano model
             }
@@ -897,11 +1104,21 @@ Content to classify:
             }
     
     async def _get_compliance_requirements(
-        self, prompt: str, domain: str, user_id: str
+        self, prompt: str, domain: str, user_id: str, language: str = "en"
     ) -> Dict[str, Any]:
         """
         Step 2: Get detailed compliance requirements using gpt-4.1-mini
+        
+        Results are cached per (domain, policy-set version, language), so
+        repeat domains skip the LLM call until policies or knowledge change.
         """
+        cache = get_compliance_cache()
+        policy_version = await cache.get_policy_set_version(self.db, user_id)
+        cached = cache.get(domain, policy_version, language)
+        if cached is not None:
+            logger.info(f"[Pipeline Step 2] Compliance cache hit for domain {domain}")
+            return {**cached, "domain": domain, "cached": True, "tokens": 0, "cost": 0}
+        
         config = self._get_model_config(ModelTier.BALANCED)
         session_id = f"compliance_check_{user_id}_{uuid4()}"
         
@@ -916,6 +1133,7 @@ Content to classify:
 DOMAIN: {domain}
 RISK LEVEL: {domain_info.get('risk_level', 'low')}
 BASE REQUIREMENTS: {', '.join(base_requirements)}
+LANGUAGE: {language}
 
 Content Request:
 {prompt[:1500]}
@@ -935,7 +1153,8 @@ RESPOND WITH ONLY THE JSON OBJECT."""
             response = await self._call_llm_with_circuit_breaker(
                 chat=chat,
                 message=compliance_prompt,
-                provider=config["provider"]
+                provider=config["provider"],
+                model=config["model"]
             )
             
             # Parse JSON response
@@ -949,6 +1168,7 @@ RESPOND WITH ONLY THE JSON OBJECT."""
                         response_clean = response_clean[4:]
                 
                 compliance_data = json.loads(response_clean)
+                cache.set(domain, policy_version, language, compliance_data)
             except json.JSONDecodeError:
                 compliance_data = {
                     "rules": base_requirements,
@@ -1018,19 +1238,8 @@ RESPOND WITH ONLY THE JSON OBJECT."""
         
         return constraints
     
-    async def _generate_with_constraints(
-        self,
-        prompt: str,
-        constraints: Dict,
-        user_id: str,
-        context: Optional[Dict]
-    ) -> Dict[str, Any]:
-        """
-        Step 3: Generate content with GPT-4o-mini using all constraints
-        """
-        config = self._get_model_config(ModelTier.TOP_TIER)  # Now maps to gpt-4o-mini
-        session_id = f"content_gen_{user_id}_{uuid4()}"
-        
+    def _build_generation_messages(self, prompt: str, constraints: Dict) -> Tuple[str, str]:
+        """Build the (system message, generation prompt) pair for Step 3"""
         # Build system message with constraints
         platform_hints = []
         if constraints.get("platforms"):
@@ -1068,8 +1277,6 @@ Your content MUST:
 3. Be engaging and valuable to the audience
 4. Avoid any discriminatory or biased language"""
 
-        chat = self._create_chat_instance(ModelTier.TOP_TIER, session_id, system_message)
-        
         # Build generation prompt with VERY EXPLICIT hashtag instructions
         hashtag_instruction = ""
         if constraints.get("hashtag_count", 0) == 0:
@@ -1106,11 +1313,31 @@ REQUEST: {prompt}
 Deliver only the final content, ready to post. Ensure ALL compliance rules are followed.
 REMEMBER: Include the required number of hashtags at the end!"""
 
+        return system_message, generation_prompt
+    
+    async def _generate_with_constraints(
+        self,
+        prompt: str,
+        constraints: Dict,
+        user_id: str,
+        context: Optional[Dict],
+        tier: ModelTier = ModelTier.TOP_TIER
+    ) -> Dict[str, Any]:
+        """
+        Step 3: Generate content with GPT-4o-mini (or the forced tier) using all constraints
+        """
+        config = self._get_model_config(tier)  # TOP_TIER maps to gpt-4o-mini
+        session_id = f"content_gen_{user_id}_{uuid4()}"
+        
+        system_message, generation_prompt = self._build_generation_messages(prompt, constraints)
+        chat = self._create_chat_instance(tier, session_id, system_message)
+        
         try:
             response = await self._call_llm_with_circuit_breaker(
                 chat=chat,
                 message=generation_prompt,
-                provider=config["provider"]
+                provider=config["provider"],
+                model=config["model"]
             )
             
             return {
@@ -1164,7 +1391,8 @@ RESPOND WITH ONLY THE JSON OBJECT."""
             response = await self._call_llm_with_circuit_breaker(
                 chat=chat,
                 message=analysis_prompt,
-                provider=config["provider"]
+                provider=config["provider"],
+                model=config["model"]
             )
             
             # Parse JSON response
@@ -1247,13 +1475,15 @@ Generate improved content that addresses these specific issues while maintaining
         self,
         chat: LlmChat,
         message: str,
-        provider: str = "openai"
+        provider: str = "openai",
+        model: Optional[str] = None
     ) -> str:
         """
         Call LLM with circuit breaker protection.
         
         This method wraps the actual LLM call with circuit breaker pattern
-        to prevent cascading failures when the AI service is down.
+        to prevent cascading failures when the AI service is down, and
+        bounds concurrent calls per provider/model with the AIMD limiter.
         """
         from services.circuit_breaker_service import get_or_create_circuit
         import time
@@ -1269,11 +1499,12 @@ Generate improved content that addresses these specific issues while maintaining
                 "retry_after": 30
             })
         
-        # Execute the LLM call
+        # Execute the LLM call within the provider's concurrency limit
         start_time = time.time()
         try:
             user_message = UserMessage(text=message)
-            response = await chat.send_message(user_message)
+            async with llm_concurrency_slot(provider, model):
+                response = await chat.send_message(user_message)
             response_time_ms = (time.time() - start_time) * 1000
             await circuit.record_success(response_time_ms)
             return response
@@ -1631,7 +1862,8 @@ Deliver only the improved text."""
         is_promotional: bool = False,
         compliance_issues: Optional[List[str]] = None,
         policies: Optional[List[str]] = None,
-        analysis_result: Optional[Dict] = None  # Full analysis from frontend
+        analysis_result: Optional[Dict] = None,  # Full analysis from frontend
+        candidates: int = REWRITE_CANDIDATES
     ) -> Dict[str, Any]:
         """
         Compliance-Focused Agentic Rewrite with Verification Loop.
@@ -1643,9 +1875,9 @@ Deliver only the improved text."""
         
         It uses an iterative approach:
         1. Analyze violations from input
-        2. Rewrite with explicit compliance rules
-        3. Re-analyze the rewritten content
-        4. If scores < 90, rewrite again with specific feedback
+        2. Rewrite with explicit compliance rules (several candidates concurrently)
+        3. Re-analyze the rewritten content (only changed sentences after the first pass)
+        4. If scores < 90, rewrite the best candidate again with specific feedback
         5. Repeat until scores meet thresholds or max_iterations reached
         
         Args:
@@ -1661,6 +1893,7 @@ Deliver only the improved text."""
             compliance_issues: Specific compliance issues to fix
             policies: Company policies to check against
             analysis_result: Full analysis result from frontend containing violations and recommendations
+            candidates: Rewrite candidates generated concurrently per iteration
         
         Returns:
             Dict with compliant rewritten content and verification scores
@@ -1855,15 +2088,21 @@ OUTPUT ONLY THE REWRITTEN CONTENT:"""
 
         session_id = f"compliance_rewrite_{user_id}_{uuid4()}"
         
+        def meets_targets(scores: Dict[str, Any]) -> bool:
+            return meets_rewrite_targets(scores, MIN_COMPLIANCE_SCORE, MIN_CULTURAL_SCORE, MIN_ACCURACY_SCORE)
+        
         # Iterative rewrite with verification loop
         current_content = original_content
+        last_verified: Optional[Dict[str, Any]] = None  # {"content", "result"} of current_content
         iteration = 0
         final_scores = {"compliance": 0, "cultural": 0, "accuracy": 0}
         iteration_history = []
+        rewrite_tokens = 0
+        verification_tokens = 0
         
         while iteration < max_iterations:
             iteration += 1
-            logger.info(f"Rewrite iteration {iteration}/{max_iterations}")
+            logger.info(f"Rewrite iteration {iteration}/{max_iterations} ({candidates} candidates)")
             
             # Build prompt with any additional feedback from previous iteration
             current_prompt = prompt
@@ -1879,64 +2118,81 @@ OUTPUT ONLY THE REWRITTEN CONTENT:"""
                     for issue in last_result['remaining_issues'][:5]:
                         feedback_prompt += f"- {issue}\n"
                 
+                # Minimal edits keep re-verification limited to the changed sentences
+                feedback_prompt += "\nChange only the sentences needed to fix these issues. Keep every other sentence exactly as it is.\n"
+                
                 current_prompt = prompt.replace("ORIGINAL CONTENT:", f"{feedback_prompt}\n\nCONTENT TO IMPROVE:") 
                 current_prompt = current_prompt.replace(original_content, current_content)
             
-            chat = self._create_chat_instance(tier, session_id + f"_iter{iteration}", system_message)
-            
+            # Generate candidates concurrently; stop at the first that meets the targets
+            tasks = [
+                asyncio.ensure_future(self._rewrite_candidate(
+                    tier, f"{session_id}_iter{iteration}_c{n}", system_message,
+                    current_prompt, user_id, last_verified
+                ))
+                for n in range(max(1, candidates))
+            ]
+            best = None
+            last_error = None
             try:
-                message = UserMessage(text=current_prompt)
-                rewritten_content = await chat.send_message(message)
-                current_content = rewritten_content
-                
-                # Quick verification check using lightweight analysis
-                verification_result = await self._quick_compliance_check(rewritten_content, user_id)
-                
-                compliance_score = verification_result.get("compliance_score", 0)
-                cultural_score = verification_result.get("cultural_score", 0)
-                accuracy_score = verification_result.get("accuracy_score", 100)  # Default to 100 if no new facts detected
-                
-                iteration_history.append({
-                    "iteration": iteration,
-                    "compliance_score": compliance_score,
-                    "cultural_score": cultural_score,
-                    "accuracy_score": accuracy_score,
-                    "remaining_issues": verification_result.get("issues", [])
-                })
-                
-                logger.info(f"Iteration {iteration} scores: Compliance={compliance_score}, Cultural={cultural_score}, Accuracy={accuracy_score}")
-                
-                # Check if we meet all thresholds
-                if (compliance_score >= MIN_COMPLIANCE_SCORE and 
-                    cultural_score >= MIN_CULTURAL_SCORE and
-                    accuracy_score >= MIN_ACCURACY_SCORE):
-                    logger.info(f"All quality thresholds met at iteration {iteration}")
-                    final_scores = {
-                        "compliance": compliance_score,
-                        "cultural": cultural_score,
-                        "accuracy": accuracy_score
-                    }
-                    break
-                
-                final_scores = {
-                    "compliance": compliance_score,
-                    "cultural": cultural_score,
-                    "accuracy": accuracy_score
-                }
-                
-            except Exception as e:
-                logger.error(f"Rewrite iteration {iteration} failed: {e}")
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        candidate = await next_done
+                    except Exception as e:
+                        last_error = e
+                        logger.warning(f"Rewrite candidate failed in iteration {iteration}: {e}")
+                        continue
+                    
+                    rewrite_tokens += candidate["rewrite_tokens"]
+                    verification_tokens += candidate["verification"].get("tokens_used", 0)
+                    
+                    if best is None or sum(candidate["scores"].values()) > sum(best["scores"].values()):
+                        best = candidate
+                    if meets_targets(candidate["scores"]):
+                        best = candidate
+                        break
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+            
+            if best is None:
+                logger.error(f"Rewrite iteration {iteration} failed: {last_error}")
                 if iteration == max_iterations:
-                    raise
+                    raise last_error
+                continue
+            
+            verification_result = best["verification"]
+            current_content = best["content"]
+            last_verified = {"content": current_content, "result": verification_result}
+            final_scores = best["scores"]
+            
+            iteration_history.append({
+                "iteration": iteration,
+                "compliance_score": final_scores["compliance"],
+                "cultural_score": final_scores["cultural"],
+                "accuracy_score": final_scores["accuracy"],
+                "remaining_issues": verification_result.get("issues", []),
+                "verification": verification_result.get("verification", "full"),
+                "changed_sentences": verification_result.get("changed_sentences"),
+                "candidates": len(tasks)
+            })
+            
+            logger.info(f"Iteration {iteration} scores: Compliance={final_scores['compliance']}, Cultural={final_scores['cultural']}, Accuracy={final_scores['accuracy']}")
+            
+            # Check if we meet all thresholds
+            if meets_targets(final_scores):
+                logger.info(f"All quality thresholds met at iteration {iteration}")
+                break
         
         end_time = datetime.now(timezone.utc)
         duration_ms = (end_time - start_time).total_seconds() * 1000
         
-        # Calculate tokens
-        input_tokens = len(prompt) // 4 + len(system_message) // 4
-        output_tokens = len(current_content) // 4
-        total_tokens = input_tokens + output_tokens * iteration  # Multiply by iterations
-        cost = (total_tokens / 1000 * config["cost_per_1k_output"])
+        # Calculate tokens and cost (rewrite calls + verification calls, which
+        # run on the FAST tier - see _quick_compliance_check)
+        total_tokens = rewrite_tokens + verification_tokens
+        verification_cost = verification_tokens / 1000 * self._get_model_config(ModelTier.FAST)["cost_per_1k_output"]
+        cost = (rewrite_tokens / 1000 * config["cost_per_1k_output"]) + verification_cost
         
         await self._log_agent_usage(
             user_id=user_id,
@@ -1952,15 +2208,13 @@ OUTPUT ONLY THE REWRITTEN CONTENT:"""
                 "violations_count": len(violations),
                 "target_score": target_score,
                 "iterations_used": iteration,
-                "final_scores": final_scores
+                "final_scores": final_scores,
+                "verification_tokens": verification_tokens,
+                "verification_cost": round(verification_cost, 6)
             }
         )
         
-        meets_threshold = (
-            final_scores["compliance"] >= MIN_COMPLIANCE_SCORE and
-            final_scores["cultural"] >= MIN_CULTURAL_SCORE and
-            final_scores["accuracy"] >= MIN_ACCURACY_SCORE
-        )
+        meets_threshold = meets_targets(final_scores)
         
         logger.info(f"Verified rewrite complete | Iterations: {iteration} | Meets threshold: {meets_threshold} | Scores: {final_scores}")
         
@@ -1982,14 +2236,89 @@ OUTPUT ONLY THE REWRITTEN CONTENT:"""
             "metrics": {
                 "duration_ms": round(duration_ms, 2),
                 "tokens_used": total_tokens,
+                "rewrite_tokens": rewrite_tokens,
+                "verification_tokens": verification_tokens,
+                "verification_cost": round(verification_cost, 6),
                 "estimated_cost": round(cost, 6)
             }
         }
+    
+    async def _rewrite_candidate(
+        self,
+        tier: ModelTier,
+        session_id: str,
+        system_message: str,
+        prompt: str,
+        user_id: str,
+        previous: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Generate one rewrite candidate and verify it"""
+        chat = self._create_chat_instance(tier, session_id, system_message)
+        content = await chat.send_message(UserMessage(text=prompt))
+        verification = await self._verify_rewrite(content, user_id, previous)
+        return {
+            "content": content,
+            "verification": verification,
+            "scores": {
+                "compliance": verification.get("compliance_score", 0),
+                "cultural": verification.get("cultural_score", 0),
+                "accuracy": verification.get("accuracy_score", 100)  # Default to 100 if no new facts detected
+            },
+            "rewrite_tokens": (len(system_message) + len(prompt) + len(content)) // 4
+        }
+    
+    async def _verify_rewrite(
+        self,
+        content: str,
+        user_id: str,
+        previous: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Verify a rewrite, re-checking only the sentences that changed.
+        
+        `previous` is the last verified version ({"content", "result"}).
+        Its issues tied to text that is still present are carried over and
+        the changed sentences are scored on their own; the merged score can't
+        exceed the previous one while carried issues remain. Falls back to a
+        full check when there is no previous version, most sentences changed,
+        a previous issue can't be located in the text, no previous issue is
+        carried over (excerpts alone can't show the whole text passes), or
+        the changed excerpts are too short to score without context.
+        """
+        if previous:
+            sentences = split_sentences(content)
+            changed = changed_sentences(previous["content"], content)
+            prev_result = previous["result"]
+            prev_spans = prev_result.get("flagged_spans", [])
+            localized = len(prev_spans) == len(prev_result.get("issues", []))
+            carried = [span for span in prev_spans if span["text"] in content]
+            excerpt = "\n".join(changed)
+            
+            if (sentences and localized and carried
+                    and len(changed) / len(sentences) <= INCREMENTAL_VERIFY_MAX_CHANGED_RATIO
+                    and (not changed or len(excerpt) >= INCREMENTAL_VERIFY_MIN_EXCERPT_CHARS)):
+                if changed:
+                    span_result = await self._quick_compliance_check(excerpt, user_id, excerpts=True)
+                else:
+                    span_result = {"compliance_score": 100, "cultural_score": 100, "accuracy_score": 100,
+                                   "issues": [], "flagged_spans": [], "tokens_used": 0}
+                return merge_incremental_verification(prev_result, carried, span_result, len(changed))
         
-    async def _quick_compliance_check(self, content: str, user_id: str) -> Dict[str, Any]:
+        result = await self._quick_compliance_check(content, user_id)
+        result["verification"] = "full"
+        result["changed_sentences"] = None
+        return result
+        
+    async def _quick_compliance_check(self, content: str, user_id: str, excerpts: bool = False) -> Dict[str, Any]:
         """
         Quick lightweight compliance and cultural check for verification loop.
         Uses a faster model to check for remaining issues.
+        
+        With excerpts=True the content is a set of changed sentences from a
+        larger document and is scored only on problems it contains.
+        
+        Issues that point at specific text are also returned as
+        flagged_spans ({"text", "issue"}) so later checks can be incremental.
         """
         tier = ModelTier.FAST
         config = self._get_model_config(tier)
@@ -2002,7 +2331,14 @@ Score the content on three dimensions (0-100):
 
 Be strict - only give 90+ if content is truly excellent in that area."""
         
-        prompt = f"""Score this content:
+        scope_note = ""
+        if excerpts:
+            scope_note = """These are EXCERPTS (changed sentences) of a larger document. Score only the problems
+present in these excerpts - do not penalize for content that may appear elsewhere.
+
+"""
+        
+        prompt = f"""{scope_note}Score this content:
 
 CONTENT:
 {content}
@@ -2012,7 +2348,9 @@ Return JSON only:
     "compliance_score": 0-100,
     "cultural_score": 0-100, 
     "accuracy_score": 0-100,
-    "issues": ["remaining issue 1", "remaining issue 2"]
+    "issues": [
+        {{"text": "exact problematic text, or empty if not tied to specific text", "issue": "remaining issue"}}
+    ]
 }}"""
         
         session_id = f"quick_check_{user_id}_{uuid4()}"
@@ -2031,6 +2369,20 @@ Return JSON only:
                 response_text = response_text.split("```")[1].split("```")[0]
             
             result = json.loads(response_text)
+            
+            # Normalize issues to strings, keeping text-anchored ones as spans
+            issues, spans = [], []
+            for issue in result.get("issues", []):
+                if isinstance(issue, dict):
+                    description = issue.get("issue", "")
+                    issues.append(description)
+                    if issue.get("text") and issue["text"] in content:
+                        spans.append({"text": issue["text"], "issue": description})
+                else:
+                    issues.append(str(issue))
+            result["issues"] = issues
+            result["flagged_spans"] = spans
+            result["tokens_used"] = (len(system_message) + len(prompt) + len(response)) // 4
             return result
             
         except Exception as e:
@@ -2040,7 +2392,9 @@ Return JSON only:
                 "compliance_score": 75,
                 "cultural_score": 75,
                 "accuracy_score": 85,
-                "issues": ["Unable to verify - manual review recommended"]
+                "issues": ["Unable to verify - manual review recommended"],
+                "flagged_spans": [],
+                "tokens_used": 0
             }
     
     async def analyze_content(
@@ -2543,6 +2897,123 @@ Return as JSON with structure:
 
     # ==================== SCENARIO-SPECIFIC METHODS ====================
     
+    async def _map_reduce(
+        self,
+        text: str,
+        user_id: str,
+        tier: ModelTier,
+        system_message: str,
+        map_instruction: str,
+        reduce_instruction: str,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        progress_range: Tuple[int, int] = (5, 50)
+    ) -> Dict[str, Any]:
+        """
+        Condense a long input with a chunked map-reduce.
+        
+        The text is split into token-bounded segments that are processed
+        concurrently (map), then the partial results are merged (reduce).
+        If the merged partials are still larger than one segment they are
+        reduced again in segment-sized groups, so every LLM call stays
+        within the context budget and the number of sequential rounds grows
+        only logarithmically with input length.
+        
+        Reducing stops after MAP_REDUCE_MAX_ROUNDS or once a round no longer
+        shrinks the partials; if they still exceed the final reduce's budget
+        they are cut and "truncated" is set (and logged).
+        
+        Returns:
+            Dict with "output", "segments", "rounds", "truncated", "tokens" and "cost"
+        """
+        config = self._get_model_config(tier)
+        semaphore = asyncio.Semaphore(MAP_REDUCE_CONCURRENCY)
+        stats = {"tokens": 0, "cost": 0.0, "calls": 0}
+        start_pct, end_pct = progress_range
+        
+        async def report(step: str, fraction: float):
+            if progress_callback:
+                await progress_callback({
+                    "step": step,
+                    "percentage": int(start_pct + (end_pct - start_pct) * fraction)
+                })
+        
+        async def run(instruction: str, body: str, label: str) -> str:
+            prompt = f"{instruction}\n\n{body}"
+            async with semaphore:
+                chat = self._create_chat_instance(tier, f"agent_mapreduce_{label}_{user_id}_{uuid4()}", system_message)
+                response = await self._call_llm_with_circuit_breaker(
+                    chat, prompt, provider=config["provider"], model=config["model"]
+                )
+            tokens = len(prompt) // 4 + len(response) // 4
+            stats["tokens"] += tokens
+            stats["cost"] += (tokens / 1000) * (config["cost_per_1k_input"] + config["cost_per_1k_output"]) / 2
+            stats["calls"] += 1
+            return response
+        
+        segments = split_into_segments(text)
+        total = len(segments)
+        
+        if total <= 1:
+            # Fits in one call - no map step needed
+            output = await run(reduce_instruction, text, "reduce")
+            await report("Segments combined", 1.0)
+            return {"output": output, "segments": total, "rounds": 1, "truncated": False,
+                    "tokens": stats["tokens"], "cost": stats["cost"]}
+        
+        await report(f"Processing {total} segments", 0)
+        
+        done = 0
+        
+        async def map_segment(index: int, segment: str) -> str:
+            nonlocal done
+            result = await run(map_instruction, f"SEGMENT {index + 1} OF {total}:\n{segment}", "map")
+            done += 1
+            await report(f"Processed segment {done}/{total}", 0.8 * done / total)
+            return result
+        
+        partials = list(await asyncio.gather(*(map_segment(i, seg) for i, seg in enumerate(segments))))
+        
+        # Reduce in segment-sized groups until the partials fit in one call
+        rounds = 0
+        groups = split_into_segments("\n\n".join(partials))
+        while len(groups) > 1 and rounds < MAP_REDUCE_MAX_ROUNDS - 1:
+            rounds += 1
+            await report(f"Combining segments (round {rounds})", 0.85)
+            partials = list(await asyncio.gather(
+                *(run(reduce_instruction, group, "reduce") for group in groups)
+            ))
+            reduced = split_into_segments("\n\n".join(partials))
+            shrinking = len(reduced) < len(groups)
+            groups = reduced
+            if not shrinking:
+                break
+        
+        # Partials that still don't fit are cut to the final reduce's budget
+        # and the result is marked truncated rather than silently shortened
+        combined = "\n\n---\n\n".join(partials)
+        truncated = len(combined) > MAP_REDUCE_FINAL_MAX_CHARS
+        if truncated:
+            logger.warning(
+                f"Map-reduce partials still {len(combined)} chars after {rounds} reduce rounds - "
+                f"truncating final reduce input to {MAP_REDUCE_FINAL_MAX_CHARS} chars"
+            )
+            combined = combined[:MAP_REDUCE_FINAL_MAX_CHARS]
+        
+        rounds += 1
+        await report("Combining segments", 0.9)
+        output = await run(reduce_instruction, combined, "reduce")
+        
+        await report("Segments combined", 1.0)
+        logger.info(f"Map-reduce complete: {total} segments, {rounds} reduce rounds, {stats['calls']} calls")
+        return {
+            "output": output,
+            "segments": total,
+            "rounds": rounds,
+            "truncated": truncated,
+            "tokens": stats["tokens"],
+            "cost": stats["cost"]
+        }
+    
     async def generate_seo_blog_post(
         self,
         topic: str,
@@ -2551,16 +3022,48 @@ Return as JSON with structure:
         word_count: int = 1200,
         include_titles: bool = True,
         include_meta: bool = True,
-        tone: str = "professional"
+        tone: str = "professional",
+        source_material: Optional[str] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         Scenario 1: Generate a long-form, SEO-optimized blog post.
         Uses TOP_TIER (gpt-4.1-mini) for complex reasoning and high-quality writing.
+        
+        Long source material (or a topic long enough to be source material
+        itself) is first condensed into an outline with a concurrent
+        map-reduce, so the writing call stays within the context budget.
         """
         start_time = datetime.now(timezone.utc)
         tier = ModelTier.TOP_TIER  # Always use top tier for SEO blog posts
         config = self._get_model_config(tier)
         
+        if source_material is None and len(topic) > MAP_REDUCE_THRESHOLD_CHARS:
+            source_material, topic = topic, topic[:300]
+        
+        outline = None
+        map_reduce_stats = None
+        if source_material and len(source_material) > MAP_REDUCE_THRESHOLD_CHARS:
+            try:
+                map_reduce_stats = await self._map_reduce(
+                    source_material,
+                    user_id,
+                    ModelTier.BALANCED,
+                    "You are an expert content strategist who extracts the structure and key facts of source material.",
+                    f"Outline this part of the source material for a blog post on \"{topic}\" (keyword: \"{target_keyword}\"). "
+                    "List its main points, supporting facts, statistics and quotes as concise bullets. Do not invent anything.",
+                    "Merge these partial outlines into one coherent blog outline with sections (H2) and key points (bullets). "
+                    "Remove duplicates, keep every distinct fact, statistic and quote, and do not invent anything.",
+                    progress_callback=progress_callback,
+                    progress_range=(5, 60)
+                )
+            except Exception as e:
+                logger.error(f"SEO blog source map-reduce error: {str(e)}")
+                return {"success": False, "error": str(e)}
+            outline = map_reduce_stats["output"]
+        elif source_material:
+            outline = source_material
+        
         system_message = f"""You are the Master Content Strategist - an expert at creating high-quality, SEO-optimized blog content.
 
 Your expertise:
@@ -2574,6 +3077,10 @@ Target Keyword: {target_keyword}
 Target Word Count: {word_count} words
 Tone: {tone}"""
 
+        outline_text = ""
+        if outline:
+            outline_text = f"\nSOURCE OUTLINE (base the post on these points, do not invent facts):\n{outline}\n"
+        
         session_id = f"agent_blog_{user_id}_{uuid4()}"
         chat = self._create_chat_instance(tier, session_id, system_message)
         
@@ -2590,13 +3097,16 @@ STRUCTURE:
 4. Natural integration of the keyword throughout (2-3% density)
 5. Actionable insights and examples
 6. Strong conclusion with call-to-action
-
+{outline_text}
 {"Also provide 3 alternative SEO-friendly titles." if include_titles else ""}
 {"Also provide a meta description (150-160 characters) optimized for search." if include_meta else ""}
 
 Deliver the complete blog post with professional formatting."""
 
         try:
+            if progress_callback:
+                await progress_callback({"step": "Writing blog post", "percentage": 65 if outline else 10})
+            
             message = UserMessage(text=blog_prompt)
             response = await chat.send_message(message)
             
@@ -2610,6 +3120,10 @@ Deliver the complete blog post with professional formatting."""
             cost = (input_tokens / 1000 * config["cost_per_1k_input"]) + \
                    (output_tokens / 1000 * config["cost_per_1k_output"])
             
+            if map_reduce_stats:
+                total_tokens += map_reduce_stats["tokens"]
+                cost += map_reduce_stats["cost"]
+            
             await self._log_agent_usage(
                 user_id=user_id,
                 operation="seo_blog_post",
@@ -2618,7 +3132,12 @@ Deliver the complete blog post with professional formatting."""
                 tokens_used=total_tokens,
                 cost=cost,
                 duration_ms=duration_ms,
-                metadata={"topic": topic, "keyword": target_keyword, "word_count": word_count}
+                metadata={
+                    "topic": topic,
+                    "keyword": target_keyword,
+                    "word_count": word_count,
+                    "map_reduce_segments": map_reduce_stats["segments"] if map_reduce_stats else 0
+                }
             )
             
             return {
@@ -2626,6 +3145,11 @@ Deliver the complete blog post with professional formatting."""
                 "content": response,
                 "topic": topic,
                 "target_keyword": target_keyword,
+                "map_reduce": {
+                    "segments": map_reduce_stats["segments"],
+                    "reduce_rounds": map_reduce_stats["rounds"],
+                    "truncated": map_reduce_stats["truncated"]
+                } if map_reduce_stats else None,
                 "model_selection": {
                     "tier": tier.value,
                     "model": config["model"],
@@ -2649,75 +3173,121 @@ Deliver the complete blog post with professional formatting."""
         num_posts: int = 5,
         platform: str = "twitter",
         include_image: bool = True,
-        image_style: str = "simple"
+        image_style: str = "simple",
+        platforms: Optional[List[str]] = None,
+        check_compliance: bool = False
     ) -> Dict[str, Any]:
         """
         Scenario 2: Generate multiple social media posts with optional graphics.
         Uses FAST tier (gpt-4.1-nano) for quick text generation.
         Uses image service for graphics if requested.
+        
+        For several platforms a shared campaign brief is written once, then
+        each platform's posts are generated (and, with check_compliance,
+        compliance-checked) concurrently with bounded fan-out, alongside the
+        image, so latency stays roughly flat as platforms are added. A
+        platform that fails is reported in failed_platforms; the campaign
+        only fails if every platform does.
         """
         start_time = datetime.now(timezone.utc)
         tier = ModelTier.FAST  # Use fast tier for social media posts
         config = self._get_model_config(tier)
+        target_platforms = list(dict.fromkeys(platforms or [platform]))
+        usage = {"tokens": 0, "cost": 0.0, "compliance_tokens": 0, "compliance_cost": 0.0}
         
-        platform_guidelines = {
-            "twitter": "Keep each tweet under 280 characters. Use punchy, engaging language.",
-            "instagram": "Focus on visual appeal. Include relevant hashtags. Be lifestyle-oriented.",
-            "linkedin": "Professional tone. Thought leadership style. Include industry insights.",
-            "facebook": "Conversational and community-focused. Encourage engagement."
-        }
-        
-        system_message = f"""You are the Social Media Master - an expert at creating viral, engaging social content.
-
-Platform: {platform.title()}
-Guidelines: {platform_guidelines.get(platform, "Optimize for engagement")}
-
-Create catchy, shareable content that drives action."""
-
-        session_id = f"agent_social_{user_id}_{uuid4()}"
-        chat = self._create_chat_instance(tier, session_id, system_message)
+        def track(prompt_text: str, response_text: str):
+            input_tokens = len(prompt_text) // 4
+            output_tokens = len(response_text) // 4
+            usage["tokens"] += input_tokens + output_tokens
+            usage["cost"] += (input_tokens / 1000 * config["cost_per_1k_input"]) + \
+                             (output_tokens / 1000 * config["cost_per_1k_output"])
         
-        social_prompt = f"""Create {num_posts} engaging {platform} posts to promote:
+        try:
+            # Step 1: Shared brief - only worth a call when several platforms reuse it
+            brief = None
+            if len(target_platforms) > 1:
+                brief_system = "You are a senior social media strategist who writes concise campaign briefs."
+                brief_prompt = f"""Write a short campaign brief (under 150 words) for promoting:
 
 PRODUCT/SERVICE: {product_description}
 
-Requirements:
-- Each post should be unique with a different angle/hook
-- Include relevant emojis where appropriate
-- Add relevant hashtags (3-5 per post)
-- Make them scroll-stopping and shareable
-
-Return as a JSON array with {num_posts} posts, each with "text" and "hashtags" fields."""
-
-        try:
-            message = UserMessage(text=social_prompt)
-            response = await chat.send_message(message)
+Include: target audience, key message, 3-5 distinct angles/hooks, tone, and call to action."""
+                chat = self._create_chat_instance(tier, f"agent_social_brief_{user_id}_{uuid4()}", brief_system)
+                brief = await self._call_llm_with_circuit_breaker(
+                    chat, brief_prompt, provider=config["provider"], model=config["model"]
+                )
+                track(brief_system + brief_prompt, brief)
             
-            # Parse posts
-            try:
-                json_match = re.search(r'\[[\s\S]*\]', response)
-                if json_match:
-                    posts = json.loads(json_match.group())
+            # Step 2: Platform variants + per-variant compliance, fanned out
+            semaphore = asyncio.Semaphore(SOCIAL_CAMPAIGN_FANOUT)
+            
+            async def build_variant(target: str) -> Dict[str, Any]:
+                async with semaphore:
+                    posts = await self._generate_platform_posts(
+                        target, product_description, brief, num_posts, user_id, tier, track
+                    )
+                variant: Dict[str, Any] = {"posts": posts}
+                if check_compliance:
+                    posts_text = "\n\n".join(
+                        p.get("text", "") if isinstance(p, dict) else str(p) for p in posts
+                    )
+                    check = await self._quick_compliance_check(posts_text, user_id)
+                    check_tokens = check.get("tokens_used", 0)
+                    check_cost = check_tokens / 1000 * self._get_model_config(ModelTier.FAST)["cost_per_1k_output"]
+                    usage["tokens"] += check_tokens
+                    usage["cost"] += check_cost
+                    usage["compliance_tokens"] += check_tokens
+                    usage["compliance_cost"] += check_cost
+                    variant["compliance"] = {
+                        "compliance_score": check.get("compliance_score"),
+                        "cultural_score": check.get("cultural_score"),
+                        "issues": check.get("issues", [])
+                    }
+                return variant
+            
+            image_task = None
+            if include_image:
+                from services.image_generation_service import get_image_service
+                image_service = get_image_service()
+                
+                image_prompt = f"Simple, eye-catching graphic for social media promoting: {product_description[:100]}"
+                image_task = asyncio.ensure_future(image_service.generate_image(
+                    prompt=image_prompt,
+                    user_id=user_id,
+                    style=image_style
+                ))
+            
+            variant_results = await asyncio.gather(
+                *(build_variant(t) for t in target_platforms), return_exceptions=True
+            )
+            variants = {}
+            failed_platforms = {}
+            for target, variant in zip(target_platforms, variant_results):
+                if isinstance(variant, BaseException):
+                    logger.warning(f"Social campaign variant for {target} failed: {variant}")
+                    failed_platforms[target] = str(variant)
                 else:
-                    posts = [{"text": response, "hashtags": []}]
-            except json.JSONDecodeError:
-                posts = [{"text": response, "hashtags": []}]
+                    variants[target] = variant
+            if not variants:
+                if image_task:
+                    image_task.cancel()
+                raise next(v for v in variant_results if isinstance(v, BaseException))
             
             end_time = datetime.now(timezone.utc)
             text_duration_ms = (end_time - start_time).total_seconds() * 1000
             
-            input_tokens = len(social_prompt) // 4 + len(system_message) // 4
-            output_tokens = len(response) // 4
-            total_tokens = input_tokens + output_tokens
-            
-            text_cost = (input_tokens / 1000 * config["cost_per_1k_input"]) + \
-                       (output_tokens / 1000 * config["cost_per_1k_output"])
+            total_tokens = usage["tokens"]
+            text_cost = usage["cost"]
+            primary_platform = next(iter(variants))
+            primary = variants[primary_platform]
             
             result = {
                 "success": True,
-                "posts": posts,
-                "platform": platform,
-                "num_posts": len(posts),
+                "posts": primary["posts"],
+                "platform": primary_platform,
+                "num_posts": len(primary["posts"]),
+                "platforms": target_platforms,
+                "variants": variants,
                 "text_model": {
                     "tier": tier.value,
                     "model": config["model"],
@@ -2729,18 +3299,17 @@ Return as a JSON array with {num_posts} posts, each with "text" and "hashtags" f
                     "text_duration_ms": round(text_duration_ms, 2)
                 }
             }
-            
-            # Generate image if requested
-            if include_image:
-                from services.image_generation_service import get_image_service
-                image_service = get_image_service()
-                
-                image_prompt = f"Simple, eye-catching graphic for social media promoting: {product_description[:100]}"
-                image_result = await image_service.generate_image(
-                    prompt=image_prompt,
-                    user_id=user_id,
-                    style=image_style
-                )
+            if brief:
+                result["brief"] = brief
+            if failed_platforms:
+                result["failed_platforms"] = failed_platforms
+            if check_compliance:
+                result["metrics"]["compliance_tokens"] = usage["compliance_tokens"]
+                result["metrics"]["compliance_cost"] = round(usage["compliance_cost"], 6)
+            
+            # Image was generated concurrently with the text
+            if image_task:
+                image_result = await image_task
                 
                 if image_result.get("success"):
                     result["image"] = {
@@ -2757,6 +3326,10 @@ Return as a JSON array with {num_posts} posts, each with "text" and "hashtags" f
             else:
                 result["metrics"]["total_cost"] = round(text_cost, 6)
             
+            result["metrics"]["duration_ms"] = round(
+                (datetime.now(timezone.utc) - start_time).total_seconds() * 1000, 2
+            )
+            
             await self._log_agent_usage(
                 user_id=user_id,
                 operation="social_campaign",
@@ -2765,7 +3338,12 @@ Return as a JSON array with {num_posts} posts, each with "text" and "hashtags" f
                 tokens_used=total_tokens,
                 cost=result["metrics"].get("total_cost", text_cost),
                 duration_ms=text_duration_ms,
-                metadata={"platform": platform, "num_posts": len(posts), "include_image": include_image}
+                metadata={
+                    "platform": primary_platform,
+                    "platforms": target_platforms,
+                    "num_posts": len(primary["posts"]),
+                    "include_image": include_image
+                }
             )
             
             return result
@@ -2773,13 +3351,72 @@ Return as a JSON array with {num_posts} posts, each with "text" and "hashtags" f
         except Exception as e:
             logger.error(f"Social campaign generation error: {str(e)}")
             return {"success": False, "error": str(e)}
+    
+    async def _generate_platform_posts(
+        self,
+        platform: str,
+        product_description: str,
+        brief: Optional[str],
+        num_posts: int,
+        user_id: str,
+        tier: ModelTier,
+        track: Callable[[str, str], None]
+    ) -> List[Dict[str, Any]]:
+        """Generate one platform's posts for a social campaign"""
+        config = self._get_model_config(tier)
+        
+        platform_guidelines = {
+            "twitter": "Keep each tweet under 280 characters. Use punchy, engaging language.",
+            "x": "Keep each post under 280 characters. Use punchy, engaging language.",
+            "instagram": "Focus on visual appeal. Include relevant hashtags. Be lifestyle-oriented.",
+            "linkedin": "Professional tone. Thought leadership style. Include industry insights.",
+            "facebook": "Conversational and community-focused. Encourage engagement."
+        }
+        
+        system_message = f"""You are the Social Media Master - an expert at creating viral, engaging social content.
+
+Platform: {platform.title()}
+Guidelines: {platform_guidelines.get(platform.lower(), "Optimize for engagement")}
+
+Create catchy, shareable content that drives action."""
+
+        brief_text = f"\nCAMPAIGN BRIEF (keep the message consistent across platforms):\n{brief}\n" if brief else ""
+        
+        social_prompt = f"""Create {num_posts} engaging {platform} posts to promote:
+
+PRODUCT/SERVICE: {product_description}
+{brief_text}
+Requirements:
+- Each post should be unique with a different angle/hook
+- Include relevant emojis where appropriate
+- Add relevant hashtags (3-5 per post)
+- Make them scroll-stopping and shareable
+
+Return as a JSON array with {num_posts} posts, each with "text" and "hashtags" fields."""
+
+        session_id = f"agent_social_{platform}_{user_id}_{uuid4()}"
+        chat = self._create_chat_instance(tier, session_id, system_message)
+        response = await self._call_llm_with_circuit_breaker(
+            chat, social_prompt, provider=config["provider"], model=config["model"]
+        )
+        track(system_message + social_prompt, response)
+        
+        # Parse posts
+        try:
+            json_match = re.search(r'\[[\s\S]*\]', response)
+            if json_match:
+                return json.loads(json_match.group())
+            return [{"text": response, "hashtags": []}]
+        except json.JSONDecodeError:
+            return [{"text": response, "hashtags": []}]
 
     async def repurpose_podcast(
         self,
         transcript_or_summary: str,
         user_id: str,
         podcast_title: str = "Podcast Episode",
-        target_formats: Optional[List[str]] = None
+        target_formats: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         Scenario 3: Repurpose podcast content into multiple formats.
@@ -2787,6 +3424,10 @@ Return as a JSON array with {num_posts} posts, each with "text" and "hashtags" f
         - BALANCED (gemini-2.5-flash): Summarization and creative content
         - TOP_TIER (gpt-4.1-mini): Blog post and LinkedIn article
         - BALANCED (gemini-2.5-flash): Short video script
+        
+        Long transcripts are summarized with a concurrent map-reduce over
+        token-bounded segments, so the whole transcript is covered and
+        latency stays bounded regardless of length.
         """
         start_time = datetime.now(timezone.utc)
         
@@ -2803,39 +3444,52 @@ Return as a JSON array with {num_posts} posts, each with "text" and "hashtags" f
         }
         
         # Step 1: First, summarize the transcript (BALANCED for speed)
-        if len(transcript_or_summary) > 5000:
+        if len(transcript_or_summary) > MAP_REDUCE_THRESHOLD_CHARS:
             tier = ModelTier.BALANCED
             config = self._get_model_config(tier)
-            session_id = f"agent_summary_{user_id}_{uuid4()}"
-            chat = self._create_chat_instance(tier, session_id, 
-                "You are an expert at extracting key insights from podcast content.")
             
-            summary_prompt = f"""Summarize this podcast transcript into a detailed summary (500-800 words) capturing all key points:
-
-{transcript_or_summary[:10000]}
+            summary_result = await self._map_reduce(
+                transcript_or_summary,
+                user_id,
+                tier,
+                "You are an expert at extracting key insights from podcast content.",
+                """Summarize this part of a podcast transcript, capturing:
+- Main topics discussed
+- Key insights and takeaways
+- Notable quotes or statistics (verbatim)
+- Actionable advice mentioned""",
+                """Combine these partial podcast summaries into one detailed summary (500-800 words) capturing all key points.
+Keep notable quotes and statistics verbatim and remove duplicates.
 
 Include:
 - Main topics discussed
 - Key insights and takeaways
 - Notable quotes or statistics
-- Actionable advice mentioned"""
-
-            message = UserMessage(text=summary_prompt)
-            summary = await chat.send_message(message)
-            
-            tokens = len(summary_prompt) // 4 + len(summary) // 4
-            cost = (tokens / 1000) * (config["cost_per_1k_input"] + config["cost_per_1k_output"]) / 2
-            results["total_tokens"] += tokens
-            results["total_cost"] += cost
+- Actionable advice mentioned""",
+                progress_callback=progress_callback,
+                progress_range=(5, 50)
+            )
+            summary = summary_result["output"]
+            
+            results["total_tokens"] += summary_result["tokens"]
+            results["total_cost"] += summary_result["cost"]
+            results["map_reduce"] = {
+                "segments": summary_result["segments"],
+                "reduce_rounds": summary_result["rounds"],
+                "truncated": summary_result["truncated"]
+            }
             results["model_usage"].append({
                 "step": "summarization",
                 "model": config["model"],
                 "tier": tier.value,
-                "justification": f"Used {config['model']} for fast, accurate summarization"
+                "justification": f"Used {config['model']} for fast, accurate summarization ({summary_result['segments']} segments in parallel)"
             })
         else:
             summary = transcript_or_summary
         
+        if progress_callback:
+            await progress_callback({"step": "Generating formats", "percentage": 55})
+        
         # Step 2: Generate Blog Post and LinkedIn Article (TOP_TIER for quality)
         if "blog_post" in target_formats or "linkedin_article" in target_formats:
             tier = ModelTier.TOP_TIER
@@ -2920,6 +3574,9 @@ Format each clearly."""
                 "justification": f"Used {config['model']} (Balanced) for creative, platform-appropriate short-form content"
             })
         
+        if progress_callback:
+            await progress_callback({"step": "Formats generated", "percentage": 95})
+        
         end_time = datetime.now(timezone.utc)
         duration_ms = (end_time - start_time).total_seconds() * 1000
         
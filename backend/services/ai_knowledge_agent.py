@@ -17,9 +17,63 @@ import re
 from typing import Dict, List, Any, Optional
 from uuid import uuid4
 
+from services.ingestion_pool_service import get_ingestion_pool
+
 logger = logging.getLogger(__name__)
 
 
+def extract_document_text(file_content: bytes, file_name: str, mime_type: str) -> str:
+    """
+    Extract text from various document formats.
+    
+    Module-level so it can run in an ingestion pool worker process.
+    """
+    
+    text = ""
+    
+    try:
+        if mime_type == "application/pdf" or file_name.lower().endswith('.pdf'):
+            # Extract from PDF
+            import io
+            try:
+                import pypdf
+                reader = pypdf.PdfReader(io.BytesIO(file_content))
+                for page in reader.pages:
+                    text += page.extract_text() + "\n"
+            except ImportError:
+                # Fallback to PyPDF2 if pypdf not available
+                import PyPDF2
+                reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+                for page in reader.pages:
+                    text += page.extract_text() + "\n"
+                    
+        elif mime_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or file_name.lower().endswith('.docx'):
+            # Extract from DOCX
+            import io
+            from docx import Document
+            doc = Document(io.BytesIO(file_content))
+            for para in doc.paragraphs:
+                text += para.text + "\n"
+                
+        elif mime_type == "text/plain" or file_name.lower().endswith('.txt'):
+            # Plain text
+            text = file_content.decode('utf-8', errors='ignore')
+            
+        elif mime_type == "text/markdown" or file_name.lower().endswith('.md'):
+            # Markdown
+            text = file_content.decode('utf-8', errors='ignore')
+            
+        else:
+            # Try generic text extraction
+            text = file_content.decode('utf-8', errors='ignore')
+            
+    except Exception as e:
+        logger.error(f"Text extraction error for {file_name}: {str(e)}")
+        raise
+    
+    return text.strip()
+
+
 class AIKnowledgeAgentService:
     """
     AI-powered agent for extracting knowledge from documents and images.
@@ -140,51 +194,10 @@ class AIKnowledgeAgentService:
         file_name: str,
         mime_type: str
     ) -> str:
-        """Extract text from various document formats."""
-        
-        text = ""
-        
-        try:
-            if mime_type == "application/pdf" or file_name.lower().endswith('.pdf'):
-                # Extract from PDF
-                import io
-                try:
-                    import pypdf
-                    reader = pypdf.PdfReader(io.BytesIO(file_content))
-                    for page in reader.pages:
-                        text += page.extract_text() + "\n"
-                except ImportError:
-                    # Fallback to PyPDF2 if pypdf not available
-                    import PyPDF2
-                    reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-                    for page in reader.pages:
-                        text += page.extract_text() + "\n"
-                        
-            elif mime_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or file_name.lower().endswith('.docx'):
-                # Extract from DOCX
-                import io
-                from docx import Document
-                doc = Document(io.BytesIO(file_content))
-                for para in doc.paragraphs:
-                    text += para.text + "\n"
-                    
-            elif mime_type == "text/plain" or file_name.lower().endswith('.txt'):
-                # Plain text
-                text = file_content.decode('utf-8', errors='ignore')
-                
-            elif mime_type == "text/markdown" or file_name.lower().endswith('.md'):
-                # Markdown
-                text = file_content.decode('utf-8', errors='ignore')
-                
-            else:
-                # Try generic text extraction
-                text = file_content.decode('utf-8', errors='ignore')
-                
-        except Exception as e:
-            logger.error(f"Text extraction error for {file_name}: {str(e)}")
-            raise
-        
-        return text.strip()
+        """Extract text from various document formats (in the ingestion pool)."""
+        return await get_ingestion_pool().run(
+            "extract_document_text", extract_document_text, file_content, file_name, mime_type
+        )
     
     async def _extract_rules_from_text(
         self,
@@ -15,6 +15,7 @@ Features:
 - Fallback responses for each service
 - Health status monitoring
 - Metrics and alerting
+- Adaptive (AIMD) concurrency limits per LLM provider/model
 
 Usage:
     from services.circuit_breaker_service import circuit_breaker, get_circuit_status
@@ -35,6 +36,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, Callable, TypeVar, Awaitable
 from enum import Enum
 from functools import wraps
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from collections import deque
 import traceback
@@ -177,6 +179,16 @@ class CircuitBreaker:
                 if should_open:
                     self._transition_to(CircuitState.OPEN)
     
+    def release_probe(self):
+        """
+        Give back a half-open probe slot for a call that ended without an
+        outcome (e.g. the client disconnected mid-stream).
+
+        Synchronous so it can run in a finally block of a cancelled task.
+        """
+        if self.state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+    
     async def record_rejection(self):
         """Record a rejected call (circuit was open)"""
         async with self._lock:
@@ -200,17 +212,17 @@ class CircuitBreaker:
         
         logger.info(f"Circuit {self.name}: State changed from {old_state.value} to {new_state.value}")
     
+    def recovery_in_seconds(self) -> Optional[float]:
+        """Seconds until an open circuit lets a probe through (None if calls are allowed now)"""
+        if self.state != CircuitState.OPEN:
+            return None
+        remaining = self.config.timeout_seconds - (time.time() - self._last_state_change)
+        return remaining if remaining > 0 else None
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current circuit status"""
-        now = time.time()
-        
         # Calculate time until recovery (if open)
-        recovery_time = None
-        if self.state == CircuitState.OPEN:
-            elapsed = now - self._last_state_change
-            remaining = self.config.timeout_seconds - elapsed
-            if remaining > 0:
-                recovery_time = remaining
+        recovery_time = self.recovery_in_seconds()
         
         # Calculate failure rate
         failure_rate = 0
@@ -309,11 +321,16 @@ _circuits: Dict[str, CircuitBreaker] = {}
 _registry_lock = asyncio.Lock()
 
 
+def _circuit_config_for(name: str) -> CircuitConfig:
+    """Per-model circuits ("openai:gpt-4o-mini") inherit their service's config"""
+    return CIRCUIT_CONFIGS.get(name) or CIRCUIT_CONFIGS.get(name.split(":")[0], CircuitConfig())
+
+
 async def get_or_create_circuit(name: str) -> CircuitBreaker:
     """Get or create a circuit breaker by name"""
     async with _registry_lock:
         if name not in _circuits:
-            config = CIRCUIT_CONFIGS.get(name, CircuitConfig())
+            config = _circuit_config_for(name)
             _circuits[name] = CircuitBreaker(name, config)
             logger.info(f"Created circuit breaker: {name}")
         return _circuits[name]
@@ -322,7 +339,7 @@ async def get_or_create_circuit(name: str) -> CircuitBreaker:
 def get_circuit_sync(name: str) -> CircuitBreaker:
     """Synchronous version for non-async contexts"""
     if name not in _circuits:
-        config = CIRCUIT_CONFIGS.get(name, CircuitConfig())
+        config = _circuit_config_for(name)
         _circuits[name] = CircuitBreaker(name, config)
     return _circuits[name]
 
@@ -454,8 +471,7 @@ def circuit_breaker_sync(
             
             # Check if we can execute (sync check)
             if circuit.state == CircuitState.OPEN:
-                elapsed = time.time() - circuit._last_state_change
-                if elapsed < circuit.config.timeout_seconds:
+                if circuit.recovery_in_seconds() is not None:
                     circuit.metrics.rejected_calls += 1
                     
                     if raise_on_open:
@@ -511,6 +527,254 @@ class ServiceUnavailableError(Exception):
         super().__init__(fallback_data.get("error", f"Service {service_name} unavailable"))
 
 
+# ============================================================
+# Adaptive Concurrency Limiter (AIMD)
+# ============================================================
+
+@dataclass
+class LimiterConfig:
+    """Configuration for an adaptive concurrency limiter"""
+    initial_limit: int = 8            # Concurrent calls allowed at startup
+    min_limit: int = 1
+    max_limit: int = 64
+    increase_step: float = 1.0        # Additive increase per limit-worth of successes
+    decrease_factor: float = 0.5      # Multiplicative decrease on overload
+    decrease_cooldown_seconds: float = 1.0  # One decrease per burst of overload signals
+    latency_tolerance: float = 2.0    # Latency above baseline * tolerance counts as overload
+    min_latency_samples: int = 10     # Samples before latency inflation is judged
+    queue_timeout_seconds: float = 30.0  # Default deadline for queued callers
+    max_queue_size: int = 200
+
+
+@dataclass
+class LimiterMetrics:
+    """Metrics for an adaptive concurrency limiter"""
+    acquired: int = 0
+    queued: int = 0                   # Calls that had to wait for a slot
+    rejected: int = 0                 # Queue full or deadline exceeded
+    overloads: int = 0                # 429 / timeout / latency inflation signals
+    decreases: int = 0
+    max_in_flight: int = 0
+    recent_queue_times: deque = field(default_factory=lambda: deque(maxlen=100))
+
+
+def _is_overload_error(error: BaseException) -> bool:
+    """Rate limits and timeouts mean the provider is saturated, not broken"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status == 429:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in ("429", "rate limit", "too many requests", "timed out", "timeout"))
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter for a single provider/model.
+    
+    - Success: limit grows by increase_step / limit (about +1 per round trip)
+    - Overload (429, timeout, latency inflation): limit *= decrease_factor
+    - Callers above the limit wait in a FIFO queue until a slot frees up
+      or their deadline passes (ServiceUnavailableError)
+    """
+    
+    def __init__(self, name: str, config: Optional[LimiterConfig] = None):
+        self.name = name
+        self.config = config or LimiterConfig()
+        self.metrics = LimiterMetrics()
+        self._limit = float(self.config.initial_limit)
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._baseline_latency_ms: Optional[float] = None
+        self._latency_samples = 0
+        self._last_decrease = 0.0
+    
+    @property
+    def limit(self) -> int:
+        return max(self.config.min_limit, int(self._limit))
+    
+    def _reject(self, reason: str) -> ServiceUnavailableError:
+        self.metrics.rejected += 1
+        logger.warning(f"Concurrency limiter {self.name}: rejecting call ({reason})")
+        return ServiceUnavailableError(self.name, {
+            "error": f"{self.name} is at capacity, please retry shortly",
+            "retry_after": 5
+        })
+    
+    def _grant(self):
+        self._in_flight += 1
+        self.metrics.acquired += 1
+        self.metrics.max_in_flight = max(self.metrics.max_in_flight, self._in_flight)
+    
+    async def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a slot. Returns the time spent queued in milliseconds.
+        
+        Raises:
+            ServiceUnavailableError: If the queue is full or the deadline passes
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._grant()
+            self.metrics.recent_queue_times.append(0.0)
+            return 0.0
+        
+        if len(self._waiters) >= self.config.max_queue_size:
+            raise self._reject("queue full")
+        
+        timeout = self.config.queue_timeout_seconds if timeout is None else timeout
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.metrics.queued += 1
+        start = time.time()
+        
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                waiter.cancel()
+                self._discard_waiter(waiter)
+                raise self._reject(f"queued longer than {timeout}s")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as we were cancelled - give it back
+                self.release()
+            else:
+                waiter.cancel()
+                self._discard_waiter(waiter)
+            raise
+        
+        queue_time_ms = (time.time() - start) * 1000
+        self.metrics.recent_queue_times.append(queue_time_ms)
+        return queue_time_ms
+    
+    def _discard_waiter(self, waiter):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+    
+    def release(self):
+        """Free a slot and hand it to the next queued caller"""
+        self._in_flight = max(0, self._in_flight - 1)
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._grant()
+                waiter.set_result(None)
+    
+    def record_outcome(self, response_time_ms: float, error: Optional[BaseException] = None):
+        """Adjust the limit from a completed call"""
+        overloaded = False
+        if error is not None:
+            overloaded = _is_overload_error(error)
+            if not overloaded:
+                return  # Hard failures are the circuit breaker's concern
+        else:
+            baseline = self._baseline_latency_ms
+            if baseline is not None and self._latency_samples >= self.config.min_latency_samples:
+                overloaded = response_time_ms > baseline * self.config.latency_tolerance
+            if not overloaded:
+                # Slow EWMA so a burst of inflated calls does not move the baseline
+                self._baseline_latency_ms = (
+                    response_time_ms if baseline is None
+                    else baseline * 0.95 + response_time_ms * 0.05
+                )
+                self._latency_samples += 1
+        
+        if overloaded:
+            self.metrics.overloads += 1
+            now = time.time()
+            if now - self._last_decrease >= self.config.decrease_cooldown_seconds:
+                self._last_decrease = now
+                self.metrics.decreases += 1
+                self._limit = max(float(self.config.min_limit), self._limit * self.config.decrease_factor)
+                logger.info(f"Concurrency limiter {self.name}: overload, limit lowered to {self.limit}")
+        else:
+            self._limit = min(
+                float(self.config.max_limit),
+                self._limit + self.config.increase_step / max(self._limit, 1.0)
+            )
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get current limiter status"""
+        queue_times = sorted(self.metrics.recent_queue_times)
+        avg_queue_time = sum(queue_times) / len(queue_times) if queue_times else 0
+        p95_queue_time = queue_times[int(0.95 * (len(queue_times) - 1))] if queue_times else 0
+        
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "baseline_latency_ms": round(self._baseline_latency_ms or 0, 2),
+            "metrics": {
+                "acquired": self.metrics.acquired,
+                "queued_calls": self.metrics.queued,
+                "rejected": self.metrics.rejected,
+                "overloads": self.metrics.overloads,
+                "decreases": self.metrics.decreases,
+                "max_in_flight": self.metrics.max_in_flight,
+                "avg_queue_time_ms": round(avg_queue_time, 2),
+                "p95_queue_time_ms": round(p95_queue_time, 2),
+            },
+            "config": {
+                "min_limit": self.config.min_limit,
+                "max_limit": self.config.max_limit,
+                "queue_timeout_seconds": self.config.queue_timeout_seconds,
+            }
+        }
+
+
+# Limiter configurations per provider (per worker process)
+LIMITER_CONFIGS = {
+    "openai": LimiterConfig(initial_limit=16, max_limit=64),
+    "gemini": LimiterConfig(initial_limit=8, max_limit=32),
+    "claude": LimiterConfig(initial_limit=8, max_limit=32),
+    "image_generation": LimiterConfig(initial_limit=2, max_limit=8, queue_timeout_seconds=60.0),
+}
+
+# Global registry of concurrency limiters, keyed "provider" or "provider/model"
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_or_create_limiter(provider: str, model: Optional[str] = None) -> AdaptiveConcurrencyLimiter:
+    """Get or create the concurrency limiter for a provider/model"""
+    name = f"{provider}/{model}" if model else provider
+    if name not in _limiters:
+        config = LIMITER_CONFIGS.get(provider, LimiterConfig())
+        _limiters[name] = AdaptiveConcurrencyLimiter(name, config)
+        logger.info(f"Created concurrency limiter: {name}")
+    return _limiters[name]
+
+
+@asynccontextmanager
+async def llm_concurrency_slot(
+    provider: str,
+    model: Optional[str] = None,
+    timeout: Optional[float] = None
+):
+    """
+    Hold a concurrency slot for one upstream call.
+    
+    Usage:
+        async with llm_concurrency_slot("openai", "gpt-4o-mini"):
+            response = await chat.send_message(message)
+    """
+    limiter = get_or_create_limiter(provider, model)
+    await limiter.acquire(timeout)
+    start_time = time.time()
+    try:
+        yield limiter
+    except Exception as e:
+        limiter.record_outcome((time.time() - start_time) * 1000, e)
+        raise
+    else:
+        limiter.record_outcome((time.time() - start_time) * 1000)
+    finally:
+        limiter.release()
+
+
 # ============================================================
 # Health Check and Status Functions
 # ============================================================
@@ -532,15 +796,19 @@ def get_all_circuits_status() -> Dict[str, Any]:
     open_circuits = [name for name, status in statuses.items() if status.get("state") == "open"]
     half_open_circuits = [name for name, status in statuses.items() if status.get("state") == "half_open"]
     
+    limiters = {name: limiter.get_status() for name, limiter in _limiters.items()}
+    
     return {
         "circuits": statuses,
+        "concurrency_limiters": limiters,
         "summary": {
             "total": len(statuses),
             "closed": len(statuses) - len(open_circuits) - len(half_open_circuits),
             "open": len(open_circuits),
             "half_open": len(half_open_circuits),
             "open_services": open_circuits,
-            "degraded": len(open_circuits) > 0 or len(half_open_circuits) > 0
+            "degraded": len(open_circuits) > 0 or len(half_open_circuits) > 0,
+            "queued_calls": sum(status["queued"] for status in limiters.values())
         },
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
@@ -0,0 +1,207 @@
+"""
+Compliance Requirements Cache Service
+
+Caches the output of pipeline Step 2 (`_get_compliance_requirements`, a
+gpt-4.1-mini call) so repeat generations in the same domain skip the LLM.
+
+Entries are keyed by (domain, policy-set version, language):
+- The policy-set version fingerprints the user's and enterprise's policy
+  documents, so uploading or deleting a policy changes the key on every
+  worker without explicit invalidation
+- Knowledge base changes bump a per-user / enterprise / company generation
+  counter that is folded into the version (see invalidate_compliance_cache).
+  Generations live in the compliance_generations collection, so a change
+  handled by one worker invalidates the cache on every worker
+
+Usage:
+    from services.compliance_cache_service import (
+        get_compliance_cache,
+        invalidate_compliance_cache,
+    )
+
+    cache = get_compliance_cache()
+    version = await cache.get_policy_set_version(db, user_id)
+    rules = cache.get(domain, version, language)
+    if rules is None:
+        rules = await call_llm(...)
+        cache.set(domain, version, language, rules)
+
+    # After a knowledge base upload/delete
+    await invalidate_compliance_cache(db, user_id=user_id, company_id=company_id)
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Entries also expire so prompt-independent rules are refreshed periodically
+COMPLIANCE_CACHE_TTL_SECONDS = 6 * 3600
+COMPLIANCE_CACHE_MAX_SIZE = 2000
+
+
+class ComplianceRequirementsCache:
+    """
+    In-memory cache for domain compliance requirements.
+    Evicts the oldest entry when full, like PermissionCache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = COMPLIANCE_CACHE_MAX_SIZE,
+        ttl_seconds: int = COMPLIANCE_CACHE_TTL_SECONDS
+    ):
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._timestamps: Dict[str, datetime] = {}
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        # Local knowledge base generation per "user:<id>", "enterprise:<id>",
+        # "company:<id>" - covers this worker if the shared counter can't be written
+        self._generations: Dict[str, int] = defaultdict(int)
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _key(self, domain: str, policy_version: str, language: str) -> str:
+        return f"{domain}:{policy_version}:{(language or 'en').lower()}"
+
+    def _is_expired(self, key: str) -> bool:
+        if key not in self._timestamps:
+            return True
+        age = (datetime.now(timezone.utc) - self._timestamps[key]).total_seconds()
+        return age > self._ttl_seconds
+
+    async def get_policy_set_version(self, db, user_id: str) -> str:
+        """
+        Fingerprint the policy set that applies to a user.
+
+        Combines the user's and enterprise's policy document ids and upload
+        times with the shared and local knowledge base generation counters.
+        """
+        user = None
+        policy_marks = []
+        try:
+            user = await db.users.find_one(
+                {"id": user_id}, {"_id": 0, "enterprise_id": 1, "company_id": 1}
+            )
+            query = {"$or": [{"user_id": user_id}]}
+            if user and user.get("enterprise_id"):
+                query["$or"].append({"enterprise_id": user["enterprise_id"]})
+            policies = await db.policies.find(
+                query, {"_id": 0, "id": 1, "uploaded_at": 1}
+            ).to_list(100)
+            policy_marks = sorted(f"{p.get('id')}@{p.get('uploaded_at')}" for p in policies)
+        except Exception as e:
+            logger.warning(f"Could not fingerprint policy set for {user_id}: {e}")
+
+        scopes = [f"user:{user_id}"]
+        for field in ("enterprise_id", "company_id"):
+            if user and user.get(field):
+                scopes.append(f"{field[:-3]}:{user[field]}")
+        shared: Dict[str, int] = {}
+        try:
+            generations = await db.compliance_generations.find(
+                {"scope": {"$in": scopes}}, {"_id": 0, "scope": 1, "generation": 1}
+            ).to_list(len(scopes))
+            shared = {g["scope"]: g.get("generation", 0) for g in generations}
+        except Exception as e:
+            logger.warning(f"Could not read compliance generations for {user_id}: {e}")
+        generation = ",".join(
+            f"{scope}={shared.get(scope, 0)}.{self._generations[scope]}" for scope in scopes
+        )
+
+        return hashlib.sha256(
+            f"{'|'.join(policy_marks)}#{generation}".encode()
+        ).hexdigest()[:24]
+
+    def get(self, domain: str, policy_version: str, language: str) -> Optional[Dict[str, Any]]:
+        key = self._key(domain, policy_version, language)
+        if key in self._cache and not self._is_expired(key):
+            self.stats["hits"] += 1
+            return dict(self._cache[key])
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, domain: str, policy_version: str, language: str, requirements: Dict[str, Any]):
+        key = self._key(domain, policy_version, language)
+
+        # Evict oldest entries if cache is full
+        if key not in self._cache and len(self._cache) >= self._max_size:
+            oldest_key = min(self._timestamps, key=self._timestamps.get)
+            del self._cache[oldest_key]
+            del self._timestamps[oldest_key]
+
+        self._cache[key] = dict(requirements)
+        self._timestamps[key] = datetime.now(timezone.utc)
+
+    async def invalidate(
+        self,
+        db=None,
+        user_id: Optional[str] = None,
+        enterprise_id: Optional[str] = None,
+        company_id: Optional[str] = None
+    ):
+        """
+        Invalidate cached requirements after a policy or knowledge base change.
+        Bumping the scope generation changes the policy-set version, so stale
+        entries are never read again and age out of the cache.
+        """
+        scopes = [
+            f"{name}:{scope_id}"
+            for name, scope_id in (("user", user_id), ("enterprise", enterprise_id), ("company", company_id))
+            if scope_id
+        ]
+        for scope in scopes:
+            self._generations[scope] += 1
+            if db is None:
+                continue
+            try:
+                await db.compliance_generations.update_one(
+                    {"scope": scope},
+                    {
+                        "$inc": {"generation": 1},
+                        "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+                    },
+                    upsert=True
+                )
+            except Exception as e:
+                logger.warning(f"Could not bump compliance generation for {scope}: {e}")
+        if scopes:
+            self.stats["invalidations"] += 1
+
+    def clear(self):
+        self._cache.clear()
+        self._timestamps.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._cache),
+            "hit_rate": round(self.stats["hits"] / total, 3) if total else 0.0,
+        }
+
+
+# Global cache instance
+_compliance_cache: Optional[ComplianceRequirementsCache] = None
+
+
+def get_compliance_cache() -> ComplianceRequirementsCache:
+    """Get or create the compliance requirements cache singleton"""
+    global _compliance_cache
+    if _compliance_cache is None:
+        _compliance_cache = ComplianceRequirementsCache()
+    return _compliance_cache
+
+
+async def invalidate_compliance_cache(
+    db=None,
+    user_id: Optional[str] = None,
+    enterprise_id: Optional[str] = None,
+    company_id: Optional[str] = None
+):
+    """Invalidate cached compliance requirements for a user, enterprise or company"""
+    await get_compliance_cache().invalidate(
+        db, user_id=user_id, enterprise_id=enterprise_id, company_id=company_id
+    )
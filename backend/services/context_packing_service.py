@@ -0,0 +1,182 @@
+"""
+Context Packing Service
+
+Packs retrieved knowledge base chunks into a prompt-sized context.
+
+Chunks retrieved from several tiers repeat each other: consecutive chunks
+of a document share CHUNK_OVERLAP characters, and the same policy text is
+often uploaded to more than one tier with small edits. Packing:
+- drops near-duplicate chunks (64-bit SimHash over word shingles)
+- strips the text a chunk shares with an adjacent chunk of the same
+  document that is already packed
+- orders chunks by tier priority, then relevance
+- fits them to a per-model token budget
+
+Usage:
+    from services.context_packing_service import get_context_token_budget, pack_chunks
+
+    packed = pack_chunks(chunks, get_context_token_budget(model), tier_order=TIER_PRIORITY)
+    context = "\n---\n".join(c["content"] for c in packed.chunks)
+"""
+
+import hashlib
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from services.token_tracking_service import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Knowledge context token budget per model (prompt share, not the window)
+DEFAULT_CONTEXT_TOKEN_BUDGET = int(os.environ.get("KB_CONTEXT_TOKEN_BUDGET", "1500"))
+CONTEXT_TOKEN_BUDGETS = {
+    "gpt-4.1-nano": 1000,
+    "gpt-4.1-mini": 2000,
+    "gpt-4o-mini": 2000,
+    "gpt-4o": 3000,
+    "gpt-4.1": 3000,
+    "gemini-2.5-flash": 3000,
+    "claude-4-sonnet-20250514": 3000,
+}
+
+# Chunks whose SimHashes differ in at most this many bits are near-duplicates
+# (a one-word edit of a 500-char chunk moves ~5 bits, unrelated text ~32)
+SIMHASH_MAX_DISTANCE = 10
+SHINGLE_WORDS = 3
+
+# Shortest shared text treated as chunk overlap rather than coincidence
+MIN_OVERLAP_CHARS = 10
+MAX_OVERLAP_CHARS = 200
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def get_context_token_budget(model: Optional[str] = None) -> int:
+    """Knowledge context token budget for a model"""
+    return CONTEXT_TOKEN_BUDGETS.get(model or "", DEFAULT_CONTEXT_TOKEN_BUDGET)
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of a text's word shingles"""
+    words = _WORD_PATTERN.findall(text.lower())
+    shingles = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(1, len(words) - SHINGLE_WORDS + 1))]
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def strip_overlap(previous: str, chunk: str) -> str:
+    """Remove the prefix of chunk that repeats the end of previous"""
+    longest = min(len(previous), len(chunk), MAX_OVERLAP_CHARS)
+    for size in range(longest, MIN_OVERLAP_CHARS - 1, -1):
+        if previous.endswith(chunk[:size]):
+            return chunk[size:].lstrip()
+    return chunk
+
+
+def strip_overlap_suffix(chunk: str, following: str) -> str:
+    """Remove the suffix of chunk that following starts with"""
+    longest = min(len(following), len(chunk), MAX_OVERLAP_CHARS)
+    for size in range(longest, MIN_OVERLAP_CHARS - 1, -1):
+        if chunk.endswith(following[:size]):
+            return chunk[:-size].rstrip()
+    return chunk
+
+
+@dataclass
+class PackedContext:
+    """Result of packing chunks into a token budget"""
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+    tokens: int = 0
+    near_duplicates: int = 0
+    overlap_chars: int = 0
+    over_budget: int = 0
+
+
+def _relevance_key(chunk: Dict[str, Any]):
+    if chunk.get("rerank_score") is not None:
+        return -chunk["rerank_score"]
+    if chunk.get("score") is not None:
+        return -chunk["score"]
+    if chunk.get("distance") is not None:
+        return chunk["distance"]
+    return float("inf")
+
+
+def order_chunks(chunks: List[Dict[str, Any]], tier_order: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """Tier priority first, then relevance (cross-encoder score, fused score or distance)"""
+    def tier_rank(chunk):
+        tier = chunk.get("tier")
+        return tier_order.index(tier) if tier in tier_order else len(tier_order)
+    return sorted(chunks, key=lambda c: (tier_rank(c), _relevance_key(c)))
+
+
+def pack_chunks(
+    chunks: List[Dict[str, Any]],
+    token_budget: int,
+    model: str = "gpt-4",
+    tier_order: Sequence[str] = ()
+) -> PackedContext:
+    """
+    Select and trim chunks to fit a token budget.
+
+    Args:
+        chunks: Retrieved chunks ({"content", "metadata", "tier", "score"/"distance"})
+        token_budget: Maximum tokens of chunk text to keep
+        model: Model whose tokenizer is used for counting
+        tier_order: Tier names, highest priority first
+
+    Returns:
+        PackedContext with copies of the kept chunks (content trimmed)
+    """
+    packed = PackedContext()
+    fingerprints: List[int] = []
+    # (document_id, chunk_index) -> packed content, to find adjacent chunks
+    positions: Dict[tuple, str] = {}
+
+    for chunk in order_chunks(chunks, tier_order):
+        content = chunk.get("content") or ""
+        fingerprint = simhash(content)
+        if any(hamming_distance(fingerprint, seen) <= SIMHASH_MAX_DISTANCE for seen in fingerprints):
+            packed.near_duplicates += 1
+            continue
+
+        metadata = chunk.get("metadata") or {}
+        document_id, index = metadata.get("document_id"), metadata.get("chunk_index")
+        if document_id is not None and isinstance(index, int):
+            previous = positions.get((document_id, index - 1))
+            if previous:
+                trimmed = strip_overlap(previous, content)
+                packed.overlap_chars += len(content) - len(trimmed)
+                content = trimmed
+            following = positions.get((document_id, index + 1))
+            if following:
+                # The later chunk is already packed and starts with our tail
+                trimmed = strip_overlap_suffix(content, following)
+                packed.overlap_chars += len(content) - len(trimmed)
+                content = trimmed
+
+        if not content:
+            continue
+        tokens = estimate_tokens(content, model)
+        if packed.tokens + tokens > token_budget:
+            packed.over_budget += 1
+            continue
+
+        fingerprints.append(fingerprint)
+        if document_id is not None and isinstance(index, int):
+            positions[(document_id, index)] = content
+        packed.chunks.append({**chunk, "content": content, "tokens": tokens})
+        packed.tokens += tokens
+
+    return packed
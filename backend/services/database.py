@@ -393,6 +393,9 @@ async def ensure_indexes() -> None:
         await db.posts.create_index("user_id")
         await db.posts.create_index("enterprise_id")
         await db.posts.create_index([("created_at", -1)])
+        # Dashboard aggregations: per-user status counts and date ranges
+        await db.posts.create_index([("user_id", 1), ("status", 1)])
+        await db.posts.create_index([("user_id", 1), ("created_at", -1)])
         
         # Content analyses indexes
         await db.content_analyses.create_index("user_id")
@@ -419,6 +422,15 @@ async def ensure_indexes() -> None:
         # Payment transactions idempotency key index (ARCH-002)
         await db.payment_transactions.create_index("idempotency_key", unique=True, sparse=True)
         
+        # Materialized knowledge base summaries (one per profile/tier)
+        await db.knowledge_summaries.create_index("scope", unique=True)
+        
+        # Compliance cache generations per user/enterprise/company (shared by all workers)
+        await db.compliance_generations.create_index("scope", unique=True)
+        
+        # Logged LLM domain classifications (raw prompt text) expire after TRAINING_LOG_TTL_DAYS
+        await db.domain_classification_log.create_index("expires_at", expireAfterSeconds=0)
+        
         # Credit grants indexes (for credit deduplication - ARCH-002)
         await db.credit_grants.create_index("idempotency_key", unique=True)
         await db.credit_grants.create_index("user_id")
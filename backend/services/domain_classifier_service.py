@@ -0,0 +1,323 @@
+"""
+Local Domain Classifier Service
+
+Fast-path replacement for the gpt-4.1-nano domain classification call
+(Step 1 of the content generation pipeline). Classifies a prompt into one of
+the pipeline domains (hiring, marketing, healthcare, financial, legal,
+general) locally and reports a confidence score. Callers fall back to the
+LLM only when the confidence is below LOCAL_CONFIDENCE_THRESHOLD.
+
+Two signals are combined:
+- Keyword automaton: a single compiled alternation over the domain keyword
+  tables (the pipeline's DOMAIN_CATEGORIES plus the industry tables from
+  industry_detection_service), matched once per prompt
+- Linear model: an online multinomial Naive Bayes trained from the LLM's own
+  classifications, which are logged to `domain_classification_log` (kept for
+  TRAINING_LOG_TTL_DAYS) and replayed on first use after a restart
+
+The model only scores tokens it has seen, and a model-driven answer is only
+confident when the keywords agree or the prompt has MODEL_MIN_KNOWN_TOKENS
+known tokens. A sampled fraction of confident prompts still goes to the LLM
+(LLM_LABEL_SAMPLE_RATE) so the model keeps receiving labels.
+
+Usage:
+    from services.domain_classifier_service import get_domain_classifier
+
+    classifier = get_domain_classifier(DOMAIN_CATEGORIES)
+    await classifier.ensure_loaded(db)
+    prediction = classifier.predict(prompt)
+    if prediction["confident"] and not classifier.sample_for_label():
+        domain = prediction["domain"]
+    else:
+        domain = await call_llm(...)
+        await classifier.record_llm_classification(db, prompt, domain)
+"""
+
+import logging
+import math
+import os
+import random
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from services.industry_detection_service import INDUSTRY_KEYWORDS
+
+logger = logging.getLogger(__name__)
+
+# Minimum combined confidence to skip the LLM call
+LOCAL_CONFIDENCE_THRESHOLD = 0.6
+
+# The linear model only contributes once it has seen enough labelled prompts
+MIN_TRAINING_SAMPLES = 50
+
+# Model-driven answers need this many tokens the model has seen (unless the
+# keywords agree), and model-only confidence is scaled by that evidence and capped
+MODEL_MIN_KNOWN_TOKENS = 3
+MODEL_MAX_CONFIDENCE = 0.9
+
+# Fraction of confident prompts still sent to the LLM for training labels
+LLM_LABEL_SAMPLE_RATE = float(os.environ.get("DOMAIN_CLASSIFIER_LABEL_SAMPLE_RATE", "0.05"))
+
+# Logged LLM classifications replayed into the model on first use
+TRAINING_LOG_COLLECTION = "domain_classification_log"
+TRAINING_LOG_LIMIT = 5000
+TRAINING_LOG_TTL_DAYS = 30  # Entries hold raw prompt text
+
+# Weight of the keyword signal vs the learned model once trained
+KEYWORD_WEIGHT = 0.5
+
+# Industry tables that map onto a pipeline domain
+INDUSTRY_TO_DOMAIN = {
+    "finance": "financial",
+    "healthcare": "healthcare",
+    "legal": "legal",
+    "retail": "marketing",
+}
+
+# Strong phrases that the single-word tables miss
+EXTRA_DOMAIN_KEYWORDS = {
+    "hiring": [
+        "we're hiring", "we are hiring", "now hiring", "#hiring", "job opening",
+        "apply now", "join our team", "open role", "vacancy", "recruiting",
+    ],
+    "marketing": [
+        "limited time", "promo code", "discount code", "launch", "campaign",
+        "#ad", "#sponsored", "shop now",
+    ],
+    "healthcare": ["hipaa", "symptoms", "clinic"],
+    "financial": ["roi", "dividend", "401k", "retirement savings", "interest rate"],
+    "legal": ["terms of service", "lawsuit", "gdpr", "legal advice"],
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9#']+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class DomainClassifier:
+    """
+    Local domain classifier combining a keyword automaton with an online
+    Naive Bayes model trained from logged LLM classifications.
+    """
+
+    def __init__(self, domain_categories: Dict[str, Dict[str, Any]]):
+        self.domains = list(domain_categories.keys())
+        self.default_domain = "general" if "general" in domain_categories else self.domains[-1]
+
+        # Build keyword -> domain table
+        self._keyword_domain: Dict[str, str] = {}
+        for domain, info in domain_categories.items():
+            for keyword in info.get("keywords", []):
+                self._keyword_domain.setdefault(keyword.lower(), domain)
+        for industry, domain in INDUSTRY_TO_DOMAIN.items():
+            if domain in domain_categories:
+                for keyword in INDUSTRY_KEYWORDS.get(industry, []):
+                    self._keyword_domain.setdefault(keyword.lower(), domain)
+        for domain, keywords in EXTRA_DOMAIN_KEYWORDS.items():
+            if domain in domain_categories:
+                for keyword in keywords:
+                    self._keyword_domain.setdefault(keyword.lower(), domain)
+
+        # One alternation, longest keywords first so phrases win over their words
+        alternation = "|".join(
+            re.escape(k) for k in sorted(self._keyword_domain, key=len, reverse=True)
+        )
+        self._keyword_pattern = re.compile(rf"(?<![\w#])(?:{alternation})(?!\w)")
+
+        # Naive Bayes state
+        self._class_counts: Dict[str, int] = defaultdict(int)
+        self._token_counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._class_token_totals: Dict[str, int] = defaultdict(int)
+        self._vocabulary: set = set()
+        self._training_samples = 0
+        self._loaded = False
+
+        # Shortcut statistics
+        self.stats = {"local_hits": 0, "llm_fallbacks": 0, "label_samples": 0, "trained_samples": 0}
+
+    # ------------------------------------------------------------------
+    # Signals
+    # ------------------------------------------------------------------
+
+    def keyword_scores(self, text: str) -> Dict[str, float]:
+        """Normalized keyword hit distribution over domains"""
+        hits: Dict[str, int] = defaultdict(int)
+        for match in self._keyword_pattern.finditer(text.lower()):
+            hits[self._keyword_domain[match.group(0)]] += 1
+
+        total = sum(hits.values())
+        if not total:
+            return {}
+        return {domain: count / total for domain, count in hits.items()}
+
+    def known_tokens(self, text: str) -> List[str]:
+        """Tokens of text the model has seen in training"""
+        return [token for token in _tokenize(text) if token in self._vocabulary]
+
+    def model_probabilities(self, text: str) -> Dict[str, float]:
+        """
+        Posterior over domains from the Naive Bayes model.
+
+        Unseen tokens are skipped - smoothing would otherwise favour the
+        domains with the least training text for every unknown word.
+        """
+        if self._training_samples < MIN_TRAINING_SAMPLES:
+            return {}
+
+        tokens = self.known_tokens(text)
+        if not tokens:
+            return {}
+        vocab_size = len(self._vocabulary) or 1
+        log_scores = {}
+        for domain, class_count in self._class_counts.items():
+            score = math.log(class_count / self._training_samples)
+            token_counts = self._token_counts[domain]
+            denominator = self._class_token_totals[domain] + vocab_size
+            for token in tokens:
+                score += math.log((token_counts.get(token, 0) + 1) / denominator)
+            log_scores[domain] = score
+
+        if not log_scores:
+            return {}
+        max_score = max(log_scores.values())
+        exp_scores = {d: math.exp(s - max_score) for d, s in log_scores.items()}
+        norm = sum(exp_scores.values())
+        return {d: v / norm for d, v in exp_scores.items()}
+
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+
+    def predict(self, text: str) -> Dict[str, Any]:
+        """
+        Classify text locally.
+
+        Returns:
+            Dict with domain, confidence, confident (>= threshold, and for
+            model-driven answers backed by the keywords or enough known
+            tokens), matched signal breakdown
+        """
+        text = (text or "")[:2000]
+        keyword_dist = self.keyword_scores(text)
+        model_dist = self.model_probabilities(text)
+        known = len(self.known_tokens(text)) if model_dist else 0
+
+        if keyword_dist and model_dist:
+            combined = defaultdict(float)
+            for domain, p in keyword_dist.items():
+                combined[domain] += KEYWORD_WEIGHT * p
+            for domain, p in model_dist.items():
+                combined[domain] += (1 - KEYWORD_WEIGHT) * p
+            method = "keywords+model"
+        elif model_dist:
+            # Model-only confidence scales with how much of the prompt it knows
+            evidence = min(1.0, known / MODEL_MIN_KNOWN_TOKENS)
+            combined = {d: min(p * evidence, MODEL_MAX_CONFIDENCE) for d, p in model_dist.items()}
+            method = "model"
+        elif keyword_dist:
+            # Keyword-only confidence also scales with how many hits we saw
+            hit_strength = min(1.0, len(self._keyword_pattern.findall(text.lower())) / 2)
+            combined = {d: p * hit_strength for d, p in keyword_dist.items()}
+            method = "keywords"
+        else:
+            return {
+                "domain": self.default_domain,
+                "confidence": 0.0,
+                "confident": False,
+                "method": "none",
+            }
+
+        domain = max(combined, key=combined.get)
+        confidence = round(combined[domain], 3)
+        confident = confidence >= LOCAL_CONFIDENCE_THRESHOLD
+        if model_dist:
+            keywords_agree = bool(keyword_dist) and max(keyword_dist, key=keyword_dist.get) == domain
+            confident = confident and (keywords_agree or known >= MODEL_MIN_KNOWN_TOKENS)
+        return {
+            "domain": domain,
+            "confidence": confidence,
+            "confident": confident,
+            "method": method,
+        }
+
+    def sample_for_label(self) -> bool:
+        """Whether to send a confident prompt to the LLM anyway, for a training label"""
+        if random.random() >= LLM_LABEL_SAMPLE_RATE:
+            return False
+        self.stats["label_samples"] += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    def observe(self, text: str, domain: str):
+        """Add one labelled example to the online model"""
+        if domain not in self.domains:
+            return
+        tokens = _tokenize((text or "")[:2000])
+        self._class_counts[domain] += 1
+        self._training_samples += 1
+        for token in tokens:
+            self._token_counts[domain][token] += 1
+            self._vocabulary.add(token)
+        self._class_token_totals[domain] += len(tokens)
+        self.stats["trained_samples"] = self._training_samples
+
+    async def ensure_loaded(self, db) -> None:
+        """Replay logged LLM classifications into the model (once per process)"""
+        if self._loaded or db is None:
+            return
+        self._loaded = True
+        try:
+            examples = await db[TRAINING_LOG_COLLECTION].find(
+                {}, {"_id": 0, "text": 1, "domain": 1}
+            ).sort("created_at", -1).to_list(TRAINING_LOG_LIMIT)
+            for example in examples:
+                self.observe(example.get("text", ""), example.get("domain", ""))
+            logger.info(f"Domain classifier trained on {len(examples)} logged classifications")
+        except Exception as e:
+            logger.warning(f"Could not load domain classification log: {e}")
+
+    async def record_llm_classification(self, db, text: str, domain: str) -> None:
+        """Learn from an LLM classification and log it for future restarts"""
+        self.observe(text, domain)
+        if db is None:
+            return
+        try:
+            now = datetime.now(timezone.utc)
+            await db[TRAINING_LOG_COLLECTION].insert_one({
+                "text": (text or "")[:2000],
+                "domain": domain,
+                "created_at": now.isoformat(),
+                "expires_at": now + timedelta(days=TRAINING_LOG_TTL_DAYS),  # TTL index
+            })
+        except Exception as e:
+            logger.warning(f"Failed to log domain classification: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Shortcut statistics for monitoring"""
+        total = self.stats["local_hits"] + self.stats["llm_fallbacks"]
+        return {
+            **self.stats,
+            "local_hit_rate": round(self.stats["local_hits"] / total, 3) if total else 0.0,
+            "threshold": LOCAL_CONFIDENCE_THRESHOLD,
+        }
+
+
+# Global instance
+_domain_classifier: Optional[DomainClassifier] = None
+
+
+def get_domain_classifier(domain_categories: Optional[Dict[str, Dict[str, Any]]] = None) -> DomainClassifier:
+    """Get or create the domain classifier singleton"""
+    global _domain_classifier
+    if _domain_classifier is None:
+        if domain_categories is None:
+            raise RuntimeError("Domain classifier not initialized - pass domain_categories on first use")
+        _domain_classifier = DomainClassifier(domain_categories)
+    return _domain_classifier
@@ -0,0 +1,210 @@
+"""
+Embedding Cache Service
+
+Persistent content-hash -> embedding store for knowledge base chunks.
+
+Re-uploading a revised document, or the same document into several tiers
+(user, company, profile), used to re-embed every chunk through Chroma's
+embedding function. Chunks are now embedded once per distinct text and
+the vectors are passed to collection.add directly.
+
+Storage (one directory per embedding model):
+- vectors.f32: float32 matrix, one row per chunk, read via np.memmap
+- index.txt: append-only "<sha256> <row>" lines
+- meta.json: model name and dimension
+
+Appends take an exclusive file lock, so several workers can share the
+store; each reader picks up rows written by others on its next miss. A
+crash mid-append leaves a partial row or index line; the next append
+truncates it before writing.
+
+Entries are never evicted. The store stops accepting new vectors at
+EMBEDDING_CACHE_MAX_ENTRIES (about 1.5 GB at 384 dims for the default
+1M); delete the model's directory to reset it.
+
+Usage:
+    from services.embedding_cache_service import get_embedding_cache
+
+    embeddings = get_embedding_cache().embed(chunks, embedding_function)
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_DIR = Path(__file__).parent.parent / "data" / "embedding_cache"
+EMBEDDING_CACHE_ENABLED = os.environ.get("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", "1000000"))
+
+
+def content_hash(text: str) -> str:
+    """Cache key for a chunk's text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """Memory-mapped float32 matrix plus an append-only hash index."""
+
+    def __init__(self, directory: Path, model: str, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.model = model
+        self.max_entries = max_entries
+        self._vectors_path = self.directory / "vectors.f32"
+        self._index_path = self.directory / "index.txt"
+        self._meta_path = self.directory / "meta.json"
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._index_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self.dim: Optional[int] = None
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "skipped_full": 0}
+
+        self._load_index()
+
+    def _load_index(self):
+        """Read index lines appended since the last load (ours or other workers')."""
+        if self.dim is None and self._meta_path.exists():
+            self.dim = json.loads(self._meta_path.read_text()).get("dim")
+        if not self._index_path.exists():
+            return
+        with open(self._index_path, "r") as f:
+            f.seek(self._index_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # Partially written by another worker
+                key, row = line.split()
+                self._rows[key] = int(row)
+                self._index_offset += len(line)
+
+    def _row_count(self) -> int:
+        if self.dim is None or not self._vectors_path.exists():
+            return 0
+        return self._vectors_path.stat().st_size // (self.dim * 4)
+
+    def _truncate_partial_writes(self) -> int:
+        """
+        Drop a partial trailing row/index line left by a crashed writer and
+        return the next row. Call with the file lock held, after _load_index.
+        """
+        if self._index_path.exists() and self._index_path.stat().st_size > self._index_offset:
+            os.truncate(self._index_path, self._index_offset)
+        rows = self._row_count()
+        if self._vectors_path.exists() and self._vectors_path.stat().st_size != rows * self.dim * 4:
+            logger.warning(f"Embedding cache {self.directory.name}: dropping partial row after row {rows}")
+            os.truncate(self._vectors_path, rows * self.dim * 4)
+        return rows
+
+    def _vector(self, row: int) -> np.ndarray:
+        if self._matrix is None or row >= self._matrix.shape[0]:
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(self._row_count(), self.dim)
+            )
+        return self._matrix[row]
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for the keys that are present"""
+        with self._lock:
+            if any(key not in self._rows for key in keys):
+                self._load_index()
+            found = {key: np.array(self._vector(self._rows[key])) for key in keys if key in self._rows}
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(set(keys)) - len(found)
+            return found
+
+    def put_many(self, vectors: Dict[str, Sequence[float]]):
+        """Append new vectors (keys already stored are skipped)"""
+        if not vectors:
+            return
+        matrix = np.asarray(list(vectors.values()), dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self._meta_path.write_text(json.dumps({"model": self.model, "dim": self.dim}))
+            elif matrix.shape[1] != self.dim:
+                logger.warning(
+                    f"Embedding cache dimension mismatch ({matrix.shape[1]} != {self.dim}), not caching"
+                )
+                return
+
+            with open(self._index_path, "a") as index:
+                fcntl.flock(index, fcntl.LOCK_EX)
+                try:
+                    self._load_index()
+                    new_keys = [k for k in vectors if k not in self._rows]
+                    room = max(self.max_entries - len(self._rows), 0)
+                    if len(new_keys) > room:
+                        if not self.stats["skipped_full"]:
+                            logger.warning(
+                                f"Embedding cache {self.directory.name} full ({self.max_entries} entries), not caching"
+                            )
+                        self.stats["skipped_full"] += len(new_keys) - room
+                        new_keys = new_keys[:room]
+                    if not new_keys:
+                        return
+                    new_key_set = set(new_keys)
+                    keep = [i for i, k in enumerate(vectors) if k in new_key_set]
+                    first_row = self._truncate_partial_writes()
+                    with open(self._vectors_path, "ab") as f:
+                        f.write(matrix[keep].tobytes())
+                    lines = "".join(f"{key} {first_row + i}\n" for i, key in enumerate(new_keys))
+                    index.write(lines)
+                    index.flush()
+                    for i, key in enumerate(new_keys):
+                        self._rows[key] = first_row + i
+                    self._index_offset += len(lines)
+                    self.stats["stored"] += len(new_keys)
+                finally:
+                    fcntl.flock(index, fcntl.LOCK_UN)
+
+    def embed(self, texts: List[str], embedding_function: Callable[[List[str]], Any]) -> List[List[float]]:
+        """
+        Embeddings for texts, computing only the ones not cached.
+
+        Duplicate texts within the batch are embedded once.
+        """
+        keys = [content_hash(text) for text in texts]
+        cached = self.get_many(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            computed = embedding_function(list(missing.values()))
+            fresh = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(missing, computed)}
+            self.put_many(fresh)
+            cached.update(fresh)
+
+        return [cached[key].tolist() for key in keys]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and store size"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "model": self.model,
+            "dim": self.dim,
+            "entries": len(self._rows),
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+_embedding_caches: Dict[str, EmbeddingStore] = {}
+
+
+def get_embedding_cache(model: str = "default") -> EmbeddingStore:
+    """Get or create the embedding store for a model"""
+    if model not in _embedding_caches:
+        _embedding_caches[model] = EmbeddingStore(EMBEDDING_CACHE_DIR / model, model)
+    return _embedding_caches[model]
@@ -17,11 +17,19 @@ The agent uses three models working together:
 1. Classifier (gpt-4.1-nano): Quick classification of content type
 2. Compliance Analyst (gpt-4.1-mini): Deep employment law analysis
 3. Validator (gemini-2.5-flash): Cross-verification and final assessment
+
+Shortcuts that avoid LLM calls (counted in get_stats()):
+- Result cache keyed by a hash of the content and company policies
+- Local keyword pre-filter: content with no employment signals skips the pipeline
+- "fast" validation mode: skips validation when the compliance pass is highly
+  confident and found nothing worse than moderate
 """
 
+import hashlib
 import logging
 import json
 import os
+import re
 import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
@@ -31,6 +39,46 @@ from services.token_tracking_service import AgentType
 
 logger = logging.getLogger(__name__)
 
+# Analysis results are reused for identical content + policies
+RESULT_CACHE_TTL_SECONDS = 24 * 3600
+RESULT_CACHE_MAX_SIZE = 1000
+
+# "full" validates every analysis with violations, "fast" skips validation
+# for high-confidence analyses with no severe findings
+VALIDATION_MODE = os.environ.get("EMPLOYMENT_LAW_VALIDATION_MODE", "full")
+FAST_MODE_MIN_CONFIDENCE = 0.85
+FAST_MODE_MAX_SEVERITIES = {"low", "moderate", "none"}
+
+# Any of these means the content may be workplace/employment related
+EMPLOYMENT_SIGNALS = [
+    # Hiring and roles
+    "hiring", "hire", "hired", "recruit", "recruiting", "recruiter", "job", "jobs",
+    "position", "role", "vacancy", "opening", "apply", "applicant", "candidate",
+    "interview", "resume", "cv", "career", "careers", "internship", "intern",
+    "qualifications", "requirements", "experience required", "salary", "compensation",
+    "benefits", "full-time", "part-time", "contract", "remote", "onboarding",
+    # People and workplace
+    "employee", "employees", "employer", "staff", "team", "teammate", "colleague",
+    "coworker", "co-worker", "manager", "boss", "workplace", "office", "company culture",
+    "culture", "work", "working", "promotion", "promoted", "award", "recognition",
+    "shout-out", "shoutout", "congratulations", "welcome aboard", "join us", "join our",
+    "hr", "human resources", "workforce", "shift", "department",
+    # Known risk phrases (see _analyze_compliance examples)
+    "recent grad", "digital native", "gen z", "young and energetic", "rockstar",
+    "ninja", "manpower", "brother-in-arms", "sweetheart", "happy hour", "happy hours",
+    "work hard, play hard", "work family", "high-stress", "own car",
+]
+
+_SIGNAL_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(term) for term in EMPLOYMENT_SIGNALS) + r")\b",
+    re.IGNORECASE
+)
+
+
+def has_employment_signals(content: str) -> bool:
+    """Local pre-filter: True if content mentions anything employment related."""
+    return bool(_SIGNAL_PATTERN.search(content or ""))
+
 
 class EmploymentLawAgent:
     """
@@ -40,11 +88,23 @@ class EmploymentLawAgent:
     single models might miss due to their tendency to interpret language positively.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, validation_mode: Optional[str] = None):
         """Initialize the agent with API key."""
         self.api_key = api_key or os.environ.get('EMERGENT_LLM_KEY')
         if not self.api_key:
             logger.warning("No API key provided for EmploymentLawAgent")
+        self.validation_mode = validation_mode or VALIDATION_MODE
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._timestamps: Dict[str, datetime] = {}
+        self.stats = {
+            "analyses": 0,
+            "cache_hits": 0,
+            "prefilter_skips": 0,
+            "classifier_skips": 0,
+            "validations_run": 0,
+            "validation_skips_no_violations": 0,
+            "validation_skips_fast_mode": 0,
+        }
     
     async def analyze_content(
         self,
@@ -66,12 +126,30 @@ class EmploymentLawAgent:
         if not self.api_key:
             return self._empty_result("API key not configured")
         
+        self.stats["analyses"] += 1
+        
+        cache_key = self._cache_key(content, company_policies)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+        
+        # Step 0: Local pre-filter - no employment signals, no LLM calls
+        if not has_employment_signals(content):
+            self.stats["prefilter_skips"] += 1
+            result = self._empty_result("Content is not workplace/employment related")
+            self._set_cached(cache_key, result)
+            return result
+        
         try:
             # Step 1: Classify content type with fast model
             classification = await self._classify_content(content)
             
             if not classification.get("is_workplace_content", False):
-                return self._empty_result("Content is not workplace/employment related")
+                self.stats["classifier_skips"] += 1
+                result = self._empty_result("Content is not workplace/employment related")
+                self._set_cached(cache_key, result)
+                return result
             
             # Step 2: Deep compliance analysis with primary model
             compliance_analysis = await self._analyze_compliance(
@@ -80,21 +158,91 @@ class EmploymentLawAgent:
                 company_policies=company_policies
             )
             
+            if compliance_analysis.get("analysis_type") == "skipped":
+                # Analysis failed - don't cache, the next attempt may succeed
+                return compliance_analysis
+            
             # Step 3: Cross-validate with secondary model if violations found
-            if compliance_analysis.get("violations_detected", False):
-                validated_analysis = await self._validate_analysis(
+            if not compliance_analysis.get("violations_detected", False):
+                self.stats["validation_skips_no_violations"] += 1
+                result = compliance_analysis
+            elif self._can_skip_validation(compliance_analysis):
+                self.stats["validation_skips_fast_mode"] += 1
+                compliance_analysis["validation_status"] = "skipped_high_confidence"
+                result = compliance_analysis
+            else:
+                self.stats["validations_run"] += 1
+                result = await self._validate_analysis(
                     content=content,
                     initial_analysis=compliance_analysis,
                     company_policies=company_policies
                 )
-                return validated_analysis
+                if result.get("validation_status") == "validation_failed":
+                    return result
             
-            return compliance_analysis
+            self._set_cached(cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Employment law analysis error: {str(e)}")
             return self._empty_result(f"Analysis error: {str(e)}")
     
+    def _can_skip_validation(self, analysis: Dict[str, Any]) -> bool:
+        """Fast mode: trust confident analyses whose findings are all moderate or lower."""
+        if self.validation_mode != "fast":
+            return False
+        try:
+            confidence = float(analysis.get("confidence", 0))
+        except (TypeError, ValueError):
+            return False
+        if confidence < FAST_MODE_MIN_CONFIDENCE:
+            return False
+        severities = {analysis.get("severity", "none")}
+        severities.update(v.get("severity", "none") for v in analysis.get("violations", []))
+        return severities <= FAST_MODE_MAX_SEVERITIES
+    
+    def _cache_key(self, content: str, company_policies: Optional[str]) -> str:
+        """Hash of everything the analysis depends on."""
+        digest = hashlib.sha256()
+        for part in (content or "", company_policies or "", self.validation_mode):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+    
+    def _get_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        if key not in self._cache:
+            return None
+        age = (datetime.now(timezone.utc) - self._timestamps[key]).total_seconds()
+        if age > RESULT_CACHE_TTL_SECONDS:
+            del self._cache[key]
+            del self._timestamps[key]
+            return None
+        return json.loads(json.dumps(self._cache[key]))
+    
+    def _set_cached(self, key: str, result: Dict[str, Any]) -> None:
+        if len(self._cache) >= RESULT_CACHE_MAX_SIZE and key not in self._cache:
+            oldest_key = min(self._timestamps, key=self._timestamps.get)
+            del self._cache[oldest_key]
+            del self._timestamps[oldest_key]
+        # Store a copy so callers can't mutate the cached result
+        self._cache[key] = json.loads(json.dumps(result))
+        self._timestamps[key] = datetime.now(timezone.utc)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """How often each shortcut avoided LLM calls."""
+        analyses = self.stats["analyses"]
+        shortcuts = ("cache_hits", "prefilter_skips", "classifier_skips",
+                     "validation_skips_no_violations", "validation_skips_fast_mode")
+        return {
+            "validation_mode": self.validation_mode,
+            "cache_size": len(self._cache),
+            **self.stats,
+            "rates": {
+                name: round(self.stats[name] / analyses, 4) if analyses else 0.0
+                for name in shortcuts
+            }
+        }
+    
     async def _classify_content(self, content: str) -> Dict[str, Any]:
         """
         Quick classification of content type using gpt-4.1-nano.
@@ -281,7 +429,8 @@ Provide your analysis as JSON:
   ],
   "summary": "Overall summary of compliance issues found",
   "rewrite_suggestions": ["list of specific rewrites for problematic phrases"],
-  "positive_elements": ["any compliant/positive aspects of the content"]
+  "positive_elements": ["any compliant/positive aspects of the content"],
+  "confidence": 0.0-1.0 (how certain you are that this assessment is complete and correct)
 }}
 
 IMPORTANT:
@@ -329,6 +478,7 @@ IMPORTANT:
             result.setdefault("summary", "No violations detected.")
             result.setdefault("rewrite_suggestions", [])
             result.setdefault("positive_elements", [])
+            result.setdefault("confidence", 0.5)
             result["model_used"] = "gpt-4.1-mini"
             result["analysis_type"] = "primary_compliance"
             
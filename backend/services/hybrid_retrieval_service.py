@@ -0,0 +1,168 @@
+"""
+Hybrid Retrieval Service
+
+Lexical (BM25) retrieval and rank fusion for knowledge base RAG.
+
+Pure vector similarity misses exact policy terms ("HIPAA", product names,
+clause numbers) and needs a larger n_results to compensate. Each
+collection gets an in-memory BM25 inverted index; its ranking is fused
+with Chroma's vector ranking by reciprocal rank fusion (RRF), and the fused
+candidates can optionally be reranked by a local cross-encoder.
+
+Features:
+- BM25Index: incremental add/remove; holds postings and lengths only (chunk
+  text stays in Chroma)
+- reciprocal_rank_fusion(): merges any number of rankings by id
+- Optional CPU cross-encoder rerank (sentence-transformers), enabled with
+  KB_RERANK_ENABLED=true
+
+Usage:
+    from services.hybrid_retrieval_service import BM25Index, reciprocal_rank_fusion
+
+    index = BM25Index()
+    index.add(ids, documents)
+    fused = reciprocal_rank_fusion([vector_ids, [i for i, _ in index.search(query, 10)]])
+"""
+
+import logging
+import math
+import os
+import re
+import sys
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# RRF constant - dampens the weight of top ranks (60 is the usual choice)
+RRF_K = 60
+
+KB_RERANK_ENABLED = os.environ.get("KB_RERANK_ENABLED", "false").lower() == "true"
+KB_RERANK_MODEL = os.environ.get("KB_RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords"""
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over one collection's chunks.
+    
+    Only postings, lengths and each chunk's distinct terms (interned, for
+    removal) are kept - callers fetch chunk text from the collection by id.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, ids: Sequence[str], documents: Sequence[str]):
+        """Index chunks (re-adding an id replaces it)"""
+        for chunk_id, document in zip(ids, documents):
+            if chunk_id in self._lengths:
+                self.remove([chunk_id])
+            terms = Counter(sys.intern(t) for t in tokenize(document))
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[chunk_id] = tf
+            length = sum(terms.values())
+            self._lengths[chunk_id] = length
+            self._total_length += length
+            self._terms[chunk_id] = tuple(terms)
+
+    def remove(self, ids: Sequence[str]):
+        """Drop chunks from the index"""
+        for chunk_id in ids:
+            if chunk_id not in self._lengths:
+                continue
+            for term in self._terms.pop(chunk_id):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(chunk_id, None)
+                    if not postings:
+                        del self._postings[term]
+            self._total_length -= self._lengths.pop(chunk_id)
+
+    def search(self, query: str, n_results: int) -> List[Tuple[str, float]]:
+        """Top chunks by BM25 score as (id, score), best first"""
+        n_docs = len(self._lengths)
+        if n_docs == 0:
+            return []
+        avg_length = self._total_length / n_docs or 1.0
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for chunk_id, tf in postings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[chunk_id] / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:n_results]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = RRF_K) -> List[Tuple[str, float]]:
+    """
+    Fuse rankings of ids: score = sum of 1 / (k + rank) over the rankings
+    an id appears in. Returns (id, score) best first.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, 1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class CrossEncoderReranker:
+    """Scores (query, chunk) pairs with a local cross-encoder model."""
+
+    def __init__(self, model_name: str = KB_RERANK_MODEL):
+        from sentence_transformers import CrossEncoder
+        self.model_name = model_name
+        self.model = CrossEncoder(model_name, device="cpu")
+
+    def rerank(self, query: str, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Chunks ordered by cross-encoder relevance (adds "rerank_score")"""
+        if not chunks:
+            return chunks
+        scores = self.model.predict([(query, chunk["content"]) for chunk in chunks])
+        for chunk, score in zip(chunks, scores):
+            chunk["rerank_score"] = float(score)
+        return sorted(chunks, key=lambda c: c["rerank_score"], reverse=True)
+
+
+_reranker: Optional[CrossEncoderReranker] = None
+_reranker_unavailable = False
+
+
+def get_reranker() -> Optional[CrossEncoderReranker]:
+    """Get the cross-encoder reranker, or None when disabled/unavailable"""
+    global _reranker, _reranker_unavailable
+    if not KB_RERANK_ENABLED or _reranker_unavailable:
+        return None
+    if _reranker is None:
+        try:
+            _reranker = CrossEncoderReranker()
+        except Exception as e:
+            logger.warning(f"Cross-encoder reranker unavailable: {str(e)}")
+            _reranker_unavailable = True
+            return None
+    return _reranker
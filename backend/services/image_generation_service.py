@@ -6,6 +6,10 @@ Model Selection:
 - OpenAI gpt-image-1: For photorealistic, complex, and high-quality images
 - Gemini Imagen (gemini-2.5-flash-image-preview): For creative, stylized, and artistic images
 
+Routing:
+- Requests go to the fastest healthy provider (latency_router_service);
+  OpenAI and Gemini fall back to each other when a provider fails
+
 Cost Tracking:
 - OpenAI gpt-image-1: ~$0.04 per image (1024x1024)
 - Gemini Imagen: ~$0.02 per image
@@ -22,6 +26,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from services.latency_router_service import Route, get_latency_router
+
 logger = logging.getLogger(__name__)
 
 
@@ -234,68 +240,35 @@ class ImageGenerationService:
             
             logger.info(f"Image generation - User style: {user_style}, Detected: {detected_style.value}, Provider: {selected_provider}, Model: {selected_model}")
             
-            # Generate image based on provider with retry and fallback
-            # Implements exponential backoff for rate limiting
+            # Generate image on the fastest healthy provider, retrying with
+            # exponential backoff for rate limiting
             import asyncio
             max_retries = 2
             
-            if selected_provider == "openai":
-                for attempt in range(max_retries + 1):
-                    try:
-                        image_base64, mime_type = await self._generate_openai(prompt, size)
-                        break
-                    except Exception as openai_error:
-                        if attempt < max_retries:
-                            wait_time = (attempt + 1) * 1.5  # 1.5s, 3s backoff
-                            logger.warning(f"OpenAI attempt {attempt + 1} failed, retrying in {wait_time}s: {str(openai_error)[:50]}")
-                            await asyncio.sleep(wait_time)
-                        else:
-                            raise openai_error
-            elif selected_provider in ["gemini_flash", "nano_banana"]:
-                # Both use Gemini API but with different quality expectations
-                gemini_success = False
-                gemini_error_msg = None
-                
-                for attempt in range(max_retries + 1):
-                    try:
-                        # Use Nano Banana enhanced prompt for high-quality styles
-                        enhanced_prompt = prompt
-                        if selected_provider == "nano_banana":
-                            # Add quality enhancement hints for Nano Banana
-                            enhanced_prompt = f"High-quality, detailed image: {prompt}"
-                        
-                        image_base64, mime_type = await self._generate_gemini(enhanced_prompt)
-                        gemini_success = True
-                        break
-                    except Exception as gemini_error:
-                        gemini_error_msg = str(gemini_error)[:100]
-                        if attempt < max_retries:
-                            wait_time = (attempt + 1) * 1.5  # 1.5s, 3s backoff
-                            logger.warning(f"{selected_provider} attempt {attempt + 1} failed, retrying in {wait_time}s: {gemini_error_msg}")
-                            await asyncio.sleep(wait_time)
-                
-                # Fallback to OpenAI if Gemini failed after all retries
-                if not gemini_success:
-                    logger.warning(f"{selected_provider} image generation failed after {max_retries + 1} attempts, falling back to OpenAI: {gemini_error_msg}")
-                    selected_provider = "openai"
-                    selected_model = IMAGE_MODEL_CONFIG["openai"]["model"]
-                    justification = f"Fallback to OpenAI after {selected_provider} failure: {gemini_error_msg[:50] if gemini_error_msg else 'Unknown error'}"
-                    
-                    # Try OpenAI with retry as well
-                    for attempt in range(max_retries + 1):
-                        try:
-                            image_base64, mime_type = await self._generate_openai(prompt, size)
-                            break
-                        except Exception as openai_error:
-                            if attempt < max_retries:
-                                wait_time = (attempt + 1) * 1.5
-                                logger.warning(f"OpenAI fallback attempt {attempt + 1} failed, retrying in {wait_time}s: {str(openai_error)[:50]}")
-                                await asyncio.sleep(wait_time)
-                            else:
-                                raise openai_error
-            else:
-                # Legacy fallback for any other provider - use Gemini
-                image_base64, mime_type = await self._generate_gemini(prompt)
+            routes = self._build_routes(selected_provider, prompt, size)
+            # An explicit provider keeps its place; otherwise order by latency
+            adaptive = provider is None
+            
+            for attempt in range(max_retries + 1):
+                try:
+                    result = await get_latency_router().execute(routes, adaptive=adaptive)
+                    break
+                except Exception as route_error:
+                    if attempt < max_retries:
+                        wait_time = (attempt + 1) * 1.5  # 1.5s, 3s backoff
+                        logger.warning(f"Image generation attempt {attempt + 1} failed, retrying in {wait_time}s: {str(route_error)[:100]}")
+                        await asyncio.sleep(wait_time)
+                    else:
+                        raise route_error
+            
+            image_base64, mime_type = result.value
+            if result.route != selected_provider:
+                justification = (
+                    f"Routed to {result.route} instead of {selected_provider} "
+                    f"({'fallback' if len(result.attempts) > 1 else 'lower latency'})"
+                )
+                selected_provider = result.route
+                selected_model = IMAGE_MODEL_CONFIG[selected_provider]["model"]
             
             # Calculate cost - handle legacy provider names
             if selected_provider in IMAGE_MODEL_CONFIG:
@@ -338,6 +311,33 @@ class ImageGenerationService:
                 "model": selected_model if 'selected_model' in locals() else None
             }
     
+    def _build_routes(self, selected_provider: str, prompt: str, size: str) -> List[Route]:
+        """
+        Build the latency router routes for a request.
+        
+        Gemini-family providers (gemini_flash, nano_banana) share one circuit
+        since both call the same model; the other provider is the fallback.
+        """
+        def openai_route() -> Route:
+            return Route("openai", "image_generation:openai", lambda: self._generate_openai(prompt, size))
+        
+        if selected_provider == "openai":
+            return [openai_route(), Route("nano_banana", "image_generation:gemini", lambda: self._generate_gemini(prompt))]
+        
+        if selected_provider not in IMAGE_MODEL_CONFIG:
+            # Legacy provider names - use Gemini
+            selected_provider = "nano_banana"
+        
+        gemini_prompt = prompt
+        if selected_provider == "nano_banana":
+            # Add quality enhancement hints for Nano Banana
+            gemini_prompt = f"High-quality, detailed image: {prompt}"
+        
+        return [
+            Route(selected_provider, "image_generation:gemini", lambda: self._generate_gemini(gemini_prompt)),
+            openai_route(),
+        ]
+    
     async def _generate_openai(self, prompt: str, size: str = "1024x1024") -> Tuple[str, str]:
         """Generate image using OpenAI gpt-image-1"""
         from emergentintegrations.llm.openai.image_generation import OpenAIImageGeneration
@@ -0,0 +1,143 @@
+"""
+Ingestion Pool Service
+
+Runs CPU-bound document parsing (PDF/DOCX/XLSX/PPTX extraction and
+chunking) in a pool of worker processes, so bulk onboarding of policy
+libraries doesn't hold the GIL in the API worker and degrade request
+latency.
+
+Features:
+- Process pool sized by KB_INGEST_PROCESSES (0 runs jobs on a thread instead)
+- Concurrency cap: at most KB_INGEST_PROCESSES documents parse at once,
+  the rest wait in FIFO order and show up as "queued" in get_stats()
+- Per-operation counts, errors, queue wait and run time
+- A crashed worker rebuilds the pool; the affected job reruns on a thread
+
+Functions submitted to the pool must be module-level (picklable) and take
+picklable arguments.
+
+Usage:
+    from services.ingestion_pool_service import get_ingestion_pool
+
+    result = await get_ingestion_pool().run("extract", extract_fn, file_path)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+KB_INGEST_PROCESSES = int(os.environ.get("KB_INGEST_PROCESSES", "2"))
+
+
+class IngestionPool:
+    """Bounded process pool for document parsing."""
+
+    def __init__(self, max_workers: int = KB_INGEST_PROCESSES):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+        self._pending = 0
+        self._running = 0
+        self._operations: Dict[str, Dict[str, float]] = {}
+        self.stats = {"pool_restarts": 0, "thread_fallbacks": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: the API process runs threads (Motor, Chroma executor) that
+            # a forked child must not inherit mid-operation
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _record(self, operation: str, wait_ms: float, run_ms: float, failed: bool):
+        op = self._operations.setdefault(operation, {
+            "calls": 0, "errors": 0, "total_run_ms": 0.0, "max_run_ms": 0.0, "total_wait_ms": 0.0
+        })
+        op["calls"] += 1
+        op["errors"] += int(failed)
+        op["total_run_ms"] += run_ms
+        op["max_run_ms"] = max(op["max_run_ms"], run_ms)
+        op["total_wait_ms"] += wait_ms
+
+    async def _submit(self, fn: Callable[..., Any], *args) -> Any:
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            logger.warning("Ingestion worker process died, restarting pool")
+            self._executor = None
+            self.stats["pool_restarts"] += 1
+            self.stats["thread_fallbacks"] += 1
+            return await asyncio.to_thread(fn, *args)
+
+    async def run(self, operation: str, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(*args) in a worker process once a slot is free"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(max(1, self.max_workers))
+            self._semaphore_loop = loop
+
+        submitted = time.perf_counter()
+        started = submitted
+        failed = False
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                self._running += 1
+                try:
+                    return await self._submit(fn, *args)
+                finally:
+                    self._running -= 1
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._pending -= 1
+            finished = time.perf_counter()
+            self._record(operation, (started - submitted) * 1000, (finished - started) * 1000, failed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool utilisation and per-operation timings"""
+        operations = {}
+        for name, op in self._operations.items():
+            calls = op["calls"] or 1
+            operations[name] = {
+                "calls": int(op["calls"]),
+                "errors": int(op["errors"]),
+                "avg_run_ms": round(op["total_run_ms"] / calls, 2),
+                "max_run_ms": round(op["max_run_ms"], 2),
+                "avg_wait_ms": round(op["total_wait_ms"] / calls, 2),
+            }
+        return {
+            "max_workers": self.max_workers,
+            "mode": "process" if self.max_workers > 0 else "thread",
+            "running": self._running,
+            "queued": max(0, self._pending - self._running),
+            **self.stats,
+            "operations": operations,
+        }
+
+
+_ingestion_pool: Optional[IngestionPool] = None
+
+
+def get_ingestion_pool() -> IngestionPool:
+    """Get or create the ingestion pool singleton"""
+    global _ingestion_pool
+    if _ingestion_pool is None:
+        _ingestion_pool = IngestionPool()
+    return _ingestion_pool
@@ -44,6 +44,7 @@ class TaskType(str, Enum):
     """Available task types"""
     CONTENT_ANALYSIS = "content_analysis"
     CONTENT_GENERATION = "content_generation"
+    CONTENT_REPURPOSE = "content_repurpose"
     IMAGE_GENERATION = "image_generation"
     SOCIAL_POSTING = "social_posting"
     MEDIA_ANALYSIS = "media_analysis"
@@ -6,11 +6,20 @@ Handles document processing, chunking, embedding, and RAG queries using ChromaDB
 import os
 import logging
 import asyncio
-from typing import List, Dict, Optional, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import uuid4
 from datetime import datetime, timezone
 from pathlib import Path
 import hashlib
+import re
+import zlib
+import json
+import tempfile
+from itertools import islice
 
 # Document processing
 from PyPDF2 import PdfReader
@@ -22,25 +31,202 @@ from pptx import Presentation
 import chromadb
 from chromadb.config import Settings
 
+from services.compliance_cache_service import invalidate_compliance_cache
+from services.rag_context_cache_service import get_rag_context_cache, invalidate_rag_context
+from services.embedding_cache_service import EMBEDDING_CACHE_ENABLED, content_hash, get_embedding_cache
+from services.ingestion_pool_service import get_ingestion_pool
+from services.hybrid_retrieval_service import BM25Index, get_reranker, reciprocal_rank_fusion
+from services.context_packing_service import get_context_token_budget, pack_chunks
+
 logger = logging.getLogger(__name__)
 
 # Configuration
 CHUNK_SIZE = 500  # characters per chunk
 CHUNK_OVERLAP = 50  # overlap between chunks
+# Content-defined chunk boundaries: sentence ends are ranked by a hash of
+# the CHUNK_ANCHOR_WINDOW chars before them
+CHUNK_ANCHOR_WINDOW = 64
+SENTENCE_END = re.compile(r"[.!?](?= )")
+# Chunks embedded and stored per batch while a document streams in, so
+# memory stays bounded regardless of document size
+INGEST_BATCH_CHUNKS = int(os.environ.get("KB_INGEST_BATCH_CHUNKS", "64"))
 UPLOADS_DIR = Path(__file__).parent.parent / "uploads" / "knowledge_base"
 CHROMADB_DIR = Path(__file__).parent.parent / "data" / "chromadb"
 
+# ChromaDB calls are synchronous (embedding + HNSW search); they run on a
+# dedicated thread pool so they never block the event loop
+CHROMA_EXECUTOR_WORKERS = int(os.environ.get("CHROMA_EXECUTOR_WORKERS", "4"))
+
+# Cached collection sizes are re-counted after this long (other workers may write)
+COLLECTION_SIZE_TTL_SECONDS = 60
+
+# Collection handles kept open (LRU), and how many tenants to preload at startup
+COLLECTION_HANDLE_CACHE_SIZE = int(os.environ.get("CHROMA_COLLECTION_CACHE_SIZE", "256"))
+COLLECTION_WARMUP_LIMIT = int(os.environ.get("CHROMA_WARMUP_COLLECTIONS", "50"))
+
+# Hybrid retrieval: vector and BM25 candidates (n_results x multiplier
+# each) are fused by reciprocal rank fusion. BM25 indexes are built in the
+# background (a page of chunks at a time) and then kept current by ingestion;
+# they are only rebuilt when the collection's chunk count drifts from them
+KB_HYBRID_RETRIEVAL = os.environ.get("KB_HYBRID_RETRIEVAL", "true").lower() == "true"
+HYBRID_CANDIDATES_MULTIPLIER = 3
+BM25_BUILD_BATCH_CHUNKS = 1000
+
+# Tier priority - a chunk found in several tiers is kept in the first
+TIER_PRIORITY = ["company_universal", "company_professional", "user", "profile"]
+
+# Materialized knowledge summaries (knowledge_summaries collection): chunks
+# sampled per summary, and the running background refresh per "<tier>:<tier_id>"
+KNOWLEDGE_SUMMARY_MAX_CHUNKS = 10
+_summary_refreshes: Dict[str, asyncio.Task] = {}
+_summary_refresh_pending: set = set()
+
+# Running background BM25 index build per collection name
+_bm25_builds: Dict[str, asyncio.Task] = {}
+
 # Ensure directories exist
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 CHROMADB_DIR.mkdir(parents=True, exist_ok=True)
 
 
+class ChromaExecutor:
+    """
+    Bounded thread pool for blocking ChromaDB operations.
+    
+    Records per-operation call counts, errors, queue wait and run time so
+    slow ingestion or search shows up in get_stats().
+    """
+    
+    def __init__(self, max_workers: int = CHROMA_EXECUTOR_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chroma")
+        self._pending = 0
+        self._running = 0
+        self._operations: Dict[str, Dict[str, float]] = {}
+    
+    def _record(self, operation: str, wait_ms: float, run_ms: float, failed: bool):
+        op = self._operations.setdefault(operation, {
+            "calls": 0, "errors": 0, "total_run_ms": 0.0, "max_run_ms": 0.0, "total_wait_ms": 0.0
+        })
+        op["calls"] += 1
+        op["errors"] += int(failed)
+        op["total_run_ms"] += run_ms
+        op["max_run_ms"] = max(op["max_run_ms"], run_ms)
+        op["total_wait_ms"] += wait_ms
+    
+    async def run(self, operation: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on the pool and await its result"""
+        submitted = time.perf_counter()
+        timings: Dict[str, float] = {}
+        
+        def call():
+            timings["started"] = time.perf_counter()
+            self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._running -= 1
+                timings["finished"] = time.perf_counter()
+        
+        self._pending += 1
+        failed = False
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, call)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._pending -= 1
+            started = timings.get("started", submitted)
+            finished = timings.get("finished", started)
+            self._record(operation, (started - submitted) * 1000, (finished - started) * 1000, failed)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool utilisation and per-operation timings"""
+        operations = {}
+        for name, op in self._operations.items():
+            calls = op["calls"] or 1
+            operations[name] = {
+                "calls": int(op["calls"]),
+                "errors": int(op["errors"]),
+                "avg_run_ms": round(op["total_run_ms"] / calls, 2),
+                "max_run_ms": round(op["max_run_ms"], 2),
+                "avg_wait_ms": round(op["total_wait_ms"] / calls, 2),
+            }
+        return {
+            "max_workers": self.max_workers,
+            "running": self._running,
+            "queued": max(0, self._pending - self._running),
+            "operations": operations,
+        }
+
+
+_chroma_executor: Optional[ChromaExecutor] = None
+
+
+def get_chroma_executor() -> ChromaExecutor:
+    """Get or create the ChromaDB executor singleton"""
+    global _chroma_executor
+    if _chroma_executor is None:
+        _chroma_executor = ChromaExecutor()
+    return _chroma_executor
+
+
+async def _invalidate_compliance_for_tier(db, tier: str, tier_id: str, user_id: Optional[str] = None):
+    """Knowledge changes invalidate cached compliance requirements for the owning scope."""
+    if tier == "user":
+        user_id = tier_id
+    company_id = tier_id if tier.startswith("company") else None
+    await invalidate_compliance_cache(db, user_id=user_id, company_id=company_id)
+
+
+def extract_chunks_to_spool(file_path: str, spool_path: str) -> Tuple[int, int]:
+    """
+    Extract and chunk a document into a JSON-lines spool file.
+    
+    Runs in an ingestion pool worker process; only the parsing helpers of
+    KnowledgeBaseService are used (no ChromaDB client is opened).
+    
+    Returns:
+        (chunk_count, text_length)
+    """
+    parser = KnowledgeBaseService.__new__(KnowledgeBaseService)
+    stats = {"text_length": 0}
+    chunk_count = 0
+    first_chunk = ""
+    
+    with open(spool_path, "w", encoding="utf-8") as spool:
+        for chunk in parser._iter_chunks(parser._iter_text(file_path, stats)):
+            first_chunk = first_chunk or chunk
+            spool.write(json.dumps(chunk) + "\n")
+            chunk_count += 1
+    
+    # Anything over one chunk is well past the minimum
+    if chunk_count <= 1 and len(first_chunk) < 10:
+        raise ValueError("Document contains no extractable text")
+    
+    return chunk_count, stats["text_length"]
+
+
 class KnowledgeBaseService:
     """Service for managing knowledge base documents and RAG queries."""
     
     _instance = None
     _chroma_client = None
     _embedding_function = None
+    # Chunk count per collection name: (count, counted_at), kept current on
+    # add/delete and re-counted after a TTL to pick up other workers' writes
+    _collection_sizes: Dict[str, Any] = {}
+    # LRU of collection handles by name - get_or_create_collection is a
+    # metadata round trip into Chroma's SQLite, so handles are reused
+    _collection_handles: "OrderedDict[str, Any]" = OrderedDict()
+    _handles_lock = threading.Lock()
+    _handle_stats = {"hits": 0, "misses": 0, "evictions": 0}
+    # BM25 index per collection name: (BM25Index, chunk count it was built
+    # for), and the adds/removes a running build replays before publishing
+    _bm25_indexes: Dict[str, Any] = {}
+    _bm25_journals: Dict[str, List[Tuple[str, List[str], Optional[List[str]]]]] = {}
     
     def __init__(self, db=None):
         self.db = db
@@ -61,12 +247,308 @@ class KnowledgeBaseService:
         
         self.client = KnowledgeBaseService._chroma_client
     
+    def _get_embedding_function(self):
+        """Chroma's default embedding model (the one collections query with)."""
+        if KnowledgeBaseService._embedding_function is None:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+            KnowledgeBaseService._embedding_function = DefaultEmbeddingFunction()
+        return KnowledgeBaseService._embedding_function
+    
+    async def _embed_chunks(self, chunks: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embeddings for chunks via the content-hash cache.
+        
+        Returns None when the cache is disabled or fails, in which case
+        Chroma embeds the documents itself.
+        """
+        if not EMBEDDING_CACHE_ENABLED:
+            return None
+        embedding_function = self._get_embedding_function()
+        try:
+            cache = get_embedding_cache(embedding_function.name())
+            return await self._chroma("embed", cache.embed, chunks, embedding_function)
+        except Exception as e:
+            logger.warning(f"Embedding cache unavailable, letting ChromaDB embed: {str(e)}")
+            return None
+    
+    async def _chroma(self, operation: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking ChromaDB call on the dedicated executor."""
+        return await get_chroma_executor().run(operation, fn, *args, **kwargs)
+    
+    async def _collection(self, profile_id: str):
+        """Profile collection, resolved off the event loop unless already cached."""
+        handle = self._cached_handle(self._profile_collection_name(profile_id))
+        if handle is not None:
+            return handle
+        return await self._chroma("get_or_create_collection", self._get_collection, profile_id)
+    
+    async def _tiered_collection(self, tier: str, tier_id: str):
+        """Tier collection, resolved off the event loop unless already cached."""
+        handle = self._cached_handle(self._tiered_collection_name(tier, tier_id))
+        if handle is not None:
+            return handle
+        return await self._chroma("get_or_create_collection", self._get_tiered_collection, tier, tier_id)
+    
+    def _cached_handle(self, name: str):
+        """Cached collection handle, or None."""
+        with KnowledgeBaseService._handles_lock:
+            handle = KnowledgeBaseService._collection_handles.get(name)
+            if handle is not None:
+                KnowledgeBaseService._collection_handles.move_to_end(name)
+                KnowledgeBaseService._handle_stats["hits"] += 1
+            return handle
+    
+    def _open_collection(self, name: str, metadata: Dict[str, Any]):
+        """get_or_create_collection through the handle LRU (blocking)."""
+        handle = self._cached_handle(name)
+        if handle is not None:
+            return handle
+        
+        handle = self.client.get_or_create_collection(name=name, metadata=metadata)
+        with KnowledgeBaseService._handles_lock:
+            handles = KnowledgeBaseService._collection_handles
+            KnowledgeBaseService._handle_stats["misses"] += 1
+            handles[name] = handle
+            handles.move_to_end(name)
+            while len(handles) > COLLECTION_HANDLE_CACHE_SIZE:
+                evicted, _ = handles.popitem(last=False)
+                KnowledgeBaseService._collection_sizes.pop(evicted, None)
+                KnowledgeBaseService._bm25_indexes.pop(evicted, None)
+                KnowledgeBaseService._bm25_journals.pop(evicted, None)
+                KnowledgeBaseService._handle_stats["evictions"] += 1
+        return handle
+    
+    @staticmethod
+    def _profile_collection_name(profile_id: str) -> str:
+        return f"profile_{profile_id.replace('-', '_')}"
+    
+    @staticmethod
+    def _tiered_collection_name(tier: str, tier_id: str) -> str:
+        # Sanitize the tier_id for collection name
+        return f"{tier}_{tier_id.replace('-', '_')}"
+    
+    @classmethod
+    def get_collection_cache_stats(cls) -> Dict[str, Any]:
+        """Handle LRU and size cache statistics."""
+        with cls._handles_lock:
+            return {
+                "handles": len(cls._collection_handles),
+                "max_handles": COLLECTION_HANDLE_CACHE_SIZE,
+                "sizes_cached": len(cls._collection_sizes),
+                "bm25_indexes": len(cls._bm25_indexes),
+                **cls._handle_stats
+            }
+    
+    async def warmup_collections(self, limit: int = COLLECTION_WARMUP_LIMIT) -> int:
+        """
+        Preload handles and sizes for the most recently active knowledge bases.
+        
+        Activity is read from knowledge_documents (latest upload per tier
+        collection), so the first queries after a restart skip the
+        collection lookup and count.
+        
+        Returns:
+            Number of collections warmed
+        """
+        if self.db is None or limit <= 0:
+            return 0
+        
+        pipeline = [
+            {"$match": {"status": "processed"}},
+            {"$group": {
+                "_id": {"tier": "$tier", "tier_id": "$tier_id", "profile_id": "$profile_id"},
+                "last_upload": {"$max": "$created_at"}
+            }},
+            {"$sort": {"last_upload": -1}},
+            {"$limit": limit}
+        ]
+        
+        warmed = 0
+        async for group in self.db.knowledge_documents.aggregate(pipeline):
+            key = group["_id"]
+            try:
+                if key.get("tier") and key.get("tier_id"):
+                    collection = await self._tiered_collection(key["tier"], key["tier_id"])
+                elif key.get("profile_id"):
+                    collection = await self._collection(key["profile_id"])
+                else:
+                    continue
+                await self._collection_size(collection)
+                warmed += 1
+            except Exception as e:
+                logger.warning(f"Collection warmup failed for {key}: {str(e)}")
+        
+        logger.info(f"Warmed {warmed} knowledge base collections")
+        return warmed
+    
+    async def _collection_size(self, collection) -> int:
+        """Chunk count for a collection, counted on first use and then kept current."""
+        sizes = KnowledgeBaseService._collection_sizes
+        cached = sizes.get(collection.name)
+        if cached is None or time.monotonic() - cached[1] > COLLECTION_SIZE_TTL_SECONDS:
+            count = await self._chroma("count", collection.count)
+            sizes[collection.name] = (count, time.monotonic())
+            return count
+        return cached[0]
+    
+    def _adjust_collection_size(self, collection, delta: int):
+        """Track chunks added to / deleted from a collection."""
+        sizes = KnowledgeBaseService._collection_sizes
+        if collection.name in sizes:
+            count, counted_at = sizes[collection.name]
+            sizes[collection.name] = (max(0, count + delta), counted_at)
+    
+    def _bm25_index(self, collection, count: int) -> Optional[BM25Index]:
+        """
+        BM25 index for a collection, or None until its first build finishes.
+        
+        The index is built in the background on first use. If its size
+        drifts from the collection's chunk count (another worker wrote to
+        it), it is rebuilt in the background while it keeps serving.
+        """
+        cached = KnowledgeBaseService._bm25_indexes.get(collection.name)
+        if cached is None or (len(cached[0]) != count and cached[1] != count):
+            self._start_bm25_build(collection, count)
+        return cached[0] if cached else None
+    
+    def _start_bm25_build(self, collection, count: int):
+        """Start a background BM25 build unless one is already running."""
+        running = _bm25_builds.get(collection.name)
+        if running is not None and not running.done() and running.get_loop() is asyncio.get_running_loop():
+            return
+        KnowledgeBaseService._bm25_journals[collection.name] = []
+        _bm25_builds[collection.name] = asyncio.create_task(self._run_bm25_build(collection, count))
+    
+    async def _run_bm25_build(self, collection, count: int):
+        name = collection.name
+        journal = KnowledgeBaseService._bm25_journals[name]
+        try:
+            index = await self._chroma("bm25_build", self._build_bm25_index, collection)
+            # Dropped (evicted, or ingestion failed) while building - discard
+            if KnowledgeBaseService._bm25_journals.get(name) is journal:
+                for operation, ids, documents in journal:
+                    if operation == "add":
+                        index.add(ids, documents)
+                    else:
+                        index.remove(ids)
+                KnowledgeBaseService._bm25_indexes[name] = (index, count)
+        except Exception as e:
+            logger.warning(f"BM25 index build failed for {name}: {str(e)}")
+        finally:
+            if KnowledgeBaseService._bm25_journals.get(name) is journal:
+                del KnowledgeBaseService._bm25_journals[name]
+            if _bm25_builds.get(name) is asyncio.current_task():
+                del _bm25_builds[name]
+    
+    def _build_bm25_index(self, collection) -> BM25Index:
+        """Tokenize a collection's chunks into a new BM25 index, a page at a time (blocking)."""
+        index = BM25Index()
+        offset = 0
+        while True:
+            page = collection.get(include=["documents"], limit=BM25_BUILD_BATCH_CHUNKS, offset=offset)
+            index.add(page["ids"], page["documents"])
+            if len(page["ids"]) < BM25_BUILD_BATCH_CHUNKS:
+                return index
+            offset += len(page["ids"])
+    
+    def _bm25_add(self, collection, ids: List[str], documents: List[str]):
+        """Keep a collection's BM25 index (and any running build) current with new chunks."""
+        cached = KnowledgeBaseService._bm25_indexes.get(collection.name)
+        if cached is not None:
+            cached[0].add(ids, documents)
+        journal = KnowledgeBaseService._bm25_journals.get(collection.name)
+        if journal is not None:
+            journal.append(("add", ids, documents))
+    
+    def _bm25_remove(self, collection, ids: List[str]):
+        """Keep a collection's BM25 index (and any running build) current with deleted chunks."""
+        cached = KnowledgeBaseService._bm25_indexes.get(collection.name)
+        if cached is not None:
+            cached[0].remove(ids)
+        journal = KnowledgeBaseService._bm25_journals.get(collection.name)
+        if journal is not None:
+            journal.append(("remove", ids, None))
+    
+    def _bm25_discard(self, collection):
+        """Drop a collection's BM25 index and any running build (rebuilt on next query)."""
+        KnowledgeBaseService._bm25_indexes.pop(collection.name, None)
+        KnowledgeBaseService._bm25_journals.pop(collection.name, None)
+    
+    async def _search_collection(self, collection, query: str, n_results: int, count: int) -> List[Dict[str, Any]]:
+        """
+        Retrieve the n_results most relevant chunks from a collection.
+        
+        With hybrid retrieval, vector and BM25 candidates are fused by
+        reciprocal rank fusion ("score", higher is better) and optionally
+        reranked by a cross-encoder; chunks found only lexically are fetched
+        by id and have no distance. Falls back to vector ranking while the
+        BM25 index is being built or if fetching lexical hits fails.
+        """
+        if not KB_HYBRID_RETRIEVAL:
+            results = await self._chroma(
+                "query",
+                collection.query,
+                query_texts=[query],
+                n_results=min(n_results, count)
+            )
+            return list(self._format_query_results(results).values())
+        
+        candidates = min(count, n_results * HYBRID_CANDIDATES_MULTIPLIER)
+        index = self._bm25_index(collection, count)
+        results = await self._chroma("query", collection.query, query_texts=[query], n_results=candidates)
+        
+        vector_hits = self._format_query_results(results)
+        lexical_hits = dict(index.search(query, candidates)) if index is not None else {}
+        
+        fused = reciprocal_rank_fusion([list(vector_hits), list(lexical_hits)])
+        reranker = get_reranker()
+        if reranker is None:
+            fused = fused[:n_results]
+        
+        # The index holds no text: fetch the chunks only BM25 found
+        lexical_only = [chunk_id for chunk_id, _ in fused if chunk_id not in vector_hits]
+        if lexical_only:
+            try:
+                fetched = await self._chroma(
+                    "get", collection.get, ids=lexical_only, include=["documents", "metadatas"]
+                )
+                for chunk_id, document, metadata in zip(fetched["ids"], fetched["documents"], fetched["metadatas"]):
+                    vector_hits[chunk_id] = {"content": document, "metadata": metadata or {}, "distance": None}
+            except Exception as e:
+                logger.warning(f"BM25 hits unavailable for {collection.name}: {str(e)}")
+        
+        chunks = []
+        for chunk_id, score in fused:
+            chunk = vector_hits.get(chunk_id)
+            if chunk is None:
+                continue  # Deleted since it was indexed, or the fetch failed
+            chunk["bm25_score"] = lexical_hits.get(chunk_id)
+            chunk["score"] = round(score, 6)
+            chunks.append(chunk)
+        
+        if reranker is not None:
+            chunks = await asyncio.to_thread(reranker.rerank, query, chunks)
+        
+        return chunks[:n_results]
+    
+    @staticmethod
+    def _format_query_results(results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Chroma query results as {chunk_id: chunk}, in rank order."""
+        formatted = {}
+        if results and results["documents"]:
+            for i, doc in enumerate(results["documents"][0]):
+                formatted[results["ids"][0][i]] = {
+                    "content": doc,
+                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
+                    "distance": results["distances"][0][i] if results["distances"] else None
+                }
+        return formatted
+    
     def _get_collection(self, profile_id: str):
         """Get or create a ChromaDB collection for a profile."""
-        collection_name = f"profile_{profile_id.replace('-', '_')}"
-        return self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"profile_id": profile_id}
+        return self._open_collection(
+            self._profile_collection_name(profile_id),
+            {"profile_id": profile_id}
         )
     
     def _get_tiered_collection(self, tier: str, tier_id: str):
@@ -78,13 +560,9 @@ class KnowledgeBaseService:
         - 'company': Company-level knowledge (Company-Wide KB)
         - 'profile': Profile-level knowledge (Strategic Profile KB) - existing behavior
         """
-        # Sanitize the tier_id for collection name
-        safe_id = tier_id.replace('-', '_')
-        collection_name = f"{tier}_{safe_id}"
-        
-        return self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"tier": tier, "tier_id": tier_id}
+        return self._open_collection(
+            self._tiered_collection_name(tier, tier_id),
+            {"tier": tier, "tier_id": tier_id}
         )
     
     async def process_document_tiered(
@@ -93,7 +571,8 @@ class KnowledgeBaseService:
         tier: str,
         tier_id: str,
         filename: str,
-        user_id: str
+        user_id: str,
+        progress_callback=None
     ) -> Dict[str, Any]:
         """
         Process a document for a specific tier: extract text, chunk, embed, and store.
@@ -104,42 +583,31 @@ class KnowledgeBaseService:
             tier_id: user_id, company_id, or profile_id depending on tier
             filename: Original filename
             user_id: ID of the user uploading the document
+            progress_callback: Optional async callback for progress updates
         """
         document_id = str(uuid4())
         
         try:
-            # Step 1: Extract text
+            # Steps 1-3: Extract, chunk, embed and store in bounded batches
             logger.info(f"Extracting text from {filename} for {tier} tier")
-            text = await self._extract_text(file_path)
-            
-            if not text or len(text.strip()) < 10:
-                raise ValueError("Document contains no extractable text")
-            
-            # Step 2: Chunk the text
-            chunks = self._chunk_text(text)
-            logger.info(f"Created {len(chunks)} chunks for {tier} tier document")
-            
-            # Step 3: Store chunks in ChromaDB
-            collection = self._get_tiered_collection(tier, tier_id)
-            
-            chunk_ids = [f"{document_id}_chunk_{i}" for i in range(len(chunks))]
-            chunk_metadatas = [
-                {
+            collection = await self._tiered_collection(tier, tier_id)
+            
+            chunk_count, text_length = await self._ingest_document(
+                collection,
+                file_path,
+                document_id,
+                lambda i: f"{document_id}_chunk_{i}",
+                lambda i: {
                     "document_id": document_id,
                     "filename": filename,
                     "chunk_index": i,
                     "tier": tier,
                     "tier_id": tier_id,
                     "user_id": user_id
-                }
-                for i in range(len(chunks))
-            ]
-            
-            collection.add(
-                documents=chunks,
-                ids=chunk_ids,
-                metadatas=chunk_metadatas
+                },
+                progress_callback
             )
+            logger.info(f"Created {chunk_count} chunks for {tier} tier document")
             
             # Step 4: Store document metadata in MongoDB
             doc_metadata = {
@@ -152,8 +620,8 @@ class KnowledgeBaseService:
                 "filename": filename,
                 "file_path": file_path,
                 "file_size": Path(file_path).stat().st_size,
-                "text_length": len(text),
-                "chunk_count": len(chunks),
+                "text_length": text_length,
+                "chunk_count": chunk_count,
                 "status": "processed",
                 "created_at": datetime.now(timezone.utc).isoformat(),
                 "processed_at": datetime.now(timezone.utc).isoformat()
@@ -162,18 +630,25 @@ class KnowledgeBaseService:
             if self.db is not None:
                 await self.db.knowledge_documents.insert_one(doc_metadata)
             
+            await _invalidate_compliance_for_tier(self.db, tier, tier_id, user_id)
+            invalidate_rag_context(tier, tier_id)
+            await self._invalidate_knowledge_summary(tier, tier_id)
+            
             return {
                 "success": True,
                 "document_id": document_id,
                 "filename": filename,
                 "tier": tier,
-                "text_length": len(text),
-                "chunk_count": len(chunks),
+                "text_length": text_length,
+                "chunk_count": chunk_count,
                 "status": "processed"
             }
             
         except Exception as e:
             logger.error(f"Error processing {tier} document {filename}: {str(e)}")
+            # Context cached mid-ingestion may include chunks that were rolled back
+            invalidate_rag_context(tier, tier_id)
+            await self._invalidate_knowledge_summary(tier, tier_id)
             
             # Store failed document metadata
             if self.db is not None:
@@ -206,7 +681,8 @@ class KnowledgeBaseService:
         company_id: Optional[str] = None,
         profile_id: Optional[str] = None,
         n_results_per_tier: int = 3,
-        profile_type: str = "personal"
+        profile_type: str = "personal",
+        top_k: Optional[int] = None
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Query knowledge bases across tiers based on profile type.
@@ -227,6 +703,11 @@ class KnowledgeBaseService:
             profile_id: Strategic Profile ID if selected (for Profile-Level KB)
             n_results_per_tier: Number of results to retrieve per tier
             profile_type: "personal" or "company" - determines which tiers to query
+            top_k: Keep only the globally closest top_k chunks across tiers
+                (default keeps every tier's results)
+        
+        The tiers are queried concurrently and de-duplicated across tiers;
+        "merged" lists all chunks ordered by distance.
         """
         results = {
             "company_universal": [],    # Tier 1 - HIGHEST PRIORITY - Applies to ALL posts
@@ -235,85 +716,116 @@ class KnowledgeBaseService:
             "profile": []               # Tier 4 - Strategic profile specific rules
         }
         
-        # Query Universal Company Policies (Tier 1) - ALWAYS applies to ALL posts
+        # Tier queries are independent - run them concurrently, in priority order
+        tier_queries = {}
+        
+        # Tier 1: Universal Company Policies - ALWAYS applies to ALL posts
         # This contains Code of Conduct, Acceptable Use Policy, etc.
         if company_id:
-            try:
-                collection = self._get_tiered_collection("company_universal", company_id)
-                if collection.count() > 0:
-                    universal_results = collection.query(
-                        query_texts=[query],
-                        n_results=min(n_results_per_tier, collection.count())
-                    )
-                    if universal_results and universal_results["documents"]:
-                        for i, doc in enumerate(universal_results["documents"][0]):
-                            results["company_universal"].append({
-                                "content": doc,
-                                "metadata": universal_results["metadatas"][0][i] if universal_results["metadatas"] else {},
-                                "distance": universal_results["distances"][0][i] if universal_results["distances"] else None,
-                                "tier": "company_universal"
-                            })
-                    logger.info(f"Retrieved {len(results['company_universal'])} universal company policy chunks (applies to ALL posts)")
-            except Exception as e:
-                logger.warning(f"Error querying universal company KB: {str(e)}")
+            tier_queries["company_universal"] = self._query_tier(
+                "company_universal", company_id, query, n_results_per_tier
+            )
         
-        # Query Professional Brand & Compliance (Tier 2) - ONLY if profile_type is "company"
+        # Tier 2: Professional Brand & Compliance - ONLY if profile_type is "company"
         # This contains brand guidelines, tone, product messaging - skipped for personal posts
         if company_id and profile_type == "company":
-            try:
-                collection = self._get_tiered_collection("company_professional", company_id)
-                if collection.count() > 0:
-                    professional_results = collection.query(
-                        query_texts=[query],
-                        n_results=min(n_results_per_tier, collection.count())
-                    )
-                    if professional_results and professional_results["documents"]:
-                        for i, doc in enumerate(professional_results["documents"][0]):
-                            results["company_professional"].append({
-                                "content": doc,
-                                "metadata": professional_results["metadatas"][0][i] if professional_results["metadatas"] else {},
-                                "distance": professional_results["distances"][0][i] if professional_results["distances"] else None,
-                                "tier": "company_professional"
-                            })
-                    logger.info(f"Retrieved {len(results['company_professional'])} professional brand chunks (profile_type: {profile_type})")
-            except Exception as e:
-                logger.warning(f"Error querying professional brand KB: {str(e)}")
+            tier_queries["company_professional"] = self._query_tier(
+                "company_professional", company_id, query, n_results_per_tier
+            )
         elif company_id and profile_type == "personal":
             logger.info(f"Skipping professional brand KB for personal profile (profile_type: {profile_type})")
         
-        # Query User-Level KB (Tier 3) - Always query for both profile types
+        # Tier 3: User-Level KB - Always query for both profile types
         # This contains personal compliance rules that apply to all content
         if user_id:
-            try:
-                collection = self._get_tiered_collection("user", user_id)
-                if collection.count() > 0:
-                    user_results = collection.query(
-                        query_texts=[query],
-                        n_results=min(n_results_per_tier, collection.count())
-                    )
-                    if user_results and user_results["documents"]:
-                        for i, doc in enumerate(user_results["documents"][0]):
-                            results["user"].append({
-                                "content": doc,
-                                "metadata": user_results["metadatas"][0][i] if user_results["metadatas"] else {},
-                                "distance": user_results["distances"][0][i] if user_results["distances"] else None,
-                                "tier": "user"
-                            })
-                    logger.info(f"Retrieved {len(results['user'])} user-level chunks")
-            except Exception as e:
-                logger.warning(f"Error querying user KB: {str(e)}")
+            tier_queries["user"] = self._query_tier("user", user_id, query, n_results_per_tier)
         
-        # Query Profile-Level KB (Tier 4) - existing behavior
+        # Tier 4: Profile-Level KB - existing behavior
         if profile_id:
-            try:
-                profile_results = await self.query_knowledge_base(profile_id, query, n_results_per_tier)
-                for r in profile_results:
-                    r["tier"] = "profile"
-                results["profile"] = profile_results
-                logger.info(f"Retrieved {len(results['profile'])} profile-level chunks")
-            except Exception as e:
-                logger.warning(f"Error querying profile KB: {str(e)}")
+            tier_queries["profile"] = self._query_profile_tier(profile_id, query, n_results_per_tier)
         
+        tier_results = await asyncio.gather(*tier_queries.values(), return_exceptions=True)
+        for tier_name, tier_result in zip(tier_queries.keys(), tier_results):
+            if isinstance(tier_result, Exception):
+                logger.warning(f"Error querying {tier_name} KB: {str(tier_result)}")
+                continue
+            results[tier_name] = tier_result
+            logger.info(f"Retrieved {len(tier_result)} {tier_name} chunks")
+        
+        return self._merge_tier_results(results, top_k)
+    
+    async def _query_tier(self, tier: str, tier_id: str, query: str, n_results: int) -> List[Dict[str, Any]]:
+        """Query one tier's collection; empty collections are skipped without a query."""
+        collection = await self._tiered_collection(tier, tier_id)
+        count = await self._collection_size(collection)
+        if count == 0:
+            return []
+        
+        formatted = await self._search_collection(collection, query, n_results, count)
+        for chunk in formatted:
+            chunk["tier"] = tier
+        return formatted
+    
+    async def _query_profile_tier(self, profile_id: str, query: str, n_results: int) -> List[Dict[str, Any]]:
+        """Query the profile tier (profile collections predate tiers)."""
+        profile_results = await self.query_knowledge_base(profile_id, query, n_results)
+        for r in profile_results:
+            r["tier"] = "profile"
+        return profile_results
+    
+    def _merge_tier_results(
+        self,
+        results: Dict[str, List[Dict[str, Any]]],
+        top_k: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        De-duplicate chunks across tiers and rank them globally.
+        
+        A chunk found in several tiers (e.g. the same document uploaded to
+        the user and profile KBs) is kept only in its highest-priority tier.
+        "merged" holds the remaining chunks ordered by cross-encoder score
+        when reranked, else fused score (hybrid retrieval) or distance; with top_k
+        only the global top_k are kept, in "merged" and in the tier lists.
+        """
+        seen = set()
+        merged = []
+        for tier_name in TIER_PRIORITY:
+            unique = []
+            for chunk in results.get(tier_name, []):
+                key = hashlib.sha1(" ".join(chunk["content"].split()).lower().encode("utf-8")).hexdigest()
+                if key in seen:
+                    continue
+                seen.add(key)
+                unique.append(chunk)
+            results[tier_name] = unique
+            merged.extend(unique)
+        
+        if KB_HYBRID_RETRIEVAL:
+            # Per-tier fused scores aren't comparable across tiers - re-fuse
+            # the global distance and BM25 rankings
+            by_distance = sorted(
+                (c for c in merged if c.get("distance") is not None), key=lambda c: c["distance"]
+            )
+            by_bm25 = sorted(
+                (c for c in merged if c.get("bm25_score")), key=lambda c: c["bm25_score"], reverse=True
+            )
+            chunks_by_id = {id(c): c for c in merged}
+            fused = reciprocal_rank_fusion([[id(c) for c in by_distance], [id(c) for c in by_bm25]])
+            for chunk_key, score in fused:
+                chunks_by_id[chunk_key]["score"] = round(score, 6)
+            merged = [chunks_by_id[chunk_key] for chunk_key, _ in fused]
+            # Cross-encoder scores are query-relative, so they do compare
+            # across tiers - reranked chunks lead in reranked order
+            merged.sort(key=lambda c: -c["rerank_score"] if c.get("rerank_score") is not None else float("inf"))
+        else:
+            merged.sort(key=lambda c: c["distance"] if c.get("distance") is not None else float("inf"))
+        if top_k is not None:
+            merged = merged[:top_k]
+            kept = {id(c) for c in merged}
+            for tier_name in TIER_PRIORITY:
+                results[tier_name] = [c for c in results[tier_name] if id(c) in kept]
+        
+        results["merged"] = merged
         return results
     
     async def get_tiered_context_for_ai(
@@ -322,7 +834,8 @@ class KnowledgeBaseService:
         user_id: str,
         company_id: Optional[str] = None,
         profile_id: Optional[str] = None,
-        profile_type: str = "personal"
+        profile_type: str = "personal",
+        model: Optional[str] = None
     ) -> str:
         """
         Get combined context from tiers for AI content generation.
@@ -338,7 +851,37 @@ class KnowledgeBaseService:
         
         Formats the context with clear tier labels and priority ordering.
         IMPORTANT: These are MANDATORY DIRECTIVES that the AI must follow.
+        
+        Chunk text is packed into the model's knowledge context token
+        budget (see context_packing_service): near-duplicates and the
+        overlap between adjacent chunks are dropped before the budget is
+        filled in tier priority order.
+        
+        The assembled context is cached per tier versions, query and
+        budget, so repeated calls skip retrieval until a tier's documents
+        change.
         """
+        token_budget = get_context_token_budget(model)
+        cache = get_rag_context_cache()
+        cache_key = await cache.key(self.db, query, user_id, company_id, profile_id, profile_type, token_budget)
+        context = cache.get(cache_key)
+        if context is None:
+            context = await self._build_tiered_context(
+                query, user_id, company_id, profile_id, profile_type, token_budget
+            )
+            cache.set(cache_key, context)
+        return context
+    
+    async def _build_tiered_context(
+        self,
+        query: str,
+        user_id: str,
+        company_id: Optional[str],
+        profile_id: Optional[str],
+        profile_type: str,
+        token_budget: int
+    ) -> str:
+        """Retrieve from the tiers and assemble the labelled context."""
         tiered_results = await self.query_tiered_knowledge_base(
             query=query,
             user_id=user_id,
@@ -347,6 +890,14 @@ class KnowledgeBaseService:
             profile_type=profile_type
         )
         
+        packed = pack_chunks(tiered_results["merged"], token_budget, tier_order=TIER_PRIORITY)
+        for tier_name in TIER_PRIORITY:
+            tiered_results[tier_name] = [c for c in packed.chunks if c.get("tier") == tier_name]
+        logger.debug(
+            f"Packed {len(packed.chunks)}/{len(tiered_results['merged'])} chunks into {packed.tokens} tokens "
+            f"({packed.near_duplicates} near-duplicates, {packed.overlap_chars} overlap chars dropped)"
+        )
+        
         context_parts = []
         
         # Determine preamble based on profile type
@@ -425,6 +976,225 @@ Apply these strategic guidelines for this specific profile:
         
         return preamble + "\n\n".join(context_parts) + closing
     
+    async def update_document_tiered(
+        self,
+        document_id: str,
+        file_path: str,
+        tier: str,
+        tier_id: str,
+        filename: str,
+        user_id: str,
+        progress_callback=None
+    ) -> Dict[str, Any]:
+        """
+        Replace a tiered document with a new version, re-indexing only what changed.
+        
+        The new file is chunked with the same content-defined boundaries and
+        its chunks are matched to the stored ones by content hash: unchanged
+        chunks are kept (only their position is updated), new chunks are
+        embedded and added, and chunks that no longer exist are deleted.
+        Stale chunks are only deleted once everything else has succeeded; on
+        failure the added chunks are removed and moved chunks restored, so
+        the previous version is left in place.
+        
+        Args:
+            document_id: Document to replace
+            file_path: Path to the new version
+            tier / tier_id: The document's tier
+            filename: Filename of the new version
+            user_id: ID of the user uploading the new version
+            progress_callback: Optional async callback for progress updates
+        """
+        async def report(step: str, percentage: int):
+            if progress_callback:
+                await progress_callback({"step": step, "percentage": percentage})
+        
+        collection = await self._tiered_collection(tier, tier_id)
+        spool = tempfile.NamedTemporaryFile(prefix="kb_chunks_", suffix=".jsonl", delete=False)
+        spool.close()
+        added_ids: List[str] = []
+        kept: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = []
+        updated_count = 0
+        
+        try:
+            await report("extracting", 0)
+            stored = await self._chroma(
+                "get", collection.get, where={"document_id": document_id}, include=["metadatas"]
+            )
+            stored_chunks = await self._stored_chunk_hashes(collection, stored)
+            total, text_length = await get_ingestion_pool().run(
+                "extract_chunks", extract_chunks_to_spool, str(file_path), spool.name
+            )
+            await report("diffing", 40)
+            
+            pending: List[Tuple[int, str, str]] = []
+            chunk_count = 0
+            
+            async def add_pending():
+                ids = [f"{document_id}_chunk_{uuid4().hex[:12]}" for _ in pending]
+                documents = [chunk for _, chunk, _ in pending]
+                metadatas = [
+                    {
+                        "document_id": document_id,
+                        "filename": filename,
+                        "chunk_index": i,
+                        "tier": tier,
+                        "tier_id": tier_id,
+                        "user_id": user_id,
+                        "chunk_hash": chunk_hash
+                    }
+                    for i, _, chunk_hash in pending
+                ]
+                await self._chroma(
+                    "add",
+                    collection.add,
+                    documents=documents,
+                    embeddings=await self._embed_chunks(documents),
+                    ids=ids,
+                    metadatas=metadatas
+                )
+                added_ids.extend(ids)
+                self._adjust_collection_size(collection, len(ids))
+                self._bm25_add(collection, ids, documents)
+                pending.clear()
+                await report("embedding", 40 + 50 * chunk_count // max(total, 1))
+            
+            with open(spool.name, "r", encoding="utf-8") as f:
+                for line in f:
+                    chunk = json.loads(line)
+                    chunk_hash = content_hash(chunk)
+                    matches = stored_chunks.get(chunk_hash)
+                    if matches:
+                        chunk_id, metadata = matches.pop()
+                        updated = {**metadata, "chunk_index": chunk_count, "filename": filename, "chunk_hash": chunk_hash}
+                        if updated != metadata:
+                            kept.append((chunk_id, updated, metadata))
+                    else:
+                        pending.append((chunk_count, chunk, chunk_hash))
+                        if len(pending) >= INGEST_BATCH_CHUNKS:
+                            await add_pending()
+                    chunk_count += 1
+            if pending:
+                await add_pending()
+            
+            # New chunks are stored - move the kept ones to their new positions
+            for start in range(0, len(kept), INGEST_BATCH_CHUNKS):
+                batch = kept[start:start + INGEST_BATCH_CHUNKS]
+                updated_count += len(batch)  # Counted first: a failed batch may be partly applied
+                await self._chroma(
+                    "update",
+                    collection.update,
+                    ids=[chunk_id for chunk_id, _, _ in batch],
+                    metadatas=[metadata for _, metadata, _ in batch]
+                )
+            
+            # Deleting is the last step: until here the previous version is intact
+            removed_ids = [chunk_id for matches in stored_chunks.values() for chunk_id, _ in matches]
+            if removed_ids:
+                await self._chroma("delete", collection.delete, ids=removed_ids)
+                self._adjust_collection_size(collection, -len(removed_ids))
+                self._bm25_remove(collection, removed_ids)
+        except Exception as e:
+            logger.error(f"Error updating {tier} document {document_id}: {str(e)}")
+            await self._rollback_document_update(collection, added_ids, kept[:updated_count])
+            return {
+                "success": False,
+                "document_id": document_id,
+                "filename": filename,
+                "tier": tier,
+                "error": str(e),
+                "status": "failed"
+            }
+        finally:
+            os.unlink(spool.name)
+        
+        if self.db is not None:
+            previous = await self.db.knowledge_documents.find_one({"id": document_id}, {"_id": 0, "file_path": 1})
+            if previous and previous.get("file_path") and previous["file_path"] != str(file_path):
+                Path(previous["file_path"]).unlink(missing_ok=True)
+            await self.db.knowledge_documents.update_one(
+                {"id": document_id},
+                {"$set": {
+                    "filename": filename,
+                    "file_path": str(file_path),
+                    "file_size": Path(file_path).stat().st_size,
+                    "text_length": text_length,
+                    "chunk_count": chunk_count,
+                    "status": "processed",
+                    "updated_by": user_id,
+                    "processed_at": datetime.now(timezone.utc).isoformat()
+                }}
+            )
+        
+        await _invalidate_compliance_for_tier(self.db, tier, tier_id, user_id)
+        invalidate_rag_context(tier, tier_id)
+        await self._invalidate_knowledge_summary(tier, tier_id)
+        await report("complete", 100)
+        
+        logger.info(
+            f"Re-indexed {tier} document {document_id}: {len(added_ids)} added, "
+            f"{len(removed_ids)} removed, {chunk_count - len(added_ids)} kept"
+        )
+        return {
+            "success": True,
+            "document_id": document_id,
+            "filename": filename,
+            "tier": tier,
+            "text_length": text_length,
+            "chunk_count": chunk_count,
+            "chunks_added": len(added_ids),
+            "chunks_removed": len(removed_ids),
+            "chunks_kept": chunk_count - len(added_ids),
+            "status": "processed"
+        }
+    
+    async def _rollback_document_update(
+        self,
+        collection,
+        added_ids: List[str],
+        updated: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]
+    ):
+        """Undo a failed update_document_tiered: drop new chunks, restore moved ones."""
+        try:
+            if added_ids:
+                await self._chroma("delete", collection.delete, ids=added_ids)
+                self._adjust_collection_size(collection, -len(added_ids))
+                self._bm25_remove(collection, added_ids)
+            for start in range(0, len(updated), INGEST_BATCH_CHUNKS):
+                batch = updated[start:start + INGEST_BATCH_CHUNKS]
+                await self._chroma(
+                    "update",
+                    collection.update,
+                    ids=[chunk_id for chunk_id, _, _ in batch],
+                    metadatas=[original for _, _, original in batch]
+                )
+        except Exception as e:
+            logger.error(f"Error rolling back document update: {str(e)}")
+    
+    async def _stored_chunk_hashes(
+        self,
+        collection,
+        stored: Dict[str, Any]
+    ) -> Dict[str, List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Stored chunks of a document grouped by content hash.
+        
+        Chunks indexed before hashes were recorded are hashed from their text.
+        """
+        metadatas = stored.get("metadatas") or [{} for _ in stored["ids"]]
+        unhashed = [chunk_id for chunk_id, metadata in zip(stored["ids"], metadatas) if not metadata.get("chunk_hash")]
+        texts = {}
+        if unhashed:
+            legacy = await self._chroma("get", collection.get, ids=unhashed, include=["documents"])
+            texts = dict(zip(legacy["ids"], legacy["documents"]))
+        
+        by_hash: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for chunk_id, metadata in zip(stored["ids"], metadatas):
+            metadata = metadata or {}
+            chunk_hash = metadata.get("chunk_hash") or content_hash(texts.get(chunk_id, ""))
+            by_hash.setdefault(chunk_hash, []).append((chunk_id, metadata))
+        return by_hash
+    
     async def delete_document_tiered(
         self,
         document_id: str,
@@ -434,14 +1204,18 @@ Apply these strategic guidelines for this specific profile:
         """Delete a document from a tiered knowledge base."""
         try:
             # Delete from ChromaDB
-            collection = self._get_tiered_collection(tier, tier_id)
+            collection = await self._tiered_collection(tier, tier_id)
             
-            results = collection.get(
+            results = await self._chroma(
+                "get",
+                collection.get,
                 where={"document_id": document_id}
             )
             
             if results and results["ids"]:
-                collection.delete(ids=results["ids"])
+                await self._chroma("delete", collection.delete, ids=results["ids"])
+                self._adjust_collection_size(collection, -len(results["ids"]))
+                self._bm25_remove(collection, results["ids"])
                 logger.info(f"Deleted {len(results['ids'])} chunks for {tier} document {document_id}")
             
             # Delete from MongoDB
@@ -454,6 +1228,10 @@ Apply these strategic guidelines for this specific profile:
                 
                 await self.db.knowledge_documents.delete_one({"id": document_id})
             
+            await _invalidate_compliance_for_tier(self.db, tier, tier_id)
+            invalidate_rag_context(tier, tier_id)
+            await self._invalidate_knowledge_summary(tier, tier_id)
+            
             return True
             
         except Exception as e:
@@ -463,8 +1241,8 @@ Apply these strategic guidelines for this specific profile:
     async def get_tiered_stats(self, tier: str, tier_id: str) -> Dict[str, Any]:
         """Get statistics for a specific tier's knowledge base."""
         try:
-            collection = self._get_tiered_collection(tier, tier_id)
-            chunk_count = collection.count()
+            collection = await self._tiered_collection(tier, tier_id)
+            chunk_count = await self._collection_size(collection)
             
             doc_count = 0
             if self.db is not None:
@@ -488,51 +1266,38 @@ Apply these strategic guidelines for this specific profile:
         file_path: str,
         profile_id: str,
         filename: str,
-        user_id: str
+        user_id: str,
+        progress_callback=None
     ) -> Dict[str, Any]:
         """
         Process a document: extract text, chunk, embed, and store in vector DB.
         This is the core RAG preprocessing step.
+        
+        Args:
+            progress_callback: Optional async callback for progress updates
         """
         document_id = str(uuid4())
         
         try:
-            # Step 1: Extract text from document
+            # Steps 1-3: Extract, chunk, embed and store in bounded batches
             logger.info(f"Extracting text from {filename}")
-            text = await self._extract_text(file_path)
-            
-            if not text or len(text.strip()) < 10:
-                raise ValueError("Document contains no extractable text")
-            
-            # Step 2: Chunk the text
-            logger.info(f"Chunking text ({len(text)} chars)")
-            chunks = self._chunk_text(text)
-            logger.info(f"Created {len(chunks)} chunks")
-            
-            # Step 3: Store chunks in ChromaDB (it handles embeddings automatically)
-            collection = self._get_collection(profile_id)
-            
-            # Prepare data for ChromaDB
-            ids = [f"{document_id}_{i}" for i in range(len(chunks))]
-            metadatas = [
-                {
+            collection = await self._collection(profile_id)
+            
+            chunk_count, text_length = await self._ingest_document(
+                collection,
+                file_path,
+                document_id,
+                lambda i: f"{document_id}_{i}",
+                lambda i: {
                     "document_id": document_id,
                     "profile_id": profile_id,
                     "filename": filename,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks)
-                }
-                for i in range(len(chunks))
-            ]
-            
-            # Add to collection (ChromaDB embeds automatically using default model)
-            collection.add(
-                documents=chunks,
-                metadatas=metadatas,
-                ids=ids
+                    "chunk_index": i
+                },
+                progress_callback
             )
             
-            logger.info(f"Stored {len(chunks)} chunks in ChromaDB for profile {profile_id}")
+            logger.info(f"Stored {chunk_count} chunks in ChromaDB for profile {profile_id}")
             
             # Step 4: Store document metadata in MongoDB
             doc_metadata = {
@@ -542,8 +1307,8 @@ Apply these strategic guidelines for this specific profile:
                 "filename": filename,
                 "file_path": file_path,
                 "file_size": os.path.getsize(file_path),
-                "text_length": len(text),
-                "chunk_count": len(chunks),
+                "text_length": text_length,
+                "chunk_count": chunk_count,
                 "status": "processed",
                 "created_at": datetime.now(timezone.utc).isoformat(),
                 "processed_at": datetime.now(timezone.utc).isoformat()
@@ -552,17 +1317,24 @@ Apply these strategic guidelines for this specific profile:
             if self.db is not None:
                 await self.db.knowledge_documents.insert_one(doc_metadata)
             
+            await _invalidate_compliance_for_tier(self.db, "profile", profile_id, user_id)
+            invalidate_rag_context("profile", profile_id)
+            await self._invalidate_knowledge_summary("profile", profile_id)
+            
             return {
                 "success": True,
                 "document_id": document_id,
                 "filename": filename,
-                "text_length": len(text),
-                "chunk_count": len(chunks),
+                "text_length": text_length,
+                "chunk_count": chunk_count,
                 "status": "processed"
             }
             
         except Exception as e:
             logger.error(f"Error processing document {filename}: {str(e)}")
+            # Context cached mid-ingestion may include chunks that were rolled back
+            invalidate_rag_context("profile", profile_id)
+            await self._invalidate_knowledge_summary("profile", profile_id)
             
             # Store failed document metadata
             if self.db is not None:
@@ -585,107 +1357,234 @@ Apply these strategic guidelines for this specific profile:
                 "status": "failed"
             }
     
-    async def _extract_text(self, file_path: str) -> str:
-        """Extract text from various document formats."""
+    async def _ingest_document(
+        self,
+        collection,
+        file_path: str,
+        document_id: str,
+        chunk_id: Callable[[int], str],
+        chunk_metadata: Callable[[int], Dict[str, Any]],
+        progress_callback=None
+    ) -> Tuple[int, int]:
+        """
+        Stream a document into a collection.
+        
+        Extraction and chunking run in the ingestion process pool, which
+        spools chunks to a temporary file; every INGEST_BATCH_CHUNKS chunks
+        are then read back, embedded and added, so only one batch is held
+        in memory. Chunks already stored are removed if a later batch fails.
+        
+        Args:
+            progress_callback: Optional async callback for progress updates
+        
+        Returns:
+            (chunk_count, text_length)
+        """
+        async def report(step: str, percentage: int):
+            if progress_callback:
+                await progress_callback({"step": step, "percentage": percentage})
+        
+        await report("extracting", 0)
+        spool = tempfile.NamedTemporaryFile(prefix="kb_chunks_", suffix=".jsonl", delete=False)
+        spool.close()
+        
+        chunk_count = 0
+        try:
+            total, text_length = await get_ingestion_pool().run(
+                "extract_chunks", extract_chunks_to_spool, str(file_path), spool.name
+            )
+            await report("embedding", 40)
+            
+            with open(spool.name, "r", encoding="utf-8") as f:
+                next_batch = lambda: [json.loads(line) for line in islice(f, INGEST_BATCH_CHUNKS)]
+                batch = await asyncio.to_thread(next_batch)
+                while batch:
+                    indexes = range(chunk_count, chunk_count + len(batch))
+                    ids = [chunk_id(i) for i in indexes]
+                    metadatas = [
+                        {**chunk_metadata(i), "chunk_hash": content_hash(chunk)}
+                        for i, chunk in zip(indexes, batch)
+                    ]
+                    await self._chroma(
+                        "add",
+                        collection.add,
+                        documents=batch,
+                        embeddings=await self._embed_chunks(batch),
+                        ids=ids,
+                        metadatas=metadatas
+                    )
+                    chunk_count += len(batch)
+                    self._adjust_collection_size(collection, len(batch))
+                    self._bm25_add(collection, ids, batch)
+                    await report("embedding", 40 + 60 * chunk_count // max(total, 1))
+                    batch = await asyncio.to_thread(next_batch)
+        except Exception:
+            if chunk_count:
+                await self._chroma("delete", collection.delete, where={"document_id": document_id})
+                self._adjust_collection_size(collection, -chunk_count)
+                self._bm25_discard(collection)
+            raise
+        finally:
+            os.unlink(spool.name)
+        
+        return chunk_count, text_length
+    
+    def _iter_text(self, file_path: str, stats: Optional[Dict[str, int]] = None) -> Iterator[str]:
+        """Yield a document's text page by page (sheet rows, slides, ...)."""
         file_path = Path(file_path)
         suffix = file_path.suffix.lower()
         
+        if suffix == ".pdf":
+            parts = self._iter_pdf(file_path)
+        elif suffix in [".docx", ".doc"]:
+            parts = self._iter_docx(file_path)
+        elif suffix in [".xlsx", ".xls"]:
+            parts = self._iter_xlsx(file_path)
+        elif suffix in [".pptx", ".ppt"]:
+            parts = self._iter_pptx(file_path)
+        elif suffix in [".txt", ".md", ".csv"]:
+            parts = self._iter_text_file(file_path)
+        else:
+            raise ValueError(f"Unsupported file format: {suffix}")
+        
         try:
-            if suffix == ".pdf":
-                return self._extract_pdf(file_path)
-            elif suffix in [".docx", ".doc"]:
-                return self._extract_docx(file_path)
-            elif suffix in [".xlsx", ".xls"]:
-                return self._extract_xlsx(file_path)
-            elif suffix in [".pptx", ".ppt"]:
-                return self._extract_pptx(file_path)
-            elif suffix in [".txt", ".md", ".csv"]:
-                return self._extract_text_file(file_path)
-            else:
-                raise ValueError(f"Unsupported file format: {suffix}")
+            for part in parts:
+                if stats is not None:
+                    stats["text_length"] = stats.get("text_length", 0) + len(part)
+                yield part
         except Exception as e:
             logger.error(f"Text extraction error for {file_path}: {str(e)}")
             raise
     
-    def _extract_pdf(self, file_path: Path) -> str:
-        """Extract text from PDF files."""
-        text_parts = []
+    def _iter_pdf(self, file_path: Path) -> Iterator[str]:
+        """Extract text from PDF files, one page at a time."""
         reader = PdfReader(str(file_path))
         for page in reader.pages:
             page_text = page.extract_text()
             if page_text:
-                text_parts.append(page_text)
-        return "\n\n".join(text_parts)
+                yield page_text
     
-    def _extract_docx(self, file_path: Path) -> str:
-        """Extract text from Word documents."""
+    def _iter_docx(self, file_path: Path) -> Iterator[str]:
+        """Extract text from Word documents, one paragraph at a time."""
         doc = DocxDocument(str(file_path))
-        text_parts = []
         for para in doc.paragraphs:
             if para.text.strip():
-                text_parts.append(para.text)
-        return "\n\n".join(text_parts)
-    
-    def _extract_xlsx(self, file_path: Path) -> str:
-        """Extract text from Excel files."""
-        wb = load_workbook(str(file_path), data_only=True)
-        text_parts = []
-        for sheet in wb.sheetnames:
-            ws = wb[sheet]
-            text_parts.append(f"Sheet: {sheet}")
-            for row in ws.iter_rows(values_only=True):
-                row_text = " | ".join(str(cell) for cell in row if cell is not None)
-                if row_text.strip():
-                    text_parts.append(row_text)
-        return "\n".join(text_parts)
-    
-    def _extract_pptx(self, file_path: Path) -> str:
-        """Extract text from PowerPoint files."""
+                yield para.text
+    
+    def _iter_xlsx(self, file_path: Path) -> Iterator[str]:
+        """Extract text from Excel files, streaming rows in read-only mode."""
+        wb = load_workbook(str(file_path), data_only=True, read_only=True)
+        try:
+            for ws in wb.worksheets:
+                yield f"Sheet: {ws.title}"
+                for row in ws.iter_rows(values_only=True):
+                    row_text = " | ".join(str(cell) for cell in row if cell is not None)
+                    if row_text.strip():
+                        yield row_text
+        finally:
+            wb.close()
+    
+    def _iter_pptx(self, file_path: Path) -> Iterator[str]:
+        """Extract text from PowerPoint files, one slide at a time."""
         prs = Presentation(str(file_path))
-        text_parts = []
         for slide_num, slide in enumerate(prs.slides, 1):
             slide_text = [f"Slide {slide_num}:"]
             for shape in slide.shapes:
                 if hasattr(shape, "text") and shape.text.strip():
                     slide_text.append(shape.text)
-            text_parts.append("\n".join(slide_text))
-        return "\n\n".join(text_parts)
+            yield "\n".join(slide_text)
     
-    def _extract_text_file(self, file_path: Path) -> str:
-        """Extract text from plain text files."""
+    def _iter_text_file(self, file_path: Path, block_size: int = 64 * 1024) -> Iterator[str]:
+        """Extract text from plain text files in fixed-size blocks."""
         with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+            pending = ""
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                # Hold back a trailing partial word so it isn't split across blocks
+                block = pending + block
+                cut = max(block.rfind(" "), block.rfind("\n"))
+                if cut == -1:
+                    pending = block
+                    continue
+                pending = block[cut + 1:]
+                yield block[:cut + 1]
+            if pending:
+                yield pending
     
     def _chunk_text(self, text: str) -> List[str]:
         """Split text into overlapping chunks for better retrieval."""
-        chunks = []
+        return list(self._iter_chunks([text]))
+    
+    def _iter_chunks(self, parts: Iterable[str]) -> Iterator[str]:
+        """
+        Split streamed text into overlapping, content-defined chunks.
         
-        # Clean the text
-        text = " ".join(text.split())
+        Whitespace is collapsed per part and parts are joined by a single
+        space, so the chunks match chunking the whole text at once while
+        only about one chunk of text is buffered.
         
-        if len(text) <= CHUNK_SIZE:
-            return [text]
+        Chunk ends are chosen from the local text (see _chunk_boundary)
+        rather than from where the previous chunk ended, so an edit only
+        changes the chunks around it - update_document_tiered keeps the rest.
+        """
+        span = CHUNK_SIZE - CHUNK_OVERLAP  # New text per chunk
+        buffer = ""
+        offset = 0  # Start of the next chunk within buffer
+        emitted = False
         
-        start = 0
-        while start < len(text):
-            end = start + CHUNK_SIZE
-            
-            # Try to break at sentence boundary
-            if end < len(text):
-                # Look for sentence ending punctuation
-                for punct in [". ", "! ", "? ", "\n"]:
-                    last_punct = text.rfind(punct, start, end)
-                    if last_punct > start + CHUNK_SIZE // 2:
-                        end = last_punct + 1
-                        break
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            start = end - CHUNK_OVERLAP
+        for part in parts:
+            # Clean the text
+            part = " ".join(part.split())
+            if not part:
+                continue
+            buffer = f"{buffer} {part}" if buffer else part
+            
+            # A chunk is only cut once text exists past its window
+            while len(buffer) - offset > span + 1:
+                end = self._chunk_boundary(buffer, offset)
+                emitted = True
+                yield buffer[max(0, offset - CHUNK_OVERLAP):end].strip()
+                offset = end
+            keep = max(0, offset - CHUNK_OVERLAP)
+            buffer, offset = buffer[keep:], offset - keep
+        
+        if not emitted:
+            yield buffer
+            return
+        
+        while len(buffer) - offset > span:
+            end = self._chunk_boundary(buffer, offset)
+            yield buffer[max(0, offset - CHUNK_OVERLAP):end].strip()
+            offset = end
+        if buffer[offset:].strip():
+            yield buffer[max(0, offset - CHUNK_OVERLAP):].strip()
+    
+    @staticmethod
+    def _chunk_boundary(text: str, start: int) -> int:
+        """
+        End of the chunk whose new text starts at start.
         
-        return chunks
+        Chunks hold at most CHUNK_SIZE chars including the overlap. Among
+        the sentence ends in the last two thirds of that span, the one whose
+        preceding text has the lowest hash wins - after an edit, two
+        chunkings whose windows mostly overlap pick the same end and stay
+        in step from there. Without a sentence end, the last word break is
+        used.
+        """
+        span = CHUNK_SIZE - CHUNK_OVERLAP
+        low, high = start + span // 3, start + span
+        best_end, best_hash = None, None
+        for match in SENTENCE_END.finditer(text, low, high + 1):
+            end = match.end()
+            anchor = zlib.crc32(text[end - CHUNK_ANCHOR_WINDOW:end].encode("utf-8"))
+            if best_hash is None or anchor < best_hash:
+                best_end, best_hash = end, anchor
+        if best_end is not None:
+            return best_end
+        space = text.rfind(" ", low, high)
+        return space if space > start else high
     
     async def query_knowledge_base(
         self,
@@ -698,28 +1597,16 @@ Apply these strategic guidelines for this specific profile:
         This is the RAG retrieval step.
         """
         try:
-            collection = self._get_collection(profile_id)
+            collection = await self._collection(profile_id)
             
             # Check if collection has documents
-            if collection.count() == 0:
+            count = await self._collection_size(collection)
+            if count == 0:
                 logger.info(f"No documents in knowledge base for profile {profile_id}")
                 return []
             
-            # Query ChromaDB (it handles embedding the query automatically)
-            results = collection.query(
-                query_texts=[query],
-                n_results=min(n_results, collection.count())
-            )
-            
-            # Format results
-            formatted_results = []
-            if results and results["documents"]:
-                for i, doc in enumerate(results["documents"][0]):
-                    formatted_results.append({
-                        "content": doc,
-                        "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                        "distance": results["distances"][0][i] if results["distances"] else None
-                    })
+            # Vector (+ BM25) retrieval - Chroma embeds the query automatically
+            formatted_results = await self._search_collection(collection, query, n_results, count)
             
             logger.info(f"Retrieved {len(formatted_results)} relevant chunks for profile {profile_id}")
             return formatted_results
@@ -732,15 +1619,19 @@ Apply these strategic guidelines for this specific profile:
         """Delete a document and its chunks from the knowledge base."""
         try:
             # Delete from ChromaDB
-            collection = self._get_collection(profile_id)
+            collection = await self._collection(profile_id)
             
             # Get all chunk IDs for this document
-            results = collection.get(
+            results = await self._chroma(
+                "get",
+                collection.get,
                 where={"document_id": document_id}
             )
             
             if results and results["ids"]:
-                collection.delete(ids=results["ids"])
+                await self._chroma("delete", collection.delete, ids=results["ids"])
+                self._adjust_collection_size(collection, -len(results["ids"]))
+                self._bm25_remove(collection, results["ids"])
                 logger.info(f"Deleted {len(results['ids'])} chunks for document {document_id}")
             
             # Delete from MongoDB
@@ -753,6 +1644,12 @@ Apply these strategic guidelines for this specific profile:
                         file_path.unlink()
                 
                 await self.db.knowledge_documents.delete_one({"id": document_id})
+                
+                if doc:
+                    await _invalidate_compliance_for_tier(self.db, "profile", profile_id, doc.get("user_id"))
+            
+            invalidate_rag_context("profile", profile_id)
+            await self._invalidate_knowledge_summary("profile", profile_id)
             
             return True
             
@@ -775,8 +1672,8 @@ Apply these strategic guidelines for this specific profile:
     async def get_profile_stats(self, profile_id: str) -> Dict[str, Any]:
         """Get statistics about a profile's knowledge base."""
         try:
-            collection = self._get_collection(profile_id)
-            chunk_count = collection.count()
+            collection = await self._collection(profile_id)
+            chunk_count = await self._collection_size(collection)
             
             doc_count = 0
             if self.db is not None:
@@ -793,18 +1690,132 @@ Apply these strategic guidelines for this specific profile:
             logger.error(f"Error getting profile stats: {str(e)}")
             return {"document_count": 0, "chunk_count": 0, "has_knowledge": False}
     
-    async def get_knowledge_summary(self, profile_id: str, max_chunks: int = 10) -> str:
+    async def get_knowledge_summary(self, profile_id: str, max_chunks: int = KNOWLEDGE_SUMMARY_MAX_CHUNKS) -> str:
         """
         Get a representative summary of the knowledge base for SEO keyword generation.
-        Retrieves diverse chunks from the knowledge base to capture key themes.
+        Reads the profile's materialized summary (see get_tier_summary).
+        """
+        return await self.get_tier_summary("profile", profile_id, max_chunks)
+    
+    async def get_tier_summary(
+        self,
+        tier: str,
+        tier_id: str,
+        max_chunks: int = KNOWLEDGE_SUMMARY_MAX_CHUNKS
+    ) -> str:
+        """
+        Get the materialized knowledge summary of a tier in one document fetch.
+        
+        Summaries live in the knowledge_summaries collection and are rebuilt
+        in the background after each document change, so readers may see the
+        previous version for a few seconds. A tier without a stored summary
+        yet is summarized inline once.
+        """
+        if self.db is not None:
+            try:
+                doc = await self.db.knowledge_summaries.find_one(
+                    {"scope": f"{tier}:{tier_id}"}, {"_id": 0, "summary": 1}
+                )
+                if doc and "summary" in doc:
+                    return doc["summary"]
+            except Exception as e:
+                logger.warning(f"Failed to read knowledge summary for {tier} {tier_id}: {str(e)}")
+        return await self.refresh_knowledge_summary(tier, tier_id, max_chunks)
+    
+    async def refresh_knowledge_summary(
+        self,
+        tier: str,
+        tier_id: str,
+        max_chunks: int = KNOWLEDGE_SUMMARY_MAX_CHUNKS
+    ) -> str:
         """
+        Rebuild and store a tier's knowledge summary.
+        
+        The stored summary records the source_version it was built from; the
+        write only lands if no document change bumped the version meanwhile
+        (that change's own refresh writes the newer summary).
+        """
+        scope = f"{tier}:{tier_id}"
+        current = None
+        if self.db is not None:
+            current = await self.db.knowledge_summaries.find_one({"scope": scope}, {"_id": 0, "source_version": 1})
+        source_version = (current or {}).get("source_version", 0)
+        
+        summary = await self._build_knowledge_summary(tier, tier_id, max_chunks)
+        
+        if self.db is not None:
+            fields = {
+                "tier": tier,
+                "tier_id": tier_id,
+                "summary": summary,
+                "summary_version": source_version,
+                "max_chunks": max_chunks,
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            }
+            if current is None:
+                await self.db.knowledge_summaries.update_one(
+                    {"scope": scope},
+                    {"$setOnInsert": {**fields, "source_version": source_version}},
+                    upsert=True
+                )
+            else:
+                await self.db.knowledge_summaries.update_one(
+                    {"scope": scope, "source_version": source_version},
+                    {"$set": fields}
+                )
+        return summary
+    
+    async def _invalidate_knowledge_summary(self, tier: str, tier_id: str):
+        """Bump a tier's summary source version and refresh it in the background."""
+        if self.db is None:
+            return
+        scope = f"{tier}:{tier_id}"
+        try:
+            await self.db.knowledge_summaries.update_one(
+                {"scope": scope},
+                {"$inc": {"source_version": 1}, "$setOnInsert": {"tier": tier, "tier_id": tier_id}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to mark knowledge summary stale for {scope}: {str(e)}")
+            return
+        
+        running = _summary_refreshes.get(scope)
+        if running is not None and not running.done() and running.get_loop() is asyncio.get_running_loop():
+            # Coalesce: the running refresh goes again once it finishes
+            _summary_refresh_pending.add(scope)
+            return
+        _summary_refreshes[scope] = asyncio.create_task(self._run_summary_refresh(tier, tier_id))
+    
+    async def _run_summary_refresh(self, tier: str, tier_id: str):
+        scope = f"{tier}:{tier_id}"
         try:
-            collection = self._get_collection(profile_id)
+            while True:
+                _summary_refresh_pending.discard(scope)
+                await self.refresh_knowledge_summary(tier, tier_id)
+                if scope not in _summary_refresh_pending:
+                    break
+        except Exception as e:
+            logger.error(f"Error refreshing knowledge summary for {scope}: {str(e)}")
+        finally:
+            _summary_refreshes.pop(scope, None)
+    
+    async def _summary_collection(self, tier: str, tier_id: str):
+        if tier == "profile":
+            return await self._collection(tier_id)
+        return await self._tiered_collection(tier, tier_id)
+    
+    async def _build_knowledge_summary(self, tier: str, tier_id: str, max_chunks: int) -> str:
+        """
+        Sample diverse chunks from a tier's knowledge base to capture key themes.
+        """
+        try:
+            collection = await self._summary_collection(tier, tier_id)
             
             # Check if collection has documents
-            total_chunks = collection.count()
+            total_chunks = await self._collection_size(collection)
             if total_chunks == 0:
-                logger.info(f"No knowledge base content for profile {profile_id}")
+                logger.info(f"No knowledge base content for {tier} {tier_id}")
                 return ""
             
             # Get a sample of chunks for diversity
@@ -825,7 +1836,9 @@ Apply these strategic guidelines for this specific profile:
                     break
                     
                 try:
-                    results = collection.query(
+                    results = await self._chroma(
+                        "query",
+                        collection.query,
                         query_texts=[query],
                         n_results=min(3, total_chunks)
                     )
@@ -845,7 +1858,7 @@ Apply these strategic guidelines for this specific profile:
             if len(all_chunks) < max_chunks // 2:
                 try:
                     # Get all chunks and sample
-                    all_results = collection.get(limit=min(50, total_chunks))
+                    all_results = await self._chroma("get", collection.get, limit=min(50, total_chunks))
                     if all_results and all_results["documents"]:
                         for doc in all_results["documents"]:
                             content_hash = hash(doc[:100])
@@ -862,7 +1875,7 @@ Apply these strategic guidelines for this specific profile:
             if len(combined_text) > 4000:
                 combined_text = combined_text[:4000] + "..."
             
-            logger.info(f"Generated knowledge summary ({len(combined_text)} chars) from {len(all_chunks)} chunks for profile {profile_id}")
+            logger.info(f"Generated knowledge summary ({len(combined_text)} chars) from {len(all_chunks)} chunks for {tier} {tier_id}")
             return combined_text
             
         except Exception as e:
@@ -888,17 +1901,19 @@ Apply these strategic guidelines for this specific profile:
             profile_id = doc.get("profile_id")
             
             # Get the collection for this profile
-            collection = self._get_collection(profile_id)
+            collection = await self._collection(profile_id)
             
             # Query all chunks for this document
             # ChromaDB stores document chunks with metadata containing the document_id
-            all_data = collection.get(
+            all_data = await self._chroma(
+                "get",
+                collection.get,
                 where={"document_id": document_id}
             )
             
             if not all_data or not all_data.get("documents"):
                 # Try alternative: get all and filter
-                all_data = collection.get()
+                all_data = await self._chroma("get", collection.get)
                 chunks = []
                 
                 if all_data and all_data.get("ids"):
@@ -930,29 +1945,34 @@ Apply these strategic guidelines for this specific profile:
             logger.error(f"Error getting document chunks: {str(e)}")
             return []
     
-    async def get_context_for_generation(self, profile_id: str, limit: int = 5) -> str:
+    async def get_context_for_generation(
+        self,
+        profile_id: str,
+        limit: int = 5,
+        model: Optional[str] = None
+    ) -> str:
         """
         Get context from knowledge base for AI content generation.
-        Returns a string of relevant chunks.
+        Returns a string of relevant chunks, packed into the model's
+        knowledge context token budget without repeated chunk overlap.
         """
         try:
-            collection = self._get_collection(profile_id)
+            collection = await self._collection(profile_id)
             
             # Get some representative chunks
-            results = collection.get(limit=limit)
+            results = await self._chroma("get", collection.get, limit=limit)
             
             if not results or not results.get("documents"):
                 return ""
             
-            # Combine chunks
-            chunks = results["documents"]
-            combined = "\n\n---\n\n".join(chunks)
-            
-            # Truncate if too long
-            if len(combined) > 3000:
-                combined = combined[:3000] + "..."
+            metadatas = results.get("metadatas") or [{}] * len(results["documents"])
+            chunks = [
+                {"content": doc, "metadata": metadata or {}}
+                for doc, metadata in zip(results["documents"], metadatas)
+            ]
+            packed = pack_chunks(chunks, get_context_token_budget(model))
             
-            return combined
+            return "\n\n---\n\n".join(c["content"] for c in packed.chunks)
             
         except Exception as e:
             logger.error(f"Error getting context for generation: {str(e)}")
@@ -0,0 +1,235 @@
+"""
+Latency-Aware Routing Service
+
+Routes a request across equivalent providers/models using the rolling
+latencies each circuit breaker already records
+(CircuitMetrics.recent_response_times), instead of only falling back after
+an exception.
+
+Features:
+- Rolling p50/p95 per route (one circuit per provider/model, e.g.
+  "openai:gpt-4o-mini", "image_generation:gemini")
+- Requests go to the fastest healthy route; routes whose circuit is open
+  are skipped
+- Hedged requests for latency-critical calls: if the first attempt runs
+  past its route's p95, a second attempt is fired on the next route and
+  whichever finishes first wins - the loser is cancelled
+- Sequential fallback to the next route when an attempt fails
+
+Usage:
+    from services.latency_router_service import Route, get_latency_router
+
+    routes = [
+        Route("openai", "openai:gpt-4o-mini", lambda: call_openai(prompt)),
+        Route("gemini", "gemini:gemini-2.5-flash", lambda: call_gemini(prompt)),
+    ]
+    result = await get_latency_router().execute(routes, hedge=True)
+    text, served_by = result.value, result.route
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from services.circuit_breaker_service import (
+    get_circuit_sync,
+    get_or_create_circuit,
+    get_fallback_response,
+    ServiceUnavailableError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Latency samples needed before a route's percentiles are trusted
+MIN_LATENCY_SAMPLES = 5
+
+# Never hedge sooner than this, even for very fast routes
+MIN_HEDGE_DELAY_MS = 250.0
+
+
+@dataclass
+class Route:
+    """One way of serving a request"""
+    name: str                              # e.g. "openai", "nano_banana"
+    circuit: str                           # Circuit breaker that records this route's latency
+    call: Callable[[], Awaitable[Any]]     # Performs the request (called once per attempt)
+
+
+@dataclass
+class RoutedResult:
+    """Outcome of a routed request"""
+    value: Any
+    route: str
+    hedged: bool = False
+    attempts: List[str] = field(default_factory=list)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    return sorted_values[int(pct * (len(sorted_values) - 1))]
+
+
+class LatencyRouter:
+    """Picks the fastest healthy route and hedges slow latency-critical calls."""
+
+    def __init__(self, min_samples: int = MIN_LATENCY_SAMPLES, min_hedge_delay_ms: float = MIN_HEDGE_DELAY_MS):
+        self.min_samples = min_samples
+        self.min_hedge_delay_ms = min_hedge_delay_ms
+        self.stats = {"routed": 0, "fallbacks": 0, "hedges_fired": 0, "hedge_wins": 0}
+
+    def latency_profile(self, circuit_name: str) -> Dict[str, Any]:
+        """Rolling p50/p95 for a route's circuit"""
+        circuit = get_circuit_sync(circuit_name)
+        samples = sorted(circuit.metrics.recent_response_times)
+        if len(samples) < self.min_samples:
+            return {"samples": len(samples), "p50_ms": None, "p95_ms": None}
+        return {
+            "samples": len(samples),
+            "p50_ms": round(_percentile(samples, 0.5), 2),
+            "p95_ms": round(_percentile(samples, 0.95), 2),
+        }
+
+    def _is_available(self, circuit_name: str) -> bool:
+        # Open circuits become available again once their half-open probe is due
+        return get_circuit_sync(circuit_name).recovery_in_seconds() is None
+
+    def rank(self, routes: List[Route], adaptive: bool = True) -> List[Route]:
+        """
+        Order healthy routes fastest first.
+
+        Routes without enough latency data keep the caller's preference:
+        the first route stays first until measured, the rest go last.
+        With adaptive=False the caller's order is kept as-is.
+        """
+        def sort_key(indexed):
+            index, route = indexed
+            p50 = self.latency_profile(route.circuit)["p50_ms"]
+            if p50 is None:
+                return 0.0 if index == 0 else float("inf")
+            return p50
+
+        healthy = [(i, r) for i, r in enumerate(routes) if self._is_available(r.circuit)]
+        if not adaptive:
+            return [route for _, route in healthy]
+        return [route for _, route in sorted(healthy, key=sort_key)]
+
+    def _hedge_delay_seconds(self, route: Route) -> Optional[float]:
+        p95 = self.latency_profile(route.circuit)["p95_ms"]
+        if p95 is None:
+            return None
+        return max(p95, self.min_hedge_delay_ms) / 1000
+
+    async def _attempt(self, route: Route) -> Any:
+        """Run one route with circuit breaker accounting"""
+        circuit = await get_or_create_circuit(route.circuit)
+        if not await circuit.can_execute():
+            await circuit.record_rejection()
+            raise ServiceUnavailableError(
+                route.circuit, get_fallback_response(route.circuit.split(":")[0])
+            )
+
+        start_time = time.time()
+        try:
+            value = await route.call()
+        except Exception as e:
+            await circuit.record_failure(e)
+            raise
+        # Cancelled attempts (hedge losers) are not recorded either way
+        await circuit.record_success((time.time() - start_time) * 1000)
+        return value
+
+    async def execute(self, routes: List[Route], hedge: bool = False, adaptive: bool = True) -> RoutedResult:
+        """
+        Serve a request from the fastest healthy route.
+
+        Args:
+            routes: Equivalent routes in preference order
+            hedge: Fire a second attempt on the next route once the first
+                passes its p95 (for latency-critical, idempotent calls)
+            adaptive: Reorder routes by latency (False keeps the given order
+                and only skips routes whose circuit is open)
+
+        Raises:
+            ServiceUnavailableError: If every route's circuit is open
+            Exception: The last route error if all attempts failed
+        """
+        ranked = self.rank(routes, adaptive)
+        if not ranked:
+            raise ServiceUnavailableError(
+                routes[0].circuit, get_fallback_response(routes[0].circuit.split(":")[0])
+            )
+
+        self.stats["routed"] += 1
+        primary, remaining = ranked[0], ranked[1:]
+        hedge_delay = self._hedge_delay_seconds(primary) if hedge and remaining else None
+
+        tasks: Dict[asyncio.Future, Route] = {}
+        attempts: List[str] = []
+
+        def start(route: Route) -> asyncio.Future:
+            attempts.append(route.name)
+            task = asyncio.ensure_future(self._attempt(route))
+            tasks[task] = route
+            return task
+
+        pending = {start(primary)}
+        hedged = False
+        last_error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                timeout = hedge_delay if (hedge_delay is not None and not hedged and remaining) else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # First attempt is past its p95 - race a second route against it
+                    route = remaining.pop(0)
+                    hedged = True
+                    self.stats["hedges_fired"] += 1
+                    logger.info(f"Hedging request: {primary.name} exceeded p95, also trying {route.name}")
+                    pending.add(start(route))
+                    continue
+
+                for task in done:
+                    if task.exception() is None:
+                        winner = tasks[task]
+                        if hedged and winner is not primary:
+                            self.stats["hedge_wins"] += 1
+                        return RoutedResult(task.result(), winner.name, hedged, attempts)
+                    last_error = task.exception()
+                    logger.warning(f"Route {tasks[task].name} failed: {str(last_error)[:100]}")
+
+                if not pending and remaining:
+                    self.stats["fallbacks"] += 1
+                    pending.add(start(remaining.pop(0)))
+        finally:
+            # Cancel the hedge loser (or everything, if we are being cancelled)
+            for task in pending:
+                task.cancel()
+
+        raise last_error
+
+    def get_status(self, circuit_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Routing statistics and per-route latency profiles"""
+        from services.circuit_breaker_service import _circuits
+
+        names = circuit_names or list(_circuits.keys())
+        return {
+            "stats": dict(self.stats),
+            "routes": {name: self.latency_profile(name) for name in names},
+        }
+
+
+# Global instance
+_latency_router: Optional[LatencyRouter] = None
+
+
+def get_latency_router() -> LatencyRouter:
+    """Get or create the latency router singleton"""
+    global _latency_router
+    if _latency_router is None:
+        _latency_router = LatencyRouter()
+    return _latency_router
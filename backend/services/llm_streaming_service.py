@@ -0,0 +1,327 @@
+"""
+LLM Streaming Service
+
+Streams chat completions token by token and frames them as Server-Sent Events,
+so interactive endpoints can show output while the model is still writing
+instead of holding the connection until the full completion is ready.
+
+Features:
+- Token streaming through litellm (the completion library LlmChat is built on)
+- Buffered fallback: if a stream cannot be opened, the completion is fetched
+  with LlmChat and emitted as a single chunk
+- Circuit breaker accounting and AIMD concurrency limits per provider (ARCH-003)
+- Client disconnects close the token iterator, which cancels the upstream call
+- Completion callback for credit deduction and usage logging
+
+SSE events:
+- token: {"token": "..."} for every chunk received from the provider
+- done:  {"content": "<full text>", ...} plus whatever on_complete returns
+- error: {"error": "...", "retry_after": ...}
+
+Usage:
+    from services.llm_streaming_service import stream_llm_completion, sse_response
+
+    tokens = stream_llm_completion(system_message, prompt, model="gpt-4o-mini")
+
+    async def finalize(content: str) -> Dict[str, Any]:
+        await deduct_credits(db, user_id, 1)
+        return {"tokens_used": len(content) // 4}
+
+    return sse_response(http_request, tokens, on_complete=finalize)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from services.circuit_breaker_service import (
+    CircuitState,
+    get_or_create_circuit,
+    get_or_create_limiter,
+    get_fallback_response,
+    ServiceUnavailableError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Universal (Emergent) keys are not accepted by the providers directly; they
+# are streamed through the OpenAI-compatible integration proxy. Set
+# UNIVERSAL_KEY_API_BASE to override it, or to an empty value to disable
+# streaming for universal keys (the buffered LlmChat completion is used).
+EMERGENT_KEY_PREFIX = "sk-emergent-"
+DEFAULT_UNIVERSAL_KEY_API_BASE = "https://integrations.emergentagent.com/llm"
+UNIVERSAL_KEY_API_BASE = os.environ.get("UNIVERSAL_KEY_API_BASE", DEFAULT_UNIVERSAL_KEY_API_BASE)
+
+# Provider-specific keys take precedence over the universal key
+PROVIDER_KEY_ENV = {
+    "openai": "OPENAI_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+}
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+
+def _resolve_api_key(provider: str, api_key: Optional[str]) -> Optional[str]:
+    """Resolve the API key for a provider from the argument or environment"""
+    if api_key:
+        return api_key
+    env_name = PROVIDER_KEY_ENV.get(provider)
+    return (env_name and os.environ.get(env_name)) or os.environ.get("EMERGENT_LLM_KEY")
+
+
+def check_streaming_config() -> bool:
+    """
+    Log a warning if streamed endpoints will fall back to buffered completions.
+
+    Called at startup. Returns True if token streaming is available.
+    """
+    try:
+        import litellm  # noqa: F401
+    except ImportError:
+        logger.warning("LLM streaming disabled: litellm is not installed - /stream endpoints send one buffered chunk")
+        return False
+
+    api_key = _resolve_api_key("openai", None)
+    if api_key and api_key.startswith(EMERGENT_KEY_PREFIX) and not UNIVERSAL_KEY_API_BASE:
+        logger.warning(
+            "LLM streaming disabled for the universal key: UNIVERSAL_KEY_API_BASE is empty - "
+            "/stream endpoints send one buffered chunk"
+        )
+        return False
+    return True
+
+
+def _build_completion_params(
+    system_message: str,
+    prompt: str,
+    provider: str,
+    model: str,
+    api_key: str,
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+) -> Optional[Dict[str, Any]]:
+    """
+    Build litellm completion parameters for a streamed chat call.
+
+    Returns None for a universal key when UNIVERSAL_KEY_API_BASE is empty.
+    """
+    params: Dict[str, Any] = {
+        "model": f"{provider}/{model}",
+        "messages": [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt},
+        ],
+        "api_key": api_key,
+        "stream": True,
+    }
+    if api_key.startswith(EMERGENT_KEY_PREFIX):
+        if not UNIVERSAL_KEY_API_BASE:
+            return None
+        params["api_base"] = UNIVERSAL_KEY_API_BASE
+    if temperature is not None:
+        params["temperature"] = temperature
+    if max_tokens:
+        params["max_tokens"] = max_tokens
+    return params
+
+
+async def _open_stream(params: Dict[str, Any]):
+    """Open a streamed completion, returning None if streaming is unavailable"""
+    try:
+        import litellm
+    except ImportError:
+        return None
+
+    try:
+        return await litellm.acompletion(**params)
+    except Exception as e:
+        logger.warning(f"Could not open LLM stream for {params['model']}, using buffered completion: {e}")
+        return None
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Extract the text delta from a streamed completion chunk"""
+    try:
+        return chunk.choices[0].delta.content or ""
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return ""
+
+
+async def _buffered_completion(
+    system_message: str,
+    prompt: str,
+    provider: str,
+    model: str,
+    api_key: str,
+) -> str:
+    """Fetch the whole completion with LlmChat (non-streaming fallback)"""
+    from uuid import uuid4
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+    chat = LlmChat(
+        api_key=api_key,
+        session_id=f"stream_fallback_{uuid4()}",
+        system_message=system_message
+    ).with_model(provider, model)
+    response = await chat.send_message(UserMessage(text=prompt))
+    return response if isinstance(response, str) else str(response)
+
+
+async def stream_llm_completion(
+    system_message: str,
+    prompt: str,
+    provider: str = "openai",
+    model: str = "gpt-4o-mini",
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    api_key: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a chat completion as text chunks.
+
+    Closing the iterator (e.g. because the client disconnected) closes the
+    provider stream, which aborts the upstream HTTP request.
+
+    Raises:
+        ServiceUnavailableError: If the provider circuit is open
+        HTTPException 500: If no API key is configured
+    """
+    resolved_key = _resolve_api_key(provider, api_key)
+    if not resolved_key:
+        raise HTTPException(500, "AI service not configured")
+
+    circuit = await get_or_create_circuit(provider)
+    if not await circuit.can_execute():
+        await circuit.record_rejection()
+        logger.warning(f"Circuit {provider} is OPEN - rejecting streamed LLM call")
+        raise ServiceUnavailableError(provider, get_fallback_response(provider))
+    probe = circuit.state == CircuitState.HALF_OPEN
+    outcome_recorded = False
+
+    # The slot is held for the whole stream, so long generations count against the limit
+    limiter = get_or_create_limiter(provider, model)
+    await limiter.acquire()
+
+    # Latency feedback is time to first token: whole-stream time grows with
+    # output length and would read as provider overload to the shared limiter
+    start_time = time.time()
+    first_token_ms: Optional[float] = None
+    try:
+        params = _build_completion_params(
+            system_message, prompt, provider, model, resolved_key, temperature, max_tokens
+        )
+        stream = await _open_stream(params) if params else None
+
+        if stream is None:
+            content = await _buffered_completion(system_message, prompt, provider, model, resolved_key)
+            first_token_ms = (time.time() - start_time) * 1000
+            yield content
+        else:
+            try:
+                async for chunk in stream:
+                    token = _chunk_text(chunk)
+                    if token:
+                        if first_token_ms is None:
+                            first_token_ms = (time.time() - start_time) * 1000
+                        yield token
+            finally:
+                close = getattr(stream, "aclose", None)
+                if close is not None:
+                    await close()
+
+        if first_token_ms is None:
+            first_token_ms = (time.time() - start_time) * 1000
+        limiter.record_outcome(first_token_ms)
+        outcome_recorded = True
+        await circuit.record_success(first_token_ms)
+    except Exception as e:
+        limiter.record_outcome((time.time() - start_time) * 1000, e)
+        outcome_recorded = True
+        await circuit.record_failure(e)
+        raise
+    finally:
+        # Client disconnects (GeneratorExit / CancelledError) end the call
+        # without an outcome - the half-open probe slot must still be freed
+        if probe and not outcome_recorded:
+            circuit.release_probe()
+        limiter.release()
+
+
+def format_sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a payload as a Server-Sent Events frame"""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_response(
+    request: Optional[Request],
+    tokens: AsyncIterator[str],
+    on_complete: Optional[Callable[[str], Awaitable[Optional[Dict[str, Any]]]]] = None,
+    on_cancel: Optional[Callable[[str], Awaitable[None]]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> StreamingResponse:
+    """
+    Wrap a token iterator in an SSE StreamingResponse.
+
+    Args:
+        request: Incoming request, polled for client disconnects
+        tokens: Async iterator of text chunks (see stream_llm_completion)
+        on_complete: Awaited with the full text once the stream finishes;
+            its returned dict is merged into the final "done" event.
+            This is where credits should be deducted and usage logged.
+        on_cancel: Scheduled with the partial text if the client disconnects
+            or the stream fails - credits are NOT deducted in that case.
+        metadata: Extra fields sent in an initial "start" event
+    """
+    async def event_stream():
+        parts = []
+        completed = False
+        try:
+            if metadata:
+                yield format_sse(metadata, event="start")
+
+            async for token in tokens:
+                if request is not None and await request.is_disconnected():
+                    logger.info("SSE client disconnected - cancelling upstream LLM call")
+                    break
+                parts.append(token)
+                yield format_sse({"token": token}, event="token")
+            else:
+                completed = True
+
+            if completed:
+                content = "".join(parts)
+                summary = await on_complete(content) if on_complete else None
+                yield format_sse({"content": content, **(summary or {})}, event="done")
+
+        except ServiceUnavailableError as e:
+            completed = False
+            yield format_sse({
+                "error": e.fallback_data.get("error", "AI service temporarily unavailable"),
+                "retry_after": e.retry_after
+            }, event="error")
+        except Exception as e:
+            completed = False
+            logger.error(f"SSE stream error: {str(e)}")
+            yield format_sse({"error": f"AI service error: {str(e)}"}, event="error")
+        finally:
+            # Closing the iterator aborts the provider request if it is still running
+            close = getattr(tokens, "aclose", None)
+            if close is not None:
+                await close()
+            if not completed and on_cancel is not None:
+                # Scheduled rather than awaited: the task may already be cancelled
+                asyncio.ensure_future(on_cancel("".join(parts)))
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
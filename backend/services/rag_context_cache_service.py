@@ -0,0 +1,171 @@
+"""
+Tiered RAG Context Cache Service
+
+Caches the assembled knowledge base context returned by
+KnowledgeBaseService.get_tiered_context_for_ai, which runs for every
+analysis and generation with frequently repeated queries.
+
+Entries are keyed by (tier ids, tier version counters, profile type,
+context token budget, normalized query hash):
+- Uploading or deleting a document bumps the version of its tier, so the
+  next lookup misses and stale entries age out
+- The shared version is the tier's knowledge_summaries.source_version,
+  which every document change bumps, so a change handled by one worker
+  invalidates the cache on every worker. A per-process counter (see
+  invalidate_rag_context) covers this worker if Mongo can't be read
+
+Usage:
+    from services.rag_context_cache_service import get_rag_context_cache
+
+    cache = get_rag_context_cache()
+    key = await cache.key(db, query, user_id, company_id, profile_id, profile_type)
+    context = cache.get(key)
+    if context is None:
+        context = await build_context(...)
+        cache.set(key, context)
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RAG_CONTEXT_CACHE_TTL_SECONDS = 300
+RAG_CONTEXT_CACHE_MAX_SIZE = 2000
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join((query or "").split()).lower()
+
+
+class RAGContextCache:
+    """
+    In-memory cache for assembled tiered RAG context.
+    Evicts the oldest entry when full, like ComplianceRequirementsCache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = RAG_CONTEXT_CACHE_MAX_SIZE,
+        ttl_seconds: int = RAG_CONTEXT_CACHE_TTL_SECONDS
+    ):
+        self._cache: Dict[str, str] = {}
+        self._timestamps: Dict[str, datetime] = {}
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        # Local document version per "<tier>:<tier_id>" (shared versions are in Mongo)
+        self._versions: Dict[str, int] = defaultdict(int)
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _tier_scopes(
+        self,
+        user_id: Optional[str],
+        company_id: Optional[str],
+        profile_id: Optional[str],
+        profile_type: str
+    ) -> List[str]:
+        """The tiers get_tiered_context_for_ai would query"""
+        scopes = []
+        if company_id:
+            scopes.append(f"company_universal:{company_id}")
+            if profile_type == "company":
+                scopes.append(f"company_professional:{company_id}")
+        if user_id:
+            scopes.append(f"user:{user_id}")
+        if profile_id:
+            scopes.append(f"profile:{profile_id}")
+        return scopes
+
+    async def key(
+        self,
+        db,
+        query: str,
+        user_id: Optional[str],
+        company_id: Optional[str] = None,
+        profile_id: Optional[str] = None,
+        profile_type: str = "personal",
+        token_budget: Optional[int] = None
+    ) -> str:
+        """
+        Cache key from tier ids, their shared and local versions, the token
+        budget and the normalized query.
+        """
+        scopes = self._tier_scopes(user_id, company_id, profile_id, profile_type)
+        shared: Dict[str, int] = {}
+        if db is not None and scopes:
+            try:
+                summaries = await db.knowledge_summaries.find(
+                    {"scope": {"$in": scopes}}, {"_id": 0, "scope": 1, "source_version": 1}
+                ).to_list(len(scopes))
+                shared = {s["scope"]: s.get("source_version", 0) for s in summaries}
+            except Exception as e:
+                logger.warning(f"Could not read knowledge versions for RAG context cache: {e}")
+        versions = ",".join(
+            f"{scope}={shared.get(scope, 0)}.{self._versions[scope]}" for scope in scopes
+        )
+        query_hash = hashlib.sha256(_normalize_query(query).encode("utf-8")).hexdigest()[:24]
+        return f"{profile_type}|{versions}|{token_budget or ''}|{query_hash}"
+
+    def _is_expired(self, key: str) -> bool:
+        if key not in self._timestamps:
+            return True
+        age = (datetime.now(timezone.utc) - self._timestamps[key]).total_seconds()
+        return age > self._ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        if key in self._cache and not self._is_expired(key):
+            self.stats["hits"] += 1
+            return self._cache[key]
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, context: str):
+        # Evict oldest entries if cache is full
+        if key not in self._cache and len(self._cache) >= self._max_size:
+            oldest_key = min(self._timestamps, key=self._timestamps.get)
+            del self._cache[oldest_key]
+            del self._timestamps[oldest_key]
+
+        self._cache[key] = context
+        self._timestamps[key] = datetime.now(timezone.utc)
+
+    def invalidate(self, tier: str, tier_id: str):
+        """
+        Bump a tier's local version after a document upload or delete, so
+        keys built for it before the change are never read again on this
+        worker (other workers see the shared source_version bump).
+        """
+        self._versions[f"{tier}:{tier_id}"] += 1
+        self.stats["invalidations"] += 1
+
+    def clear(self):
+        self._cache.clear()
+        self._timestamps.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._cache),
+            "hit_rate": round(self.stats["hits"] / total, 3) if total else 0.0,
+        }
+
+
+# Global cache instance
+_rag_context_cache: Optional[RAGContextCache] = None
+
+
+def get_rag_context_cache() -> RAGContextCache:
+    """Get or create the RAG context cache singleton"""
+    global _rag_context_cache
+    if _rag_context_cache is None:
+        _rag_context_cache = RAGContextCache()
+    return _rag_context_cache
+
+
+def invalidate_rag_context(tier: str, tier_id: str):
+    """Invalidate cached RAG context for a knowledge base tier"""
+    get_rag_context_cache().invalidate(tier, tier_id)
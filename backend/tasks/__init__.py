@@ -28,10 +28,12 @@ def register_all_tasks(service: JobQueueService):
     """
     from tasks.content_analysis_task import content_analysis_handler
     from tasks.content_generation_task import content_generation_handler
+    from tasks.content_repurpose_task import content_repurpose_handler
     from tasks.image_generation_task import image_generation_handler
     from tasks.social_posting_task import social_posting_handler
     
     service.register_task_handler(TaskType.CONTENT_ANALYSIS, content_analysis_handler)
     service.register_task_handler(TaskType.CONTENT_GENERATION, content_generation_handler)
+    service.register_task_handler(TaskType.CONTENT_REPURPOSE, content_repurpose_handler)
     service.register_task_handler(TaskType.IMAGE_GENERATION, image_generation_handler)
     service.register_task_handler(TaskType.SOCIAL_POSTING, social_posting_handler)
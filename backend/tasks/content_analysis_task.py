@@ -26,6 +26,9 @@ from services.token_tracking_service import AgentType
 
 logger = logging.getLogger(__name__)
 
+# Model that reads the analysis prompt (sizes the knowledge base context)
+ANALYSIS_MODEL = "gpt-4.1-nano"
+
 # Language mapping
 LANGUAGE_NAMES = {
     'en': 'English',
@@ -167,7 +170,8 @@ async def content_analysis_handler(
                     user_id=user_id,
                     company_id=company_id,
                     profile_id=profile_id,
-                    profile_type=profile_type
+                    profile_type=profile_type,
+                    model=ANALYSIS_MODEL
                 )
                 
                 if knowledge_context:
@@ -199,7 +203,7 @@ Your primary responsibility is to check social media content against the user's
         api_key=api_key,
         session_id=f"job_{job.job_id}",
         system_message=hardened_system_message
-    ).with_model("openai", "gpt-4.1-nano")
+    ).with_model("openai", ANALYSIS_MODEL)
     
     language_instruction = ""
     if language != "en":
@@ -318,7 +322,7 @@ CRITICAL: You MUST include ALL 6 cultural dimensions with detailed feedback for
     await log_llm_call(
         user_id=user_id,
         agent_type=AgentType.CONTENT_ANALYSIS,
-        model="gpt-4.1-nano",
+        model=ANALYSIS_MODEL,
         provider="openai",
         input_text=prompt,
         output_text=response,
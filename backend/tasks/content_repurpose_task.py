@@ -0,0 +1,96 @@
+"""
+Content Repurpose Background Task
+
+Long-input content operations that use the chunked map-reduce mode of
+AIContentAgent:
+- podcast_repurpose: transcript -> blog post, LinkedIn article, scripts
+- seo_blog_post: long source material -> SEO blog post
+
+This is the async version of the /api/content/repurpose-podcast and
+/api/content/generate-seo-blog endpoints. Segment progress from the
+map-reduce is forwarded to the job.
+"""
+
+import logging
+from typing import Dict, Any, Callable, Coroutine
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from services.job_queue_service import Job, JobProgress
+
+logger = logging.getLogger(__name__)
+
+TOTAL_STEPS = 3
+
+
+async def content_repurpose_handler(
+    job: Job,
+    db: AsyncIOMotorDatabase,
+    progress_callback: Callable[[JobProgress], Coroutine]
+) -> Dict[str, Any]:
+    """
+    Execute a podcast repurpose or SEO blog post job.
+    
+    Args:
+        job: Job containing input data ("operation" plus the agent arguments)
+        db: Database connection
+        progress_callback: Callback to report progress
+        
+    Returns:
+        The agent result dictionary
+    """
+    from services.ai_content_agent import get_content_agent
+    
+    input_data = job.input_data
+    user_id = job.user_id
+    operation = input_data.get("operation")
+    
+    logger.info(f"[ContentRepurposeTask] Starting {operation} for job {job.job_id}")
+    
+    await progress_callback(JobProgress(
+        current_step="Preparing input",
+        total_steps=TOTAL_STEPS,
+        current_step_num=1,
+        percentage=2,
+        message="Splitting long input into segments..."
+    ))
+    
+    async def agent_progress_callback(progress: Dict):
+        percentage = progress.get("percentage", 50)
+        await progress_callback(JobProgress(
+            current_step=progress.get("step", "Processing"),
+            total_steps=TOTAL_STEPS,
+            current_step_num=2 if percentage < 55 else 3,
+            percentage=percentage,
+            message=progress.get("step", "Processing")
+        ))
+    
+    agent = get_content_agent()
+    
+    if operation == "podcast_repurpose":
+        result = await agent.repurpose_podcast(
+            transcript_or_summary=input_data.get("transcript_or_summary", ""),
+            user_id=user_id,
+            podcast_title=input_data.get("podcast_title", "Podcast Episode"),
+            target_formats=input_data.get("target_formats"),
+            progress_callback=agent_progress_callback
+        )
+    elif operation == "seo_blog_post":
+        result = await agent.generate_seo_blog_post(
+            topic=input_data.get("topic", ""),
+            user_id=user_id,
+            target_keyword=input_data.get("target_keyword", ""),
+            word_count=input_data.get("word_count", 1200),
+            include_titles=input_data.get("include_titles", True),
+            include_meta=input_data.get("include_meta", True),
+            tone=input_data.get("tone", "professional"),
+            source_material=input_data.get("source_material"),
+            progress_callback=agent_progress_callback
+        )
+    else:
+        raise ValueError(f"Unknown repurpose operation: {operation}")
+    
+    if not result.get("success"):
+        raise Exception(result.get("error", f"{operation} failed"))
+    
+    logger.info(f"[ContentRepurposeTask] Completed job {job.job_id}")
+    return result
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Benchmark Suite
+
+Measures how KnowledgeBaseService scales with collection size, offline:
+- Synthetic, seeded corpora of 1k/10k/100k chunks spread over the
+  company universal, user and profile tiers
+- A local hashing embedding function stands in for the ONNX model, so no
+  network or model download is needed and runs are comparable
+- Ingestion throughput (documents/s, chunks/s)
+- Tiered query latency (p50/p90/p99) through query_tiered_knowledge_base
+- Peak RSS of the benchmark process and of the ingestion workers
+- On-disk size of the ChromaDB directory and embedding cache
+
+Each corpus size runs in a fresh subprocess (so peak RSS is per size) with
+its own temporary ChromaDB directory. Results are written as JSON next to
+tests/baseline_results.json.
+
+Usage:
+    cd backend
+    python tests/benchmark_knowledge_base.py                       # 1k, 10k, 100k
+    python tests/benchmark_knowledge_base.py --sizes 1000 --queries 100
+    python tests/benchmark_knowledge_base.py --output /tmp/kb.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_OUTPUT = BACKEND_DIR / "tests" / "kb_benchmark_results.json"
+DEFAULT_QUERIES = 200
+WARMUP_QUERIES = 10
+CHUNKS_PER_DOCUMENT = 10
+INGEST_CONCURRENCY = 4
+EMBEDDING_DIM = 384
+SEED = 1337
+
+# Tier layout of the synthetic corpus (documents are dealt round-robin)
+TIERS = ["company_universal", "user", "profile"]
+
+
+class HashingEmbeddingFunction:
+    """
+    Deterministic bag-of-words embedding (signed feature hashing).
+    Stands in for the ONNX model: similar texts get similar vectors, at a
+    fraction of the cost, so timings isolate storage and search.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        from services.hybrid_retrieval_service import tokenize
+
+        vectors = []
+        for text in input:
+            vector = np.zeros(self.dim, dtype=np.float32)
+            for token in tokenize(text):
+                digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+                vector[digest % self.dim] += 1.0 if digest >> 63 else -1.0
+            norm = np.linalg.norm(vector)
+            vectors.append(vector / norm if norm else vector)
+        return vectors
+
+    def embed_query(self, input: List[str]) -> List[np.ndarray]:
+        return self(input)
+
+    @staticmethod
+    def name() -> str:
+        return "benchmark-hashing"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"dim": self.dim}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "HashingEmbeddingFunction":
+        return HashingEmbeddingFunction(config.get("dim", EMBEDDING_DIM))
+
+    def is_legacy(self) -> bool:
+        return False
+
+    def default_space(self) -> str:
+        return "l2"
+
+    def supported_spaces(self) -> List[str]:
+        return ["cosine", "l2", "ip"]
+
+
+class LocalEmbeddingClient:
+    """Chroma client whose collections embed with the local stand-in"""
+
+    def __init__(self, client, embedding_function):
+        self._client = client
+        self._embedding_function = embedding_function
+
+    def get_or_create_collection(self, name, metadata=None):
+        return self._client.get_or_create_collection(
+            name=name, metadata=metadata, embedding_function=self._embedding_function
+        )
+
+    def __getattr__(self, attr):
+        return getattr(self._client, attr)
+
+
+class SyntheticCorpus:
+    """Seeded policy-like documents over a fixed pseudo-word vocabulary"""
+
+    def __init__(self, seed: int = SEED, vocabulary_size: int = 5000):
+        self.random = random.Random(seed)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        self.vocabulary = [
+            "".join(self.random.choice(letters) for _ in range(self.random.randint(3, 10)))
+            for _ in range(vocabulary_size)
+        ]
+
+    def sentence(self) -> str:
+        words = self.random.choices(self.vocabulary, k=self.random.randint(8, 18))
+        return " ".join(words).capitalize() + "."
+
+    def document(self, chunks: int = CHUNKS_PER_DOCUMENT) -> str:
+        # ~450 characters of new text per chunk
+        sentences, length = [], 0
+        while length < chunks * 450:
+            sentences.append(self.sentence())
+            length += len(sentences[-1]) + 1
+        return " ".join(sentences)
+
+    def query(self) -> str:
+        return " ".join(self.random.choices(self.vocabulary, k=self.random.randint(3, 6)))
+
+
+def _directory_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) if path.exists() else 0
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+def _percentile(samples: List[float], percent: int) -> float:
+    if len(samples) < 2:
+        return round(samples[0], 2) if samples else 0.0
+    return round(statistics.quantiles(samples, n=100, method="inclusive")[percent - 1], 2)
+
+
+async def _run_size(target_chunks: int, workdir: Path, queries: int) -> Dict[str, Any]:
+    """Ingest a corpus of target_chunks chunks and time tiered queries"""
+    import chromadb
+    from chromadb.config import Settings
+
+    from services import embedding_cache_service
+    from services.knowledge_base_service import KnowledgeBaseService
+
+    embedding_function = HashingEmbeddingFunction()
+    chroma_dir = workdir / "chromadb"
+    cache_dir = workdir / "embedding_cache"
+    client = chromadb.PersistentClient(path=str(chroma_dir), settings=Settings(anonymized_telemetry=False))
+    previous = (KnowledgeBaseService._chroma_client, KnowledgeBaseService._embedding_function)
+    KnowledgeBaseService._chroma_client = LocalEmbeddingClient(client, embedding_function)
+    KnowledgeBaseService._embedding_function = embedding_function
+    embedding_cache_service._embedding_caches[embedding_function.name()] = embedding_cache_service.EmbeddingStore(
+        cache_dir / embedding_function.name(), embedding_function.name()
+    )
+    service = KnowledgeBaseService(db=None)
+
+    ids = {"company_universal": "bench-company", "user": "bench-user", "profile": "bench-profile"}
+    try:
+        return await _measure(service, target_chunks, workdir, queries, ids)
+    finally:
+        # Leave no benchmark client or cached handles behind for the caller
+        KnowledgeBaseService._chroma_client, KnowledgeBaseService._embedding_function = previous
+        embedding_cache_service._embedding_caches.pop(embedding_function.name(), None)
+        for name in (
+            service._tiered_collection_name("company_universal", ids["company_universal"]),
+            service._tiered_collection_name("user", ids["user"]),
+            service._profile_collection_name(ids["profile"]),
+        ):
+            KnowledgeBaseService._collection_handles.pop(name, None)
+            KnowledgeBaseService._collection_sizes.pop(name, None)
+            KnowledgeBaseService._bm25_indexes.pop(name, None)
+            KnowledgeBaseService._bm25_journals.pop(name, None)
+
+
+async def _measure(service, target_chunks: int, workdir: Path, queries: int, ids: Dict[str, str]) -> Dict[str, Any]:
+    corpus = SyntheticCorpus()
+    docs_dir = workdir / "documents"
+    docs_dir.mkdir(parents=True, exist_ok=True)
+
+    semaphore = asyncio.Semaphore(INGEST_CONCURRENCY)
+    totals = {"documents": 0, "chunks": 0, "failed": 0}
+
+    async def ingest(index: int, text: str):
+        tier = TIERS[index % len(TIERS)]
+        path = docs_dir / f"doc_{index}.txt"
+        path.write_text(text)
+        async with semaphore:
+            if tier == "profile":
+                result = await service.process_document(str(path), ids[tier], path.name, ids["user"])
+            else:
+                result = await service.process_document_tiered(str(path), tier, ids[tier], path.name, ids["user"])
+        if result.get("success"):
+            totals["documents"] += 1
+            totals["chunks"] += result["chunk_count"]
+        else:
+            totals["failed"] += 1
+
+    # Documents are produced in waves until the corpus reaches the target
+    started = time.perf_counter()
+    index = 0
+    while totals["chunks"] < target_chunks:
+        remaining = target_chunks - totals["chunks"]
+        wave = max(1, min(INGEST_CONCURRENCY * 4, remaining // CHUNKS_PER_DOCUMENT))
+        await asyncio.gather(*(ingest(index + i, corpus.document()) for i in range(wave)))
+        index += wave
+        if totals["failed"] and not totals["documents"]:
+            raise RuntimeError("Every document failed to ingest")
+    ingest_seconds = time.perf_counter() - started
+
+    latencies = []
+    first_query_ms = None
+    for i in range(WARMUP_QUERIES + queries):
+        query_started = time.perf_counter()
+        await service.query_tiered_knowledge_base(
+            query=corpus.query(),
+            user_id=ids["user"],
+            company_id=ids["company_universal"],
+            profile_id=ids["profile"],
+            profile_type="personal"
+        )
+        elapsed_ms = (time.perf_counter() - query_started) * 1000
+        if first_query_ms is None:
+            first_query_ms = round(elapsed_ms, 2)
+        if i >= WARMUP_QUERIES:
+            latencies.append(elapsed_ms)
+
+    return {
+        "target_chunks": target_chunks,
+        "documents": totals["documents"],
+        "chunks": totals["chunks"],
+        "failed_documents": totals["failed"],
+        "ingest_seconds": round(ingest_seconds, 2),
+        "ingest_docs_per_second": round(totals["documents"] / ingest_seconds, 2),
+        "ingest_chunks_per_second": round(totals["chunks"] / ingest_seconds, 2),
+        "queries": len(latencies),
+        "first_query_ms": first_query_ms,
+        "query_p50_ms": _percentile(latencies, 50),
+        "query_p90_ms": _percentile(latencies, 90),
+        "query_p99_ms": _percentile(latencies, 99),
+        "query_mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_worker_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "chroma_disk_mb": round(_directory_size(workdir / "chromadb") / 2 ** 20, 2),
+        "embedding_cache_disk_mb": round(_directory_size(workdir / "embedding_cache") / 2 ** 20, 2),
+    }
+
+
+def run_size(target_chunks: int, queries: int = DEFAULT_QUERIES) -> Dict[str, Any]:
+    """Benchmark one corpus size in a temporary directory (in this process)"""
+    workdir = Path(tempfile.mkdtemp(prefix="kb_benchmark_"))
+    try:
+        return asyncio.run(_run_size(target_chunks, workdir, queries))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _environment() -> Dict[str, Any]:
+    from services.ingestion_pool_service import KB_INGEST_PROCESSES
+    from services.knowledge_base_service import CHUNK_OVERLAP, CHUNK_SIZE, INGEST_BATCH_CHUNKS, KB_HYBRID_RETRIEVAL
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+        "seed": SEED,
+        "embedding": {"function": HashingEmbeddingFunction.name(), "dim": EMBEDDING_DIM},
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "ingest_batch_chunks": INGEST_BATCH_CHUNKS,
+        "ingest_processes": KB_INGEST_PROCESSES,
+        "ingest_concurrency": INGEST_CONCURRENCY,
+        "hybrid_retrieval": KB_HYBRID_RETRIEVAL,
+        "tiers": TIERS,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge base scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Corpus sizes in chunks")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="Timed queries per size")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Results JSON path")
+    parser.add_argument("--run-size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_size:
+        # Worker mode: one size, result JSON on stdout
+        print(json.dumps(run_size(args.run_size, args.queries)))
+        return 0
+
+    print("📊 Knowledge Base Benchmark")
+    print("=" * 80)
+    results = {}
+    for size in args.sizes:
+        print(f"▶ {size} chunks ...", flush=True)
+        completed = subprocess.run(
+            [sys.executable, __file__, "--run-size", str(size), "--queries", str(args.queries)],
+            cwd=BACKEND_DIR, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            print(f"❌ {size} chunks failed:\n{completed.stderr[-2000:]}")
+            results[str(size)] = {"target_chunks": size, "error": completed.stderr.strip().splitlines()[-1:]}
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results[str(size)] = result
+        print(
+            f"   ingest {result['ingest_docs_per_second']} docs/s ({result['ingest_chunks_per_second']} chunks/s), "
+            f"query p50 {result['query_p50_ms']} ms / p99 {result['query_p99_ms']} ms, "
+            f"peak RSS {result['peak_rss_mb']} MB, disk {result['chroma_disk_mb']} MB"
+        )
+
+    report = {
+        "benchmark_date": datetime.now().isoformat(),
+        "environment": _environment(),
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print("=" * 80)
+    print(f"💾 Benchmark results saved to: {args.output}")
+    return 0 if all("error" not in r for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
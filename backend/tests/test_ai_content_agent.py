@@ -0,0 +1,411 @@
+"""
+Unit Tests for AI Content Agent
+
+Tests the verified rewrite loop:
+- Sentence splitting and changed-sentence detection
+- Incremental verification merge and full-check fallbacks
+- Pass decision, early stop and verification cost
+
+Tests the map-reduce mode for long inputs:
+- Segment splitting on paragraph and sentence boundaries
+- Multi-round reduce and truncation marking
+
+Tests the social campaign fan-out:
+- One variant per platform, bounded by SOCIAL_CAMPAIGN_FANOUT
+- Partial platform failure
+- Optional compliance check counted in tokens and cost
+"""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import services.ai_content_agent as ai_content_agent
+from services.ai_content_agent import (
+    AIContentAgent,
+    INCREMENTAL_VERIFY_MIN_EXCERPT_CHARS,
+    MAP_REDUCE_FINAL_MAX_CHARS,
+    MAP_REDUCE_MAX_ROUNDS,
+    MODEL_CONFIG,
+    ModelTier,
+    changed_sentences,
+    meets_rewrite_targets,
+    merge_incremental_verification,
+    split_into_segments,
+    split_sentences,
+)
+
+
+POST = (
+    "We are hiring a product designer to join our Berlin studio. "
+    "You will shape onboarding flows used by millions of people every week. "
+    "We welcome candidates from all backgrounds and experience levels.\n"
+    "#hiring #design"
+)
+
+
+def _agent():
+    agent = AIContentAgent(MagicMock(), api_key="test-key")
+    agent._log_agent_usage = AsyncMock()
+    return agent
+
+
+def _check(score=95, issues=None, spans=None, tokens=50):
+    return {
+        "compliance_score": score,
+        "cultural_score": score,
+        "accuracy_score": 100,
+        "issues": issues or [],
+        "flagged_spans": spans or [],
+        "tokens_used": tokens,
+    }
+
+
+class TestSentenceDiff:
+    """Test sentence splitting and diffing"""
+
+    def test_split_on_punctuation_and_lines(self):
+        """Test sentences and standalone lines such as hashtags are split"""
+        sentences = split_sentences(POST)
+
+        assert len(sentences) == 4
+        assert sentences[0] == "We are hiring a product designer to join our Berlin studio."
+        assert sentences[-1] == "#hiring #design"
+
+    def test_split_empty(self):
+        """Test empty or missing text has no sentences"""
+        assert split_sentences("") == []
+        assert split_sentences(None) == []
+
+    def test_only_changed_sentences_returned(self):
+        """Test unchanged sentences are not reported"""
+        edited = POST.replace("Berlin studio.", "Berlin or remote team.")
+
+        assert changed_sentences(POST, edited) == ["We are hiring a product designer to join our Berlin or remote team."]
+        assert changed_sentences(POST, POST) == []
+
+
+class TestIncrementalVerification:
+    """Test merging and falling back in _verify_rewrite"""
+
+    def test_merge_caps_scores_while_issues_carried(self):
+        """Test carried issues keep the merged score at or below the previous one"""
+        prev = _check(score=70, issues=["Age proxy"], spans=[{"text": "digital native", "issue": "Age proxy"}])
+        span_result = _check(score=100, issues=["Idiom", "Gendered term"],
+                             spans=[{"text": "rockstar", "issue": "Gendered term"}])
+
+        merged = merge_incremental_verification(prev, prev["flagged_spans"], span_result, 2)
+
+        assert merged["compliance_score"] == 70
+        assert merged["verification"] == "incremental" and merged["changed_sentences"] == 2
+        assert merged["issues"] == ["Age proxy", "Gendered term", "Idiom"]
+
+    @pytest.mark.asyncio
+    async def test_full_check_when_nothing_carried(self):
+        """Test a rewrite that fixed every previous issue is fully re-verified"""
+        agent = _agent()
+        agent._quick_compliance_check = AsyncMock(return_value=_check())
+        prev = _check(score=70, issues=["Age proxy"], spans=[{"text": "young", "issue": "Age proxy"}])
+
+        result = await agent._verify_rewrite(POST, "user-1", {"content": POST.replace("a product", "a young"), "result": prev})
+
+        assert result["verification"] == "full"
+        assert agent._quick_compliance_check.await_args.args[0] == POST
+
+    @pytest.mark.asyncio
+    async def test_full_check_when_excerpt_too_short(self):
+        """Test a tiny changed excerpt is not scored on its own"""
+        agent = _agent()
+        agent._quick_compliance_check = AsyncMock(return_value=_check())
+        content = POST.replace("every week.", "daily.")
+        prev = _check(score=70, issues=["Missing EEO"], spans=[{"text": "#hiring", "issue": "Missing EEO"}])
+
+        result = await agent._verify_rewrite(content, "user-1", {"content": POST, "result": prev})
+
+        assert len(changed_sentences(POST, content)[0]) < INCREMENTAL_VERIFY_MIN_EXCERPT_CHARS
+        assert result["verification"] == "full"
+
+    @pytest.mark.asyncio
+    async def test_incremental_when_issue_carried(self):
+        """Test only the changed sentences are checked while an issue is carried"""
+        agent = _agent()
+        agent._quick_compliance_check = AsyncMock(return_value=_check(score=100))
+        addition = (
+            " Reasonable accommodations are available on request during every stage of the process,"
+            " and interviews can be held remotely, in person, or asynchronously to suit each candidate."
+            " Share any adjustments you need with the recruiting team at any point."
+        )
+        content = POST.replace("every week.", "every week." + addition)
+        prev = _check(score=80, issues=["Missing EEO"], spans=[{"text": "#hiring", "issue": "Missing EEO"}])
+
+        result = await agent._verify_rewrite(content, "user-1", {"content": POST, "result": prev})
+
+        assert result["verification"] == "incremental"
+        assert result["compliance_score"] == 80
+        assert agent._quick_compliance_check.await_args.kwargs == {"excerpts": True}
+
+
+class TestRewriteLoop:
+    """Test the pass decision and accounting in iterative_rewrite_until_score"""
+
+    def test_pass_decision(self):
+        """Test every score must meet its threshold"""
+        assert meets_rewrite_targets({"compliance": 90, "cultural": 95, "accuracy": 100})
+        assert not meets_rewrite_targets({"compliance": 95, "cultural": 95, "accuracy": 99})
+        assert not meets_rewrite_targets({"compliance": 89, "cultural": 95, "accuracy": 100})
+
+    @pytest.mark.asyncio
+    async def test_stops_when_targets_met_and_costs_verification(self):
+        """Test the loop stops on a passing rewrite and prices verification tokens"""
+        agent = _agent()
+        results = [
+            {"content": "draft", "verification": _check(score=80, tokens=100),
+             "scores": {"compliance": 80, "cultural": 80, "accuracy": 100}, "rewrite_tokens": 1000},
+            {"content": "final", "verification": _check(score=95, tokens=100),
+             "scores": {"compliance": 95, "cultural": 95, "accuracy": 100}, "rewrite_tokens": 1000},
+        ]
+        agent._rewrite_candidate = AsyncMock(side_effect=results)
+
+        result = await agent.iterative_rewrite_until_score(POST, "user-1", max_iterations=3)
+
+        assert result["final_content"] == "final"
+        assert result["iterations_used"] == 2 and result["meets_quality_threshold"] is True
+        assert [h["candidates"] for h in result["iteration_history"]] == [1, 1]
+
+        metrics = result["metrics"]
+        expected_verification_cost = 200 / 1000 * MODEL_CONFIG[ModelTier.FAST]["cost_per_1k_output"]
+        expected_rewrite_cost = 2000 / 1000 * MODEL_CONFIG[ModelTier.TOP_TIER]["cost_per_1k_output"]
+        assert metrics["tokens_used"] == 2200
+        assert metrics["verification_cost"] == pytest.approx(expected_verification_cost)
+        assert metrics["estimated_cost"] == pytest.approx(expected_rewrite_cost + expected_verification_cost)
+
+
+def _paragraphs(count, words=60):
+    return "\n\n".join(" ".join(f"p{i}w{j}" for j in range(words)) + "." for i in range(count))
+
+
+class TestSplitIntoSegments:
+    """Test token-bounded segment splitting"""
+
+    def test_short_text_single_segment(self):
+        """Test text under the limit stays in one segment"""
+        assert split_into_segments(POST) == [POST.strip()]
+
+    def test_paragraphs_packed_without_splitting(self):
+        """Test paragraphs are packed into segments and never split across them"""
+        text = _paragraphs(12)
+        segments = split_into_segments(text, max_tokens=300)
+
+        assert len(segments) > 1
+        assert all(len(segment) <= 1200 for segment in segments)
+        assert "\n\n".join(segments) == text
+
+    def test_oversized_paragraph_split_on_sentences(self):
+        """Test a paragraph over the limit is split between sentences"""
+        paragraph = " ".join(f"Sentence number {i} is about the podcast." for i in range(60))
+        segments = split_into_segments(paragraph, max_tokens=100)
+
+        assert all(len(segment) <= 400 for segment in segments)
+        assert all(segment.endswith("podcast.") for segment in segments)
+
+    def test_oversized_sentence_hard_split(self):
+        """Test a single sentence over the limit is hard-split"""
+        segments = split_into_segments("x" * 1000, max_tokens=100)
+
+        assert [len(segment) for segment in segments] == [400, 400, 200]
+
+
+@pytest.mark.asyncio
+class TestMapReduce:
+    """Test _map_reduce rounds"""
+
+    @staticmethod
+    def _agent(reduce_output, partial_chars=1000):
+        """Agent whose map calls return partial_chars of text and reduce calls reduce_output(prompt)"""
+        agent = _agent()
+        agent._create_chat_instance = MagicMock()
+        calls = {"map": 0, "reduce": 0}
+
+        async def call_llm(chat, prompt, provider=None, model=None):
+            if prompt.startswith("MAP"):
+                calls["map"] += 1
+                return "m" * partial_chars
+            calls["reduce"] += 1
+            return reduce_output(prompt)
+
+        agent._call_llm_with_circuit_breaker = AsyncMock(side_effect=call_llm)
+        return agent, calls
+
+    async def test_reduces_in_rounds_until_partials_fit(self):
+        """Test oversized partials are reduced in groups before the final reduce"""
+        agent, calls = self._agent(lambda prompt: "r" * 200)
+        text = _paragraphs(60, words=400)
+
+        result = await agent._map_reduce(text, "user-1", ModelTier.BALANCED, "sys", "MAP", "REDUCE")
+
+        assert result["segments"] == calls["map"] > 12
+        assert result["rounds"] == 2
+        assert result["truncated"] is False
+        assert result["output"] == "r" * 200
+        assert result["tokens"] > 0 and result["cost"] > 0
+
+    async def test_truncation_marked_when_reduce_does_not_shrink(self):
+        """Test partials that never fit are cut, logged and marked truncated"""
+        agent, calls = self._agent(lambda prompt: prompt, partial_chars=3000)
+        text = _paragraphs(60, words=400)
+
+        result = await agent._map_reduce(text, "user-1", ModelTier.BALANCED, "sys", "MAP", "REDUCE")
+
+        final_prompt = agent._call_llm_with_circuit_breaker.await_args.args[1]
+        assert result["truncated"] is True
+        assert result["rounds"] <= MAP_REDUCE_MAX_ROUNDS
+        assert len(final_prompt) <= len("REDUCE\n\n") + MAP_REDUCE_FINAL_MAX_CHARS
+
+    async def test_short_input_single_call(self):
+        """Test input that fits in one segment skips the map step"""
+        agent, calls = self._agent(lambda prompt: "summary")
+
+        result = await agent._map_reduce(POST, "user-1", ModelTier.BALANCED, "sys", "MAP", "REDUCE")
+
+        assert calls == {"map": 0, "reduce": 1}
+        assert result == {"output": "summary", "segments": 1, "rounds": 1, "truncated": False,
+                          "tokens": result["tokens"], "cost": result["cost"]}
+
+
+@pytest.mark.asyncio
+class TestSocialCampaign:
+    """Test generate_social_campaign platform fan-out"""
+
+    @staticmethod
+    def _agent(fail=(), delay=0.0):
+        """Agent whose LLM returns a brief or a JSON post list per platform"""
+        agent = _agent()
+        agent._create_chat_instance = MagicMock(side_effect=lambda tier, session_id, system: session_id)
+        state = {"in_flight": 0, "max_in_flight": 0}
+
+        async def call_llm(session_id, prompt, provider=None, model=None):
+            if session_id.startswith("agent_social_brief"):
+                return "Brief: inclusive hiring campaign"
+            platform = session_id.split("_")[2]
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                state["in_flight"] -= 1
+            if platform in fail:
+                raise RuntimeError(f"{platform} provider down")
+            return json.dumps([{"text": f"{platform} post", "hashtags": ["#hiring"]}])
+
+        agent._call_llm_with_circuit_breaker = AsyncMock(side_effect=call_llm)
+        return agent, state
+
+    async def test_one_variant_per_platform(self):
+        """Test each platform gets its own posts and the brief is shared"""
+        agent, _ = self._agent()
+
+        result = await agent.generate_social_campaign(
+            "Hiring platform", "user-1", num_posts=1, include_image=False,
+            platforms=["twitter", "linkedin", "twitter"]
+        )
+
+        assert result["success"] is True
+        assert result["platforms"] == ["twitter", "linkedin"]
+        assert result["variants"]["linkedin"]["posts"][0]["text"] == "linkedin post"
+        assert result["posts"] == result["variants"]["twitter"]["posts"]
+        assert result["brief"] == "Brief: inclusive hiring campaign"
+        assert "compliance" not in result["variants"]["twitter"]
+
+    async def test_partial_platform_failure(self):
+        """Test a failed platform is reported without failing the campaign"""
+        agent, _ = self._agent(fail=("twitter",))
+
+        result = await agent.generate_social_campaign(
+            "Hiring platform", "user-1", include_image=False, platforms=["twitter", "linkedin"]
+        )
+
+        assert result["success"] is True
+        assert list(result["variants"]) == ["linkedin"]
+        assert result["platform"] == "linkedin"
+        assert "twitter provider down" in result["failed_platforms"]["twitter"]
+
+    async def test_all_platforms_failing_fails_campaign(self):
+        """Test the campaign fails when no platform succeeds"""
+        agent, _ = self._agent(fail=("twitter", "linkedin"))
+
+        result = await agent.generate_social_campaign(
+            "Hiring platform", "user-1", include_image=False, platforms=["twitter", "linkedin"]
+        )
+
+        assert result["success"] is False
+        assert "provider down" in result["error"]
+
+    async def test_fanout_capped(self, monkeypatch):
+        """Test no more than SOCIAL_CAMPAIGN_FANOUT platforms run at once"""
+        monkeypatch.setattr(ai_content_agent, "SOCIAL_CAMPAIGN_FANOUT", 2)
+        agent, state = self._agent(delay=0.02)
+
+        result = await agent.generate_social_campaign(
+            "Hiring platform", "user-1", include_image=False,
+            platforms=["twitter", "linkedin", "instagram", "facebook", "x"]
+        )
+
+        assert len(result["variants"]) == 5
+        assert state["max_in_flight"] == 2
+
+    async def test_compliance_check_counted(self):
+        """Test opted-in compliance checks add to the campaign tokens and cost"""
+        agent, _ = self._agent()
+        baseline = await agent.generate_social_campaign(
+            "Hiring platform", "user-1", include_image=False, platforms=["twitter", "linkedin"]
+        )
+        agent._quick_compliance_check = AsyncMock(return_value=_check(score=92, tokens=400))
+
+        result = await agent.generate_social_campaign(
+            "Hiring platform", "user-1", include_image=False, platforms=["twitter", "linkedin"],
+            check_compliance=True
+        )
+
+        expected_cost = 800 / 1000 * MODEL_CONFIG[ModelTier.FAST]["cost_per_1k_output"]
+        metrics = result["metrics"]
+        assert result["variants"]["twitter"]["compliance"]["compliance_score"] == 92
+        assert metrics["compliance_tokens"] == 800
+        assert metrics["text_tokens"] == baseline["metrics"]["text_tokens"] + 800
+        assert metrics["compliance_cost"] == pytest.approx(expected_cost)
+        assert metrics["total_cost"] == pytest.approx(baseline["metrics"]["total_cost"] + expected_cost, abs=1e-6)
+
+
+@pytest.mark.asyncio
+class TestForcedTier:
+    """Test force_tier reaches the buffered and streamed generation calls"""
+
+    async def test_generation_uses_forced_tier(self):
+        """Test the buffered Step 3 call runs on the forced tier's model"""
+        agent = _agent()
+        agent._call_llm_with_circuit_breaker = AsyncMock(return_value="Post")
+
+        await agent._generate_with_constraints("Write a post", {}, "user-1", None, ModelTier.FAST)
+
+        assert agent._call_llm_with_circuit_breaker.await_args.kwargs["model"] == MODEL_CONFIG[ModelTier.FAST]["model"]
+
+    async def test_stream_uses_forced_tier(self, monkeypatch):
+        """Test the streamed Step 3 call runs on the forced tier's model"""
+        import services.llm_streaming_service as streaming
+
+        agent = _agent()
+        agent._classify_domain = AsyncMock(return_value={"domain": "general"})
+        agent._get_compliance_requirements = AsyncMock(return_value={"rules": []})
+        monkeypatch.setattr(ai_content_agent, "is_feature_enabled", AsyncMock(return_value=True))
+        models = []
+
+        async def fake_stream(**kwargs):
+            models.append(kwargs["model"])
+            yield "Post"
+
+        monkeypatch.setattr(streaming, "stream_llm_completion", fake_stream)
+        tokens = [t async for t in agent.stream_generate_content("Write a post", "user-1", override_tier=ModelTier.FAST)]
+
+        assert tokens == ["Post"]
+        assert models == [MODEL_CONFIG[ModelTier.FAST]["model"]]
@@ -6,6 +6,7 @@ Tests the circuit breaker pattern implementation:
 - Failure tracking and thresholds
 - Metrics collection
 - Fallback execution
+- Adaptive (AIMD) concurrency limiting
 """
 
 import pytest
@@ -18,6 +19,11 @@ from services.circuit_breaker_service import (
     CircuitConfig,
     CircuitMetrics,
     CircuitBreaker,
+    AdaptiveConcurrencyLimiter,
+    LimiterConfig,
+    ServiceUnavailableError,
+    get_all_circuits_status,
+    llm_concurrency_slot,
 )
 
 
@@ -154,6 +160,17 @@ class TestCircuitBreakerStateTransitions:
             # Circuit is closed by default
             assert cb.state == CircuitState.CLOSED
 
+    def test_recovery_in_seconds(self):
+        """Test recovery time is reported only while an open circuit is cooling down"""
+        cb = CircuitBreaker("test_service", CircuitConfig(timeout_seconds=30))
+        assert cb.recovery_in_seconds() is None
+        
+        cb._transition_to(CircuitState.OPEN)
+        assert 0 < cb.recovery_in_seconds() <= 30
+        
+        cb.config.timeout_seconds = 0
+        assert cb.recovery_in_seconds() is None
+
 
 class TestCircuitBreakerMetrics:
     """Test circuit breaker metrics tracking"""
@@ -188,3 +205,82 @@ class TestCircuitBreakerFallback:
         
         # When open, calls should be rejected
         assert cb.state == CircuitState.OPEN
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test AIMD concurrency limiter"""
+    
+    def test_additive_increase_on_success(self):
+        """Test limit grows by about one after a limit-worth of successes"""
+        limiter = AdaptiveConcurrencyLimiter("test", LimiterConfig(initial_limit=4))
+        
+        for _ in range(4):
+            limiter.record_outcome(100.0)
+        
+        assert limiter._limit > 4
+        assert limiter.limit <= 5
+    
+    def test_multiplicative_decrease_on_rate_limit(self):
+        """Test a 429 halves the limit"""
+        limiter = AdaptiveConcurrencyLimiter("test", LimiterConfig(initial_limit=16))
+        
+        limiter.record_outcome(100.0, Exception("Error code: 429 - Too Many Requests"))
+        
+        assert limiter.limit == 8
+        assert limiter.metrics.overloads == 1
+    
+    def test_hard_failure_does_not_change_limit(self):
+        """Test non-overload errors are left to the circuit breaker"""
+        limiter = AdaptiveConcurrencyLimiter("test", LimiterConfig(initial_limit=16))
+        
+        limiter.record_outcome(100.0, ValueError("bad request"))
+        
+        assert limiter.limit == 16
+    
+    def test_latency_inflation_decreases_limit(self):
+        """Test latency far above baseline counts as overload"""
+        limiter = AdaptiveConcurrencyLimiter("test", LimiterConfig(initial_limit=16, min_latency_samples=5))
+        for _ in range(5):
+            limiter.record_outcome(100.0)
+        
+        limiter.record_outcome(1000.0)
+        
+        assert limiter.limit < 16
+    
+    @pytest.mark.asyncio
+    async def test_queued_caller_gets_released_slot(self):
+        """Test callers above the limit wait for a slot"""
+        limiter = AdaptiveConcurrencyLimiter("test", LimiterConfig(initial_limit=1))
+        await limiter.acquire()
+        
+        waiter = asyncio.ensure_future(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        assert limiter.get_status()["queued"] == 1
+        
+        limiter.release()
+        queue_time = await waiter
+        
+        assert queue_time >= 0
+        assert limiter.get_status()["in_flight"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_deadline_rejects_queued_caller(self):
+        """Test queued callers past their deadline are rejected"""
+        limiter = AdaptiveConcurrencyLimiter("test", LimiterConfig(initial_limit=1))
+        await limiter.acquire()
+        
+        with pytest.raises(ServiceUnavailableError):
+            await limiter.acquire(timeout=0.01)
+        
+        assert limiter.metrics.rejected == 1
+        assert limiter.get_status()["queued"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_limiters_in_circuit_status(self):
+        """Test limiter status appears in get_all_circuits_status"""
+        async with llm_concurrency_slot("test_provider", "test-model"):
+            status = get_all_circuits_status()
+        
+        limiter_status = status["concurrency_limiters"]["test_provider/test-model"]
+        assert limiter_status["in_flight"] == 1
+        assert "queued_calls" in status["summary"]
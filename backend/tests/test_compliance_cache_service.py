@@ -0,0 +1,138 @@
+"""
+Unit Tests for Compliance Requirements Cache Service
+
+Tests the pipeline Step 2 cache:
+- Keying by domain, policy-set version and language
+- Policy-set fingerprint changes when policies change
+- Invalidation on knowledge base changes, shared across workers
+- Eviction and expiry
+"""
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from services.compliance_cache_service import ComplianceRequirementsCache
+
+
+RULES = {"rules": ["no age preferences"], "prohibited_terms": ["young"]}
+
+
+def _mock_db(user, policies):
+    db = MagicMock()
+    db.users.find_one = AsyncMock(return_value=user)
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=policies)
+    db.policies.find = MagicMock(return_value=cursor)
+
+    # compliance_generations backed by a dict, shared by every cache using this db
+    generations = {}
+
+    async def update_one(query, update, upsert=False):
+        generations[query["scope"]] = generations.get(query["scope"], 0) + update["$inc"]["generation"]
+
+    def find(query, projection=None):
+        docs = [{"scope": scope, "generation": generations[scope]}
+                for scope in query["scope"]["$in"] if scope in generations]
+        return MagicMock(to_list=AsyncMock(return_value=docs))
+
+    db.compliance_generations.update_one = AsyncMock(side_effect=update_one)
+    db.compliance_generations.find = MagicMock(side_effect=find)
+    return db
+
+
+class TestCacheKeys:
+    """Test cache keying"""
+
+    def test_hit_after_set(self):
+        """Test a stored entry is returned for the same key"""
+        cache = ComplianceRequirementsCache()
+        cache.set("hiring", "v1", "en", RULES)
+
+        assert cache.get("hiring", "v1", "en") == RULES
+        assert cache.get_stats()["hits"] == 1
+
+    def test_language_and_domain_are_part_of_key(self):
+        """Test different language or domain misses"""
+        cache = ComplianceRequirementsCache()
+        cache.set("hiring", "v1", "en", RULES)
+
+        assert cache.get("hiring", "v1", "de") is None
+        assert cache.get("marketing", "v1", "en") is None
+
+    def test_expired_entry_misses(self):
+        """Test entries older than the TTL are not returned"""
+        cache = ComplianceRequirementsCache(ttl_seconds=-1)
+        cache.set("hiring", "v1", "en", RULES)
+
+        assert cache.get("hiring", "v1", "en") is None
+
+    def test_evicts_oldest_when_full(self):
+        """Test the oldest entry is evicted at max size"""
+        cache = ComplianceRequirementsCache(max_size=2)
+        cache.set("hiring", "v1", "en", RULES)
+        cache.set("legal", "v1", "en", RULES)
+        cache.set("marketing", "v1", "en", RULES)
+
+        assert cache.get("hiring", "v1", "en") is None
+        assert cache.get("marketing", "v1", "en") == RULES
+
+
+class TestPolicySetVersion:
+    """Test policy-set fingerprinting and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_version_changes_with_policies(self):
+        """Test adding a policy changes the version"""
+        cache = ComplianceRequirementsCache()
+        user = {"enterprise_id": "ent-1"}
+
+        before = await cache.get_policy_set_version(_mock_db(user, []), "user-1")
+        after = await cache.get_policy_set_version(
+            _mock_db(user, [{"id": "p1", "uploaded_at": "2025-01-01"}]), "user-1"
+        )
+
+        assert before != after
+
+    @pytest.mark.asyncio
+    async def test_version_stable_without_changes(self):
+        """Test the version is stable for an unchanged policy set"""
+        cache = ComplianceRequirementsCache()
+        db = _mock_db({}, [{"id": "p1", "uploaded_at": "2025-01-01"}])
+
+        assert await cache.get_policy_set_version(db, "user-1") == await cache.get_policy_set_version(db, "user-1")
+
+    @pytest.mark.asyncio
+    async def test_company_knowledge_invalidation(self):
+        """Test company knowledge changes change member versions"""
+        cache = ComplianceRequirementsCache()
+        db = _mock_db({"company_id": "co-1"}, [])
+
+        before = await cache.get_policy_set_version(db, "user-1")
+        await cache.invalidate(db, company_id="co-1")
+        after = await cache.get_policy_set_version(db, "user-1")
+
+        assert before != after
+        assert cache.get_stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers(self):
+        """Test an invalidation on one worker changes the version on another"""
+        db = _mock_db({"company_id": "co-1"}, [])
+        worker_a, worker_b = ComplianceRequirementsCache(), ComplianceRequirementsCache()
+
+        before = await worker_b.get_policy_set_version(db, "user-1")
+        await worker_a.invalidate(db, user_id="user-1")
+
+        assert await worker_b.get_policy_set_version(db, "user-1") != before
+
+    @pytest.mark.asyncio
+    async def test_unreadable_generations_fall_back_to_local(self):
+        """Test a failed generation read still honours local invalidations"""
+        cache = ComplianceRequirementsCache()
+        db = _mock_db({}, [])
+        db.compliance_generations.find = MagicMock(side_effect=RuntimeError("mongo down"))
+
+        before = await cache.get_policy_set_version(db, "user-1")
+        await cache.invalidate(user_id="user-1")
+
+        assert await cache.get_policy_set_version(db, "user-1") != before
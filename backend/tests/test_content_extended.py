@@ -4,6 +4,7 @@ Comprehensive tests for content analysis and generation endpoints.
 Based on routes in /app/backend/routes/content.py
 """
 
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
@@ -379,3 +380,73 @@ class TestAgentCapabilities:
             headers=user_headers
         )
         assert response.status_code in [200, 401, 403, 404, 422, 500]
+
+
+# =============================================================================
+# AGENTIC STAGE MERGE TESTS
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestAgentStageMerge:
+    """Tests for merging the concurrent employment law and cultural agents"""
+
+    @staticmethod
+    def _analysis():
+        return {
+            "summary": "Main analysis",
+            "compliance_analysis": {"severity": "none", "violations": []},
+            "cultural_analysis": {"overall_score": 80},
+        }
+
+    async def test_failing_and_malformed_agents_do_not_break_analysis(self):
+        """Test a raising agent and a malformed agent payload are skipped"""
+        from routes.content import _merge_agent_results, _run_cultural_stage, _run_employment_law_stage
+
+        malformed = {"violations_detected": True, "severity": "high", "violations": ["not a dict"]}
+        with patch("services.employment_law_agent.analyze_employment_compliance",
+                   AsyncMock(return_value=malformed)), \
+             patch("services.cultural_analysis_agent.analyze_cultural_sensitivity",
+                   AsyncMock(side_effect=RuntimeError("provider down"))):
+            hr_analysis, cultural_result = await asyncio.gather(
+                _run_employment_law_stage("We are hiring young graduates", "No custom policies uploaded"),
+                _run_cultural_stage("We are hiring young graduates", None, None),
+            )
+
+        assert hr_analysis is malformed and cultural_result is None
+        result = self._analysis()
+        scores = _merge_agent_results(result, hr_analysis, cultural_result, 90, 80, 85)
+
+        assert scores == (90, 80, 85)
+        assert result == self._analysis()
+
+    async def test_malformed_hr_result_still_merges_cultural(self):
+        """Test each merge is independent of the other"""
+        from routes.content import _merge_agent_results
+
+        cultural = {"analysis_type": "agentic_multi_model", "overall_score": 62, "models_used": ["gpt-4.1-mini"]}
+        result = self._analysis()
+        compliance, cultural_score, overall = _merge_agent_results(
+            result, {"violations_detected": True, "violations": [None]}, cultural, 90, 80, 85
+        )
+
+        assert (compliance, cultural_score, overall) == (90, 62, 85)
+        assert result["cultural_analysis"]["overall_score"] == 62
+        assert result["compliance_analysis"] == {"severity": "none", "violations": []}
+
+    async def test_violations_merged(self):
+        """Test detected violations cap the scores and flag the content"""
+        from routes.content import _merge_agent_results
+
+        hr_analysis = {
+            "violations_detected": True,
+            "severity": "high",
+            "compliance_score": 40,
+            "violations": [{"type": "age_discrimination", "explanation": "Age preference in hiring"}],
+        }
+        result = self._analysis()
+        compliance, cultural_score, overall = _merge_agent_results(result, hr_analysis, None, 90, 80, 85)
+
+        assert (compliance, cultural_score, overall) == (40, 80, 55)
+        assert result["flagged_status"] == "policy_violation"
+        assert result["compliance_analysis"]["violations"][0]["type"] == "age_discrimination"
+        assert result["compliance_analysis"]["employment_law_check"]["violation_count"] == 1
@@ -0,0 +1,115 @@
+"""
+Unit Tests for the Content Repurpose Background Task
+
+Tests the CONTENT_REPURPOSE job:
+- Handler dispatch per operation and agent progress forwarding
+- Failed agent results and unknown operations fail the job
+- /async endpoints queue a job with the request input
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.job_queue_service import Job, JobStatus, TaskType
+from tasks.content_repurpose_task import content_repurpose_handler
+
+
+def _job(input_data):
+    return Job(job_id="job-1", task_type=TaskType.CONTENT_REPURPOSE, user_id="user-1", input_data=input_data)
+
+
+def _agent():
+    agent = MagicMock()
+
+    async def repurpose_podcast(progress_callback=None, **kwargs):
+        await progress_callback({"step": "Processed segment 1/2", "percentage": 30})
+        await progress_callback({"step": "Writing formats", "percentage": 70})
+        return {"success": True, "formats": {"blog_post": "..."}}
+
+    agent.repurpose_podcast = AsyncMock(side_effect=repurpose_podcast)
+    agent.generate_seo_blog_post = AsyncMock(return_value={"success": False, "error": "LLM down"})
+    return agent
+
+
+@pytest.mark.asyncio
+class TestContentRepurposeHandler:
+    """Test content_repurpose_handler"""
+
+    async def test_podcast_progress_forwarded(self):
+        """Test agent progress becomes job progress with the right step number"""
+        agent = _agent()
+        progress = AsyncMock()
+
+        with patch("services.ai_content_agent.get_content_agent", return_value=agent):
+            result = await content_repurpose_handler(
+                _job({"operation": "podcast_repurpose", "transcript_or_summary": "transcript"}),
+                MagicMock(), progress
+            )
+
+        assert result["success"] is True
+        assert agent.repurpose_podcast.await_args.kwargs["transcript_or_summary"] == "transcript"
+        steps = [call.args[0] for call in progress.await_args_list]
+        assert [p.percentage for p in steps] == [2, 30, 70]
+        assert [p.current_step_num for p in steps] == [1, 2, 3]
+
+    async def test_failed_result_fails_job(self):
+        """Test an unsuccessful agent result raises with its error"""
+        with patch("services.ai_content_agent.get_content_agent", return_value=_agent()):
+            with pytest.raises(Exception, match="LLM down"):
+                await content_repurpose_handler(
+                    _job({"operation": "seo_blog_post", "topic": "t", "source_material": "long"}),
+                    MagicMock(), AsyncMock()
+                )
+
+    async def test_unknown_operation(self):
+        """Test an unknown operation is rejected"""
+        with patch("services.ai_content_agent.get_content_agent", return_value=_agent()):
+            with pytest.raises(ValueError, match="Unknown repurpose operation"):
+                await content_repurpose_handler(_job({"operation": "video"}), MagicMock(), AsyncMock())
+
+
+@pytest.mark.asyncio
+class TestRepurposeAsyncEndpoints:
+    """Test the /async endpoints queue CONTENT_REPURPOSE jobs"""
+
+    @staticmethod
+    def _job_service():
+        service = MagicMock()
+        service.create_job = AsyncMock(return_value=MagicMock(job_id="job-1", status=JobStatus.PENDING))
+        return service
+
+    async def test_podcast_async_queues_job(self):
+        """Test the podcast endpoint queues the transcript and returns the job id"""
+        from routes.content import PodcastRepurposeRequest, repurpose_podcast_async
+
+        service = self._job_service()
+        with patch("services.job_queue_service.get_job_queue_service", return_value=service):
+            response = await repurpose_podcast_async.__wrapped__(
+                request_obj=None,
+                request=PodcastRepurposeRequest(transcript_or_summary="transcript", podcast_title="Ep 1"),
+                user_id="user-1",
+                db_conn=MagicMock()
+            )
+
+        kwargs = service.create_job.await_args.kwargs
+        assert kwargs["task_type"] == TaskType.CONTENT_REPURPOSE
+        assert kwargs["input_data"]["operation"] == "podcast_repurpose"
+        assert kwargs["input_data"]["transcript_or_summary"] == "transcript"
+        assert response["job_id"] == "job-1" and response["status"] == "pending"
+
+    async def test_seo_blog_async_passes_source_material(self):
+        """Test the SEO blog endpoint queues the source material"""
+        from routes.content import SEOBlogPostRequest, generate_seo_blog_post_async
+
+        service = self._job_service()
+        with patch("services.job_queue_service.get_job_queue_service", return_value=service):
+            await generate_seo_blog_post_async.__wrapped__(
+                request_obj=None,
+                request=SEOBlogPostRequest(topic="Hiring", target_keyword="inclusive hiring", source_material="notes"),
+                user_id="user-1",
+                db_conn=MagicMock()
+            )
+
+        input_data = service.create_job.await_args.kwargs["input_data"]
+        assert input_data["operation"] == "seo_blog_post"
+        assert input_data["source_material"] == "notes"
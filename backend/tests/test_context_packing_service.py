@@ -0,0 +1,124 @@
+"""
+Unit Tests for Context Packing Service
+
+Tests packing retrieved chunks into a token budget:
+- SimHash near-duplicate detection
+- Overlap between adjacent chunks stripped
+- Tier priority and relevance ordering
+- Token budget respected
+"""
+
+from services.context_packing_service import (
+    CONTEXT_TOKEN_BUDGETS,
+    get_context_token_budget,
+    hamming_distance,
+    pack_chunks,
+    simhash,
+)
+from services.token_tracking_service import estimate_tokens
+
+TIERS = ["company_universal", "company_professional", "user", "profile"]
+
+POLICY = (
+    "Employees must disclose paid partnerships in every social post and never share client "
+    "data without written approval from the legal team. Product claims need a cited source, "
+    "pricing is only announced by marketing, and competitor names are not used in ads. "
+    "Posts about earnings wait until the quarterly report is public."
+)
+
+
+def _chunk(content, tier="user", document_id=None, chunk_index=None, distance=None, score=None):
+    metadata = {}
+    if document_id is not None:
+        metadata = {"document_id": document_id, "chunk_index": chunk_index}
+    return {"content": content, "metadata": metadata, "tier": tier, "distance": distance, "score": score}
+
+
+class TestSimHash:
+    """Test near-duplicate fingerprints"""
+
+    def test_small_edit_is_close(self):
+        """Test a one-word edit stays within the near-duplicate distance"""
+        edited = POLICY.replace("written approval", "explicit approval")
+        assert hamming_distance(simhash(POLICY), simhash(edited)) <= 10
+
+    def test_unrelated_text_is_far(self):
+        """Test unrelated chunks are not near-duplicates"""
+        other = (
+            "Our summer campaign focuses on outdoor gear for families, with weekly giveaways, "
+            "behind the scenes videos from the warehouse team, and customer stories from trail runners."
+        )
+        assert hamming_distance(simhash(POLICY), simhash(other)) > 10
+
+
+class TestPackChunks:
+    """Test pack_chunks"""
+
+    def test_near_duplicate_across_tiers_dropped(self):
+        """Test the lower-priority copy of a near-duplicate chunk is dropped"""
+        edited = POLICY.replace("written approval", "explicit approval")
+        packed = pack_chunks(
+            [_chunk(edited, tier="profile", distance=0.1), _chunk(POLICY, tier="company_universal", distance=0.3)],
+            1000, tier_order=TIERS
+        )
+
+        assert [c["tier"] for c in packed.chunks] == ["company_universal"]
+        assert packed.near_duplicates == 1
+
+    def test_adjacent_overlap_stripped(self):
+        """Test text shared with the previous chunk of a document appears once"""
+        first, second = POLICY[:200], POLICY[150:350]
+        packed = pack_chunks(
+            [_chunk(second, "user", "doc1", 1, distance=0.2), _chunk(first, "user", "doc1", 0, distance=0.1)],
+            1000, tier_order=TIERS
+        )
+
+        combined = "".join(c["content"] for c in packed.chunks)
+        assert combined.count(POLICY[150:200].strip()) == 1
+        assert packed.overlap_chars >= 40
+
+    def test_overlap_stripped_when_later_chunk_ranks_first(self):
+        """Test the earlier chunk loses its tail when the later one was packed first"""
+        first, second = POLICY[:200], POLICY[150:350]
+        packed = pack_chunks(
+            [_chunk(second, "user", "doc1", 1, distance=0.1), _chunk(first, "user", "doc1", 0, distance=0.2)],
+            1000, tier_order=TIERS
+        )
+
+        assert packed.chunks[0]["content"] == second
+        assert not packed.chunks[1]["content"].endswith(POLICY[190:200])
+
+    def test_tier_priority_then_relevance(self):
+        """Test chunks are ordered by tier before score or distance"""
+        chunks = [
+            _chunk("Profile strategy favours short video posts on weekdays.", "profile", distance=0.05),
+            _chunk("Use the approved logo lockup on every graphic.", "company_professional", distance=0.6),
+            _chunk("Never discuss unreleased products publicly.", "company_universal", score=0.01),
+            _chunk("Code of conduct applies to personal accounts too.", "company_universal", score=0.03),
+        ]
+        packed = pack_chunks(chunks, 1000, tier_order=TIERS)
+
+        assert [c["content"][:5] for c in packed.chunks] == ["Code ", "Never", "Use t", "Profi"]
+
+    def test_budget_respected(self):
+        """Test packing stops adding chunks at the token budget"""
+        chunks = [
+            _chunk(f"Rule {i}: " + " ".join(f"term{i}x{j}" for j in range(40)), distance=i / 10)
+            for i in range(10)
+        ]
+        budget = estimate_tokens(chunks[0]["content"]) * 3 + 5
+        packed = pack_chunks(chunks, budget, tier_order=TIERS)
+
+        assert packed.tokens <= budget
+        assert len(packed.chunks) == 3 and packed.over_budget == 7
+        assert packed.chunks[0]["content"].startswith("Rule 0:")
+
+    def test_model_budgets(self):
+        """Test larger models get a larger context budget"""
+        assert get_context_token_budget("gpt-4o") > get_context_token_budget(None)
+        assert get_context_token_budget("unknown-model") == get_context_token_budget()
+
+    def test_caller_models_have_budgets(self):
+        """Test every model that reads knowledge context has its own budget"""
+        callers = {"gpt-4o-mini", "gpt-4.1-mini", "gpt-4.1-nano", "claude-4-sonnet-20250514"}
+        assert callers <= set(CONTEXT_TOKEN_BUDGETS)
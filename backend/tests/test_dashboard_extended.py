@@ -182,3 +182,170 @@ class TestDashboardExport:
             headers=user_headers
         )
         assert response.status_code in [400, 401, 403, 404, 422, 500]
+
+
+# =============================================================================
+# AGGREGATION PIPELINE TESTS
+# =============================================================================
+
+def _aggregate_result(rows):
+    """Motor aggregate() stand-in returning fixed rows"""
+    return MagicMock(return_value=MagicMock(to_list=AsyncMock(return_value=rows)))
+
+
+def _dashboard_db(post_rows, analysis_rows):
+    db = MagicMock()
+    db.users.find_one = AsyncMock(return_value={"id": "user-1", "role": "user"})
+    db.posts.aggregate = _aggregate_result(post_rows)
+    db.content_analyses.aggregate = _aggregate_result(analysis_rows)
+    db.posts.find = MagicMock(side_effect=AssertionError("posts must not be loaded into Python"))
+    db.content_analyses.find = MagicMock(side_effect=AssertionError("analyses must not be loaded into Python"))
+    return db
+
+
+class TestDashboardAggregations:
+    """Tests that dashboard stats are computed by MongoDB aggregations"""
+
+    STATUS_ROWS = [
+        {"_id": "published", "count": 3, "post_ids": ["p1", "p2", "p3"]},
+        {"_id": "approved", "count": 1, "post_ids": ["p4"]},
+        {"_id": "draft", "count": 2, "post_ids": ["p5", "p6"]},
+        {"_id": "flagged", "count": 1, "post_ids": ["p7"]},
+    ]
+
+    @pytest.mark.asyncio
+    async def test_stats_from_status_counts(self):
+        """Test /stats buckets per-status counts and the averaged score"""
+        from routes.dashboard import get_dashboard_stats
+
+        db = _dashboard_db(self.STATUS_ROWS, [{"_id": None, "overall": 72.345}])
+        result = await get_dashboard_stats.__wrapped__(request=None, x_user_id="user-1", db_conn=db)
+
+        assert result["stats"] == {
+            "total_posts": 7,
+            "approved_posts": 4,
+            "pending_posts": 2,
+            "flagged_posts": 1,
+            "avg_overall_score": 72.3,
+        }
+        pipeline = db.posts.aggregate.call_args[0][0]
+        assert pipeline[0] == {"$match": {"user_id": "user-1"}}
+        assert "$group" in pipeline[1]
+
+    @pytest.mark.asyncio
+    async def test_overview_keeps_drill_down_ids(self):
+        """Test /overview returns ids per bucket and handles no analyses"""
+        from routes.dashboard import get_dashboard_overview
+
+        db = _dashboard_db(self.STATUS_ROWS, [])
+        result = await get_dashboard_overview.__wrapped__(
+            request=None, x_user_id="user-1", date_range="last_30_days",
+            custom_start=None, custom_end=None, db_conn=db
+        )
+
+        assert sorted(result["stats"]["approved"]["post_ids"]) == ["p1", "p2", "p3", "p4"]
+        assert result["stats"]["total_posts"]["value"] == 7
+        assert result["stats"]["revisions_requested"]["value"] == 0
+        assert result["scores"]["overall"]["value"] == 0
+        assert result["total_analyses"] == 0
+        assert "$or" in db.posts.aggregate.call_args[0][0][0]["$match"]
+
+    @pytest.mark.asyncio
+    async def test_content_strategy_resolves_profiles_in_one_query(self):
+        """Test profile names are fetched once for all grouped profile ids"""
+        from routes.dashboard import get_content_strategy_insights
+
+        facets = [{
+            "total": [{"count": 6}],
+            "by_platform": [{"_id": "linkedin", "count": 4}, {"_id": "unspecified", "count": 2}],
+            "by_profile": [{"_id": "prof-1", "count": 3}, {"_id": "prof-2", "count": 1}, {"_id": None, "count": 2}],
+        }]
+        db = _dashboard_db(facets, [])
+        db.strategic_profiles.find = MagicMock(return_value=MagicMock(
+            to_list=AsyncMock(return_value=[{"id": "prof-1", "name": "Brand"}])
+        ))
+
+        result = await get_content_strategy_insights.__wrapped__(
+            request=None, x_user_id="user-1", date_range="last_30_days",
+            custom_start=None, custom_end=None, db_conn=db
+        )
+
+        assert db.strategic_profiles.find.call_count == 1
+        assert {d["profile"]: d["count"] for d in result["posts_by_profile"]["data"]} == {
+            "Brand": 3, "Unknown": 1, "No Profile": 2
+        }
+        assert result["posts_by_platform"]["chart"] == {"labels": ["Linkedin", "Unspecified"], "data": [4, 2]}
+        assert result["total_posts"] == 6
+
+    def test_created_at_filter_matches_strings_and_dates(self):
+        """Test the date filter covers ISO-string and BSON-date created_at values"""
+        from datetime import datetime, timezone
+        from routes.dashboard import created_at_filter
+
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2025, 1, 31, tzinfo=timezone.utc)
+        branches = created_at_filter(start, end)["$or"]
+
+        assert branches[0]["created_at"] == {"$gte": start.isoformat(), "$lte": end.isoformat()}
+        assert branches[1]["created_at"] == {"$gte": start, "$lte": end}
+
+    def test_created_at_filter_normalizes_bounds_to_utc(self):
+        """Test offset and naive bounds match Z-suffixed UTC created_at strings"""
+        from datetime import datetime, timedelta, timezone
+        from routes.dashboard import created_at_filter
+
+        plus_five = timezone(timedelta(hours=5))
+        start = datetime(2025, 1, 10, 15, 0, tzinfo=plus_five)  # 10:00 UTC
+        end = datetime(2025, 1, 10, 18, 0)  # Naive, taken as UTC
+        bounds = created_at_filter(start, end)["$or"][0]["created_at"]
+
+        assert bounds == {"$gte": "2025-01-10T10:00:00+00:00", "$lte": "2025-01-10T18:00:00+00:00"}
+        inside, before = "2025-01-10T12:00:00Z", "2025-01-10T09:59:59.500000Z"
+        assert bounds["$gte"] <= inside <= bounds["$lte"]
+        assert not bounds["$gte"] <= before
+
+
+class TestTeamPerformanceAggregation:
+    """Tests that team performance runs a constant number of queries"""
+
+    def _db(self, member_count):
+        members = [{"id": f"m{i}", "full_name": f"Member {i}"} for i in range(member_count)]
+        db = MagicMock()
+        db.users.find_one = AsyncMock(return_value={"id": "m0", "role": "admin", "enterprise_id": "ent-1"})
+        db.users.find = MagicMock(return_value=MagicMock(to_list=AsyncMock(return_value=members)))
+        db.posts.aggregate = _aggregate_result([{"_id": f"m{i}", "content_volume": i} for i in range(member_count)])
+        db.content_analyses.aggregate = _aggregate_result([{"_id": "m3", "avg_score": 81.26}])
+        db.posts.find = MagicMock(side_effect=AssertionError("no per-member post queries"))
+        db.content_analyses.find = MagicMock(side_effect=AssertionError("no per-member analysis queries"))
+        return db
+
+    async def _call(self, db, **kwargs):
+        from routes.dashboard import get_team_performance
+
+        params = {"date_range": "last_30_days", "custom_start": None, "custom_end": None, "limit": 100, "skip": 0}
+        params.update(kwargs)
+        return await get_team_performance.__wrapped__(request=None, x_user_id="m0", db_conn=db, **params)
+
+    @pytest.mark.asyncio
+    async def test_one_aggregation_per_collection(self):
+        """Test a large team is served by one grouped aggregation per collection"""
+        db = self._db(300)
+        result = await self._call(db, limit=1000)
+
+        assert db.posts.aggregate.call_count == 1
+        assert db.content_analyses.aggregate.call_count == 1
+        group = db.posts.aggregate.call_args[0][0][1]["$group"]
+        assert group["_id"] == "$user_id"
+        assert result["team_performance"][0]["user_id"] == "m299"
+        assert next(m for m in result["team_performance"] if m["user_id"] == "m3")["avg_compliance_score"] == 81.3
+        assert result["team_performance"][-1]["avg_compliance_score"] == 0
+
+    @pytest.mark.asyncio
+    async def test_paginated_with_team_wide_charts(self):
+        """Test limit/skip page the members while charts show the team's top 10"""
+        result = await self._call(self._db(30), limit=5, skip=5)
+
+        assert [m["user_id"] for m in result["team_performance"]] == ["m24", "m23", "m22", "m21", "m20"]
+        assert result["pagination"] == {"total_members": 30, "limit": 5, "skip": 5}
+        assert result["charts"]["content_volume"]["data"][0] == 29
+        assert len(result["charts"]["content_volume"]["labels"]) == 10
@@ -0,0 +1,156 @@
+"""
+Unit Tests for Domain Classifier Service
+
+Tests the local Step 1 domain classifier:
+- Keyword automaton matching and confidence
+- Fallback signal when nothing matches
+- Online Naive Bayes training from logged classifications
+- Model-only answers need known tokens or agreeing keywords
+- Sampled LLM labels and the expiring training log
+- Shortcut statistics
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from services.domain_classifier_service import (
+    DomainClassifier,
+    LOCAL_CONFIDENCE_THRESHOLD,
+    MIN_TRAINING_SAMPLES,
+    TRAINING_LOG_COLLECTION,
+)
+
+
+DOMAINS = {
+    "hiring": {"keywords": ["hiring", "job", "position", "candidate", "salary"]},
+    "marketing": {"keywords": ["product", "sale", "discount", "buy"]},
+    "healthcare": {"keywords": ["health", "medical", "patient"]},
+    "financial": {"keywords": ["investment", "stock", "trading"]},
+    "legal": {"keywords": ["legal", "contract", "compliance"]},
+    "general": {"keywords": []},
+}
+
+
+class TestKeywordAutomaton:
+    """Test keyword-based classification"""
+
+    def test_confident_hiring_prompt(self):
+        """Test a prompt with several hiring keywords is classified locally"""
+        classifier = DomainClassifier(DOMAINS)
+        result = classifier.predict("We're hiring! Senior engineer position, competitive salary")
+
+        assert result["domain"] == "hiring"
+        assert result["confident"] is True
+        assert result["confidence"] >= LOCAL_CONFIDENCE_THRESHOLD
+
+    def test_word_boundaries(self):
+        """Test keywords do not match inside other words"""
+        classifier = DomainClassifier(DOMAINS)
+
+        assert classifier.keyword_scores("jobless buyers") == {}
+
+    def test_mixed_signals_not_confident(self):
+        """Test ambiguous prompts fall back to the LLM"""
+        classifier = DomainClassifier(DOMAINS)
+        result = classifier.predict("stock discount")
+
+        assert result["confident"] is False
+
+    def test_no_match_returns_general(self):
+        """Test prompts without signals default to general with zero confidence"""
+        classifier = DomainClassifier(DOMAINS)
+        result = classifier.predict("Write something about the weather today")
+
+        assert result["domain"] == "general"
+        assert result["confidence"] == 0.0
+        assert result["confident"] is False
+
+
+class TestOnlineModel:
+    """Test the Naive Bayes model trained from LLM classifications"""
+
+    def test_model_inactive_until_enough_samples(self):
+        """Test the model does not contribute with too little training data"""
+        classifier = DomainClassifier(DOMAINS)
+        classifier.observe("quarterly newsletter for our volunteers", "general")
+
+        assert classifier.model_probabilities("newsletter") == {}
+
+    def test_model_learns_from_observations(self):
+        """Test logged LLM answers teach the model new vocabulary"""
+        classifier = DomainClassifier(DOMAINS)
+        for _ in range(MIN_TRAINING_SAMPLES):
+            classifier.observe("quarterly newsletter for our volunteers", "general")
+            classifier.observe("new lawsuit filed over patents", "legal")
+
+        result = classifier.predict("quarterly volunteers newsletter")
+
+        assert result["domain"] == "general"
+        assert result["method"] == "model"
+        assert result["confident"] is True
+
+    def _skewed(self):
+        classifier = DomainClassifier(DOMAINS)
+        for i in range(40):
+            classifier.observe(f"team update number {i} for the office newsletter and quarterly plans", "general")
+        for i in range(10):
+            classifier.observe(f"patient clinic visit {i}", "healthcare")
+        return classifier
+
+    def test_unseen_text_not_confident(self):
+        """Test text the model has never seen does not skip the LLM"""
+        classifier = self._skewed()
+
+        for prompt in ("company picnic bake-off", "CEO speaks at kubernetes conference"):
+            result = classifier.predict(prompt)
+            assert result["confident"] is False, prompt
+            assert result["confidence"] < 1.0
+
+    def test_few_known_tokens_need_agreeing_keywords(self):
+        """Test a model answer on one known token is only confident when keywords agree"""
+        classifier = self._skewed()
+
+        assert classifier.predict("visit")["confident"] is False
+        assert classifier.predict("patient visit")["confident"] is True
+
+    def test_unknown_domain_ignored(self):
+        """Test labels outside the domain table are not learned"""
+        classifier = DomainClassifier(DOMAINS)
+        classifier.observe("anything", "sports")
+
+        assert classifier.get_stats()["trained_samples"] == 0
+
+    @pytest.mark.asyncio
+    async def test_record_without_db(self):
+        """Test recording a classification without a database still trains"""
+        classifier = DomainClassifier(DOMAINS)
+        await classifier.record_llm_classification(None, "patient care tips", "healthcare")
+
+        assert classifier.get_stats()["trained_samples"] == 1
+
+    @pytest.mark.asyncio
+    async def test_logged_classification_expires(self):
+        """Test logged prompts carry the date the TTL index expires them at"""
+        classifier = DomainClassifier(DOMAINS)
+        log = MagicMock()
+        log.insert_one = AsyncMock()
+
+        await classifier.record_llm_classification({TRAINING_LOG_COLLECTION: log}, "patient care tips", "healthcare")
+
+        entry = log.insert_one.await_args.args[0]
+        assert entry["expires_at"].isoformat() > entry["created_at"]
+
+
+class TestLabelSampling:
+    """Test confident prompts are still sampled for LLM labels"""
+
+    def test_sample_rate(self):
+        """Test sampling follows the configured rate and is counted"""
+        classifier = DomainClassifier(DOMAINS)
+
+        with patch("services.domain_classifier_service.random.random", return_value=0.01):
+            assert classifier.sample_for_label() is True
+        with patch("services.domain_classifier_service.random.random", return_value=0.5):
+            assert classifier.sample_for_label() is False
+
+        assert classifier.get_stats()["label_samples"] == 1
@@ -0,0 +1,98 @@
+"""
+Unit Tests for Embedding Cache Service
+
+Tests the content-hash embedding store:
+- Only uncached texts are embedded
+- Vectors survive a reload from disk
+- Rows written by another store instance are picked up
+- Partial writes from a crash are truncated; the entry cap is enforced
+"""
+
+import numpy as np
+
+from services.embedding_cache_service import EmbeddingStore, content_hash
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.embedded = []
+
+    def __call__(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(t)), float(sum(map(ord, t)) % 97), 1.0] for t in texts]
+
+
+class TestEmbeddingStore:
+    """Test EmbeddingStore"""
+
+    def test_only_misses_are_embedded(self, tmp_path):
+        """Test cached and duplicate texts are not re-embedded"""
+        store = EmbeddingStore(tmp_path, "test")
+        embedder = CountingEmbedder()
+
+        first = store.embed(["alpha", "beta", "alpha"], embedder)
+        second = store.embed(["beta", "gamma"], embedder)
+
+        assert embedder.embedded == ["alpha", "beta", "gamma"]
+        assert first[0] == first[2]
+        assert second[0] == first[1]
+        assert store.get_stats()["entries"] == 3
+
+    def test_persisted_across_instances(self, tmp_path):
+        """Test vectors are read back from the memory-mapped file"""
+        embedder = CountingEmbedder()
+        original = EmbeddingStore(tmp_path, "test").embed(["policy text"], embedder)
+
+        reloaded = EmbeddingStore(tmp_path, "test")
+
+        assert reloaded.dim == 3
+        assert reloaded.embed(["policy text"], embedder) == original
+        assert embedder.embedded == ["policy text"]
+
+    def test_sees_other_writers(self, tmp_path):
+        """Test a store picks up rows appended by another instance"""
+        reader = EmbeddingStore(tmp_path, "test")
+        writer = EmbeddingStore(tmp_path, "test")
+        writer.put_many({content_hash("shared"): [1.0, 2.0, 3.0]})
+
+        found = reader.get_many([content_hash("shared")])
+
+        assert np.allclose(found[content_hash("shared")], [1.0, 2.0, 3.0])
+
+    def test_dimension_mismatch_not_cached(self, tmp_path):
+        """Test vectors of the wrong size are not stored"""
+        store = EmbeddingStore(tmp_path, "test")
+        store.put_many({"a": [1.0, 2.0, 3.0]})
+        store.put_many({"b": [1.0, 2.0]})
+
+        assert store.get_many(["a", "b"]).keys() == {"a"}
+
+    def test_partial_writes_truncated_before_append(self, tmp_path):
+        """Test a crash mid-append does not misalign later rows"""
+        store = EmbeddingStore(tmp_path, "test")
+        store.put_many({"a": [1.0, 2.0, 3.0]})
+        with open(tmp_path / "vectors.f32", "ab") as f:
+            f.write(np.float32(9.0).tobytes())  # Half of a crashed row
+        with open(tmp_path / "index.txt", "a") as f:
+            f.write("crashed 1")  # No newline
+
+        store = EmbeddingStore(tmp_path, "test")
+        store.put_many({"b": [4.0, 5.0, 6.0]})
+        reloaded = EmbeddingStore(tmp_path, "test")
+
+        found = reloaded.get_many(["a", "b"])
+        assert np.allclose(found["a"], [1.0, 2.0, 3.0])
+        assert np.allclose(found["b"], [4.0, 5.0, 6.0])
+        assert reloaded.get_stats()["entries"] == 2
+
+    def test_stops_storing_at_max_entries(self, tmp_path):
+        """Test the store does not grow past its entry cap"""
+        store = EmbeddingStore(tmp_path, "test", max_entries=2)
+        embedder = CountingEmbedder()
+
+        vectors = store.embed(["one", "two", "three"], embedder)
+
+        assert len(vectors) == 3
+        assert store.get_stats()["entries"] == 2
+        assert store.get_stats()["skipped_full"] == 1
+        assert store.get_many([content_hash("three")]) == {}
@@ -0,0 +1,146 @@
+"""
+Unit Tests for Employment Law Agent
+
+Tests the shortcuts around the three-call LLM pipeline:
+- Local pre-filter for non-employment content
+- Content-hash result cache
+- Fast validation mode
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from services.employment_law_agent import EmploymentLawAgent, has_employment_signals
+
+
+HIRING_POST = "We're hiring! Looking for a recent grad rockstar to join our team."
+
+CLASSIFICATION = {
+    "is_workplace_content": True,
+    "content_type": "hiring_post",
+    "requires_compliance_check": True,
+    "detected_topics": ["hiring"],
+    "confidence": 0.9
+}
+
+
+def _analysis(severity="moderate", confidence=0.95, violations=True):
+    return {
+        "violations_detected": violations,
+        "severity": severity if violations else "none",
+        "compliance_score": 70 if violations else 100,
+        "overall_rating": "needs_improvement" if violations else "good",
+        "violations": [{"type": "age_discrimination", "severity": severity}] if violations else [],
+        "summary": "",
+        "rewrite_suggestions": [],
+        "positive_elements": [],
+        "confidence": confidence,
+        "analysis_type": "primary_compliance"
+    }
+
+
+def _agent(analysis, validation_mode="full"):
+    agent = EmploymentLawAgent(api_key="test-key", validation_mode=validation_mode)
+    agent._classify_content = AsyncMock(return_value=dict(CLASSIFICATION))
+    agent._analyze_compliance = AsyncMock(return_value=analysis)
+    agent._validate_analysis = AsyncMock(
+        return_value={**analysis, "analysis_type": "validated_ensemble", "validation_status": "confirmed"}
+    )
+    return agent
+
+
+class TestPreFilter:
+    """Test the local employment-signal pre-filter"""
+
+    def test_detects_employment_content(self):
+        """Test hiring and recognition content passes the filter"""
+        assert has_employment_signals(HIRING_POST)
+        assert has_employment_signals("Congratulations to Sarah on her promotion!")
+
+    def test_ignores_unrelated_content(self):
+        """Test product content without employment terms is filtered"""
+        assert not has_employment_signals("Our new summer sneakers are 20% off this weekend.")
+
+    @pytest.mark.asyncio
+    async def test_skips_all_llm_calls(self):
+        """Test filtered content never reaches the classifier"""
+        agent = _agent(_analysis())
+
+        result = await agent.analyze_content("Fresh strawberries at the farmers market today.")
+
+        assert result["analysis_type"] == "skipped"
+        agent._classify_content.assert_not_called()
+        assert agent.stats["prefilter_skips"] == 1
+
+
+class TestResultCache:
+    """Test the content-hash result cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_content_hits_cache(self):
+        """Test identical content and policies reuse the first result"""
+        agent = _agent(_analysis(severity="high"))
+
+        first = await agent.analyze_content(HIRING_POST, company_policies="Policy A")
+        second = await agent.analyze_content(HIRING_POST, company_policies="Policy A")
+
+        assert first == second
+        assert agent._analyze_compliance.await_count == 1
+        assert agent.stats["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_policy_change_misses_cache(self):
+        """Test different company policies are analyzed separately"""
+        agent = _agent(_analysis(severity="high"))
+
+        await agent.analyze_content(HIRING_POST, company_policies="Policy A")
+        await agent.analyze_content(HIRING_POST, company_policies="Policy B")
+
+        assert agent._analyze_compliance.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_not_cached(self):
+        """Test analysis failures are retried on the next call"""
+        agent = _agent(EmploymentLawAgent(api_key="test-key")._empty_result("Analysis failed: timeout"))
+
+        await agent.analyze_content(HIRING_POST)
+        await agent.analyze_content(HIRING_POST)
+
+        assert agent._analyze_compliance.await_count == 2
+
+
+class TestValidationMode:
+    """Test validation skipping"""
+
+    @pytest.mark.asyncio
+    async def test_full_mode_validates_violations(self):
+        """Test full mode always validates analyses with violations"""
+        agent = _agent(_analysis())
+
+        result = await agent.analyze_content(HIRING_POST)
+
+        assert result["analysis_type"] == "validated_ensemble"
+        assert agent.stats["validations_run"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_skips_confident_moderate(self):
+        """Test fast mode trusts confident analyses with moderate findings"""
+        agent = _agent(_analysis(severity="moderate", confidence=0.95), validation_mode="fast")
+
+        result = await agent.analyze_content(HIRING_POST)
+
+        agent._validate_analysis.assert_not_called()
+        assert result["validation_status"] == "skipped_high_confidence"
+        assert agent.get_stats()["rates"]["validation_skips_fast_mode"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_validates_severe_findings(self):
+        """Test fast mode still validates severe findings and low confidence"""
+        severe = _agent(_analysis(severity="severe", confidence=0.99), validation_mode="fast")
+        unsure = _agent(_analysis(severity="moderate", confidence=0.6), validation_mode="fast")
+
+        await severe.analyze_content(HIRING_POST)
+        await unsure.analyze_content(HIRING_POST)
+
+        severe._validate_analysis.assert_awaited_once()
+        unsure._validate_analysis.assert_awaited_once()
@@ -0,0 +1,58 @@
+"""
+Unit Tests for Hybrid Retrieval Service
+
+Tests lexical retrieval and fusion:
+- BM25 ranks exact terms and supports incremental updates
+- Reciprocal rank fusion rewards agreement between rankings
+"""
+
+from services.hybrid_retrieval_service import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+class TestBM25Index:
+    """Test BM25Index"""
+
+    def _index(self):
+        index = BM25Index()
+        index.add(
+            ["a", "b", "c"],
+            [
+                "Patient data must follow HIPAA rules at all times",
+                "Posts about patients need manager approval",
+                "Use the brand colours in every campaign",
+            ],
+        )
+        return index
+
+    def test_exact_term_ranks_first(self):
+        """Test a rare exact term finds its chunk"""
+        results = self._index().search("HIPAA compliance", 3)
+
+        assert results[0][0] == "a"
+        assert len(results) == 1
+
+    def test_remove_and_replace(self):
+        """Test removed chunks stop matching and re-adding replaces text"""
+        index = self._index()
+        index.remove(["a"])
+        index.add(["b"], ["HIPAA training is mandatory"])
+
+        assert [chunk_id for chunk_id, _ in index.search("hipaa", 3)] == ["b"]
+        assert index.search("manager approval", 3) == []
+        assert len(index) == 2
+
+    def test_stopwords_ignored(self):
+        """Test stopwords don't produce matches"""
+        assert tokenize("The rules of the brand") == ["rules", "brand"]
+        assert self._index().search("the and of", 3) == []
+
+
+class TestReciprocalRankFusion:
+    """Test reciprocal_rank_fusion"""
+
+    def test_agreement_wins(self):
+        """Test an item ranked well by both lists beats a single top rank"""
+        fused = reciprocal_rank_fusion([["x", "y", "z"], ["y", "w"]])
+
+        assert fused[0][0] == "y"
+        assert {item for item, _ in fused} == {"x", "y", "z", "w"}
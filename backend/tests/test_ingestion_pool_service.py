@@ -0,0 +1,64 @@
+"""
+Unit Tests for Ingestion Pool Service
+
+Tests the document parsing pool:
+- Jobs run in a separate worker process
+- The concurrency cap queues documents beyond the worker count
+- Errors propagate and are counted
+"""
+
+import asyncio
+import os
+import time
+import pytest
+
+from services.ingestion_pool_service import IngestionPool
+
+
+def _fail(message):
+    raise ValueError(message)
+
+
+class TestIngestionPool:
+    """Test IngestionPool"""
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self):
+        """Test jobs execute outside the API process"""
+        pool = IngestionPool(max_workers=1)
+
+        pid = await pool.run("pid", os.getpid)
+
+        assert pid != os.getpid()
+        assert pool.get_stats()["operations"]["pid"]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test documents beyond the cap wait for a free slot"""
+        pool = IngestionPool(max_workers=0)
+        observed = []
+
+        async def watch():
+            await asyncio.sleep(0.05)
+            observed.append(pool.get_stats())
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            pool.run("sleep", time.sleep, 0.1),
+            pool.run("sleep", time.sleep, 0.1),
+            watch()
+        )
+
+        assert time.perf_counter() - start >= 0.2
+        assert observed[0]["running"] == 1 and observed[0]["queued"] == 1
+        assert pool.get_stats()["operations"]["sleep"]["avg_wait_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self):
+        """Test worker exceptions reach the caller and are counted"""
+        pool = IngestionPool(max_workers=1)
+
+        with pytest.raises(ValueError, match="unreadable"):
+            await pool.run("parse", _fail, "unreadable")
+
+        assert pool.get_stats()["operations"]["parse"]["errors"] == 1
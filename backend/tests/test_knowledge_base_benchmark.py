@@ -0,0 +1,44 @@
+"""
+Unit Tests for the Knowledge Base Benchmark Suite
+
+Tests the offline benchmark harness:
+- Deterministic local embedding stand-in
+- Seeded synthetic corpus
+- A small end-to-end run reports every metric
+"""
+
+import numpy as np
+import pytest
+
+from tests.benchmark_knowledge_base import HashingEmbeddingFunction, SyntheticCorpus, run_size
+
+
+class TestBenchmarkHarness:
+    """Test benchmark building blocks"""
+
+    def test_embedding_deterministic_and_similar(self):
+        """Test equal texts embed equally and overlapping texts are closer"""
+        embed = HashingEmbeddingFunction()
+        a, b, c = embed(["disclose paid partnerships", "disclose paid partnerships", "quarterly earnings report"])
+
+        assert np.allclose(a, b)
+        assert np.linalg.norm(a) == pytest.approx(1.0, abs=1e-5)
+        assert float(a @ embed(["disclose partnerships"])[0]) > float(a @ c)
+
+    def test_corpus_seeded(self):
+        """Test two corpora with the same seed produce the same documents"""
+        assert SyntheticCorpus().document() == SyntheticCorpus().document()
+
+
+@pytest.mark.slow
+class TestBenchmarkRun:
+    """Test a small benchmark run"""
+
+    def test_small_run_reports_metrics(self):
+        """Test a 100-chunk run ingests the corpus and times queries"""
+        result = run_size(100, queries=5)
+
+        assert result["chunks"] >= 100 and result["failed_documents"] == 0
+        assert result["queries"] == 5
+        assert 0 < result["query_p50_ms"] <= result["query_p99_ms"]
+        assert result["chroma_disk_mb"] > 0 and result["peak_rss_mb"] > 0
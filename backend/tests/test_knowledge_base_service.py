@@ -0,0 +1,872 @@
+"""
+Unit Tests for Knowledge Base Service
+
+Tests ChromaDB access:
+- Blocking Chroma calls run on the dedicated executor
+- The event loop stays responsive during slow Chroma operations
+- Executor instrumentation
+- Concurrent tiered retrieval, cached sizes, cross-tier merge
+- Streaming extraction and batched ingestion
+- Hybrid vector + BM25 retrieval
+- Cached tiered context invalidated by document changes
+- Tiered context packed without near-duplicates
+- Incremental re-indexing of updated documents
+- Materialized, versioned knowledge summaries
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from uuid import uuid4
+
+from services.knowledge_base_service import ChromaExecutor, KnowledgeBaseService
+
+
+class FakeCollection:
+    """Synchronous stand-in for a Chroma collection"""
+
+    def __init__(self, documents=None, delay=0.0, distances=None):
+        self.name = f"test_{uuid4().hex[:8]}"
+        self.documents = documents or []
+        self.delay = delay
+        self.distances = distances
+        self.threads = set()
+        self.count_calls = 0
+
+    def _work(self):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+
+    def count(self):
+        self._work()
+        self.count_calls += 1
+        return len(self.documents)
+
+    def get(self, include=None, where=None, limit=None, offset=0, ids=None):
+        self._work()
+        rows = [i for i in range(len(self.documents)) if ids is None or f"chunk{i}" in ids]
+        rows = rows[offset:offset + limit if limit is not None else None]
+        return {
+            "ids": [f"chunk{i}" for i in rows],
+            "documents": [self.documents[i] for i in rows],
+            "metadatas": [{"document_id": f"doc{i}"} for i in rows],
+        }
+
+    def query(self, query_texts, n_results):
+        self._work()
+        docs = self.documents[:n_results]
+        return {
+            "ids": [[f"chunk{i}" for i in range(len(docs))]],
+            "documents": [docs],
+            "metadatas": [[{"document_id": f"doc{i}"} for i in range(len(docs))]],
+            "distances": [(self.distances or [0.1 * i for i in range(len(docs))])[:len(docs)]],
+        }
+
+
+def _service(collection, tiers=None):
+    service = KnowledgeBaseService.__new__(KnowledgeBaseService)
+    service.db = None
+    service._get_collection = lambda profile_id: (tiers or {}).get("profile", collection)
+    service._get_tiered_collection = lambda tier, tier_id: (tiers or {}).get(tier, collection)
+    return service
+
+
+class TestChromaExecutor:
+    """Test the bounded Chroma executor"""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_event_loop(self):
+        """Test calls run on the chroma thread pool"""
+        executor = ChromaExecutor(max_workers=2)
+
+        name = await executor.run("probe", lambda: threading.current_thread().name)
+
+        assert name.startswith("chroma")
+        assert executor.get_stats()["operations"]["probe"]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """Test other coroutines keep running during a slow Chroma call"""
+        executor = ChromaExecutor(max_workers=2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        await asyncio.gather(executor.run("slow", time.sleep, 0.2), ticker())
+
+        assert ticks == 10
+
+    @pytest.mark.asyncio
+    async def test_errors_recorded_and_raised(self):
+        """Test failures propagate and are counted"""
+        executor = ChromaExecutor(max_workers=1)
+
+        def boom():
+            raise RuntimeError("chroma down")
+
+        with pytest.raises(RuntimeError):
+            await executor.run("query", boom)
+
+        assert executor.get_stats()["operations"]["query"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_is_bounded(self):
+        """Test concurrent calls beyond max_workers wait in the queue"""
+        executor = ChromaExecutor(max_workers=1)
+
+        await asyncio.gather(*(executor.run("add", time.sleep, 0.05) for _ in range(3)))
+
+        stats = executor.get_stats()["operations"]["add"]
+        assert stats["calls"] == 3
+        assert stats["avg_wait_ms"] > 20
+
+
+class TestServiceUsesExecutor:
+    """Test KnowledgeBaseService routes Chroma calls through the executor"""
+
+    @pytest.mark.asyncio
+    async def test_query_runs_on_executor(self):
+        """Test query_knowledge_base doesn't touch Chroma on the loop thread"""
+        collection = FakeCollection(["rule one", "rule two"])
+        service = _service(collection)
+
+        results = await service.query_knowledge_base("profile-1", "rules", n_results=5)
+
+        assert [r["content"] for r in results] == ["rule one", "rule two"]
+        assert collection.threads and all(t.startswith("chroma") for t in collection.threads)
+
+    @pytest.mark.asyncio
+    async def test_tiered_query_keeps_loop_responsive(self):
+        """Test a slow tiered query doesn't stall unrelated coroutines"""
+        service = _service(FakeCollection(["policy"], delay=0.05))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        results, _ = await asyncio.gather(
+            service.query_tiered_knowledge_base("policy", user_id="u1", company_id="c1"),
+            ticker()
+        )
+
+        assert results["company_universal"][0]["content"] == "policy"
+        assert ticks == 5
+
+
+class TestTieredRetrieval:
+    """Test concurrent multi-tier retrieval"""
+
+    @pytest.mark.asyncio
+    async def test_tiers_queried_concurrently(self):
+        """Test four tiers cost about one query's latency"""
+        tiers = {name: FakeCollection([f"{name} rule"], delay=0.1)
+                 for name in ("company_universal", "company_professional", "user", "profile")}
+        service = _service(None, tiers)
+        await service.query_tiered_knowledge_base("warmup", "u1", "c1", "p1", profile_type="company")
+
+        start = time.perf_counter()
+        results = await service.query_tiered_knowledge_base("rules", "u1", "c1", "p1", profile_type="company")
+        elapsed = time.perf_counter() - start
+
+        assert all(results[name] for name in tiers)
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_counts_cached(self):
+        """Test collection sizes are counted once, not per query"""
+        collection = FakeCollection(["policy"])
+        service = _service(collection)
+
+        for _ in range(3):
+            await service.query_tiered_knowledge_base("policy", user_id="u1")
+
+        assert collection.count_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicates_kept_in_highest_tier(self):
+        """Test a chunk present in several tiers appears once"""
+        tiers = {
+            "company_universal": FakeCollection(["Shared  policy"]),
+            "user": FakeCollection(["shared policy", "personal rule"]),
+        }
+        service = _service(None, tiers)
+
+        results = await service.query_tiered_knowledge_base("policy", "u1", "c1")
+
+        assert [c["content"] for c in results["company_universal"]] == ["Shared  policy"]
+        assert [c["content"] for c in results["user"]] == ["personal rule"]
+        assert len(results["merged"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_global_top_k(self):
+        """Test top_k keeps the closest chunks across tiers"""
+        tiers = {
+            "company_universal": FakeCollection(["far", "farther"], distances=[0.9, 1.0]),
+            "user": FakeCollection(["near", "nearer"], distances=[0.2, 0.1]),
+        }
+        service = _service(None, tiers)
+
+        results = await service.query_tiered_knowledge_base("q", "u1", "c1", top_k=2)
+
+        assert [c["content"] for c in results["merged"]] == ["nearer", "near"]
+        assert results["company_universal"] == []
+
+
+class FakeClient:
+    """Chroma client stand-in that counts collection lookups"""
+
+    def __init__(self):
+        self.lookups = 0
+
+    def get_or_create_collection(self, name, metadata=None):
+        self.lookups += 1
+        collection = FakeCollection(["chunk"])
+        collection.name = name
+        return collection
+
+
+class FakeAggregateCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __aiter__(self):
+        self._iter = iter(self.rows)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class TestCollectionCache:
+    """Test the collection handle LRU and warmup"""
+
+    def _service(self, client, db=None):
+        service = KnowledgeBaseService.__new__(KnowledgeBaseService)
+        service.db = db
+        service.client = client
+        return service
+
+    @pytest.mark.asyncio
+    async def test_handles_reused(self):
+        """Test repeated queries don't call get_or_create_collection again"""
+        client = FakeClient()
+        service = self._service(client)
+        profile_id = uuid4().hex
+
+        for _ in range(3):
+            await service.query_knowledge_base(profile_id, "query")
+
+        assert client.lookups == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test least recently used handles are evicted past the limit"""
+        from unittest.mock import patch
+
+        client = FakeClient()
+        service = self._service(client)
+        first, second, third = (uuid4().hex for _ in range(3))
+
+        with patch("services.knowledge_base_service.COLLECTION_HANDLE_CACHE_SIZE", 2):
+            KnowledgeBaseService._collection_handles.clear()
+            await service._collection(first)
+            await service._collection(second)
+            await service._collection(first)
+            await service._collection(third)
+            await service._collection(first)
+
+        assert client.lookups == 3
+        assert KnowledgeBaseService._profile_collection_name(second) not in KnowledgeBaseService._collection_handles
+
+    @pytest.mark.asyncio
+    async def test_warmup_preloads_active_collections(self):
+        """Test warmup opens and counts the collections from recent uploads"""
+        from unittest.mock import MagicMock
+
+        client = FakeClient()
+        company_id, profile_id = uuid4().hex, uuid4().hex
+        db = MagicMock()
+        db.knowledge_documents.aggregate.return_value = FakeAggregateCursor([
+            {"_id": {"tier": "company_universal", "tier_id": company_id}},
+            {"_id": {"profile_id": profile_id}},
+        ])
+        service = self._service(client, db)
+
+        warmed = await service.warmup_collections(limit=10)
+        await service.query_tiered_knowledge_base("q", user_id=None, company_id=company_id)
+
+        assert warmed == 2
+        assert client.lookups == 2
+
+
+class IngestCollection:
+    """Collection stand-in recording add/delete batches"""
+
+    def __init__(self, fail_on_batch=None):
+        self.name = f"test_{uuid4().hex[:8]}"
+        self.batches = []
+        self.deleted = []
+        self.fail_on_batch = fail_on_batch
+
+    def add(self, documents, ids, metadatas, embeddings=None):
+        if len(self.batches) == self.fail_on_batch:
+            raise RuntimeError("chroma write failed")
+        self.batches.append((documents, ids, metadatas))
+
+    def delete(self, where):
+        self.deleted.append(where)
+
+
+class TestStreamingIngestion:
+    """Test streaming extraction, chunking and pooled ingestion"""
+
+    def test_streamed_chunks_match_whole_text(self):
+        """Test chunking page by page gives the same chunks as the full text"""
+        import random
+
+        rng = random.Random(7)
+        words = ["policy", "employee", "leave.", "benefits!", "notice?", "the", "a", "handbook"]
+        pages = [" ".join(rng.choice(words) for _ in range(rng.randint(0, 400))) for _ in range(30)]
+        service = KnowledgeBaseService.__new__(KnowledgeBaseService)
+
+        streamed = list(service._iter_chunks(pages))
+
+        assert streamed == service._chunk_text("\n\n".join(pages))
+        assert service._chunk_text("short text") == ["short text"]
+        assert all(len(chunk) <= 500 for chunk in streamed)
+
+    def test_edit_changes_only_nearby_chunks(self):
+        """Test content-defined boundaries resynchronise after an insertion"""
+        sentences = [f"Rule {i} covers topic {i * 7 % 13} for every employee." for i in range(300)]
+        edited = sentences[:150] + ["A brand new clause about remote work allowances."] + sentences[150:]
+        service = KnowledgeBaseService.__new__(KnowledgeBaseService)
+
+        before = service._chunk_text(" ".join(sentences))
+        after = service._chunk_text(" ".join(edited))
+
+        assert len(set(after) - set(before)) <= 3
+
+    @pytest.mark.asyncio
+    async def test_ingest_in_bounded_batches(self, tmp_path):
+        """Test chunks are added in batches with continuous ids"""
+        from unittest.mock import AsyncMock, patch
+
+        path = tmp_path / "handbook.txt"
+        path.write_text("Employees accrue paid leave monthly. " * 400)
+        collection = IngestCollection()
+        service = _service(collection)
+        service._embed_chunks = AsyncMock(return_value=None)
+
+        progress = []
+
+        async def on_progress(update):
+            progress.append(update["percentage"])
+
+        with patch("services.knowledge_base_service.INGEST_BATCH_CHUNKS", 8):
+            count, text_length = await service._ingest_document(
+                collection, str(path), "doc", lambda i: f"doc_{i}", lambda i: {"chunk_index": i},
+                on_progress
+            )
+
+        ids = [i for _, batch_ids, _ in collection.batches for i in batch_ids]
+        assert all(len(docs) <= 8 for docs, _, _ in collection.batches)
+        assert ids == [f"doc_{i}" for i in range(count)]
+        assert count == len(service._chunk_text(path.read_text()))
+        assert text_length == len(path.read_text())
+        assert progress[0] == 0 and progress[-1] == 100 and progress == sorted(progress)
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_removes_stored_chunks(self, tmp_path):
+        """Test a failure mid-document deletes the chunks already added"""
+        from unittest.mock import AsyncMock, patch
+
+        path = tmp_path / "handbook.txt"
+        path.write_text("Overtime is paid at time and a half. " * 400)
+        collection = IngestCollection(fail_on_batch=2)
+        service = _service(collection)
+        service._embed_chunks = AsyncMock(return_value=None)
+
+        with patch("services.knowledge_base_service.INGEST_BATCH_CHUNKS", 8):
+            with pytest.raises(RuntimeError):
+                await service._ingest_document(
+                    collection, str(path), "doc", lambda i: f"doc_{i}", lambda i: {}
+                )
+
+        assert collection.deleted == [{"document_id": "doc"}]
+
+    @pytest.mark.asyncio
+    async def test_empty_document_rejected(self, tmp_path):
+        """Test documents without text are rejected before any write"""
+        path = tmp_path / "blank.txt"
+        path.write_text("   \n  ")
+        collection = IngestCollection()
+        service = _service(collection)
+
+        with pytest.raises(ValueError, match="no extractable text"):
+            await service._ingest_document(collection, str(path), "doc", str, lambda i: {})
+
+        assert collection.batches == []
+
+
+class TestHybridRetrieval:
+    """Test BM25 fusion with vector results"""
+
+    @staticmethod
+    async def _built_index(service, collection, count):
+        service._bm25_index(collection, count)
+        await asyncio.gather(*[t for t in asyncio.all_tasks() if t is not asyncio.current_task()])
+        return service._bm25_index(collection, count)
+
+    @pytest.mark.asyncio
+    async def test_exact_term_found_beyond_vector_candidates(self):
+        """Test a lexical match outside the vector candidates is fetched and returned"""
+        documents = [f"general guidance {i}" for i in range(10)] + ["HIPAA applies to patient stories"]
+        collection = FakeCollection(documents)
+        service = _service(collection)
+        await self._built_index(service, collection, len(documents))
+
+        results = await service.query_knowledge_base(uuid4().hex, "HIPAA", n_results=2)
+
+        assert "HIPAA applies to patient stories" in [r["content"] for r in results]
+        lexical = next(r for r in results if r["content"].startswith("HIPAA"))
+        assert lexical["distance"] is None and lexical["bm25_score"] > 0
+        assert lexical["metadata"] == {"document_id": "doc10"}
+
+    @pytest.mark.asyncio
+    async def test_vector_only_until_index_built(self):
+        """Test the first query is served by vector search while the index builds in the background"""
+        documents = [f"general guidance {i}" for i in range(10)] + ["HIPAA applies to patient stories"]
+        collection = FakeCollection(documents)
+        service = _service(collection)
+
+        results = await service.query_knowledge_base(uuid4().hex, "HIPAA", n_results=2)
+
+        assert all(r["distance"] is not None for r in results)
+        assert await self._built_index(service, collection, len(documents)) is not None
+
+    @pytest.mark.asyncio
+    async def test_writes_during_build_replayed(self):
+        """Test chunks added or removed while the index builds end up in it"""
+        collection = FakeCollection(["HIPAA rule", "brand rule"], delay=0.05)
+        service = _service(collection)
+
+        service._bm25_index(collection, 2)
+        service._bm25_remove(collection, ["chunk0"])
+        service._bm25_add(collection, ["chunk2"], ["GDPR rule"])
+        index = await self._built_index(service, collection, 2)
+
+        assert index.search("hipaa", 5) == []
+        assert [chunk_id for chunk_id, _ in index.search("gdpr", 5)] == ["chunk2"]
+
+    @pytest.mark.asyncio
+    async def test_index_follows_deletes(self):
+        """Test deleted chunks leave the BM25 index without a rebuild"""
+        collection = FakeCollection(["HIPAA rule", "brand rule"])
+        service = _service(collection)
+        index = await self._built_index(service, collection, 2)
+
+        service._bm25_remove(collection, ["chunk0"])
+
+        assert service._bm25_index(collection, 1) is index
+        assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        assert index.search("hipaa", 5) == []
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_when_count_drifts(self):
+        """Test another worker's writes trigger one background rebuild"""
+        collection = FakeCollection(["HIPAA rule", "brand rule"])
+        service = _service(collection)
+        index = await self._built_index(service, collection, 2)
+
+        collection.documents.append("GDPR rule")
+        assert service._bm25_index(collection, 3) is index  # Stale index keeps serving
+        rebuilt = await self._built_index(service, collection, 3)
+
+        assert rebuilt is not index and len(rebuilt) == 3
+
+    def test_global_merge_keeps_rerank_order(self):
+        """Test cross-encoder scores order the merged tiers, not distance or BM25"""
+        service = _service(None)
+        results = {
+            "user": [
+                {"content": "brand voice guide", "distance": 0.1, "bm25_score": 4.0, "rerank_score": -2.0, "tier": "user"},
+            ],
+            "profile": [
+                {"content": "HIPAA patient rule", "distance": 0.6, "bm25_score": None, "rerank_score": 7.5, "tier": "profile"},
+                {"content": "posting schedule", "distance": 0.3, "bm25_score": 1.0, "rerank_score": 1.2, "tier": "profile"},
+            ],
+        }
+
+        merged = service._merge_tier_results(results, top_k=2)["merged"]
+
+        assert [c["content"] for c in merged] == ["HIPAA patient rule", "posting schedule"]
+        assert results["user"] == []
+
+
+class TestTieredContextCache:
+    """Test get_tiered_context_for_ai caching"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_skips_retrieval(self):
+        """Test a repeated query is served without querying tiers"""
+        from unittest.mock import AsyncMock
+
+        service = _service(FakeCollection(["Always disclose partnerships"]))
+        service.query_tiered_knowledge_base = AsyncMock(wraps=service.query_tiered_knowledge_base)
+        user_id = uuid4().hex
+
+        first = await service.get_tiered_context_for_ai("launch post", user_id)
+        second = await service.get_tiered_context_for_ai("Launch  post", user_id)
+
+        assert first == second and "Always disclose partnerships" in first
+        assert service.query_tiered_knowledge_base.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates(self):
+        """Test deleting a tier document forces fresh retrieval"""
+        from unittest.mock import AsyncMock
+
+        collection = FakeCollection(["Always disclose partnerships"])
+        collection.delete = lambda ids: None
+        service = _service(collection)
+        service.query_tiered_knowledge_base = AsyncMock(wraps=service.query_tiered_knowledge_base)
+        user_id = uuid4().hex
+
+        await service.get_tiered_context_for_ai("launch post", user_id)
+        await service.delete_document_tiered("doc0", "user", user_id)
+        await service.get_tiered_context_for_ai("launch post", user_id)
+
+        assert service.query_tiered_knowledge_base.await_count == 2
+
+
+class TestContextPacking:
+    """Test token-budgeted packing of tiered context"""
+
+    POLICY = (
+        "Employees must disclose paid partnerships in every social post and never share client "
+        "data without written approval from the legal team. Product claims need a cited source, "
+        "pricing is only announced by marketing, and competitor names are not used in ads."
+    )
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_tier_copy_included_once(self):
+        """Test a policy edited and re-uploaded to the profile tier appears once"""
+        edited = self.POLICY.replace("written approval", "explicit approval")
+        service = _service(None, tiers={
+            "user": FakeCollection([self.POLICY]),
+            "profile": FakeCollection([edited]),
+        })
+
+        context = await service.get_tiered_context_for_ai("partnership post", uuid4().hex, profile_id=uuid4().hex)
+
+        assert context.count("Employees must disclose") == 1
+        assert "PERSONAL COMPLIANCE RULES" in context
+        assert "PROFILE/CAMPAIGN STRATEGY" not in context
+
+    @pytest.mark.asyncio
+    async def test_generation_context_within_budget(self):
+        """Test generation context is limited by tokens rather than characters"""
+        from services.context_packing_service import get_context_token_budget
+        from services.token_tracking_service import estimate_tokens
+
+        documents = [f"Rule {i}: " + " ".join(f"term{i}x{j}" for j in range(300)) for i in range(5)]
+        collection = FakeCollection(documents)
+        service = _service(collection)
+
+        async def _collection(profile_id):
+            return collection
+        service._collection = _collection
+
+        context = await service.get_context_for_generation(uuid4().hex, limit=5)
+
+        assert context.startswith("Rule 0:")
+        assert estimate_tokens(context) <= get_context_token_budget() + 20
+
+    @pytest.mark.asyncio
+    async def test_generation_context_follows_model_budget(self):
+        """Test the caller's model sizes the generation context"""
+        from services.context_packing_service import get_context_token_budget
+        from services.token_tracking_service import estimate_tokens
+
+        documents = [f"Rule {i}: " + " ".join(f"term{i}x{j}" for j in range(300)) for i in range(10)]
+        collection = FakeCollection(documents)
+        service = _service(collection)
+
+        async def _collection(profile_id):
+            return collection
+        service._collection = _collection
+
+        small = await service.get_context_for_generation(uuid4().hex, limit=10, model="gpt-4.1-nano")
+        large = await service.get_context_for_generation(uuid4().hex, limit=10, model="gpt-4o")
+
+        assert estimate_tokens(small) <= get_context_token_budget("gpt-4.1-nano") + 20
+        assert estimate_tokens(large) > estimate_tokens(small)
+
+
+class StoreCollection:
+    """In-memory collection supporting get/add/delete/update"""
+
+    def __init__(self):
+        self.name = f"test_{uuid4().hex[:8]}"
+        self.rows = {}
+        self.added = 0
+
+    def get(self, where=None, ids=None, include=None):
+        rows = [
+            (i, row) for i, row in self.rows.items()
+            if (ids is None or i in ids)
+            and (where is None or row[1].get("document_id") == where["document_id"])
+        ]
+        return {
+            "ids": [i for i, _ in rows],
+            "documents": [row[0] for _, row in rows],
+            "metadatas": [dict(row[1]) for _, row in rows],
+        }
+
+    def add(self, documents, ids, metadatas, embeddings=None):
+        self.added += len(ids)
+        for i, doc, meta in zip(ids, documents, metadatas):
+            self.rows[i] = (doc, dict(meta))
+
+    def delete(self, ids=None, where=None):
+        for i in ids or [i for i, r in self.rows.items() if r[1].get("document_id") == where["document_id"]]:
+            self.rows.pop(i, None)
+
+    def update(self, ids, metadatas):
+        for i, meta in zip(ids, metadatas):
+            self.rows[i] = (self.rows[i][0], dict(meta))
+
+
+class TestIncrementalReindex:
+    """Test update_document_tiered"""
+
+    def _handbook(self, tmp_path, name, extra=None):
+        sentences = [f"Section {i} sets rule {i * 5 % 11} for all staff members." for i in range(200)]
+        if extra:
+            sentences.insert(100, extra)
+        path = tmp_path / name
+        path.write_text(" ".join(sentences))
+        return path
+
+    @pytest.mark.asyncio
+    async def test_small_edit_reindexes_few_chunks(self, tmp_path):
+        """Test only changed chunks are added and removed"""
+        from unittest.mock import AsyncMock
+
+        collection = StoreCollection()
+        service = _service(collection)
+        service._embed_chunks = AsyncMock(return_value=None)
+        tier_id = uuid4().hex
+
+        created = await service.process_document_tiered(
+            str(self._handbook(tmp_path, "v1.txt")), "user", tier_id, "handbook.txt", "u1"
+        )
+        collection.added = 0
+        result = await service.update_document_tiered(
+            created["document_id"],
+            str(self._handbook(tmp_path, "v2.txt", "Remote work is allowed two days a week.")),
+            "user", tier_id, "handbook-v2.txt", "u1"
+        )
+
+        new_chunks = service._chunk_text(self._handbook(tmp_path, "v3.txt", "Remote work is allowed two days a week.").read_text())
+        stored = collection.get(where={"document_id": created["document_id"]})
+        ordered = [doc for _, doc in sorted(zip([m["chunk_index"] for m in stored["metadatas"]], stored["documents"]))]
+
+        assert result["success"] is True
+        assert result["chunks_added"] <= 3 and collection.added == result["chunks_added"]
+        assert result["chunks_kept"] == result["chunk_count"] - result["chunks_added"]
+        assert ordered == new_chunks
+        assert all(m["filename"] == "handbook-v2.txt" and m["chunk_hash"] for m in stored["metadatas"])
+
+    @pytest.mark.asyncio
+    async def test_failed_update_keeps_previous_version(self, tmp_path):
+        """Test a failing re-index leaves the stored chunks untouched"""
+        from unittest.mock import AsyncMock
+
+        collection = StoreCollection()
+        service = _service(collection)
+        service._embed_chunks = AsyncMock(return_value=None)
+        tier_id = uuid4().hex
+        created = await service.process_document_tiered(
+            str(self._handbook(tmp_path, "v1.txt")), "user", tier_id, "handbook.txt", "u1"
+        )
+        before = dict(collection.rows)
+
+        missing = tmp_path / "missing.pdf"
+        result = await service.update_document_tiered(
+            created["document_id"], str(missing), "user", tier_id, "handbook.pdf", "u1"
+        )
+
+        assert result["success"] is False
+        assert collection.rows == before
+
+    @pytest.mark.asyncio
+    async def test_stale_chunks_deleted_last(self, tmp_path):
+        """Test stale chunks are deleted after the new and moved chunks are stored"""
+        from unittest.mock import AsyncMock
+
+        collection = StoreCollection()
+        service = _service(collection)
+        service._embed_chunks = AsyncMock(return_value=None)
+        tier_id = uuid4().hex
+        created = await service.process_document_tiered(
+            str(self._handbook(tmp_path, "v1.txt")), "user", tier_id, "handbook.txt", "u1"
+        )
+
+        calls = []
+        for name in ("add", "update", "delete"):
+            method = getattr(collection, name)
+            setattr(collection, name, lambda *a, _n=name, _m=method, **kw: calls.append(_n) or _m(*a, **kw))
+        result = await service.update_document_tiered(
+            created["document_id"],
+            str(self._handbook(tmp_path, "v2.txt", "Remote work is allowed two days a week.")),
+            "user", tier_id, "handbook-v2.txt", "u1"
+        )
+
+        assert result["success"] is True and result["chunks_removed"] > 0
+        assert calls[-1] == "delete" and calls.count("delete") == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_metadata_update_keeps_previous_version(self, tmp_path):
+        """Test a failing metadata update removes added chunks and keeps the old ones"""
+        from unittest.mock import AsyncMock
+
+        collection = StoreCollection()
+        service = _service(collection)
+        service._embed_chunks = AsyncMock(return_value=None)
+        tier_id = uuid4().hex
+        created = await service.process_document_tiered(
+            str(self._handbook(tmp_path, "v1.txt")), "user", tier_id, "handbook.txt", "u1"
+        )
+        before = {i: (doc, dict(meta)) for i, (doc, meta) in collection.rows.items()}
+
+        update = collection.update
+        attempts = []
+
+        def failing_update(ids, metadatas):
+            attempts.append(ids)
+            if len(attempts) == 1:
+                update(ids[:1], metadatas[:1])  # Partly applied before failing
+                raise RuntimeError("chroma unavailable")
+            update(ids, metadatas)
+
+        collection.update = failing_update
+        result = await service.update_document_tiered(
+            created["document_id"],
+            str(self._handbook(tmp_path, "v2.txt", "Remote work is allowed two days a week.")),
+            "user", tier_id, "handbook-v2.txt", "u1"
+        )
+
+        assert result["success"] is False
+        assert collection.rows == before
+
+
+class FakeSummaries:
+    """Async stand-in for the knowledge_summaries Mongo collection"""
+
+    def __init__(self):
+        self.docs = {}
+        self.reads = 0
+
+    async def find_one(self, query, projection=None):
+        self.reads += 1
+        doc = self.docs.get(query["scope"])
+        return dict(doc) if doc else None
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["scope"])
+        if doc is None:
+            if not upsert:
+                return
+            doc = self.docs[query["scope"]] = {"scope": query["scope"], **update.get("$setOnInsert", {})}
+        elif any(doc.get(k) != v for k, v in query.items()):
+            return
+        doc.update(update.get("$set", {}))
+        for field, amount in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + amount
+
+
+class TestKnowledgeSummaries:
+    """Test materialized knowledge summaries"""
+
+    def _service(self, documents):
+        collection = FakeCollection(documents)
+        collection.query_calls = 0
+        query = collection.query
+
+        def counting_query(query_texts, n_results):
+            collection.query_calls += 1
+            return query(query_texts, n_results)
+        collection.query = counting_query
+
+        service = _service(collection)
+        service.db = type("DB", (), {"knowledge_summaries": FakeSummaries()})()
+
+        async def _collection(profile_id):
+            return collection
+        service._collection = _collection
+        return service, collection
+
+    @pytest.mark.asyncio
+    async def test_summary_read_in_one_fetch(self):
+        """Test a stored summary is returned without querying the knowledge base"""
+        service, collection = self._service(["We sell solar panels to farms."])
+        profile_id = uuid4().hex
+
+        first = await service.get_knowledge_summary(profile_id)
+        queries = collection.query_calls
+        reads = service.db.knowledge_summaries.reads
+        second = await service.get_knowledge_summary(profile_id)
+
+        assert first == second and "solar panels" in first
+        assert collection.query_calls == queries
+        assert service.db.knowledge_summaries.reads == reads + 1
+
+    @pytest.mark.asyncio
+    async def test_document_change_refreshes_in_background(self):
+        """Test a document change rebuilds the summary asynchronously"""
+        from services import knowledge_base_service as kb
+
+        service, collection = self._service(["We sell solar panels to farms."])
+        profile_id = uuid4().hex
+        await service.get_knowledge_summary(profile_id)
+
+        collection.documents = ["We now install wind turbines too."]
+        await service._invalidate_knowledge_summary("profile", profile_id)
+        await kb._summary_refreshes[f"profile:{profile_id}"]
+
+        doc = service.db.knowledge_summaries.docs[f"profile:{profile_id}"]
+        assert "wind turbines" in await service.get_knowledge_summary(profile_id)
+        assert doc["summary_version"] == doc["source_version"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_refresh_not_written(self):
+        """Test a refresh that raced a newer document change does not overwrite"""
+        service, collection = self._service(["We sell solar panels to farms."])
+        profile_id = uuid4().hex
+        summaries = service.db.knowledge_summaries
+        await service.get_knowledge_summary(profile_id)
+
+        build = service._build_knowledge_summary
+
+        async def racing_build(tier, tier_id, max_chunks):
+            summary = await build(tier, tier_id, max_chunks)
+            await summaries.update_one({"scope": f"{tier}:{tier_id}"}, {"$inc": {"source_version": 1}})
+            return summary
+        service._build_knowledge_summary = racing_build
+        collection.documents = ["Outdated draft text."]
+
+        await service.refresh_knowledge_summary("profile", profile_id)
+
+        assert "solar panels" in summaries.docs[f"profile:{profile_id}"]["summary"]
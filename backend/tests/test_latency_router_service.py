@@ -0,0 +1,167 @@
+"""
+Unit Tests for Latency Router Service
+
+Tests latency-aware routing:
+- Ranking by rolling p50 and skipping open circuits
+- Sequential fallback on failure
+- Hedged requests past p95 and loser cancellation
+"""
+
+import asyncio
+import pytest
+from uuid import uuid4
+
+from services.circuit_breaker_service import CircuitState, get_circuit_sync
+from services.latency_router_service import LatencyRouter, Route
+
+
+def _circuit(latencies=None):
+    name = f"test_router:{uuid4().hex[:8]}"
+    circuit = get_circuit_sync(name)
+    circuit.metrics.recent_response_times.extend(latencies or [])
+    return name
+
+
+def _route(name, circuit, value=None, delay=0.0, error=None, log=None):
+    async def call():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append(f"{name}:cancelled")
+            raise
+        if error:
+            raise error
+        return value if value is not None else name
+    return Route(name, circuit, call)
+
+
+class TestRanking:
+    """Test route ranking"""
+
+    def test_fastest_route_first(self):
+        """Test routes are ordered by measured p50"""
+        router = LatencyRouter(min_samples=3)
+        slow = _route("slow", _circuit([900, 1000, 1100]))
+        fast = _route("fast", _circuit([100, 120, 140]))
+
+        assert [r.name for r in router.rank([slow, fast])] == ["fast", "slow"]
+
+    def test_unmeasured_preferred_route_stays_first(self):
+        """Test the preferred route keeps priority until it has data"""
+        router = LatencyRouter(min_samples=3)
+        preferred = _route("preferred", _circuit())
+        other = _route("other", _circuit([100, 100, 100]))
+
+        assert router.rank([preferred, other])[0].name == "preferred"
+
+    def test_open_circuit_skipped(self):
+        """Test routes whose circuit is open are excluded"""
+        router = LatencyRouter(min_samples=3)
+        broken_circuit = _circuit()
+        get_circuit_sync(broken_circuit).state = CircuitState.OPEN
+        get_circuit_sync(broken_circuit)._last_state_change = float("inf")
+
+        ranked = router.rank([_route("broken", broken_circuit), _route("ok", _circuit())])
+
+        assert [r.name for r in ranked] == ["ok"]
+
+    def test_non_adaptive_keeps_order(self):
+        """Test adaptive=False preserves the caller's order"""
+        router = LatencyRouter(min_samples=3)
+        slow = _route("slow", _circuit([900, 1000, 1100]))
+        fast = _route("fast", _circuit([100, 120, 140]))
+
+        assert [r.name for r in router.rank([slow, fast], adaptive=False)] == ["slow", "fast"]
+
+
+class TestExecute:
+    """Test routed execution"""
+
+    @pytest.mark.asyncio
+    async def test_fallback_on_failure(self):
+        """Test the next route is tried when the first fails"""
+        router = LatencyRouter()
+        routes = [
+            _route("primary", _circuit(), error=RuntimeError("boom")),
+            _route("backup", _circuit()),
+        ]
+
+        result = await router.execute(routes)
+
+        assert result.route == "backup"
+        assert result.attempts == ["primary", "backup"]
+        assert router.stats["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_routes_fail_raises_last_error(self):
+        """Test the last error propagates when every route fails"""
+        router = LatencyRouter()
+        routes = [
+            _route("a", _circuit(), error=RuntimeError("a failed")),
+            _route("b", _circuit(), error=RuntimeError("b failed")),
+        ]
+
+        with pytest.raises(RuntimeError, match="b failed"):
+            await router.execute(routes)
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_cancels_loser(self):
+        """Test a hedge fires past p95 and the slow attempt is cancelled"""
+        router = LatencyRouter(min_samples=3, min_hedge_delay_ms=10)
+        log = []
+        routes = [
+            _route("slow", _circuit([10, 10, 10]), delay=1.0, log=log),
+            _route("fast", _circuit(), delay=0.0),
+        ]
+
+        result = await router.execute(routes, hedge=True)
+        await asyncio.sleep(0)
+
+        assert result.route == "fast"
+        assert result.hedged is True
+        assert router.stats["hedge_wins"] == 1
+        assert "slow:cancelled" in log
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_data(self):
+        """Test no hedge is fired before p95 is known"""
+        router = LatencyRouter(min_samples=3)
+        routes = [
+            _route("primary", _circuit(), delay=0.05),
+            _route("backup", _circuit()),
+        ]
+
+        result = await router.execute(routes, hedge=True)
+
+        assert result.route == "primary"
+        assert result.hedged is False
+
+
+class TestProxyRouting:
+    """Test AI proxy calls report the model that answered"""
+
+    @pytest.mark.asyncio
+    async def test_fallback_model_returned_and_logged(self):
+        """Test a response served by the fallback route reports and logs its model"""
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from routes import ai_proxy
+        from services.latency_router_service import RoutedResult
+
+        router = MagicMock(execute=AsyncMock(return_value=RoutedResult(value="Hello", route="gemini")))
+        db = MagicMock()
+        db.subscriptions.find_one = AsyncMock(return_value={"credits": 10})
+        db.subscriptions.update_one = AsyncMock()
+        db.ai_operations_log.insert_one = AsyncMock()
+
+        with patch.object(ai_proxy, "get_latency_router", return_value=router):
+            response = await ai_proxy.ai_complete.__wrapped__(
+                http_request=None,
+                request=ai_proxy.AICompletionRequest(prompt="Hi", model="gpt-4o-mini"),
+                user_id="user-1",
+                db=db
+            )
+
+        assert response.content == "Hello"
+        assert response.model_used == "gemini-2.5-flash"
+        assert db.ai_operations_log.insert_one.call_args[0][0]["model"] == "gemini-2.5-flash"
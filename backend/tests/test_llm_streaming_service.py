@@ -0,0 +1,191 @@
+"""
+Unit Tests for LLM Streaming Service
+
+Tests the SSE streaming helpers:
+- SSE frame formatting
+- Token/done event sequence and completion callback
+- Cancel callback when the stream fails
+- litellm parameter building for universal keys
+- Startup warning when streaming is disabled
+- Half-open probe slot released on client disconnect
+- Limiter latency feedback uses time to first token
+"""
+
+import asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import services.llm_streaming_service as streaming
+from services.circuit_breaker_service import CircuitState, get_or_create_circuit, get_or_create_limiter
+from services.llm_streaming_service import (
+    format_sse,
+    sse_response,
+    stream_llm_completion,
+    _build_completion_params,
+    check_streaming_config,
+    DEFAULT_UNIVERSAL_KEY_API_BASE,
+    EMERGENT_KEY_PREFIX,
+)
+
+
+def _make_app(tokens_factory, on_complete=None, on_cancel=None):
+    app = FastAPI()
+
+    @app.get("/stream")
+    async def stream(request: Request):
+        return sse_response(request, tokens_factory(), on_complete=on_complete, on_cancel=on_cancel)
+
+    return app
+
+
+class TestFormatSse:
+    """Test SSE frame formatting"""
+
+    def test_frame_with_event(self):
+        """Test frame includes event name and JSON data"""
+        frame = format_sse({"token": "Hi"}, event="token")
+        assert frame == 'event: token\ndata: {"token": "Hi"}\n\n'
+
+    def test_frame_without_event(self):
+        """Test frame without event name only has data line"""
+        assert format_sse({"a": 1}) == 'data: {"a": 1}\n\n'
+
+
+class TestSseResponse:
+    """Test SSE StreamingResponse wrapper"""
+
+    def test_streams_tokens_then_done(self):
+        """Test tokens are emitted in order followed by a done event"""
+        completed = []
+
+        async def tokens():
+            for token in ["Hel", "lo"]:
+                yield token
+
+        async def on_complete(content):
+            completed.append(content)
+            return {"tokens_used": 1}
+
+        response = TestClient(_make_app(tokens, on_complete=on_complete)).get("/stream")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = response.text
+        assert body.index('"Hel"') < body.index('"lo"') < body.index("event: done")
+        assert '"content": "Hello"' in body
+        assert '"tokens_used": 1' in body
+        assert completed == ["Hello"]
+
+    def test_error_skips_completion(self):
+        """Test upstream failure emits an error event and no completion"""
+        completed = []
+
+        async def tokens():
+            yield "partial"
+            raise RuntimeError("upstream failed")
+
+        async def on_complete(content):
+            completed.append(content)
+
+        response = TestClient(_make_app(tokens, on_complete=on_complete)).get("/stream")
+
+        assert "event: error" in response.text
+        assert "event: done" not in response.text
+        assert completed == []
+
+
+class TestCompletionParams:
+    """Test litellm parameter building"""
+
+    def test_provider_key_uses_default_base(self):
+        """Test provider keys are sent straight to the provider"""
+        params = _build_completion_params("sys", "hi", "openai", "gpt-4o-mini", "sk-test", 0.5, None)
+
+        assert params["model"] == "openai/gpt-4o-mini"
+        assert params["stream"] is True
+        assert params["temperature"] == 0.5
+        assert "api_base" not in params
+        assert "max_tokens" not in params
+
+    def test_universal_key_routes_through_configured_base(self, monkeypatch):
+        """Test universal keys are sent to the configured API base"""
+        monkeypatch.setattr(streaming, "UNIVERSAL_KEY_API_BASE", "https://proxy.example.com/llm")
+        params = _build_completion_params("sys", "hi", "openai", "gpt-4o-mini", f"{EMERGENT_KEY_PREFIX}abc", None, 100)
+
+        assert params["api_base"] == "https://proxy.example.com/llm"
+        assert params["max_tokens"] == 100
+
+    def test_universal_key_streams_by_default(self):
+        """Test universal keys stream through the integration proxy unless configured otherwise"""
+        assert streaming.UNIVERSAL_KEY_API_BASE == DEFAULT_UNIVERSAL_KEY_API_BASE
+
+    def test_universal_key_without_base_is_not_streamed(self, monkeypatch):
+        """Test universal keys fall back to the buffered completion when the base is emptied"""
+        monkeypatch.setattr(streaming, "UNIVERSAL_KEY_API_BASE", "")
+
+        assert _build_completion_params("sys", "hi", "openai", "gpt-4o-mini", f"{EMERGENT_KEY_PREFIX}abc", None, None) is None
+
+    def test_startup_warning_when_streaming_disabled(self, monkeypatch, caplog):
+        """Test the startup check warns when universal keys cannot be streamed"""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setenv("EMERGENT_LLM_KEY", f"{EMERGENT_KEY_PREFIX}abc")
+        monkeypatch.setattr(streaming, "UNIVERSAL_KEY_API_BASE", "")
+
+        assert check_streaming_config() is False
+        assert "UNIVERSAL_KEY_API_BASE" in caplog.text
+
+        monkeypatch.setattr(streaming, "UNIVERSAL_KEY_API_BASE", DEFAULT_UNIVERSAL_KEY_API_BASE)
+        assert check_streaming_config() is True
+
+
+def _chunk(token):
+    delta = type("Delta", (), {"content": token})
+    return type("Chunk", (), {"choices": [type("Choice", (), {"delta": delta})]})
+
+
+class TestStreamCircuit:
+    """Test circuit breaker and limiter accounting for streamed calls"""
+
+    def test_disconnect_releases_half_open_probe(self, monkeypatch):
+        """Test closing the stream mid-way frees the half-open probe slot"""
+        async def provider_stream():
+            for token in ["a", "b", "c"]:
+                yield _chunk(token)
+
+        async def open_stream(params):
+            return provider_stream()
+
+        monkeypatch.setattr(streaming, "_open_stream", open_stream)
+
+        async def run():
+            circuit = await get_or_create_circuit("stream_probe_test")
+            circuit._transition_to(CircuitState.HALF_OPEN)
+            tokens = stream_llm_completion("sys", "hi", provider="stream_probe_test", api_key="sk-test")
+            assert await tokens.__anext__() == "a"
+            assert circuit._half_open_calls == 1
+            await tokens.aclose()
+            return circuit
+
+        circuit = asyncio.run(run())
+
+        assert circuit.state == CircuitState.HALF_OPEN
+        assert circuit._half_open_calls == 0
+
+    def test_limiter_records_time_to_first_token(self, monkeypatch):
+        """Test a long generation is not fed back to the limiter as latency"""
+        async def provider_stream():
+            yield _chunk("first")
+            await asyncio.sleep(0.3)
+            yield _chunk("second")
+
+        async def open_stream(params):
+            return provider_stream()
+
+        monkeypatch.setattr(streaming, "_open_stream", open_stream)
+
+        async def run():
+            tokens = stream_llm_completion("sys", "hi", provider="stream_ttft_test", api_key="sk-test")
+            return [token async for token in tokens]
+
+        assert asyncio.run(run()) == ["first", "second"]
+        assert get_or_create_limiter("stream_ttft_test", "gpt-4o-mini")._baseline_latency_ms < 100
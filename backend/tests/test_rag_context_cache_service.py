@@ -0,0 +1,108 @@
+"""
+Unit Tests for RAG Context Cache Service
+
+Tests the tiered context cache:
+- Keys normalize the query and cover only the tiers that are queried
+- Bumping a tier version misses previously cached context
+- Shared tier versions invalidate the cache on every worker
+- TTL expiry and oldest-entry eviction
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import MagicMock
+
+from services.rag_context_cache_service import RAGContextCache
+
+
+class FakeSummaries:
+    """knowledge_summaries stand-in holding source versions by scope"""
+
+    def __init__(self):
+        self.versions = {}
+
+    def find(self, query, projection=None):
+        docs = [
+            {"scope": scope, "source_version": version}
+            for scope, version in self.versions.items() if scope in query["scope"]["$in"]
+        ]
+        cursor = MagicMock()
+
+        async def to_list(length):
+            return docs[:length]
+
+        cursor.to_list = to_list
+        return cursor
+
+
+def _db(summaries):
+    db = MagicMock()
+    db.knowledge_summaries = summaries
+    return db
+
+
+@pytest.mark.asyncio
+class TestRAGContextCache:
+    """Test RAGContextCache"""
+
+    async def test_query_normalized(self):
+        """Test whitespace and case don't change the key"""
+        cache = RAGContextCache()
+
+        assert await cache.key(None, "Summer  Sale post", "u1") == await cache.key(None, "summer sale POST ", "u1")
+        assert await cache.key(None, "summer sale", "u1") != await cache.key(None, "winter sale", "u1")
+
+    async def test_tier_bump_misses(self):
+        """Test a document change in a queried tier invalidates the entry"""
+        cache = RAGContextCache()
+        key = await cache.key(None, "policy", "u1", company_id="c1")
+        cache.set(key, "context")
+
+        cache.invalidate("company_universal", "c1")
+
+        assert cache.get(key) == "context"
+        assert cache.get(await cache.key(None, "policy", "u1", company_id="c1")) is None
+
+    async def test_unqueried_tier_bump_keeps_entry(self):
+        """Test professional KB changes don't affect personal context"""
+        cache = RAGContextCache()
+        cache.set(await cache.key(None, "policy", "u1", company_id="c1", profile_type="personal"), "context")
+
+        cache.invalidate("company_professional", "c1")
+
+        assert cache.get(await cache.key(None, "policy", "u1", company_id="c1", profile_type="personal")) == "context"
+
+    async def test_change_on_other_worker_misses(self):
+        """Test a source_version bump made by another worker invalidates this worker's entry"""
+        summaries = FakeSummaries()
+        worker = RAGContextCache()
+        cache_key = await worker.key(_db(summaries), "policy", "u1", company_id="c1")
+        worker.set(cache_key, "context")
+
+        # Another worker deletes a company policy
+        summaries.versions["company_universal:c1"] = 1
+
+        assert worker.get(await worker.key(_db(summaries), "policy", "u1", company_id="c1")) is None
+
+    async def test_unreadable_versions_fall_back_to_local(self):
+        """Test a failing Mongo read still keys on the local versions"""
+        db = MagicMock()
+        db.knowledge_summaries.find.side_effect = RuntimeError("mongo down")
+        cache = RAGContextCache()
+
+        key = await cache.key(db, "policy", "u1")
+        cache.invalidate("user", "u1")
+
+        assert await cache.key(db, "policy", "u1") != key
+
+    async def test_expiry_and_eviction(self):
+        """Test expired entries miss and the oldest is evicted when full"""
+        cache = RAGContextCache(max_size=2, ttl_seconds=60)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache._timestamps["a"] = datetime.now(timezone.utc) - timedelta(seconds=120)
+
+        assert cache.get("a") is None
+        cache.set("c", "3")
+        assert "a" not in cache._cache and cache.get("b") == "2"